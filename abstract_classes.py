@@ -37,4 +37,59 @@ class DrawingTool(ABC):
         Her çizim aracının kullanıcı arayüzünde görüntülenecek bir adı olmalıdır.
         Bu özellik, arayüzdeki butonlar ve durum çubuğunda kullanılır.
         """
-        pass
\ No newline at end of file
+        pass
+
+class HistoryAction(ABC):
+    """
+    Geçmişe tam tuval kopyası yerine yalnızca değişikliği kaydeden işlem.
+    
+    Taşıma, çoğaltma ve silme gibi işlemler tüm belgeyi kopyalamak yerine
+    kendi farkını (delta) saklar. Öğeler kimlikleriyle değil belge içindeki
+    sıralarıyla (z-sırası) anılır; böylece geçmişten geri yüklenen ve
+    kimlikleri değişen öğelerde de işlem doğru uygulanır.
+    """
+    
+    # Kullanıcının değil uygulamanın kendiliğinden yaptığı işlemler (ör. eski
+    # öğeleri birleştirme) ayrı bir adım sayılmaz; geri ve ileri alma onları
+    # bir önceki adımla birlikte oynatır
+    automatic = False
+    
+    @abstractmethod
+    def undo(self, canvas):
+        """İşlemi tuval üzerinde geri alır"""
+        pass
+    
+    @abstractmethod
+    def redo(self, canvas):
+        """İşlemi tuval üzerinde yeniden uygular"""
+        pass
+    
+    @abstractmethod
+    def apply(self, records):
+        """
+        İşlemi bir kayıt listesine uygular ve yeni listeyi döndürür.
+        
+        Geçmiş tam kopya saklamaz; yalnızca mevcut düğümün kayıtlarını tutar.
+        İleri alırken yeni durumun kayıtları bu metotla, geri alırken revert
+        ile elde edilir. Farklar (ör. SnapshotDelta) ortak öneki olduğu gibi
+        bırakır ve yalnızca önekten sonraki kuyruğu değiştirir.
+        """
+        pass
+    
+    def revert(self, records):
+        """
+        apply'ın tersi: işlemden sonraki kayıtlardan önceki kayıtları döndürür.
+        
+        Geçmiş ağacında dallar arasında gezinirken kullanılır. Hesaplanamıyorsa
+        None döndürülür; geçmiş bu durumda kayıtları tuvalden yeniden okur.
+        """
+        return None
+    
+    def records_held(self):
+        """
+        İşlemin geri alma ve yineleme için sakladığı kayıtlar.
+        
+        Geçmiş, hiçbir durumda kullanılmayan görüntüleri bulmak için bunlara
+        bakar (bkz. PaintHistory.image_names).
+        """
+        return ()
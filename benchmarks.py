@@ -0,0 +1,514 @@
+"""
+Paint uygulaması için basit performans ölçümleri.
+
+Kullanım:
+    python benchmarks.py [ölçüm adı ...]
+
+Arayüz ölçümleri gerçek bir Tk penceresi açar, bu yüzden bir ekran (display) gerektirir.
+"""
+import os
+import sys
+import time
+
+
+def bench_startup():
+    """
+    Açılış süresini ölçer.
+    
+    - import: paint_app modülünün içe aktarılma süresi
+    - first_paint: uygulama nesnesinin oluşturulmasından ilk karenin
+      ekrana gelmesine kadar geçen süre (time-to-first-paint)
+    """
+    started = time.perf_counter()
+    import tkinter as tk
+    import paint_app
+    import_time = time.perf_counter() - started
+    
+    root = tk.Tk()
+    app = paint_app.AdvancedPaintApp(root)
+    # İlk kare gösterilene kadar olay döngüsünü çalıştır
+    deadline = time.perf_counter() + 10
+    while app.time_to_first_paint is None and time.perf_counter() < deadline:
+        root.update()
+    root.destroy()
+    
+    return {
+        "import": import_time,
+        "first_paint": app.time_to_first_paint,
+        "pil_loaded": "PIL" in sys.modules,
+    }
+
+
+def bench_collaboration(clients=32, batches=100, dabs_per_batch=20):
+    """
+    Ortak çizim aktarma sunucusunun dağıtım gecikmesini ölçer.
+    
+    Sunucu ayrı bir süreçte çalışır. Tüm istemciler aynı anda çizer; her
+    paket diğer tüm istemcilere ulaşana kadar geçen süre ölçülür.
+    Ekran gerektirmez.
+    """
+    import socket
+    import subprocess
+    import threading
+    from collaboration import encode_records, encode_message
+    
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "collaboration.py"),
+         "--port", "0"],
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    port = int(server.stdout.readline().split()[-3].rpartition(":")[2])
+    sockets = [socket.create_connection(("127.0.0.1", port)) for _ in range(clients)]
+    for sock in sockets:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    latencies = []
+    lock = threading.Lock()
+    expected = batches * (clients - 1)
+    
+    def receive(sock):
+        stream = sock.makefile("rb")
+        stream.readline()  # anlık görüntü
+        local = []
+        for _ in range(expected):
+            line = stream.readline()
+            # Tüm mesajı çözmek yerine yalnızca zaman damgasını oku
+            start = line.rindex(b'"ts":') + 5
+            sent = float(line[start:line.index(b",", start)])
+            local.append(time.perf_counter() - sent)
+        with lock:
+            latencies.extend(local)
+    
+    def send(sock, index):
+        records = [("oval", [index, i, index + 10, i + 10], {"fill": "#000000"})
+                   for i in range(dabs_per_batch)]
+        ops = encode_records(records)
+        for _ in range(batches):
+            sock.sendall(encode_message("d", ops=ops, ts=time.perf_counter()))
+            time.sleep(0.016)
+    
+    receivers = [threading.Thread(target=receive, args=(sock,)) for sock in sockets]
+    senders = [threading.Thread(target=send, args=(sock, i)) for i, sock in enumerate(sockets)]
+    started = time.perf_counter()
+    for thread in receivers + senders:
+        thread.start()
+    for thread in receivers + senders:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for sock in sockets:
+        sock.close()
+    server.terminate()
+    server.wait()
+    
+    latencies.sort()
+    return {
+        "clients": clients,
+        "messages": len(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "elapsed": elapsed,
+    }
+
+
+def bench_vector_export(items=100000):
+    """
+    100 bin öğelik bir çizimin SVG ve PDF olarak dışa aktarılma süresini
+    ve en yüksek bellek kullanımını ölçer. Ekran gerektirmez.
+    """
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+    from vector_export import export_vector
+    
+    def records():
+        # Öğeler üreteçle verilir; bellekte hiçbir zaman tam liste oluşmaz
+        rng = random.Random(1)
+        for i in range(items):
+            color = "#FF0000" if (i // 50) % 2 else "#0000FF"
+            x, y = rng.random() * 800, rng.random() * 600
+            yield ("oval", [x, y, x + 10, y + 10], {"fill": color, "outline": color})
+    
+    result = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for ext in ("svg", "pdf"):
+            path = os.path.join(folder, f"drawing.{ext}")
+            started = time.perf_counter()
+            export_vector(records(), path, 800, 600)
+            result[ext] = time.perf_counter() - started
+            # Bellek ölçümü ayrı çalıştırılır; tracemalloc süreyi çok uzatır
+            tracemalloc.start()
+            export_vector(records(), path, 800, 600)
+            result[f"{ext}_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+            result[f"{ext}_size_kb"] = os.path.getsize(path) // 1024
+    return result
+
+
+def bench_raster_brush(dabs=5000, brush_size=50):
+    """
+    Raster fırçanın saniyede basabildiği damga sayısını ölçer.
+    
+    Damgalar 800x600'lük bir alanda rastgele çizgiler boyunca, çizimdeki
+    aralıkla basılır. Ekran gerektirmez (yalnızca tampon ölçülür).
+    """
+    import random
+    import numpy as np
+    from raster_brush import SPACING, RasterBuffer, dab_mask, make_dab
+    
+    rng = random.Random(1)
+    color = np.array((0.2, 0.4, 0.8), dtype=np.float32)
+    started = time.perf_counter()
+    for shape in ("oval", "square", "star"):
+        dab_mask(shape, brush_size, 0.8)
+    mask_time = time.perf_counter() - started
+    
+    result = {"masks": mask_time}
+    step = brush_size * 2 * SPACING
+    for shape in ("oval", "star"):
+        dab = make_dab(dab_mask(shape, brush_size, 0.8), color)
+        buffer = RasterBuffer()
+        buffer.begin_stroke()
+        x, y = 400.0, 300.0
+        started = time.perf_counter()
+        for i in range(dabs):
+            if i % 50 == 0:
+                angle = rng.random() * 6.283
+            x = min(max(x + step * np.cos(angle), 0), 800)
+            y = min(max(y + step * np.sin(angle), 0), 600)
+            buffer.stamp(x, y, dab)
+        elapsed = time.perf_counter() - started
+        result[f"{shape}_dabs_per_s"] = int(dabs / elapsed)
+        # Bir karede değişen döşemelerin ekran dizisine çevrilmesi
+        started = time.perf_counter()
+        dirty = buffer.take_dirty()
+        for key in dirty:
+            buffer.rgba(key)
+        result[f"{shape}_tiles"] = len(dirty)
+        result[f"{shape}_tile_convert"] = (time.perf_counter() - started) / max(len(dirty), 1)
+    return result
+
+
+def bench_raster_worker(events=500, dabs_per_event=4, brush_size=50):
+    """
+    Raster fırça olaylarının Tk iş parçacığındaki maliyetini yerel tampon
+    ile işçi süreçli tampon (raster_worker) arasında karşılaştırır.
+
+    - local / worker: olay başına Tk tarafında geçen süre (damgalama ve
+      karedeki kirli döşemelerin ekran dizisine çevrilmesi dahil)
+    - worker_drain: son olaydan sonra işçinin tüm döşemeleri yayınlaması
+    Ekran gerektirmez.
+    """
+    import math
+    from raster_brush import FRAME_MS, SPACING, RasterBuffer
+    from raster_worker import WorkerRasterBuffer
+
+    spec = ("oval", brush_size, 0.8, (0.2, 0.4, 0.8))
+    step = brush_size * 2 * SPACING
+    batches = []
+    x, y = 400.0, 300.0
+    for i in range(events):
+        angle = (i // 40) * 1.3
+        batch = []
+        for _ in range(dabs_per_event):
+            x = min(max(x + step * math.cos(angle), 0), 1600)
+            y = min(max(y + step * math.sin(angle), 0), 1000)
+            batch.append((x, y))
+        batches.append(batch)
+
+    def run(buffer):
+        buffer.begin_stroke()
+        frame = time.perf_counter()
+        elapsed = 0.0
+        for batch in batches:
+            started = time.perf_counter()
+            buffer.stamp_dabs(batch, spec)
+            # Kare zamanı geldiyse kirli döşemeler ekran biçimine çevrilir
+            if started - frame > FRAME_MS / 1000:
+                for key in buffer.take_dirty():
+                    buffer.rgba(key)
+                frame = started
+            elapsed += time.perf_counter() - started
+        return elapsed / events
+
+    result = {"local": run(RasterBuffer())}
+    buffer = WorkerRasterBuffer()
+    try:
+        buffer.keys()
+        result["worker"] = run(buffer)
+        started = time.perf_counter()
+        buffer.keys()
+        result["worker_drain"] = time.perf_counter() - started
+    finally:
+        buffer.close()
+    return result
+
+
+def bench_png_export(strokes=200, dabs_per_stroke=60, width=1600, height=1000):
+    """
+    Hızlı renk paletiyle yapılmış bir çizimin PNG boyutunu ve kodlama
+    süresini RGB (varsayılan ayarlar) ile paletli PNG arasında karşılaştırır.
+    Ekran gerektirmez.
+    """
+    import math
+    import os
+    import random
+    import tempfile
+    from png_export import PNG_STRATEGIES, save_png
+    from raster_render import new_image, render_records
+    
+    # Fırça çizgileri gibi art arda basılmış oval damgalar
+    rng = random.Random(1)
+    colors = ["#000000", "#FF0000", "#00AA00", "#0000FF", "#FFCC00", "#884400"]
+    records = []
+    for stroke in range(strokes):
+        color = colors[stroke % len(colors)]
+        x, y = rng.random() * width, rng.random() * height
+        angle = rng.random() * 2 * math.pi
+        size = rng.choice((3, 5, 8, 12))
+        for _ in range(dabs_per_stroke):
+            angle += rng.uniform(-0.3, 0.3)
+            x += math.cos(angle) * size / 2
+            y += math.sin(angle) * size / 2
+            records.append(("oval", [x - size, y - size, x + size, y + size],
+                            {"fill": color, "outline": color}))
+    image = render_records(new_image(width, height), records)
+    
+    result = {}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "drawing.png")
+        started = time.perf_counter()
+        image.save(path)
+        result["rgb_default"] = time.perf_counter() - started
+        rgb_size = os.path.getsize(path)
+        result["rgb_kb"] = rgb_size // 1024
+        for name, level in (("fast", 1), ("default", 6), ("max", 9)):
+            for strategy in ("Varsayılan", "RLE"):
+                info = save_png(image, path, level, PNG_STRATEGIES[strategy])
+                key = f"p_{name}_{strategy[:3].lower()}"
+                result[key] = info["seconds"]
+                result[f"{key}_ratio"] = f"{rgb_size / info['bytes']:.1f}x"
+    return result
+
+
+def bench_thumbnails(files=5000):
+    """
+    Bir klasördeki çizimlerin önizlemelerini soğuk önbellekle üretme ve
+    ısınmış önbellekle (yeni bir süreçteki gibi dizinden okuyarak) listeleme
+    süresini ölçer. Ekran gerektirmez.
+    """
+    import os
+    import random
+    import tempfile
+    from PIL import Image, ImageDraw
+    from thumbnails import ThumbnailCache
+    
+    rng = random.Random(1)
+    result = {}
+    with tempfile.TemporaryDirectory() as folder:
+        drawings = os.path.join(folder, "drawings")
+        os.makedirs(drawings)
+        for i in range(files):
+            image = Image.new("RGB", (320, 240), "white")
+            draw = ImageDraw.Draw(image)
+            for _ in range(5):
+                x, y = rng.randrange(300), rng.randrange(220)
+                draw.ellipse((x, y, x + 20, y + 20), fill=(rng.randrange(256), 0, 0))
+            image.save(os.path.join(drawings, f"drawing_{i:05d}.png"), compress_level=1)
+        cache_dir = os.path.join(folder, "cache")
+        
+        cache = ThumbnailCache(cache_dir)
+        started = time.perf_counter()
+        listed = cache.list_folder(drawings)
+        cache.close()
+        result["cold"] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        cache = ThumbnailCache(cache_dir)
+        result["warm_open"] = time.perf_counter() - started
+        started = time.perf_counter()
+        listed = cache.list_folder(drawings)
+        result["warm_list"] = time.perf_counter() - started
+        result["hits"] = sum(1 for _, thumbnail in listed if thumbnail)
+        result["cache_kb"] = cache.total_bytes // 1024
+        cache.close()
+    return result
+
+
+def bench_image_brush(dabs=2000, brush_size=20):
+    """
+    Resim damgalı fırçanın bir çizgideki damga başına süresini ölçer: boş
+    önbellekle (her açı dilimi ilk kez hazırlanır) ve ısınmış önbellekle.
+    Tk penceresi açar (PhotoImage için).
+    """
+    import os
+    import tempfile
+    import tkinter as tk
+    from PIL import Image, ImageDraw
+    from image_brush import ImageStampBrush, StampCache
+    
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=1600, height=1000)
+    result = {}
+    with tempfile.TemporaryDirectory() as folder:
+        tip_path = os.path.join(folder, "leaf.png")
+        tip = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+        ImageDraw.Draw(tip).ellipse((32, 64, 224, 192), fill=(0, 0, 0, 255))
+        tip.save(tip_path)
+        brush = ImageStampBrush(tip_path, cache=StampCache())
+        for label in ("cold", "warm"):
+            brush.start(canvas, 0, 0)
+            started = time.perf_counter()
+            count = 0
+            for i in range(dabs):
+                count += len(brush.draw(canvas, (i * 7) % 1600, (i * 3) % 1000, brush_size, "#336699"))
+            result[label] = (time.perf_counter() - started) / max(count, 1)
+        result["stamps"] = len(brush._cache)
+        result["cache_kb"] = brush._cache.total_bytes // 1024
+    root.destroy()
+    return result
+
+
+def bench_document(shapes=20000, lasso_queries=200):
+    """
+    Araçları, seçimi ve geçmişi ekran olmadan belge modeli (DocumentCanvas)
+    üzerinde çalıştırır: şekil çizme, kement seçimi ve geri al/yinele.
+    """
+    import random
+    from document import DocumentCanvas
+    from drawing_tools import EllipseTool, RectangleTool
+    from selection import LassoTool
+    from settings import PaintHistory
+    
+    rng = random.Random(1)
+    canvas = DocumentCanvas(width=1600, height=1000)
+    history = PaintHistory(canvas)
+    tools = [RectangleTool(), EllipseTool()]
+    result = {}
+    
+    started = time.perf_counter()
+    for i in range(shapes):
+        tool = tools[i % 2]
+        x, y = rng.randrange(1580), rng.randrange(980)
+        tool.start(canvas, x, y)
+        for step in range(1, 5):
+            tool.drag(canvas, x + 5 * step, y + 5 * step, "#000000")
+        canvas.update()
+        tool.end(canvas, x + 20, y + 20, 2, "#000000")
+    result["draw"] = time.perf_counter() - started
+    
+    lasso = LassoTool()
+    started = time.perf_counter()
+    for _ in range(lasso_queries):
+        x, y = rng.randrange(1500), rng.randrange(900)
+        lasso.start(canvas, x, y)
+        for dx, dy in ((100, 0), (100, 100), (0, 100)):
+            lasso.drag(canvas, x + dx, y + dy, "#000000")
+        lasso.end(canvas, x, y + 100, 1, "#000000")
+    result["lasso"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    history.save_state()
+    for _ in range(20):
+        action = lasso.duplicate_selection(canvas)
+        if action:
+            history.push_action(action)
+    result["duplicate"] = time.perf_counter() - started
+    result["items"] = len(canvas.document)
+    started = time.perf_counter()
+    while history.undo():
+        pass
+    result["undo_all"] = time.perf_counter() - started
+    return result
+
+
+def bench_fills(shapes=1000, size=(240, 160)):
+    """
+    Geçişli dolgulu elipslerin şekil başına süresini ölçer: ilk şekil (dolgu
+    hesaplanır ve kırpılır) ve aynı boyuttaki sonraki şekiller (önbellek).
+    Tk penceresi açar (PhotoImage için).
+    """
+    import tkinter as tk
+    from fills import Fill, FillCache
+    
+    root = tk.Tk()
+    cache = FillCache()
+    result = {}
+    for kind in ("linear", "radial", "checker"):
+        fill = Fill(kind, "#336699", "#FFFFFF", 90)
+        started = time.perf_counter()
+        cache.shape_image(fill, "oval", [0, 0, *size])
+        result[f"{kind}_first"] = time.perf_counter() - started
+        started = time.perf_counter()
+        for i in range(shapes):
+            cache.shape_image(fill, "oval", [i, i, i + size[0], i + size[1]])
+        result[f"{kind}_cached"] = (time.perf_counter() - started) / shapes
+    root.destroy()
+    return result
+
+
+def bench_project_file(items=200000, size=16000):
+    """
+    Bölge dizinli proje dosyasını yazar; açılış (yalnızca dizin), görünen
+    alanın kayıtlarını okuma ve tüm dosyayı okuma sürelerini karşılaştırır.
+    """
+    import os
+    import random
+    import tempfile
+    from project_file import ProjectFile, save_project
+    
+    rng = random.Random(1)
+    records = []
+    for _ in range(items):
+        x, y = rng.uniform(0, size), rng.uniform(0, size)
+        records.append(("line", [x, y, x + rng.uniform(-40, 40), y + rng.uniform(-40, 40)],
+                        {"fill": "#000000", "width": "2.0"}))
+    result = {}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench.paintproj")
+        started = time.perf_counter()
+        save_project(path, records)
+        result["save"] = time.perf_counter() - started
+        result["kb"] = os.path.getsize(path) // 1024
+        started = time.perf_counter()
+        with ProjectFile(path) as project:
+            result["open"] = time.perf_counter() - started
+            started = time.perf_counter()
+            result["viewport_items"] = len(project.records_in((0, 0, 1600, 1000)))
+            result["viewport"] = time.perf_counter() - started
+            started = time.perf_counter()
+            project.records_in()
+            result["full"] = time.perf_counter() - started
+    return result
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "collaboration": bench_collaboration,
+    "vector_export": bench_vector_export,
+    "raster_brush": bench_raster_brush,
+    "raster_worker": bench_raster_worker,
+    "png_export": bench_png_export,
+    "thumbnails": bench_thumbnails,
+    "document": bench_document,
+    "image_brush": bench_image_brush,
+    "project_file": bench_project_file,
+    "fills": bench_fills,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        bench = BENCHMARKS[name]
+        result = bench()
+        values = ", ".join(
+            f"{key}={value * 1000:.1f} ms" if isinstance(value, float) else f"{key}={value}"
+            for key, value in result.items()
+        )
+        print(f"{name}: {values}")
+
+
+if __name__ == "__main__":
+    main()
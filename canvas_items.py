@@ -0,0 +1,249 @@
+import tkinter as tk
+
+# Kanvas öğelerinin taşınabilir kayıtları
+# =======================================
+# Bir kanvas öğesi (item_type, coords, options) üçlüsü ile temsil edilir.
+# Geçmiş (PaintHistory), ortak çizim ve dışa aktarma gibi özellikler
+# öğeleri bu ortak biçimle kaydeder ve yeniden oluşturur.
+
+# Belgeye ait olmayan öğeler (önizlemeler, seçim çerçevesi vb.) bu etiketi taşır
+OVERLAY_TAG = "overlay"
+# Belge öğelerini seçen Tk etiket ifadesi
+DOCUMENT_ITEMS = "!" + OVERLAY_TAG
+
+# Kaydedilen stil seçenekleri
+ITEM_OPTIONS = ['fill', 'outline', 'width', 'dash']
+# Görüntü öğeleri için kaydedilen seçenekler
+IMAGE_OPTIONS = ['image', 'anchor']
+
+# Öğe tipine göre kanvas oluşturma metodunun adı
+CREATE_METHODS = {
+    "oval": "create_oval",
+    "rectangle": "create_rectangle",
+    "line": "create_line",
+    "polygon": "create_polygon",
+    "image": "create_image",
+}
+
+# Kayıtlarda adıyla anılan görüntüler: ad -> (PhotoImage, PIL görüntüsü).
+# Tk görüntüsü, ona başvuran bir kayıt (geçmişte ya da tuvalde) kaldığı
+# sürece yaşamalıdır; bu yüzden burada tutulur.
+_IMAGES = {}
+# Yalnızca tek bir belgeye ait görüntülerin adları (birleştirme, proje
+# dosyası). Önbellekteki paylaşılan görüntülerin (dolgu, görüntü fırçası)
+# aksine belge sekmesi askıya alınınca kayıttan çıkarılabilirler.
+_DOCUMENT_IMAGES = set()
+
+
+def register_image(photo, image, document=False):
+    """
+    Bir PhotoImage'ı ve PIL karşılığını kayıtlarda kullanılmak üzere saklar.
+
+    document, görüntünün yalnızca bir belgeye ait olduğunu belirtir (bkz.
+    document_images).
+    """
+    name = str(photo)
+    _IMAGES[name] = (photo, image)
+    if document:
+        _DOCUMENT_IMAGES.add(name)
+    return name
+
+
+def image_for(name):
+    """Kayıttaki görüntü adının PIL görüntüsünü döndürür (bilinmiyorsa None)"""
+    entry = _IMAGES.get(name)
+    return entry[1] if entry else None
+
+
+def release_images(names):
+    """Artık hiçbir kayıtta anılmayan görüntüleri bırakır (Tk görüntüsü de silinir)"""
+    for name in names:
+        _IMAGES.pop(name, None)
+        _DOCUMENT_IMAGES.discard(name)
+
+
+def document_images(names):
+    """Adlardan belgeye ait olanların PIL görüntüleri ({ad: görüntü}); kayıt değişmez"""
+    return {
+        name: _IMAGES[name][1] for name in names
+        if name in _DOCUMENT_IMAGES and name in _IMAGES
+    }
+
+
+def restore_images(images):
+    """document_images ile alınıp bırakılan görüntüleri aynı adlarla yeniden kaydeder"""
+    if not images:
+        return
+    from PIL import ImageTk
+    for name, image in images.items():
+        register_image(ImageTk.PhotoImage(image, name=name), image, document=True)
+
+
+def referenced_images(records):
+    """Kayıtlardaki görüntü öğelerinin anıldığı görüntü adları (küme)"""
+    return {
+        options["image"] for item_type, _, options in records
+        if item_type == "image" and options.get("image")
+    }
+
+
+def capture_item(canvas, item_id):
+    """Tek bir kanvas öğesini (item_type, coords, options) kaydına dönüştürür"""
+    item_type = canvas.type(item_id)
+    coords = canvas.coords(item_id)
+    options = {}
+    for option in (IMAGE_OPTIONS if item_type == "image" else ITEM_OPTIONS):
+        try:
+            value = canvas.itemcget(item_id, option)
+            if value:
+                options[option] = value
+        except tk.TclError:
+            # Bu öğe tipi bu seçeneği desteklemiyor
+            pass
+    return (item_type, coords, options)
+
+
+def document_items(canvas):
+    """Belgeye ait öğelerin kimliklerini z-sırasıyla (alttan üste) döndürür"""
+    return canvas.find_withtag(DOCUMENT_ITEMS)
+
+
+def capture_items(canvas, item_ids=None):
+    """Verilen (ya da tüm belge) öğeleri kayıt listesine dönüştürür"""
+    if item_ids is None:
+        item_ids = document_items(canvas)
+    if _is_headless(canvas):
+        # Belge modelinde kayıtlar doğrudan okunur
+        return canvas.document.records(item_ids)
+    return [capture_item(canvas, item_id) for item_id in item_ids]
+
+
+def _is_headless(canvas):
+    """
+    Kanvas Tk yerine bir belge modeli üzerinde çalışıyorsa (DocumentCanvas)
+    True döndürür; toplu Tcl çağrıları yerine kanvasın metotları kullanılır.
+    """
+    return getattr(canvas, "document", None) is not None
+
+
+def bboxes(canvas, item_ids):
+    """
+    Öğelerin sınır kutularını tek bir Tcl çağrısıyla döndürür.
+    
+    Her öğe için ayrı canvas.bbox çağrısı yapmak binlerce Python-Tcl
+    gidiş dönüşü demektir; bunun yerine döngü Tcl içinde çalıştırılır.
+    """
+    if not item_ids:
+        return []
+    if _is_headless(canvas):
+        return [canvas.bbox(item_id) for item_id in item_ids]
+    script = "set r {}; foreach i {%s} { lappend r [%s bbox $i] }; set r" % (
+        " ".join(str(i) for i in item_ids), canvas._w
+    )
+    boxes = []
+    for box in canvas.tk.splitlist(canvas.tk.eval(script)):
+        values = canvas.tk.splitlist(box)
+        boxes.append(tuple(float(v) for v in values) if values else None)
+    return boxes
+
+
+def tag_items(canvas, tag, item_ids):
+    """Verilen öğelere tek bir Tcl çağrısıyla etiket ekler"""
+    if item_ids and _is_headless(canvas):
+        for item_id in item_ids:
+            canvas.addtag(tag, "withtag", item_id)
+    elif item_ids:
+        canvas.tk.eval("foreach i {%s} { %s addtag %s withtag $i }" % (
+            " ".join(str(i) for i in item_ids), canvas._w, tag
+        ))
+
+
+def lower_items(canvas, pairs):
+    """
+    Her (öğe, alt komşu) çiftinde öğeyi komşusunun altına tek bir Tcl
+    çağrısıyla taşır; çiftler verildiği sırayla uygulanır.
+    """
+    if pairs and _is_headless(canvas):
+        for item_id, below in pairs:
+            canvas.tag_lower(item_id, below)
+    elif pairs:
+        canvas.tk.eval("foreach {i b} {%s} { %s lower $i $b }" % (
+            " ".join(f"{item_id} {below}" for item_id, below in pairs), canvas._w
+        ))
+
+
+def create_items(canvas, records):
+    """
+    Kayıtlardan öğeleri tek bir Tcl çağrısıyla oluşturur ve kimliklerini döndürür.
+    
+    Komutlar iç içe demetler (tuple) olarak verilir; tkinter bunları Tcl
+    listelerine çevirdiği için değerlerin ayrıca tırnaklanması gerekmez.
+    Desteklenmeyen öğe tipleri atlanır.
+    """
+    if _is_headless(canvas):
+        created = [create_item(canvas, record) for record in records]
+        return [item_id for item_id in created if item_id is not None]
+    commands = []
+    for item_type, coords, options in records:
+        if item_type not in CREATE_METHODS:
+            continue
+        command = [canvas._w, "create", item_type, *coords]
+        for option, value in options.items():
+            command.extend(("-" + option, value))
+        commands.append(tuple(command))
+    if not commands:
+        return []
+    result = canvas.tk.call("lmap", "command", tuple(commands), "{*}$command")
+    return [int(i) for i in canvas.tk.splitlist(result)]
+
+
+class RecordingCanvas:
+    """
+    Öğe oluşturma çağrılarını kanvasa göndermek yerine kayıt olarak biriktirir.
+    
+    Araçların draw metodu bu nesneyle çağrılır, biriken kayıtlar sonra
+    create_items ile tek seferde oluşturulur. Diğer tüm çağrılar gerçek
+    kanvasa iletilir.
+    """
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self.records = []
+    
+    def _record(self, item_type, coords, options):
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self.records.append((item_type, list(coords), options))
+    
+    def create_oval(self, *coords, **options):
+        self._record("oval", coords, options)
+    
+    def create_rectangle(self, *coords, **options):
+        self._record("rectangle", coords, options)
+    
+    def create_line(self, *coords, **options):
+        self._record("line", coords, options)
+    
+    def create_polygon(self, *coords, **options):
+        self._record("polygon", coords, options)
+    
+    def create_image(self, *coords, **options):
+        self._record("image", coords, options)
+    
+    def __getitem__(self, key):
+        return self._canvas[key]
+    
+    def __getattr__(self, name):
+        return getattr(self._canvas, name)
+
+
+def create_item(canvas, record):
+    """
+    Bir kayıttan kanvas öğesi oluşturur.
+
+    Desteklenmeyen öğe tipleri için None döndürür.
+    """
+    item_type, coords, options = record
+    method = CREATE_METHODS.get(item_type)
+    if method is None:
+        return None
+    return getattr(canvas, method)(coords, **options)
@@ -0,0 +1,500 @@
+import asyncio
+import json
+import queue
+import socket
+import threading
+import uuid
+from collections import deque
+
+from canvas_items import DOCUMENT_ITEMS, capture_items, create_items, tag_items
+
+# Ortak (gerçek zamanlı) çizim
+# ============================
+# Her istemci, bir kare (frame) boyunca oluşturduğu öğeleri tek bir delta
+# mesajında toplar ve küçük bir aktarma (relay) sunucusuna gönderir.
+# Sunucu mesajı diğer istemcilere aynen iletir. Sonradan katılan istemciler
+# önce bir anlık görüntü (snapshot), ardından son deltaları (tail) alır.
+#
+# Mesajlar satır sonu ile ayrılmış JSON nesneleridir:
+#   {"t": "d", "s": çizgi, "ops": [...]}       -> delta paketi
+#   {"t": "s", "bg": renk, "ops": [...]}       -> anlık görüntü (sunucudan)
+#
+# Bir işlem (op) şu biçimlerden biridir:
+#   [item_type, coords, options]  -> öğe oluştur (stil öncekiyle aynıysa options yazılmaz)
+#   ["!clear"]                    -> tuvali temizle
+#   ["!bg", renk]                 -> arka plan rengini değiştir
+#   ["!s", çizgi]                 -> sonraki öğeler bu çizgiye ait (anlık görüntüde)
+#   ["!undo", çizgi]              -> çizginin öğelerini sil
+#
+# Her istemcinin çizgileri "istemci:sıra" biçiminde bir kimlik taşır ve
+# kanvasta bu kimliğin etiketiyle işaretlenir. Oturum sürerken geri alma
+# yalnızca istemcinin kendi çizgilerini kapsar: geri alınan çizgi "!undo"
+# ile herkeste silinir, ileri alınan çizgi aynı kimlikle yeniden gönderilir.
+# Uzak işlemler yerel geçmişe geri alınamaz adımlar olarak yazılır
+# (on_remote); böylece yerel geri alma başkalarının çizgilerine dokunmaz.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+FRAME_MS = 16  # ~60 kare/sn
+
+CLEAR = "!clear"
+BACKGROUND = "!bg"
+STROKE = "!s"
+UNDO = "!undo"
+
+
+def stroke_tag(stroke):
+    """Çizgi kimliğinin kanvas etiketi"""
+    return "stroke:" + stroke
+
+
+def encode_records(records):
+    """
+    Öğe kayıtlarını kompakt işlem listesine dönüştürür.
+
+    Koordinatlar yuvarlanır ve art arda gelen aynı stildeki öğeler için
+    stil sözlüğü yalnızca bir kez yazılır.
+    """
+    ops = []
+    last_options = None
+    for item_type, coords, options in records:
+        if not item_type:
+            # Gönderilmeden önce silinmiş öğe
+            continue
+        op = [item_type, [round(float(c), 1) for c in coords]]
+        if options != last_options:
+            op.append(options)
+            last_options = options
+        ops.append(op)
+    return ops
+
+
+def encode_message(kind, **fields):
+    """Bir mesajı tek satırlık JSON baytlarına dönüştürür"""
+    fields["t"] = kind
+    return (json.dumps(fields, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class RelayServer:
+    """
+    Deltaları istemciler arasında dağıtan asyncio tabanlı aktarma sunucusu.
+
+    Her istemcinin sınırlı boyutta bir gönderim kuyruğu vardır. Kuyruğu dolan
+    (geride kalan) istemcinin bağlantısı kesilir; böylece yavaş bir istemci
+    diğerlerinin gecikmesini artıramaz. Yeniden bağlanan istemci anlık
+    görüntü ile güncel duruma gelir.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=0, tail_limit=512, queue_limit=256):
+        self._host = host
+        self._port = port
+        self._tail_limit = tail_limit
+        self._queue_limit = queue_limit
+        self._clients = {}
+        self._snapshot = []
+        self._folded = []
+        self._background = None
+        self._tail = deque()
+        self._server = None
+        self._loop = None
+
+    @property
+    def port(self):
+        """Sunucunun dinlediği port (port=0 verildiyse işletim sistemi seçer)"""
+        return self._port
+
+    async def start(self):
+        """Sunucuyu başlatır"""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(
+            self._handle_client, self._host, self._port, limit=2 ** 24
+        )
+        self._port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Sunucuyu başlatır ve kapatılana kadar çalıştırır"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        """
+        Sunucuyu arka planda ayrı bir iş parçacığında çalıştırır.
+
+        Sunucu dinlemeye başladığında portu döndürür. Sunucu başlatılamazsa
+        (ör. port kullanımda) hata çağıranın iş parçacığında yeniden fırlatılır.
+        """
+        ready = threading.Event()
+        failure = []
+
+        async def run():
+            try:
+                await self.start()
+            except BaseException as e:
+                failure.append(e)
+                return
+            finally:
+                ready.set()
+            try:
+                await self.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+        thread.start()
+        ready.wait()
+        if failure:
+            thread.join()
+            raise failure[0]
+        return self._port
+
+    def stop(self):
+        """Sunucuyu durdurur (herhangi bir iş parçacığından çağrılabilir)"""
+        if self._server is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+    async def _handle_client(self, reader, writer):
+        """Yeni bir istemciye anlık görüntü gönderir ve mesajlarını dağıtır"""
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        outbox = asyncio.Queue(self._queue_limit)
+        # Sonradan katılan istemci: anlık görüntü + son deltalar
+        writer.write(encode_message("s", bg=self._background, ops=self._build_snapshot()))
+        for line in self._tail:
+            writer.write(line)
+        self._clients[writer] = outbox
+        sender = asyncio.ensure_future(self._send_loop(writer, outbox))
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._record(line)
+                self._broadcast(line, writer)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self._drop(writer)
+            sender.cancel()
+
+    async def _send_loop(self, writer, outbox):
+        """Bir istemcinin kuyruğundaki mesajları toplu halde yazar"""
+        try:
+            while True:
+                writer.write(await outbox.get())
+                # Birikmiş mesajları tek seferde yaz
+                while not outbox.empty():
+                    writer.write(outbox.get_nowait())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def _broadcast(self, line, sender):
+        """Mesajı gönderen dışındaki tüm istemcilere iletir"""
+        for writer, outbox in list(self._clients.items()):
+            if writer is sender:
+                continue
+            try:
+                outbox.put_nowait(line)
+            except asyncio.QueueFull:
+                # Geride kalan istemci: gecikmeyi sınırlı tutmak için bağlantıyı kes
+                self._drop(writer)
+
+    def _drop(self, writer):
+        """İstemciyi listeden çıkarır ve bağlantısını kapatır"""
+        if self._clients.pop(writer, None) is not None:
+            writer.close()
+
+    def _record(self, line):
+        """Mesajı anlık görüntü ve son deltalar listesine işler"""
+        # Sıcak yol: kontrol işlemi içermeyen paketler çözümlenmeden saklanır
+        if b'"!' in line:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                return
+            for op in message.get("ops", ()):
+                if op and op[0] == CLEAR:
+                    self._snapshot = []
+                    self._folded.clear()
+                    self._tail.clear()
+                elif op and op[0] == BACKGROUND:
+                    self._background = op[1]
+        self._tail.append(line)
+        # Eski deltalar ham halleriyle anlık görüntüye aktarılır; çözümleme
+        # yalnızca yeni bir istemci katıldığında yapılır
+        while len(self._tail) > self._tail_limit:
+            self._folded.append(self._tail.popleft())
+
+    def _build_snapshot(self):
+        """
+        Anlık görüntüye aktarılmış paketleri tek bir işlem listesinde birleştirir.
+
+        Çizgi kimlikleri "!s" işlemleriyle, geri almalar sırasıyla korunur.
+        """
+        for line in self._folded:
+            message = json.loads(line)
+            if message.get("s"):
+                self._snapshot.append([STROKE, message["s"]])
+            self._snapshot.extend(
+                op for op in message.get("ops", ())
+                if op and (op[0] == UNDO or not op[0].startswith("!"))
+            )
+        self._folded.clear()
+        return self._snapshot
+
+
+class CollaborationSession:
+    """
+    Bir AdvancedPaintApp tuvalini aktarma sunucusuna bağlayan istemci.
+
+    Ağ işlemleri arka plan iş parçacıklarında yapılır. Tk iş parçacığı
+    yalnızca her karede bir kez gelen mesajları uygular ve o karede
+    oluşturulan yerel öğeleri tek bir delta paketi halinde gönderir.
+
+    on_remote, uzak işlemler uygulandıktan sonra karede bir kez çağrılır:
+    yalnızca öğe eklendiyse eklenen kayıtlarla, öğe silindiyse None ile.
+    """
+    def __init__(self, root, canvas, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 on_clear=None, on_background=None, on_disconnect=None, on_remote=None):
+        self._root = root
+        self._canvas = canvas
+        self._on_clear = on_clear
+        self._on_background = on_background
+        self._on_disconnect = on_disconnect
+        self._on_remote = on_remote
+
+        # Yerel çizgilerin kimlikleri: gönderilen ve geri alınabilir olanlar
+        # (done), geri alınmış ve kayıtlarıyla ileri alınabilir olanlar (undone)
+        self._client = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._stroke = self._next_stroke()
+        self._done = []
+        self._undone = []
+
+        self._sock = socket.create_connection((host, port))
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._incoming = queue.Queue()
+        self._outgoing = queue.Queue()
+        self._pending_items = []
+        self._pending_controls = []
+        self._connected = True
+
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        threading.Thread(target=self._write_loop, daemon=True).start()
+        self._tick_job = self._root.after(FRAME_MS, self._tick)
+
+    @property
+    def connected(self):
+        return self._connected
+
+    def items_created(self, item_ids):
+        """Yerel olarak oluşturulan öğeleri bir sonraki pakete ekler"""
+        tag_items(self._canvas, stroke_tag(self._stroke), item_ids)
+        self._pending_items.extend(item_ids)
+
+    def stroke_committed(self):
+        """Tamamlanan çizgiyi kare beklemeden hemen gönderir"""
+        self._flush()
+        if self._canvas.find_withtag(stroke_tag(self._stroke)):
+            self._done.append(self._stroke)
+            self._undone.clear()
+            self._stroke = self._next_stroke()
+
+    def send_clear(self):
+        """Tuval temizleme işlemini gönderir; temizlenen çizgiler geri alınamaz"""
+        self._flush()
+        self._pending_controls.append([CLEAR])
+        self._flush()
+        self._forget_strokes()
+
+    def undo(self):
+        """
+        Bu istemcinin son çizgisini siler ve silmeyi diğer istemcilere gönderir.
+
+        Geri alınacak çizgi yoksa False döndürür.
+        """
+        self._flush()
+        while self._done:
+            stroke = self._done.pop()
+            tag = stroke_tag(stroke)
+            item_ids = self._canvas.find_withtag(tag)
+            if not item_ids:
+                # Çizgi başka bir yolla (ör. seçimle) silinmiş
+                continue
+            self._undone.append((stroke, capture_items(self._canvas, item_ids)))
+            self._canvas.delete(tag)
+            self._outgoing.put(encode_message("d", ops=[[UNDO, stroke]]))
+            return True
+        return False
+
+    def redo(self):
+        """Son geri alınan çizgiyi aynı kimlikle yeniden oluşturur ve gönderir"""
+        self._flush()
+        if not self._undone:
+            return False
+        stroke, records = self._undone.pop()
+        tag_items(self._canvas, stroke_tag(stroke), create_items(self._canvas, records))
+        self._outgoing.put(encode_message("d", s=stroke, ops=encode_records(records)))
+        self._done.append(stroke)
+        return True
+
+    def send_background(self, color):
+        """Arka plan rengi değişikliğini gönderir"""
+        self._pending_controls.append([BACKGROUND, color])
+
+    def close(self):
+        """Bağlantıyı kapatır"""
+        if not self._connected:
+            return
+        self._connected = False
+        self._root.after_cancel(self._tick_job)
+        self._outgoing.put(None)
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def _tick(self):
+        """Her karede: gelen mesajları uygula, bekleyen yerel öğeleri gönder"""
+        self._flush()
+        self._apply_incoming()
+        if self._connected:
+            self._tick_job = self._root.after(FRAME_MS, self._tick)
+
+    def _next_stroke(self):
+        self._sequence += 1
+        return f"{self._client}:{self._sequence}"
+
+    def _forget_strokes(self):
+        """Temizlenen tuvaldeki çizgiler artık geri ya da ileri alınamaz"""
+        self._done.clear()
+        self._undone.clear()
+
+    def _flush(self):
+        """Bu karede biriken öğeleri tek bir delta paketi olarak kuyruğa koyar"""
+        if not self._pending_items and not self._pending_controls:
+            return
+        ops = encode_records(capture_items(self._canvas, self._pending_items))
+        ops.extend(self._pending_controls)
+        self._pending_items = []
+        self._pending_controls = []
+        if ops:
+            self._outgoing.put(encode_message("d", s=self._stroke, ops=ops))
+
+    def _apply_incoming(self):
+        """Kuyruktaki tüm uzak mesajları tuvale uygular"""
+        added = []
+        removed = False
+        while True:
+            try:
+                message = self._incoming.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                self._connected = False
+                if self._on_disconnect:
+                    self._on_disconnect()
+                return
+            if message.get("t") == "s":
+                self._canvas.delete(DOCUMENT_ITEMS)
+                self._forget_strokes()
+                removed = True
+                if message.get("bg") and self._on_background:
+                    self._on_background(message["bg"])
+            removed = self._apply_ops(message.get("ops", ()), message.get("s"), added) or removed
+        if (added or removed) and self._on_remote:
+            self._on_remote(None if removed else added)
+
+    def _apply_ops(self, ops, stroke, added):
+        """
+        İşlem listesini tuvale uygular; oluşturulan kayıtları added'a ekler.
+
+        Art arda gelen oluşturma işlemleri tek bir Tcl çağrısıyla uygulanır.
+        Öğe silindiyse True döndürür.
+        """
+        options = {}
+        records = []
+        removed = False
+
+        def create():
+            if records:
+                item_ids = create_items(self._canvas, records)
+                if stroke:
+                    tag_items(self._canvas, stroke_tag(stroke), item_ids)
+                added.extend(records)
+                records.clear()
+
+        for op in ops:
+            kind = op[0]
+            if not kind.startswith("!"):
+                if len(op) > 2:
+                    options = op[2]
+                records.append((kind, op[1], options))
+                continue
+            create()
+            if kind == CLEAR:
+                self._canvas.delete(DOCUMENT_ITEMS)
+                self._forget_strokes()
+                removed = True
+                if self._on_clear:
+                    self._on_clear()
+            elif kind == BACKGROUND:
+                if self._on_background:
+                    self._on_background(op[1])
+            elif kind == STROKE:
+                stroke = op[1]
+            elif kind == UNDO:
+                self._canvas.delete(stroke_tag(op[1]))
+                removed = True
+        create()
+        return removed
+
+    def _read_loop(self):
+        """Arka plan: sunucudan gelen satırları çözer ve kuyruğa koyar"""
+        try:
+            for line in self._sock.makefile("rb"):
+                self._incoming.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        self._incoming.put(None)
+
+    def _write_loop(self):
+        """Arka plan: gönderim kuyruğundaki paketleri sokete yazar"""
+        while True:
+            data = self._outgoing.get()
+            if data is None:
+                return
+            try:
+                self._sock.sendall(data)
+            except OSError:
+                return
+
+
+def main():
+    """Aktarma sunucusunu komut satırından çalıştırır"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Ortak çizim aktarma sunucusu")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = RelayServer(args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(f"Aktarma sunucusu {args.host}:{server.port} üzerinde çalışıyor", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,579 @@
+import math
+
+from canvas_items import CREATE_METHODS, DOCUMENT_ITEMS, OVERLAY_TAG, create_items, tag_items
+
+# Tk'dan bağımsız belge modeli
+# ============================
+# Belge; öğeleri (tip, koordinatlar, stil), z-sırasını ve arka plan rengini
+# sade Python verisi olarak tutar. Her değişiklik dinleyicilere bir olay
+# olarak bildirilir:
+#
+#   ("add", kimlik)            ("remove", [kimlik, ...])
+#   ("coords", kimlik)         ("style", kimlik)
+#   ("move", [kimlik, ...], dx, dy)
+#   ("order", [kimlik, ...])   ("tags", kimlik)
+#   ("background", renk)
+#
+# CanvasView bu olaylarla bir Tk kanvasını güncel tutar (ör. zaman atlamalı
+# oynatma belgeyi günlükten kurar, tuval görünümdür); DocumentCanvas ise
+# araçların, geçmişin ve dışa aktarmanın ekran olmadan (testlerde ve
+# ölçümlerde) doğrudan belge üzerinde çalışmasını sağlayan, Tk kanvasıyla
+# aynı arayüze sahip bir cephedir (facade).
+
+# Konumsal dizinin hücre boyutu (piksel)
+GRID_CELL = 64
+
+
+def _bbox_of(item_type, coords, options):
+    """Öğenin sınır kutusunu çizgi kalınlığıyla birlikte hesaplar"""
+    if not coords:
+        return None
+    xs, ys = coords[0::2], coords[1::2]
+    try:
+        half = float(options.get("width", 1)) / 2
+    except (TypeError, ValueError):
+        half = 0.5
+    if item_type == "image":
+        # Görüntünün boyutu modelde bilinmez; yalnızca bağlantı noktası kullanılır
+        half = 0
+    return (min(xs) - half, min(ys) - half, max(xs) + half, max(ys) + half)
+
+
+class Document:
+    """
+    Öğeleri, z-sırasını ve arka planı tutan belge modeli.
+
+    Kimlikler belge içinde benzersizdir ve yeniden kullanılmaz. Öğeler
+    alttan üste z-sırasıyla saklanır; konumsal sorgular için öğelerin sınır
+    kutuları ızgara hücrelerine dağıtılır.
+    """
+    def __init__(self, background="#FFFFFF"):
+        self._background = background
+        # kimlik -> [tip, koordinatlar, seçenekler, etiketler]
+        self._items = {}
+        self._order = []
+        self._rank = None
+        self._next_id = 1
+        self._listeners = []
+        # etiket -> kimlikler
+        self._tagged = {}
+        # (hücre x, hücre y) -> kimlikler; kimlik -> sınır kutusu
+        self._grid = {}
+        self._boxes = {}
+
+    # ------------------------------------------------------------ bildirim
+
+    def subscribe(self, listener):
+        """Değişiklik olaylarını alacak bir işlev ekler"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, *event):
+        for listener in self._listeners:
+            listener(*event)
+
+    # ------------------------------------------------------------ okuma
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    @property
+    def background(self):
+        return self._background
+
+    @property
+    def item_ids(self):
+        """Öğe kimlikleri, z-sırasıyla (alttan üste)"""
+        return tuple(self._order)
+
+    def item_type(self, item_id):
+        return self._items[item_id][0]
+
+    def coords(self, item_id):
+        return list(self._items[item_id][1])
+
+    def options(self, item_id):
+        return dict(self._items[item_id][2])
+
+    def tags(self, item_id):
+        return tuple(self._items[item_id][3])
+
+    def record(self, item_id):
+        """Öğenin (item_type, coords, options) kaydı"""
+        item_type, coords, options, _ = self._items[item_id]
+        return (item_type, list(coords), dict(options))
+
+    def records(self, item_ids=None):
+        """Verilen (ya da tüm) öğelerin kayıtları, z-sırasıyla"""
+        return [self.record(i) for i in (self._order if item_ids is None else item_ids)]
+
+    def bbox(self, item_id):
+        return self._boxes.get(item_id)
+
+    def find_overlapping(self, x0, y0, x1, y1):
+        """Sınır kutusu verilen dikdörtgenle kesişen öğeler, z-sırasıyla"""
+        return self._query(x0, y0, x1, y1, lambda b: b[0] <= x1 and b[2] >= x0 and b[1] <= y1 and b[3] >= y0)
+
+    def find_enclosed(self, x0, y0, x1, y1):
+        """Tamamen verilen dikdörtgenin içinde kalan öğeler, z-sırasıyla"""
+        return self._query(x0, y0, x1, y1, lambda b: b[0] >= x0 and b[2] <= x1 and b[1] >= y0 and b[3] <= y1)
+
+    def with_tag(self, tag):
+        """Etiketi taşıyan öğeler, z-sırasıyla"""
+        return tuple(sorted(self._tagged.get(tag, ()), key=self.rank))
+
+    def rank(self, item_id):
+        """Öğenin z-sırasındaki konumu"""
+        if self._rank is None:
+            self._rank = {item_id: i for i, item_id in enumerate(self._order)}
+        return self._rank[item_id]
+
+    # ------------------------------------------------------------ değiştirme
+
+    def add(self, item_type, coords, options=None, tags=(), item_id=None):
+        """Yeni bir öğeyi en üste ekler ve kimliğini döndürür"""
+        if item_id is None:
+            item_id = self._next_id
+        self._next_id = max(self._next_id, item_id + 1)
+        coords = [float(c) for c in coords]
+        self._items[item_id] = [item_type, coords, dict(options or {}), set(tags)]
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(item_id)
+        if self._rank is not None:
+            self._rank[item_id] = len(self._order)
+        self._order.append(item_id)
+        self._index(item_id)
+        self._notify("add", item_id)
+        return item_id
+
+    def remove(self, item_ids):
+        """Öğeleri siler"""
+        removed = [i for i in item_ids if i in self._items]
+        if not removed:
+            return
+        for item_id in removed:
+            self._unindex(item_id)
+            for tag in self._items.pop(item_id)[3]:
+                self._untag(item_id, tag)
+        self._order = [i for i in self._order if i in self._items]
+        self._rank = None
+        self._notify("remove", removed)
+
+    def clear(self):
+        """Tüm öğeleri siler"""
+        self.remove(list(self._order))
+
+    def set_coords(self, item_id, coords):
+        self._items[item_id][1] = [float(c) for c in coords]
+        self._reindex(item_id)
+        self._notify("coords", item_id)
+
+    def configure(self, item_id, **options):
+        self._items[item_id][2].update(options)
+        if "width" in options:
+            self._reindex(item_id)
+        self._notify("style", item_id)
+
+    def move(self, item_ids, dx, dy):
+        """Öğeleri (dx, dy) kadar kaydırır"""
+        item_ids = [i for i in item_ids if i in self._items]
+        for item_id in item_ids:
+            item = self._items[item_id]
+            item[1] = [c + (dy if k % 2 else dx) for k, c in enumerate(item[1])]
+            self._reindex(item_id)
+        if item_ids:
+            self._notify("move", item_ids, dx, dy)
+
+    def add_tag(self, item_ids, tag):
+        for item_id in item_ids:
+            self._items[item_id][3].add(tag)
+            self._tagged.setdefault(tag, set()).add(item_id)
+            self._notify("tags", item_id)
+
+    def remove_tag(self, item_ids, tag):
+        for item_id in item_ids:
+            tags = self._items[item_id][3]
+            if tag in tags:
+                tags.discard(tag)
+                self._untag(item_id, tag)
+                self._notify("tags", item_id)
+
+    def _untag(self, item_id, tag):
+        members = self._tagged[tag]
+        members.discard(item_id)
+        if not members:
+            del self._tagged[tag]
+
+    def restack(self, item_ids, below=None):
+        """
+        Öğeleri sıralarını koruyarak below öğesinin hemen altına taşır.
+
+        below verilmezse öğeler en üste taşınır.
+        """
+        moving = set(item_ids)
+        rest = [i for i in self._order if i not in moving]
+        ordered = [i for i in self._order if i in moving]
+        position = rest.index(below) if below is not None and below in self._items else len(rest)
+        self._order = rest[:position] + ordered + rest[position:]
+        self._rank = None
+        self._notify("order", ordered)
+
+    def set_background(self, color):
+        self._background = color
+        self._notify("background", color)
+
+    # ------------------------------------------------------------ konumsal dizin
+
+    def _cells(self, box):
+        x0, y0, x1, y1 = (int(math.floor(v / GRID_CELL)) for v in box)
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def _index(self, item_id):
+        item_type, coords, options, _ = self._items[item_id]
+        box = _bbox_of(item_type, coords, options)
+        if box is None:
+            return
+        self._boxes[item_id] = box
+        for cell in self._cells(box):
+            self._grid.setdefault(cell, set()).add(item_id)
+
+    def _unindex(self, item_id):
+        box = self._boxes.pop(item_id, None)
+        if box is None:
+            return
+        for cell in self._cells(box):
+            members = self._grid.get(cell)
+            if members is not None:
+                members.discard(item_id)
+                if not members:
+                    del self._grid[cell]
+
+    def _reindex(self, item_id):
+        self._unindex(item_id)
+        self._index(item_id)
+
+    def _query(self, x0, y0, x1, y1, keep):
+        candidates = set()
+        for cell in self._cells((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))):
+            candidates.update(self._grid.get(cell, ()))
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        found = [i for i in candidates if keep(self._boxes[i])]
+        return tuple(sorted(found, key=self.rank))
+
+
+class DocumentCanvas:
+    """
+    Tk kanvasının araçların ve geçmişin kullandığı bölümünü belge üzerinde
+    uygulayan, ekran gerektirmeyen cephe.
+
+    Belge öğeleri Document'a yazılır; önizleme gibi overlay etiketli öğeler
+    belgeye girmez, ayrı tutulur ve her zaman belgenin üstünde sayılır.
+    after ile planlanan işler update çağrılınca çalışır.
+    """
+    def __init__(self, document=None, width=800, height=600):
+        self.document = document or Document()
+        self._overlay = Document()
+        self._width = width
+        self._height = height
+        self._jobs = {}
+        self._next_job = 1
+
+    # ------------------------------------------------------------ öğe oluşturma
+
+    def _create(self, item_type, coords, options):
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = tags.split()
+        # Kimlikler belge ve overlay öğeleri arasında benzersizdir
+        item_id = max(self.document._next_id, self._overlay._next_id)
+        target = self._overlay if OVERLAY_TAG in tags else self.document
+        return target.add(item_type, coords, options, tags, item_id=item_id)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    # ------------------------------------------------------------ sorgular
+
+    def _owner(self, item_id):
+        return self.document if item_id in self.document else self._overlay
+
+    def _resolve(self, tag):
+        """Bir kimliği ya da etiket ifadesini öğe kimliklerine çevirir"""
+        if isinstance(tag, int) or (isinstance(tag, str) and tag.isdigit()):
+            item_id = int(tag)
+            return (item_id,) if item_id in self.document or item_id in self._overlay else ()
+        if tag == DOCUMENT_ITEMS:
+            return self.document.item_ids
+        if tag == "all":
+            return self.document.item_ids + self._overlay.item_ids
+        return self.document.with_tag(tag) + self._overlay.with_tag(tag)
+
+    def find_withtag(self, tag):
+        return self._resolve(tag)
+
+    def find_all(self):
+        return self._resolve("all")
+
+    def find_overlapping(self, x0, y0, x1, y1):
+        return (self.document.find_overlapping(x0, y0, x1, y1)
+                + self._overlay.find_overlapping(x0, y0, x1, y1))
+
+    def type(self, tag):
+        ids = self._resolve(tag)
+        return self._owner(ids[0]).item_type(ids[0]) if ids else None
+
+    def coords(self, tag, *coords):
+        ids = self._resolve(tag)
+        if not ids:
+            return []
+        if coords:
+            if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+                coords = coords[0]
+            self._owner(ids[0]).set_coords(ids[0], coords)
+            return None
+        return self._owner(ids[0]).coords(ids[0])
+
+    def itemcget(self, tag, option):
+        ids = self._resolve(tag)
+        if not ids:
+            return ""
+        value = self._owner(ids[0]).options(ids[0]).get(option, "")
+        # Tk gibi seçenek değerleri metin olarak döndürülür
+        return value if isinstance(value, str) else str(value)
+
+    def itemconfigure(self, tag, **options):
+        for item_id in self._resolve(tag):
+            self._owner(item_id).configure(item_id, **options)
+
+    itemconfig = itemconfigure
+
+    def bbox(self, *tags):
+        boxes = [self._owner(i).bbox(i) for tag in tags for i in self._resolve(tag)]
+        boxes = [b for b in boxes if b is not None]
+        if not boxes:
+            return None
+        return (int(math.floor(min(b[0] for b in boxes))), int(math.floor(min(b[1] for b in boxes))),
+                int(math.ceil(max(b[2] for b in boxes))), int(math.ceil(max(b[3] for b in boxes))))
+
+    # ------------------------------------------------------------ değiştirme
+
+    def delete(self, *tags):
+        for tag in tags:
+            ids = self._resolve(tag)
+            self.document.remove([i for i in ids if i in self.document])
+            self._overlay.remove([i for i in ids if i in self._overlay])
+
+    def move(self, tag, dx, dy):
+        ids = self._resolve(tag)
+        self.document.move([i for i in ids if i in self.document], dx, dy)
+        self._overlay.move([i for i in ids if i in self._overlay], dx, dy)
+
+    def addtag(self, tag, how, *args):
+        """Tk'daki "addtag etiket withtag|enclosed ..." komutunun karşılığı"""
+        if how == "withtag":
+            ids = self._resolve(args[0])
+        elif how == "enclosed":
+            ids = self.document.find_enclosed(*args)
+        else:
+            raise ValueError(f"desteklenmeyen addtag biçimi: {how}")
+        for item_id in ids:
+            self._owner(item_id).add_tag([item_id], tag)
+
+    def addtag_withtag(self, tag, target):
+        self.addtag(tag, "withtag", target)
+
+    def addtag_enclosed(self, tag, x0, y0, x1, y1):
+        self.addtag(tag, "enclosed", x0, y0, x1, y1)
+
+    def dtag(self, tag, remove=None):
+        remove = tag if remove is None else remove
+        for item_id in self._resolve(tag):
+            self._owner(item_id).remove_tag([item_id], remove)
+
+    def tag_lower(self, tag, below=None):
+        ids = [i for i in self._resolve(tag) if i in self.document]
+        if below is None:
+            bottom = self.document.item_ids
+            below = bottom[0] if bottom else None
+        else:
+            below = self._resolve(below)[0]
+        if ids:
+            self.document.restack(ids, below)
+
+    def tag_raise(self, tag, above=None):
+        ids = [i for i in self._resolve(tag) if i in self.document]
+        if not ids:
+            return
+        order = self.document.item_ids
+        if above is None:
+            self.document.restack(ids)
+            return
+        above_id = self._resolve(above)[0]
+        position = order.index(above_id) + 1
+        following = [i for i in order[position:] if i not in ids]
+        self.document.restack(ids, following[0] if following else None)
+
+    # ------------------------------------------------------------ pencere benzeri
+
+    def __getitem__(self, key):
+        if key in ("background", "bg"):
+            return self.document.background
+        raise KeyError(key)
+
+    def configure(self, **options):
+        color = options.get("bg", options.get("background"))
+        if color is not None:
+            self.document.set_background(color)
+
+    config = configure
+
+    def winfo_width(self):
+        return self._width
+
+    def winfo_height(self):
+        return self._height
+
+    def after(self, ms, func, *args):
+        job = self._next_job
+        self._next_job += 1
+        self._jobs[job] = (func, args)
+        return job
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, job):
+        self._jobs.pop(job, None)
+
+    def update(self):
+        """Planlanmış işleri (ve onların planladıklarını) çalıştırır"""
+        while self._jobs:
+            job = min(self._jobs)
+            func, args = self._jobs.pop(job)
+            func(*args)
+
+
+class CanvasView:
+    """
+    Bir Document'ı Tk kanvasında gösterir.
+
+    Belge olaylarıyla güncellenir; yeni öğeler biriktirilip boşta (idle)
+    tek bir Tcl çağrısıyla oluşturulur. Diğer olaylardan önce bekleyen
+    öğeler oluşturulur, böylece sıra korunur.
+    """
+    # Görünüm işlemlerinin geçici olarak kullandığı etiket
+    _WORK_TAG = "view_work"
+
+    def __init__(self, document, canvas):
+        self._document = document
+        self._canvas = canvas
+        self._tk_ids = {}
+        self._pending = []
+        self._job = None
+        canvas.config(bg=document.background)
+        self._pending.extend(document.item_ids)
+        self.flush()
+        document.subscribe(self._on_change)
+
+    def tk_id(self, item_id):
+        """Belge öğesinin kanvastaki kimliği (henüz oluşturulmadıysa oluşturur)"""
+        self.flush()
+        return self._tk_ids.get(item_id)
+
+    def close(self):
+        """Görünümü belgeden ayırır; kanvastaki öğeler kalır"""
+        self.flush()
+        self._document.unsubscribe(self._on_change)
+
+    def flush(self):
+        """
+        Bekleyen yeni öğeleri tek bir Tcl çağrısıyla oluşturur ve belge
+        kimliklerini döndürür.
+
+        Öğeler belgedeki güncel halleriyle oluşturulur.
+        """
+        if self._job is not None:
+            self._canvas.after_cancel(self._job)
+            self._job = None
+        pending = [i for i in self._pending if i in self._document]
+        self._pending = []
+        if not pending:
+            return set()
+        records = []
+        for item_id in pending:
+            item_type, coords, options = self._document.record(item_id)
+            tags = self._document.tags(item_id)
+            if tags:
+                options["tags"] = tags
+            records.append((item_type, coords, options))
+        created = create_items(self._canvas, records)
+        self._tk_ids.update(zip([i for i, r in zip(pending, records) if r[0] in CREATE_METHODS], created))
+        return set(pending)
+
+    def _on_idle(self):
+        self._job = None
+        self.flush()
+
+    def _on_change(self, kind, *args):
+        if kind == "add":
+            self._pending.append(args[0])
+            if self._job is None:
+                self._job = self._canvas.after_idle(self._on_idle)
+            return
+        # Yeni oluşturulan öğeler değişikliği zaten içerir
+        fresh = self.flush()
+        canvas = self._canvas
+        if kind == "remove":
+            tk_ids = [self._tk_ids.pop(i) for i in args[0] if i in self._tk_ids]
+            tag_items(canvas, self._WORK_TAG, tk_ids)
+            canvas.delete(self._WORK_TAG)
+        elif kind == "move":
+            item_ids, dx, dy = args
+            tag_items(canvas, self._WORK_TAG, [self._tk_ids[i] for i in item_ids
+                                               if i in self._tk_ids and i not in fresh])
+            canvas.move(self._WORK_TAG, dx, dy)
+            canvas.dtag(self._WORK_TAG, self._WORK_TAG)
+        elif kind == "coords":
+            canvas.coords(self._tk_ids[args[0]], *self._document.coords(args[0]))
+        elif kind == "style":
+            canvas.itemconfigure(self._tk_ids[args[0]], **self._document.options(args[0]))
+        elif kind == "tags":
+            canvas.itemconfigure(self._tk_ids[args[0]], tags=self._document.tags(args[0]))
+        elif kind == "order":
+            self._restack(args[0])
+        elif kind == "background":
+            canvas.config(bg=args[0])
+
+    def _restack(self, item_ids):
+        """Taşınan öğeleri belgedeki bir üst komşularının altına yerleştirir"""
+        order = self._document.item_ids
+        moved = set(item_ids)
+        for item_id in reversed(item_ids):
+            position = self._document.rank(item_id)
+            above = next((i for i in order[position + 1:] if i not in moved), None)
+            tk_id = self._tk_ids[item_id]
+            if above is not None and above in self._tk_ids:
+                self._canvas.tag_lower(tk_id, self._tk_ids[above])
+            else:
+                self._canvas.tag_raise(tk_id)
+            moved.discard(item_id)
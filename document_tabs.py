@@ -0,0 +1,298 @@
+import os
+import pickle
+import sys
+import tempfile
+import time
+import zlib
+
+from canvas_items import DOCUMENT_ITEMS, create_items, document_images, release_images, restore_images
+
+# Çok belgeli sekmeler
+# ====================
+# Uygulamada tek bir kanvas ve tek bir geçmiş (PaintHistory) nesnesi vardır;
+# sekmeler bunları sırayla kullanır. Yalnızca etkin belgenin öğeleri
+# kanvasta durur. Başka sekmeye geçilince etkin belge askıya alınır:
+#
+#   - geçmiş ağacı düz bir düğüm listesi olarak dışa aktarılır (export_state),
+#   - raster fırça döşemeleri (vektör öğelerin arasındaki yerleriyle),
+#     arka plan durumu (renk, dolgu) ve geçmişin andığı belgeye ait
+#     görüntüler (birleştirilmiş çizimler, projeden yüklenenler) eklenir,
+#   - hepsi tek bir pickle + zlib bloğu olarak bellekte tutulur,
+#   - ancak bu başarılı olursa geçmiş sıfırlanır, raster katmanı,
+#     görüntüler ve kanvastaki belge öğeleri bırakılır; pickle hata verirse
+#     belge olduğu gibi etkin kalır.
+#
+# Askıdaki belgelerin sıkıştırılmış boyutu MEMORY_LIMIT'i aşarsa en uzun
+# süredir kullanılmayanlar geçici dosyalara yazılır. Geri dönüldüğünde
+# öğeler tek bir Tcl çağrısıyla (create_items) yeniden oluşturulur ve geçmiş
+# olduğu gibi geri yüklenir. Böylece bellek ve Tk öğe sayısı yalnızca etkin
+# belgeyle büyür; 30 sekme açık olsa da kanvasta bir belge vardır.
+
+# Askıdaki belgelerin bellekte tutulabilecek toplam sıkıştırılmış boyutu (bayt)
+MEMORY_LIMIT = 64 * 1024 * 1024
+# Askıya alma hızlı olmalı; yüksek sıkıştırma seviyesi değiştirmeyi yavaşlatır
+COMPRESS_LEVEL = 1
+
+
+class SuspendedDocument:
+    """
+    Askıya alınmış bir belgenin sıkıştırılmış durumu.
+
+    Durum önce bellekte tutulur; spill ile geçici bir dosyaya taşınabilir.
+    """
+    def __init__(self, state):
+        self._data = zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), COMPRESS_LEVEL)
+        self.size = len(self._data)
+        self._path = None
+        self.suspended_at = time.monotonic()
+
+    @property
+    def spilled(self):
+        """Durum diskte mi"""
+        return self._path is not None
+
+    def spill(self, folder=None):
+        """Durumu geçici bir dosyaya yazar ve bellekten bırakır"""
+        if self._path is not None:
+            return
+        handle, path = tempfile.mkstemp(prefix="paint_tab_", suffix=".bin", dir=folder)
+        with os.fdopen(handle, "wb") as f:
+            f.write(self._data)
+        self._path = path
+        self._data = None
+
+    def load(self):
+        """Durumu açar; disk dosyası varsa silinir"""
+        data = self._data
+        if data is None:
+            with open(self._path, "rb") as f:
+                data = f.read()
+        self.discard()
+        return pickle.loads(zlib.decompress(data))
+
+    def discard(self):
+        """Bellekteki ya da diskteki durumu bırakır"""
+        self._data = None
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
+class DocumentTab:
+    """Bir sekme: adı ve (etkin değilse) askıdaki durumu"""
+    def __init__(self, name):
+        self.name = name
+        self.suspended = None
+
+
+class DocumentTabs:
+    """
+    Sekmeleri ve etkin belgenin kanvasla geçmiş arasındaki değişimini yönetir.
+
+    background etkin belgenin arka plan durumunu (ör. renk ve dolgu) döndürür,
+    on_background geri yüklenen belgenin durumunu uygular; on_switch her
+    geçişten sonra etkin sekmeyle çağrılır.
+    """
+    def __init__(self, canvas, history, background, on_background, on_switch=None,
+                 memory_limit=MEMORY_LIMIT, spill_folder=None):
+        self._canvas = canvas
+        self._history = history
+        self._background = background
+        self._on_background = on_background
+        self._on_switch = on_switch
+        self.memory_limit = memory_limit
+        self._spill_folder = spill_folder
+        self._tabs = [DocumentTab("Belge 1")]
+        self._active = 0
+        self._created = 1
+
+    def __len__(self):
+        return len(self._tabs)
+
+    def __getitem__(self, index):
+        return self._tabs[index]
+
+    @property
+    def active(self):
+        """Etkin sekmenin sırası"""
+        return self._active
+
+    @property
+    def suspended_bytes(self):
+        """Bellekteki askıda belgelerin toplam sıkıştırılmış boyutu"""
+        return sum(
+            tab.suspended.size for tab in self._tabs
+            if tab.suspended is not None and not tab.suspended.spilled
+        )
+
+    def new(self, name=None, background="#FFFFFF"):
+        """Boş bir belge açar ve ona geçer"""
+        self._suspend_active()
+        self._created += 1
+        self._tabs.append(DocumentTab(name or f"Belge {self._created}"))
+        self._active = len(self._tabs) - 1
+        self._on_background(background)
+        self._switched()
+        return self._active
+
+    def switch(self, index):
+        """index sırasındaki belgeye geçer"""
+        if index == self._active:
+            return
+        self._suspend_active()
+        self._active = index
+        self._resume(self._tabs[index])
+        self._switched()
+
+    def close(self, index):
+        """Belgeyi kapatır; son sekme kapatılamaz. Etkin sekmenin sırasını döndürür"""
+        if len(self._tabs) < 2:
+            return self._active
+        if index == self._active:
+            # Kapatılan belge askıya alınmaz, doğrudan bırakılır
+            self._canvas.delete(DOCUMENT_ITEMS)
+            self._clear_raster_tiles(self._raster_tiles())
+            release_images(document_images(self._history.image_names()))
+            self._history.reset()
+            del self._tabs[index]
+            self._active = min(index, len(self._tabs) - 1)
+            self._resume(self._tabs[self._active])
+            self._switched()
+            return self._active
+        tab = self._tabs.pop(index)
+        tab.suspended.discard()
+        if index < self._active:
+            self._active -= 1
+        self._switched()
+        return self._active
+
+    def close_all(self):
+        """Askıdaki tüm belgelerin disk dosyalarını siler"""
+        for tab in self._tabs:
+            if tab.suspended is not None:
+                tab.suspended.discard()
+
+    def _suspend_active(self):
+        """Etkin belgeyi sıkıştırıp kanvastan kaldırır"""
+        tab = self._tabs[self._active]
+        state = {
+            "background": self._background(),
+            "raster": self._raster_tiles(),
+            "raster_positions": self._raster_positions(),
+            "history": self._history.export_state(),
+            # Paylaşılan önbellek görüntüleri (dolgu, görüntü fırçası) kayıtta kalır
+            "images": document_images(self._history.image_names()),
+        }
+        # Önce sıkıştırılır; hata olursa belge kanvasta ve geçmişte kalır
+        suspended = SuspendedDocument(state)
+        self._history.reset()
+        self._clear_raster_tiles(state["raster"])
+        self._canvas.delete(DOCUMENT_ITEMS)
+        release_images(state["images"])
+        tab.suspended = suspended
+        self._enforce_memory_limit()
+
+    def _resume(self, tab):
+        """Askıdaki belgeyi kanvasa ve geçmişe geri yükler"""
+        state = tab.suspended.load()
+        tab.suspended = None
+        history = state["history"]
+        # Görüntüler öğelerden önce, askıya alınmadan önceki adlarıyla kaydedilir
+        restore_images(state["images"])
+        # Tüm öğeler tek bir Tcl çağrısıyla oluşturulur
+        create_items(self._canvas, history[2])
+        self._history.restore_state(history)
+        if state["raster"]:
+            from raster_brush import RasterLayer
+            RasterLayer.for_canvas(self._canvas).restore(state["raster"], state["raster_positions"])
+        self._on_background(state["background"])
+
+    def _raster_tiles(self):
+        """Raster fırça döşemelerini kanvasa dokunmadan döndürür"""
+        # Raster modülü yüklenmediyse raster çizim de yoktur
+        if "raster_brush" not in sys.modules:
+            return None
+        from raster_brush import RasterLayer
+        layer = RasterLayer.existing(self._canvas)
+        if layer is None:
+            return None
+        return layer.buffer.tiles()
+
+    def _raster_positions(self):
+        """Raster döşemelerinin vektör öğelerin arasındaki yerleri (bkz. RasterLayer.tile_positions)"""
+        if "raster_brush" not in sys.modules:
+            return None
+        from raster_brush import RasterLayer
+        layer = RasterLayer.existing(self._canvas)
+        return None if layer is None else layer.tile_positions()
+
+    def _clear_raster_tiles(self, tiles):
+        """Raster fırça döşemelerini geçmişe yazmadan kanvastan siler"""
+        if tiles:
+            from raster_brush import RasterLayer
+            RasterLayer.existing(self._canvas).restore(dict.fromkeys(tiles))
+
+    def _enforce_memory_limit(self):
+        """Bellek sınırı aşılırsa en uzun süredir askıdaki belgeleri diske yazar"""
+        in_memory = sorted(
+            (tab.suspended for tab in self._tabs
+             if tab.suspended is not None and not tab.suspended.spilled),
+            key=lambda suspended: suspended.suspended_at
+        )
+        total = sum(suspended.size for suspended in in_memory)
+        for suspended in in_memory:
+            if total <= self.memory_limit:
+                break
+            suspended.spill(self._spill_folder)
+            total -= suspended.size
+
+    def _switched(self):
+        if self._on_switch is not None:
+            self._on_switch(self._tabs[self._active])
+
+
+class TabBar:
+    """
+    Sekme düğmelerini gösteren şerit.
+
+    Bir sekmeye tıklamak ona geçer, orta tık ya da ✕ sekmeyi kapatır,
+    + yeni belge açar.
+    """
+    def __init__(self, parent, tabs, on_select, on_close, on_new, **pack_options):
+        import tkinter as tk
+        self._tk = tk
+        self._tabs = tabs
+        self._on_select = on_select
+        self._on_close = on_close
+        self._on_new = on_new
+        self.frame = tk.Frame(parent, bg="#e8e8e8")
+        self.frame.pack(side=tk.TOP, fill=tk.X, **pack_options)
+        self.refresh()
+
+    def refresh(self):
+        """Düğmeleri sekme listesine göre yeniden oluşturur"""
+        tk = self._tk
+        for child in self.frame.winfo_children():
+            child.destroy()
+        for index in range(len(self._tabs)):
+            active = index == self._tabs.active
+            tab = tk.Frame(self.frame, bg="#ffffff" if active else "#d8d8d8", bd=1, relief=tk.RIDGE)
+            tab.pack(side=tk.LEFT, padx=(0, 2))
+            label = tk.Label(
+                tab, text=self._tabs[index].name, bg=tab["bg"], padx=6, cursor="hand2",
+                font=("Segoe UI", 9, "bold" if active else "normal")
+            )
+            label.pack(side=tk.LEFT)
+            label.bind("<Button-1>", lambda e, i=index: self._on_select(i))
+            label.bind("<Button-2>", lambda e, i=index: self._on_close(i))
+            if len(self._tabs) > 1:
+                close = tk.Label(tab, text="✕", bg=tab["bg"], fg="#888888", cursor="hand2")
+                close.pack(side=tk.LEFT, padx=(0, 4))
+                close.bind("<Button-1>", lambda e, i=index: self._on_close(i))
+        new = tk.Label(self.frame, text="+", bg="#e8e8e8", padx=8, cursor="hand2",
+                       font=("Segoe UI", 10, "bold"))
+        new.pack(side=tk.LEFT)
+        new.bind("<Button-1>", lambda e: self._on_new())
@@ -1,6 +1,7 @@
 import tkinter as tk
 import math
 from abstract_classes import DrawingTool
+from shape_preview import ShapeTool
 
 # İLKE 4: ÇOK BİÇİMLİLİK (POLYMORPHISM)
 # =====================================
@@ -55,8 +56,12 @@ class StarBrush(DrawingTool):
     def draw(self, canvas, x, y, brush_size, color):
         # Çok biçimlilik: Aynı metodun farklı bir implementasyonu
         # Bu metot yıldız şekiller çizerek draw arayüzünü uygular
-        
-        # Yıldız için köşe noktaları
+        points = self.points(x, y, brush_size)
+        return canvas.create_polygon(points, fill=color, outline=color)
+    
+    @staticmethod
+    def points(x, y, brush_size):
+        """Yıldızın köşe noktalarını düz bir [x1, y1, x2, y2, ...] listesi olarak döndürür"""
         points = []
         outer_radius = brush_size * 2
         inner_radius = brush_size
@@ -71,108 +76,165 @@ class StarBrush(DrawingTool):
             px = x + radius * 0.8 * math.cos(angle)
             py = y + radius * 0.8 * math.sin(angle)
             points.extend([px, py])
-            
-        return canvas.create_polygon(points, fill=color, outline=color)
+        return points
     
     @property
     def name(self):
         # name property'sinin uygulanması
         return "Yıldız Fırça"
 
-class LineTool(DrawingTool):
+class LineTool(ShapeTool):
     """
-    Çizgi çizme aracı - DrawingTool soyut sınıfından türeyen
-    ama daha karmaşık davranışı olan bir çizim aracı.
+    Çizgi çizme aracı - ortak önizlemeyi kullanan bir şekil aracı.
+    Sürükleme sırasında tek bir önizleme öğesi güncellenir.
     """
-    def __init__(self):
-        # Bu araç için özel durum bilgilerini saklama
-        self.start_x = None
-        self.start_y = None
-        self.temp_line = None
+    item_type = "line"
     
-    # Çok biçimlilik: DrawingTool arayüzünün ötesinde ek metotlar ekleyebiliriz
-    def start(self, canvas, x, y):
-        """Çizgi çiziminin başlangıç noktasını kaydeder"""
-        self.start_x = x
-        self.start_y = y
-        
-    def drag(self, canvas, x, y, color):
-        """Çizgi önizlemesini gösterir"""
-        if self.temp_line:
-            canvas.delete(self.temp_line)
-        self.temp_line = canvas.create_line(
-            self.start_x, self.start_y, x, y, 
-            fill=color, width=2, dash=(4, 2)
-        )
+    def shape_coords(self, x, y):
+        return [self.start_x, self.start_y, x, y]
     
-    def draw(self, canvas, x, y, brush_size, color):
-        # Çok biçimlilik: Aynı arayüz (draw) ama farklı davranış
-        if self.start_x is not None and self.start_y is not None:
-            if self.temp_line:
-                canvas.delete(self.temp_line)
-                self.temp_line = None
-            result = canvas.create_line(
-                self.start_x, self.start_y, x, y, 
-                fill=color, width=brush_size, smooth=True, 
-                capstyle=tk.ROUND, joinstyle=tk.ROUND
-            )
-            self.start_x = None
-            self.start_y = None
-            return result
-        return None
+    def options(self, brush_size, color):
+        # Çok biçimlilik: Aynı arayüz ama farklı şekil seçenekleri
+        return {
+            "fill": color, "width": brush_size, "smooth": True,
+            "capstyle": tk.ROUND, "joinstyle": tk.ROUND
+        }
     
     @property
     def name(self):
         return "Çizgi Aracı"
 
-class CircleTool(DrawingTool):
+class CircleTool(ShapeTool):
     """
-    Daire çizme aracı - DrawingTool soyut sınıfından türeyen başka bir araç.
+    Daire çizme aracı - başlangıç noktası merkez, sürükleme yarıçaptır.
     """
-    def __init__(self):
-        self.start_x = None
-        self.start_y = None
-        self.temp_circle = None
+    item_type = "oval"
     
-    def start(self, canvas, x, y):
-        """Daire çiziminin merkez noktasını kaydeder"""
-        self.start_x = x
-        self.start_y = y
-        
-    def drag(self, canvas, x, y, color):
-        """Daire önizlemesini gösterir"""
-        if self.start_x is None or self.start_y is None:
-            return
-        if self.temp_circle:
-            canvas.delete(self.temp_circle)
+    def shape_coords(self, x, y):
         radius = ((x - self.start_x) ** 2 + (y - self.start_y) ** 2) ** 0.5
-        self.temp_circle = canvas.create_oval(
+        return [
             self.start_x - radius, self.start_y - radius,
-            self.start_x + radius, self.start_y + radius,
-            outline=color, dash=(4, 2), tags="preview"
-        )
-    
-    def draw(self, canvas, x, y, brush_size, color):
-        # Çok biçimlilik: Aynı arayüz (draw) ama farklı davranış
-        if self.start_x is not None and self.start_y is not None:
-            if self.temp_circle:
-                canvas.delete(self.temp_circle)
-                self.temp_circle = None
-            radius = ((x - self.start_x) ** 2 + (y - self.start_y) ** 2) ** 0.5
-            result = canvas.create_oval(
-                self.start_x - radius, self.start_y - radius,
-                self.start_x + radius, self.start_y + radius,
-                outline=color, width=brush_size
-            )
-            self.start_x = None
-            self.start_y = None
-            return result
-        return None
+            self.start_x + radius, self.start_y + radius
+        ]
     
     @property
     def name(self):
         return "Daire Aracı"
 
+class RectangleTool(ShapeTool):
+    """Dikdörtgen aracı - başlangıç ve bitiş noktaları karşılıklı köşelerdir"""
+    item_type = "rectangle"
+    
+    def shape_coords(self, x, y):
+        return [self.start_x, self.start_y, x, y]
+    
+    @property
+    def name(self):
+        return "Dikdörtgen"
+
+class EllipseTool(ShapeTool):
+    """Elips aracı - elips, sürüklenen dikdörtgenin içine çizilir"""
+    item_type = "oval"
+    
+    def shape_coords(self, x, y):
+        return [self.start_x, self.start_y, x, y]
+    
+    @property
+    def name(self):
+        return "Elips"
+
+class PolygonTool(ShapeTool):
+    """
+    Düzgün çokgen aracı - başlangıç noktası merkez, fare bir köşedir.
+    Çokgen fareyle birlikte döner.
+    """
+    item_type = "polygon"
+    
+    def __init__(self, sides=6):
+        super().__init__()
+        self.sides = sides
+    
+    def shape_coords(self, x, y):
+        radius = math.hypot(x - self.start_x, y - self.start_y)
+        angle = math.atan2(y - self.start_y, x - self.start_x)
+        points = []
+        for i in range(self.sides):
+            a = angle + 2 * math.pi * i / self.sides
+            points.extend([self.start_x + radius * math.cos(a), self.start_y + radius * math.sin(a)])
+        return points
+    
+    def options(self, brush_size, color):
+        # Kayıtlarda boş dolgu saklanmadığından çokgen (yıldız fırça gibi) doludur
+        return {"fill": color, "outline": color}
+    
+    @property
+    def name(self):
+        return "Çokgen"
+
+class BezierTool(ShapeTool):
+    """
+    Bézier eğrisi aracı - iki hareketle çizilir.
+    
+    İlk sürükleme eğrinin uç noktalarını belirler; ikinci sürükleme eğriyi
+    büker, eğri fareden geçer. Eğri düz bir çizgi öğesi olarak (örneklenmiş
+    noktalarla) saklanır, böylece tüm dışa aktarma biçimlerinde aynı görünür.
+    """
+    item_type = "line"
+    # Eğrinin örneklendiği parça sayısı
+    segments = 32
+    
+    def __init__(self):
+        super().__init__()
+        self._end = None
+    
+    @property
+    def pending(self):
+        """İlk hareket bitti, eğri henüz tamamlanmadıysa True"""
+        return self._end is not None
+    
+    def start(self, canvas, x, y):
+        # İkinci harekette başlangıç ve bitiş noktaları korunur
+        if self._end is None:
+            super().start(canvas, x, y)
+    
+    def shape_coords(self, x, y):
+        if self._end is None:
+            return [self.start_x, self.start_y, x, y]
+        (x0, y0), (x2, y2) = (self.start_x, self.start_y), self._end
+        # Kontrol noktası, eğri t=0.5'te (x, y)'den geçecek şekilde seçilir
+        cx, cy = 2 * x - (x0 + x2) / 2, 2 * y - (y0 + y2) / 2
+        points = []
+        for i in range(self.segments + 1):
+            t = i / self.segments
+            a, b, c = (1 - t) ** 2, 2 * (1 - t) * t, t ** 2
+            points.extend([a * x0 + b * cx + c * x2, a * y0 + b * cy + c * y2])
+        return points
+    
+    def end(self, canvas, x, y, brush_size, color):
+        if self._end is None and self.start_x is not None:
+            # İlk hareket: uç noktalar belirlendi, önizleme ekranda kalır
+            self._end = (x, y)
+            self._preview.show(canvas, self.item_type, self.shape_coords(x, y),
+                               **self.preview_options(color))
+            return None
+        item = self.draw(canvas, x, y, brush_size, color)
+        self._end = None
+        return item
+    
+    def cancel(self, canvas):
+        super().cancel(canvas)
+        self._end = None
+    
+    def options(self, brush_size, color):
+        return {
+            "fill": color, "width": brush_size,
+            "capstyle": tk.ROUND, "joinstyle": tk.ROUND
+        }
+    
+    @property
+    def name(self):
+        return "Bézier Eğri"
+
 class EraserTool(DrawingTool):
     """
     Silgi aracı - DrawingTool soyut sınıfının somut bir uygulaması.
@@ -188,4 +250,99 @@ class EraserTool(DrawingTool):
     
     @property
     def name(self):
-        return "Silgi"
\ No newline at end of file
+        return "Silgi"
+
+class ToolRegistry:
+    """
+    Çizim araçlarını isteğe bağlı (lazy) yükleyen kayıt defteri.
+    
+    Araçlar nesne olarak değil, fabrika olarak kaydedilir. Fabrika bir sınıf,
+    çağrılabilir bir nesne ya da "modul:Sinif" biçiminde bir metin olabilir;
+    metin verilirse modül ancak araç ilk kez kullanıldığında içe aktarılır.
+    Böylece ağır bağımlılıkları olan araçlar açılış süresini uzatmaz.
+    """
+    def __init__(self):
+        self._factories = {}
+        self._names = {}
+        self._instances = {}
+    
+    def register(self, tool_id, factory, name=None):
+        """
+        Yeni bir araç kaydeder.
+        
+        name verilirse arayüz, aracı yüklemeden bu adı gösterebilir.
+        """
+        self._factories[tool_id] = factory
+        if name is not None:
+            self._names[tool_id] = name
+        self._instances.pop(tool_id, None)
+    
+    def __getitem__(self, tool_id):
+        """Aracı döndürür; henüz oluşturulmadıysa ilk kullanımda oluşturur"""
+        tool = self._instances.get(tool_id)
+        if tool is None:
+            tool = self.create(tool_id)
+            self._instances[tool_id] = tool
+        return tool
+    
+    def create(self, tool_id):
+        """
+        Aracın yeni ve bağımsız bir örneğini oluşturur.
+        
+        Betikler gibi arayüzdeki araçların durumunu (ör. çizginin başlangıç
+        noktası) bozmaması gereken kullanıcılar için.
+        """
+        factory = self._factories[tool_id]
+        if isinstance(factory, str):
+            import importlib
+            module_name, class_name = factory.split(":")
+            factory = getattr(importlib.import_module(module_name), class_name)
+        return factory()
+    
+    def __contains__(self, tool_id):
+        return tool_id in self._factories
+    
+    def __iter__(self):
+        # Kayıt sırası korunur (arayüzdeki buton sırası)
+        return iter(self._factories)
+    
+    def __len__(self):
+        return len(self._factories)
+    
+    def is_loaded(self, tool_id):
+        """Aracın şimdiye kadar oluşturulup oluşturulmadığını döndürür"""
+        return tool_id in self._instances
+    
+    def name_of(self, tool_id):
+        """Aracın görünen adını döndürür; kayıtta ad yoksa aracı yükler"""
+        if tool_id in self._names:
+            return self._names[tool_id]
+        return self[tool_id].name
+
+
+def create_default_registry():
+    """Uygulamanın yerleşik araçlarını içeren kayıt defterini oluşturur"""
+    registry = ToolRegistry()
+    registry.register("oval", OvalBrush)
+    registry.register("square", SquareBrush)
+    registry.register("star", StarBrush)
+    registry.register("line", LineTool)
+    registry.register("circle", CircleTool)
+    registry.register("eraser", EraserTool)
+    # Seçim araçları ilk kullanımda yüklenir
+    registry.register("selection", "selection:SelectionTool", name="Seçim")
+    registry.register("lasso", "selection:LassoTool", name="Kement")
+    # NumPy gerektiren araçlar
+    registry.register("dynamic", "dynamic_brush:VelocityBrush", name="Dinamik Fırça")
+    registry.register("raster_oval", "raster_brush:RasterOvalBrush", name="Raster Yuvarlak")
+    registry.register("raster_square", "raster_brush:RasterSquareBrush", name="Raster Kare")
+    registry.register("raster_star", "raster_brush:RasterStarBrush", name="Raster Yıldız")
+    # Ortak önizlemeyi kullanan şekil araçları
+    registry.register("rectangle", RectangleTool)
+    registry.register("ellipse", EllipseTool)
+    registry.register("polygon", PolygonTool)
+    registry.register("bezier", BezierTool)
+    # Fırça klasörlerindeki PNG uçlar resim damgalı fırçalar olarak eklenir
+    from image_brush import register_image_brushes
+    register_image_brushes(registry)
+    return registry
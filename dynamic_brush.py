@@ -0,0 +1,123 @@
+import time
+
+import numpy as np
+
+from abstract_classes import DrawingTool
+from canvas_items import OVERLAY_TAG
+
+# Hıza duyarlı (dinamik) fırça
+# ============================
+# Çizim sırasında yalnızca noktalar ve zaman damgaları toplanır; ekranda ince
+# bir önizleme çizgisi gösterilir. Çizim bitince tüm noktaların hızı ve ivmesi
+# NumPy ile tek seferde hesaplanır, kalınlık profili çıkarılır ve çizgi tek bir
+# dolu çokgen (polygon) olarak kanvasa eklenir. Böylece yüzlerce damga yerine
+# tek bir öğe oluşur.
+
+# Bu hızda (piksel/sn) çizgi en ince haline ulaşır
+MAX_SPEED = 2500.0
+# En ince çizginin fırça kalınlığına oranı
+MIN_RATIO = 0.25
+# İvmenin kalınlığa etkisi
+ACCEL_FACTOR = 0.15
+# Başta ve sonda incelen nokta sayısı
+TAPER_POINTS = 4
+# Önizleme parçalarının etiketi
+PREVIEW_TAG = "velocity_preview"
+
+
+def width_profile(points, brush_size):
+    """
+    Nokta tamponundan (N x 3: x, y, zaman) her nokta için çizgi kalınlığını hesaplar.
+
+    Hızlı hareket çizgiyi inceltir, yavaş hareket kalınlaştırır; hızlanma
+    ek olarak inceltir, yavaşlama kalınlaştırır. Tüm hesap vektörel yapılır.
+    """
+    xy = points[:, :2]
+    dt = np.maximum(np.diff(points[:, 2]), 1e-3)
+    speed = np.hypot(*np.diff(xy, axis=0).T) / dt
+    # Olay zamanlamasındaki titremeyi azaltmak için kayan ortalama
+    kernel = np.ones(3) / 3
+    speed = np.convolve(np.pad(speed, 1, mode="edge"), kernel, mode="valid")
+    accel = np.diff(speed, prepend=speed[0]) / dt
+
+    ratio = 1.0 - speed / MAX_SPEED - ACCEL_FACTOR * np.clip(accel / MAX_SPEED, -1.0, 1.0)
+    ratio = np.clip(ratio, MIN_RATIO, 1.0)
+    # Noktalar arası hız N-1 değerdir; uç noktalar komşularını kullanır
+    ratio = np.concatenate(([ratio[0]], (ratio[:-1] + ratio[1:]) / 2, [ratio[-1]]))
+
+    widths = ratio * brush_size * 2
+    # Uçlarda doğal görünüm için inceltme
+    taper = min(TAPER_POINTS, len(widths) // 2)
+    if taper:
+        ramp = np.linspace(0.3, 1.0, taper)
+        widths[:taper] *= ramp
+        widths[-taper:] *= ramp[::-1]
+    return widths
+
+
+def stroke_outline(points, widths):
+    """Orta çizgi ve kalınlıklardan dolu çokgenin kenar noktalarını üretir"""
+    xy = points[:, :2]
+    tangent = np.gradient(xy, axis=0)
+    length = np.maximum(np.hypot(tangent[:, 0], tangent[:, 1]), 1e-9)
+    normal = np.column_stack((-tangent[:, 1], tangent[:, 0])) / length[:, None]
+    offset = normal * (widths[:, None] / 2)
+    left = xy + offset
+    right = (xy - offset)[::-1]
+    return np.concatenate((left, right)).ravel().tolist()
+
+
+class VelocityBrush(DrawingTool):
+    """
+    Kalınlığı çizim hızına göre değişen fırça.
+
+    Çizgi bittiğinde tek bir dolu çokgen olarak eklenir.
+    """
+    def __init__(self):
+        self._points = []
+
+    @property
+    def name(self):
+        return "Dinamik Fırça"
+
+    def start(self, canvas, x, y):
+        """Yeni bir çizgi için nokta tamponunu sıfırlar"""
+        self._points = [(x, y, time.perf_counter())]
+
+    def drag(self, canvas, x, y, color):
+        """
+        Noktayı tampona ekler ve ince önizlemeye yalnızca yeni parçayı ekler.
+
+        Tüm noktaları her harekette yeniden göndermek çizgi boyunca O(N²)
+        olurdu; her parça ayrı, kısa bir önizleme öğesidir.
+        """
+        last = self._points[-1] if self._points else None
+        # 1 pikselden yakın noktalar profil için bilgi taşımaz
+        if last is not None and abs(x - last[0]) < 1 and abs(y - last[1]) < 1:
+            return
+        self._points.append((x, y, time.perf_counter()))
+        if last is not None:
+            canvas.create_line(
+                last[0], last[1], x, y, fill=color, width=1, tags=(OVERLAY_TAG, PREVIEW_TAG)
+            )
+
+    def draw(self, canvas, x, y, brush_size, color):
+        # Çizim, end metodunda tek seferde yapılır
+        return None
+
+    def end(self, canvas, x, y, brush_size, color):
+        """Kalınlık profilini hesaplar ve çizgiyi tek bir çokgen olarak ekler"""
+        canvas.delete(PREVIEW_TAG)
+        points, self._points = self._points, []
+        if not points:
+            return None
+        if len(points) < 3:
+            # Tek tıklama: nokta
+            px, py, _ = points[-1]
+            return canvas.create_oval(
+                px - brush_size, py - brush_size, px + brush_size, py + brush_size,
+                fill=color, outline=color
+            )
+        buffer = np.asarray(points, dtype=float)
+        outline = stroke_outline(buffer, width_profile(buffer, brush_size))
+        return canvas.create_polygon(outline, fill=color, outline=color)
@@ -0,0 +1,254 @@
+import math
+from collections import OrderedDict, namedtuple
+
+from canvas_items import OVERLAY_TAG, register_image
+
+# Geçişli (gradient) ve desenli dolgular
+# ======================================
+# Kapalı şekiller (dikdörtgen, elips, çokgen) ve tuval arka planı düz renk
+# yerine doğrusal ya da dairesel bir geçişle veya bir desenle doldurulabilir.
+# Dolgunun pikselleri NumPy ile tek seferde (vektörel) hesaplanır, şeklin
+# maskesiyle kırpılır ve bir kanvas görüntü öğesi olarak şeklin altına
+# konur; şeklin kenar çizgisi ayrı bir vektör öğesidir.
+#
+# Dolgular iki düzeyde önbelleğe alınır:
+#   - (dolgu, genişlik, yükseklik) anahtarıyla hesaplanmış dolgu görüntüsü
+#     (bellek sınırlı LRU),
+#   - (dolgu, şekil tipi, boyut, göreli köşeler) anahtarıyla maskelenmiş ve
+#     kanvas görüntüsü olarak kaydedilmiş sonuç.
+# Aynı dolguyla aynı boyutta ikinci bir şekil çizmek tek bir sözlük
+# aramasıdır. NumPy ve PIL ilk dolguda yüklenir.
+
+# Dolgu türleri ve arayüzde gösterilen adları
+FILL_KINDS = {
+    "flat": "Düz",
+    "linear": "Doğrusal",
+    "radial": "Dairesel",
+    "checker": "Damalı",
+    "stripes": "Çizgili",
+    "dots": "Noktalı",
+}
+# Dolguyla doldurulabilen öğe tipleri
+FILLABLE = ("rectangle", "oval", "polygon")
+# Desenlerin hücre boyutu (piksel)
+PATTERN_CELL = 16
+# Arka plan dolgusu öğesinin etiketi
+BACKGROUND_TAG = "background_fill"
+# Hesaplanmış dolgu görüntüleri önbelleğinin sınırı (bayt)
+MAX_FILL_BYTES = 32 * 1024 * 1024
+
+
+class Fill(namedtuple("Fill", "kind start end angle")):
+    """
+    Dolgu tanımı: tür, başlangıç ve bitiş rengi, doğrusal geçişin açısı (derece).
+
+    Değiştirilemez olduğu için önbellek anahtarı olarak kullanılır. Desenlerde
+    start desenin, end zeminin rengidir.
+    """
+    __slots__ = ()
+
+    def __new__(cls, kind, start="#000000", end="#FFFFFF", angle=0):
+        if kind not in FILL_KINDS or kind == "flat":
+            raise ValueError(f"geçersiz dolgu türü: {kind}")
+        return super().__new__(cls, kind, start, end, angle % 360)
+
+
+def _rgb(color):
+    """Tk rengini (ad ya da #rrggbb) bir RGB üçlüsüne çevirir"""
+    from PIL import ImageColor
+    try:
+        return ImageColor.getrgb(color)[:3]
+    except ValueError:
+        return (0, 0, 0)
+
+
+def fill_pixels(fill, width, height):
+    """Dolgunun (yükseklik, genişlik, 3) boyutlu uint8 piksellerini hesaplar"""
+    import numpy as np
+    xs = np.arange(width, dtype=np.float32)[None, :] + 0.5
+    ys = np.arange(height, dtype=np.float32)[:, None] + 0.5
+    if fill.kind == "linear":
+        angle = math.radians(fill.angle)
+        dx, dy = math.cos(angle), math.sin(angle)
+        # İzdüşümün en küçük ve en büyük değeri köşelerdedir
+        corners = [x * dx + y * dy for x in (0, width) for y in (0, height)]
+        low, span = min(corners), max(max(corners) - min(corners), 1e-6)
+        t = (xs * dx + ys * dy - low) / span
+    elif fill.kind == "radial":
+        cx, cy = width / 2, height / 2
+        t = np.sqrt((xs - cx) ** 2 + (ys - cy) ** 2) / max(math.hypot(cx, cy), 1e-6)
+    elif fill.kind == "checker":
+        t = ((xs // PATTERN_CELL + ys // PATTERN_CELL) % 2).astype(np.float32)
+    elif fill.kind == "stripes":
+        t = (((xs + ys) // PATTERN_CELL) % 2).astype(np.float32)
+    else:
+        half = PATTERN_CELL / 2
+        inside = (xs % PATTERN_CELL - half) ** 2 + (ys % PATTERN_CELL - half) ** 2 <= (PATTERN_CELL / 4) ** 2
+        t = (~inside).astype(np.float32)
+    t = np.broadcast_to(np.clip(t, 0, 1), (height, width))[..., None]
+    start = np.array(_rgb(fill.start), dtype=np.float32)
+    end = np.array(_rgb(fill.end), dtype=np.float32)
+    return (start + (end - start) * t + 0.5).astype(np.uint8)
+
+
+class FillCache:
+    """
+    Dolgu görüntülerinin ve şekle göre kırpılmış kanvas görüntülerinin önbelleği.
+
+    Kırpılmış görüntüler tuvalde kullanıldığı için canvas_items görüntü
+    kaydında yaşar; burada yalnızca adları tutulur.
+    """
+    def __init__(self, max_bytes=MAX_FILL_BYTES):
+        self.max_bytes = max_bytes
+        # (dolgu, genişlik, yükseklik) -> PIL görüntüsü
+        self._gradients = OrderedDict()
+        self._total = 0
+        # (dolgu, tip, genişlik, yükseklik, göreli köşeler) -> görüntü adı
+        self._shapes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def gradient(self, fill, width, height):
+        """Dolgunun verilen boyuttaki RGB görüntüsünü döndürür"""
+        key = (fill, width, height)
+        image = self._gradients.get(key)
+        if image is not None:
+            self._gradients.move_to_end(key)
+            return image
+        from PIL import Image
+        image = self._gradients[key] = Image.fromarray(fill_pixels(fill, width, height), "RGB")
+        self._total += width * height * 3
+        while self._total > self.max_bytes and len(self._gradients) > 1:
+            (_, old_width, old_height), _ = self._gradients.popitem(last=False)
+            self._total -= old_width * old_height * 3
+        return image
+
+    def shape_image(self, fill, item_type, coords):
+        """
+        Şeklin maskesiyle kırpılmış dolgu görüntüsünün adını ve sol üst
+        köşesini (ad, x, y) döndürür.
+        """
+        xs, ys = coords[0::2], coords[1::2]
+        left, top = math.floor(min(xs)), math.floor(min(ys))
+        width = max(1, math.ceil(max(xs)) - left)
+        height = max(1, math.ceil(max(ys)) - top)
+        # Dikdörtgen ve elipsin maskesi yalnızca boyuta bağlıdır
+        relative = () if item_type != "polygon" else tuple(
+            round(c - (top if i % 2 else left)) for i, c in enumerate(coords)
+        )
+        key = (fill, item_type, width, height, relative)
+        name = self._shapes.get(key)
+        if name is not None:
+            self.hits += 1
+            return name, left, top
+        self.misses += 1
+        from PIL import Image, ImageDraw, ImageTk
+        image = self.gradient(fill, width, height).convert("RGBA")
+        if item_type != "rectangle":
+            mask = Image.new("L", (width, height), 0)
+            draw = ImageDraw.Draw(mask)
+            if item_type == "oval":
+                draw.ellipse((0, 0, width - 1, height - 1), fill=255)
+            else:
+                draw.polygon(relative, fill=255)
+            image.putalpha(mask)
+        name = self._shapes[key] = register_image(ImageTk.PhotoImage(image), image)
+        return name, left, top
+
+
+# Tüm dolguların paylaştığı önbellek
+_FILLS = FillCache()
+
+
+def fill_records(fill, item_type, coords, options, cache=None):
+    """
+    Dolgulu bir şeklin kayıtlarını döndürür: kırpılmış dolgu görüntüsü ve
+    üstünde şeklin kenar çizgisi.
+
+    Kayıtlarda boş dolgu saklanmadığından çokgenin kenarı kapalı bir çizgidir.
+    """
+    name, left, top = (cache or _FILLS).shape_image(fill, item_type, coords)
+    outline = options.get("outline") or options.get("fill") or fill.start
+    width = options.get("width", 1)
+    records = [("image", [left, top], {"image": name, "anchor": "nw"})]
+    if item_type == "polygon":
+        records.append(("line", list(coords) + list(coords[:2]), {"fill": outline, "width": width}))
+    else:
+        records.append((item_type, list(coords), {"outline": outline, "width": width}))
+    return records
+
+
+def refill_records(fill, outline_record, cache=None):
+    """
+    fill_records'un kenar çizgisi kaydından (ör. simetri kopyası) dolgulu
+    şeklin kayıtlarını yeniden oluşturur.
+    """
+    item_type, coords, options = outline_record
+    if item_type == "line":
+        return fill_records(fill, "polygon", list(coords)[:-2], {"outline": options.get("fill"),
+                                                                  "width": options.get("width", 1)}, cache)
+    return fill_records(fill, item_type, coords, options, cache)
+
+
+class BackgroundFill:
+    """
+    Tuval arka planını dolduran, tüm çizimlerin altındaki görüntü öğesi.
+
+    Öğe belgeye ait değildir (overlay); tuval boyutu değişince dolgu yeni
+    boyutta (önbellekten) yeniden gösterilir.
+    """
+    def __init__(self, canvas, cache=None):
+        self._canvas = canvas
+        self._cache = cache or _FILLS
+        self.fill = None
+        self._item = None
+        self._photo = None
+        self._size = None
+        self._resize_job = None
+        canvas.bind("<Configure>", self._on_configure, add="+")
+
+    def set(self, fill):
+        """Arka plan dolgusunu değiştirir; None dolguyu kaldırır"""
+        self.fill = fill
+        if fill is None:
+            if self._item is not None:
+                self._canvas.delete(self._item)
+            self._item = self._photo = self._size = None
+            return
+        self._size = None
+        self.refresh()
+
+    def refresh(self):
+        """Dolguyu tuvalin mevcut boyutunda gösterir"""
+        if self.fill is None:
+            return
+        size = (max(1, self._canvas.winfo_width()), max(1, self._canvas.winfo_height()))
+        if size == self._size:
+            return
+        from PIL import ImageTk
+        self._size = size
+        self._photo = ImageTk.PhotoImage(self._cache.gradient(self.fill, *size))
+        if self._item is None:
+            self._item = self._canvas.create_image(
+                0, 0, image=self._photo, anchor="nw", tags=(OVERLAY_TAG, BACKGROUND_TAG)
+            )
+        else:
+            self._canvas.itemconfig(self._item, image=self._photo)
+        self._canvas.tag_lower(self._item)
+
+    def image(self, width, height):
+        """Dışa aktarma için dolgunun PIL görüntüsü (dolgu yoksa None)"""
+        if self.fill is None:
+            return None
+        return self._cache.gradient(self.fill, width, height)
+
+    def _on_configure(self, event):
+        if self.fill is None:
+            return
+        if self._resize_job is not None:
+            self._canvas.after_cancel(self._resize_job)
+        self._resize_job = self._canvas.after(100, self._after_resize)
+
+    def _after_resize(self):
+        self._resize_job = None
+        self.refresh()
@@ -0,0 +1,218 @@
+import time
+
+from abstract_classes import HistoryAction
+from canvas_items import (
+    bboxes, capture_item, create_items, document_items, register_image,
+    release_images, tag_items
+)
+from raster_render import render_records
+
+# Öğe bütçesi ve arka planda birleştirme (flattening)
+# ===================================================
+# Tk kanvası on binlerce öğede belirgin şekilde yavaşlar. Uygulama belge
+# öğelerinin sayısını kendi sayacıyla izler; sayı bütçeyi aştığında en eski
+# öğeler tek bir görüntü öğesinde birleştirilir. Öğeler boşta (idle)
+# çalışan kısa zaman dilimlerinde okunup çizilir, böylece arayüz donmaz.
+# Birleştirme ve geri alınması PaintHistory üzerinden bir işlem olarak yapılır;
+# işlem kendiliğinden yapıldığı için geri alma onu önceki adımla birlikte
+# oynatır. Birleştirilmiş görüntüler geçmişte anılmadıkları anda bırakılır.
+
+# Bir zaman diliminin en uzun süresi (saniye)
+SLICE_SECONDS = 0.008
+# Birleştirmeden sonra bütçenin bu oranı kadar öğe kalır
+KEEP_RATIO = 0.75
+# Geçmiş işlemlerinin geçici olarak kullandığı etiket
+_WORK_TAG = "flatten_work"
+
+
+def _place_at_bottom(canvas, item_ids, below):
+    """Öğeleri, belgenin geri kalanının (below) altına sıralarını koruyarak taşır"""
+    if below is None:
+        return
+    tag_items(canvas, _WORK_TAG, item_ids)
+    canvas.tag_lower(_WORK_TAG, below)
+    canvas.dtag(_WORK_TAG, _WORK_TAG)
+
+
+class FlattenAction(HistoryAction):
+    """
+    Belgenin en alttaki count öğesini tek bir görüntü öğesiyle değiştirir.
+
+    Geri almak için birleştirilen öğelerin kayıtları saklanır.
+    """
+    automatic = True
+
+    def __init__(self, records, image_record):
+        self._records = records
+        self._image_record = image_record
+
+    @property
+    def image_name(self):
+        """Birleştirilmiş görüntünün kayıtlardaki adı"""
+        return self._image_record[2]["image"]
+
+    def undo(self, canvas):
+        ids = document_items(canvas)
+        if not ids:
+            return
+        canvas.delete(ids[0])
+        created = create_items(canvas, self._records)
+        _place_at_bottom(canvas, created, ids[1] if len(ids) > 1 else None)
+
+    def redo(self, canvas):
+        ids = document_items(canvas)
+        count = len(self._records)
+        tag_items(canvas, _WORK_TAG, ids[:count])
+        canvas.delete(_WORK_TAG)
+        created = create_items(canvas, [self._image_record])
+        _place_at_bottom(canvas, created, ids[count] if len(ids) > count else None)
+
+    def apply(self, records):
+        return [self._image_record] + list(records)[len(self._records):]
+
+    def revert(self, records):
+        return list(self._records) + list(records)[1:]
+
+    def records_held(self):
+        return list(self._records) + [self._image_record]
+
+
+class ItemBudget:
+    """
+    Belge öğesi sayısını izler ve bütçe aşılınca eski öğeleri birleştirir.
+
+    Sayaç, oluşturulan öğelerle artırılır; geri alma gibi sayıyı
+    öngörülemez biçimde değiştiren işlemlerden sonra invalidate çağrılır
+    ve sayı bir sonraki kontrolde kanvastan yeniden okunur.
+    """
+    def __init__(self, root, canvas, history, limit=20000, on_status=None):
+        self._root = root
+        self._canvas = canvas
+        self._history = history
+        self.limit = limit
+        self._on_status = on_status
+        self._count = 0
+        self._job = None
+        # Birleştirmelerin kaydettiği görüntü adları
+        self._images = set()
+
+    @property
+    def count(self):
+        if self._count is None:
+            self._count = len(document_items(self._canvas))
+        return self._count
+
+    @property
+    def flattening(self):
+        return self._job is not None
+
+    def add(self, count):
+        """Yeni oluşturulan öğeleri sayaca ekler"""
+        if self._count is not None:
+            self._count += count
+
+    def invalidate(self):
+        """
+        Belge öngörülemez biçimde değiştiğinde çağrılır.
+
+        Sayı bir sonraki kontrolde yeniden okunur; süren bir birleştirme
+        eskimiş kayıtlarla bitmemesi için iptal edilir.
+        """
+        self._count = None
+        self.cancel()
+
+    def cancel(self):
+        """Süren birleştirmeyi iptal eder (ör. seçili öğeler taşınırken); sayı korunur"""
+        if self._job is not None:
+            self._job.cancelled = True
+
+    def check(self):
+        """Bütçe aşıldıysa arka planda birleştirmeyi başlatır"""
+        if self._job is None and self.count > self.limit:
+            count = self.count - int(self.limit * KEEP_RATIO)
+            self._job = _FlattenJob(self, document_items(self._canvas)[:count])
+            self._root.after_idle(self._job.step)
+
+    def _status(self, text):
+        if self._on_status is not None:
+            self._on_status(text)
+
+    def _finished(self, action, count):
+        """Birleştirme bittiğinde çağrılır; işlem None ise iptal edilmiştir"""
+        self._job = None
+        if action is None:
+            self.invalidate()
+            self._status("Birleştirme iptal edildi (belge değişti)")
+            return
+        action.redo(self._canvas)
+        self._history.push_action(action)
+        self._images.add(action.image_name)
+        # Geçmişten düşen birleştirmelerin görüntüleri bırakılır
+        unused = self._images - self._history.image_names()
+        release_images(unused)
+        self._images -= unused
+        if self._count is not None:
+            self._count -= count - 1
+        self._status(f"{count} eski öğe tek bir görüntüde birleştirildi")
+
+
+class _FlattenJob:
+    """Birleştirmeyi kısa zaman dilimlerine bölen iş"""
+    def __init__(self, budget, item_ids):
+        self._budget = budget
+        self._canvas = budget._canvas
+        self._ids = item_ids
+        self._records = []
+        self._image = None
+        self._origin = None
+        self._boxes = None
+        self.cancelled = False
+
+    def step(self):
+        """Bir zaman dilimi boyunca öğeleri okuyup görüntüye çizer"""
+        from PIL import Image
+        canvas = self._canvas
+        if self.cancelled:
+            self._budget._finished(None, 0)
+            return
+        if self._image is None:
+            # Sınır kutuları bitişte öğelerin taşınmadığını doğrulamak için saklanır
+            self._boxes = bboxes(canvas, self._ids)
+            known = [box for box in self._boxes if box]
+            if not known:
+                self._budget._finished(None, 0)
+                return
+            box = (int(min(b[0] for b in known)), int(min(b[1] for b in known)),
+                   int(max(b[2] for b in known)), int(max(b[3] for b in known)))
+            self._origin = (box[0], box[1])
+            self._image = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), (0, 0, 0, 0))
+        deadline = time.perf_counter() + SLICE_SECONDS
+        start = len(self._records)
+        end = start
+        while end < len(self._ids) and time.perf_counter() < deadline:
+            record = capture_item(canvas, self._ids[end])
+            if record[0] is None:
+                # Öğe bu arada silinmiş (ör. geri alma)
+                self._budget._finished(None, 0)
+                return
+            self._records.append(record)
+            end += 1
+        render_records(self._image, self._records[start:end], self._origin)
+        if end < len(self._ids):
+            percent = 100 * end // len(self._ids)
+            self._budget._status(f"Eski öğeler birleştiriliyor... %{percent}")
+            canvas.after_idle(self.step)
+        else:
+            self._finish()
+
+    def _finish(self):
+        from PIL import ImageTk
+        # Öğeler hâlâ belgenin en altındaysa ve taşınmadıysa birleştirme uygulanır
+        if (tuple(document_items(self._canvas)[:len(self._ids)]) != tuple(self._ids)
+                or bboxes(self._canvas, self._ids) != self._boxes):
+            self._budget._finished(None, 0)
+            return
+        photo = ImageTk.PhotoImage(self._image)
+        name = register_image(photo, self._image, document=True)
+        image_record = ("image", list(self._origin), {"image": name, "anchor": "nw"})
+        self._budget._finished(FlattenAction(self._records, image_record), len(self._ids))
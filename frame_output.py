@@ -0,0 +1,379 @@
+import struct
+import sys
+from bisect import bisect_left
+import threading
+import time
+from multiprocessing import shared_memory
+
+from canvas_items import DOCUMENT_ITEMS, capture_items, image_for
+from raster_render import new_image, render_layers, render_records
+
+# Paylaşılan bellek üzerinden canlı kare çıkışı
+# =============================================
+# Çizim oturumu aynı makinedeki başka süreçlere (video kodlayıcı, yayın
+# katmanı vb.) ekran görüntüsü alınmadan aktarılır. Tuvalin görüntüsü sabit
+# bir hızda multiprocessing.shared_memory içindeki bir kare halkasına
+# (ring) yazılır; okuyucular kareleri kopyalamadan (zero-copy) okuyabilir.
+#
+# Tk iş parçacığı her karede yalnızca ucuz bir anlık görüntü alır (geçmişin
+# değişmez kayıt demeti, süren çizginin öğeleri, değişen raster
+# döşemeleri ve döşemelerin vektör öğelerin arasındaki yerleri). Görüntü ayrı bir iş parçacığında, bir önceki kareye göre
+# yalnızca değişen bölge yeniden çizilerek üretilir. Çizim kare hızına
+# yetişemezse bekleyen anlık görüntünün yerine yenisi konur; kareler
+# kuyrukta birikmez. Okuyucular geride kalırsa halkadaki eski kareler
+# üzerine yazılır.
+#
+# Bellek düzeni (küçük uçlu / little-endian):
+#   Genel başlık (32 bayt): b"PFRM", sürüm, yuva sayısı, genişlik,
+#       yükseklik, satır uzunluğu (bayt), son tamamlanan karenin indeksi (u64)
+#   Her yuva: yuva başlığı (32 bayt) + RGB pikseller (yükseklik x satır)
+#       kare indeksi (u64, yazılırken 0), zaman damgası (f64, time.time),
+#       kirli dikdörtgen x0, y0, x1, y1 (u32; önceki kareye göre değişen bölge)
+#
+# Kare indeksleri 1'den başlar; bir okuyucu aradaki kareleri kaçırdıysa
+# (indeks birden fazla arttıysa) kirli dikdörtgen yerine tüm kareyi
+# değişmiş saymalıdır.
+
+MAGIC = b"PFRM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIIIIQ")
+SLOT_HEADER = struct.Struct("<QdIIII")
+# Son tamamlanan kare indeksinin genel başlıktaki konumu
+_LATEST_OFFSET = HEADER.size - 8
+# Yuvaların hizalandığı sınır (bayt)
+_ALIGN = 64
+# Kirli bölge karenin bu oranından büyükse tüm kare yeniden çizilir
+_FULL_REDRAW_RATIO = 0.5
+
+
+def _slot_size(stride, height):
+    size = SLOT_HEADER.size + stride * height
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _record_box(record):
+    """Kaydın kaplayabileceği alanın sınır kutusu (çizgi kalınlığı dahil)"""
+    item_type, coords, options = record
+    if not coords:
+        return None
+    xs = [float(c) for c in coords[0::2]]
+    ys = [float(c) for c in coords[1::2]]
+    if item_type == "image":
+        source = image_for(options.get("image"))
+        if source is None:
+            return None
+        return (xs[0], ys[0], xs[0] + source.width, ys[0] + source.height)
+    try:
+        pad = float(options.get("width", 1)) / 2 + 2
+    except ValueError:
+        pad = 2
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+
+def _overlaps(a, b):
+    return a is not None and a[0] < b[2] and a[2] > b[0] and a[1] < b[3] and a[3] > b[1]
+
+
+class CanvasFrameSource:
+    """
+    Tk iş parçacığında tuvalin anlık görüntüsünü (arka plan, kayıtlar,
+    değişen raster döşemeleri, döşemelerin yerleri) alır.
+
+    Arka plan (renk, görüntü) çiftidir; background rengi, background_image
+    arka plan dolgusunun görüntüsünü (yoksa None) döndürür. Dolgu değişmedikçe
+    aynı (önbellekteki) görüntü nesnesi dönmelidir.
+
+    Kayıtlar geçmişin değişmez kayıt demetinden ve süren çizginin
+    öğelerinden oluşur; tuvaldeki öğe sayısı bununla uyuşmuyorsa (ör. ortak
+    çizimden gelen öğeler ya da temizlenen tuval) belge öğeleri yeniden
+    okunur ve sayı değişene kadar tekrar kullanılır.
+    """
+    def __init__(self, canvas, history, background, stroke_items=lambda: (),
+                 background_image=lambda: None):
+        self._canvas = canvas
+        self._history = history
+        self._background = background
+        self._background_image = background_image
+        self._stroke_items = stroke_items
+        self._raster_revision = 0
+        self._fallback = None
+        self._positions = None
+
+    def __call__(self):
+        canvas = self._canvas
+        records = self._history.records
+        stroke = list(self._stroke_items())
+        count = int(canvas.tk.eval("llength [%s find withtag %s]" % (canvas._w, DOCUMENT_ITEMS)))
+        if count != len(records) + len(stroke):
+            key = (records, count)
+            if self._fallback is None or self._fallback[0] != key:
+                self._fallback = (key, tuple(capture_items(canvas)))
+            records = self._fallback[1]
+        elif stroke:
+            records = records + tuple(capture_items(canvas, stroke))
+        background = (self._background(), self._background_image())
+        layer = self._raster_layer()
+        if layer is None:
+            return background, records, {}, {}
+        changed, self._raster_revision = layer.buffer.changed_since(self._raster_revision)
+        return background, records, changed, self._tile_positions(layer, records, count)
+
+    def _raster_layer(self):
+        # Raster modülü yüklenmediyse raster çizim de yoktur
+        if "raster_brush" not in sys.modules:
+            return None
+        from raster_brush import RasterLayer
+        return RasterLayer.existing(self._canvas)
+
+    def _tile_positions(self, layer, records, count):
+        """Döşemelerin yerleri; kayıtlar ve döşeme öğeleri değişmedikçe yeniden sorulmaz"""
+        key = (records, count, layer.placements)
+        if self._positions is None or self._positions[0] != key:
+            self._positions = (key, layer.tile_positions())
+        return self._positions[1]
+
+
+class FramePublisher:
+    """
+    Anlık görüntüleri sabit hızda paylaşılan bellekteki kare halkasına yazar.
+
+    source, Tk iş parçacığında çağrılan ve (arka plan, kayıtlar, değişen
+    raster döşemeleri, döşemelerin yerleri) döndüren bir işlevdir (bkz.
+    CanvasFrameSource).
+    Kareler width x height boyutundadır; arka plan görüntüsü sol üst köşeye
+    yerleştirilir, dışında kalan alan arka plan rengiyle doldurulur.
+    """
+    def __init__(self, root, source, width, height, fps=30, slots=3, name=None):
+        self._root = root
+        self._source = source
+        self.width = int(width)
+        self.height = int(height)
+        self.slots = slots
+        self._interval = max(1, int(1000 / fps))
+        self._stride = self.width * 3
+        self._slot_bytes = _slot_size(self._stride, self.height)
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=HEADER.size + slots * self._slot_bytes
+        )
+        HEADER.pack_into(self._shm.buf, 0, MAGIC, FORMAT_VERSION, slots,
+                         self.width, self.height, self._stride, 0)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None
+        self._running = False
+        self._job = None
+        self._thread = None
+        # Çizim iş parçacığının durumu
+        self._image = None
+        self._background = None
+        self._records = ()
+        self._tiles = {}
+        self._positions = {}
+        self.index = 0
+        self.dropped = 0
+
+    @property
+    def name(self):
+        """Okuyucuların bağlanacağı paylaşılan bellek adı"""
+        return self._shm.name
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._render_loop, name="frame-output", daemon=True)
+        self._thread.start()
+        self._job = self._root.after(self._interval, self._tick)
+
+    def close(self):
+        """Yayını durdurur ve paylaşılan belleği kaldırır"""
+        if self._job is not None:
+            self._root.after_cancel(self._job)
+            self._job = None
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _tick(self):
+        """Tk iş parçacığında: anlık görüntüyü alır ve çizim iş parçacığına bırakır"""
+        self._job = self._root.after(self._interval, self._tick)
+        background, records, raster, positions = self._source()
+        with self._lock:
+            if self._pending is not None:
+                # Önceki kare henüz çizilmedi; yerine yenisi geçer, ancak
+                # arada değişen döşemeler kaybolmamalı
+                self.dropped += 1
+                raster = {**self._pending[2], **raster}
+            self._pending = (background, records, raster, positions)
+        self._wake.set()
+
+    def _render_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                return
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+            if snapshot is not None:
+                dirty = self._render(*snapshot)
+                self._publish(dirty)
+
+    def _render(self, background, records, raster, positions):
+        """Kareyi bir öncekine göre günceller ve kirli dikdörtgeni döndürür"""
+        full = (0, 0, self.width, self.height)
+        # Görüntüler piksel piksel karşılaştırılmaz; dolgu değişince nesne değişir
+        if (self._image is None or background[0] != self._background[0]
+                or background[1] is not self._background[1]):
+            # raster yalnızca değişen döşemeleri içerir; önceki döşemeler
+            # korunur ve yeni arka planın üzerine yeniden yerleştirilir
+            self._background = background
+            self._records = records
+            self._positions = positions
+            self._apply_tiles(raster)
+            self._redraw(full)
+            return full
+        dirty = None
+        for key in raster:
+            dirty = _union(dirty, self._tile_box(key))
+        # Yeri değişen döşemeler de yeniden çizilir
+        for key in positions.keys() | self._positions.keys():
+            if positions.get(key) != self._positions.get(key):
+                dirty = _union(dirty, self._tile_box(key))
+        self._positions = positions
+        self._apply_tiles(raster)
+        old, self._records = self._records, records
+        prefix = 0
+        limit = min(len(old), len(records))
+        while prefix < limit and old[prefix] is records[prefix]:
+            prefix += 1
+        removed, added = old[prefix:], records[prefix:]
+        if not removed and dirty is None:
+            # En sık durum: yalnızca yeni öğeler eklendi, üstüne çizilir
+            for record in added:
+                dirty = _union(dirty, _record_box(record))
+            render_records(self._image, added)
+            return self._clip(dirty)
+        for record in removed + added:
+            dirty = _union(dirty, _record_box(record))
+        dirty = self._clip(dirty)
+        if dirty is not None:
+            area = (dirty[2] - dirty[0]) * (dirty[3] - dirty[1])
+            if area > _FULL_REDRAW_RATIO * self.width * self.height:
+                dirty = full
+            self._redraw(dirty)
+        return dirty
+
+    def _redraw(self, box):
+        """Bölgeyi arka plan, raster döşemeleri ve kayıtlarla baştan çizer"""
+        x0, y0, x1, y1 = box
+        color, image = self._background
+        region = new_image(x1 - x0, y1 - y0, color)
+        if image is not None:
+            region.paste(image, (-x0, -y0))
+        kept = [i for i, record in enumerate(self._records) if _overlaps(_record_box(record), box)]
+        tiles = []
+        for key, tile in self._tiles.items():
+            tile_box = self._tile_box(key)
+            if _overlaps(tile_box, box):
+                # Konum, bölgeye giren kayıtlar arasındaki sıraya çevrilir
+                position = bisect_left(kept, self._positions.get(key, len(self._records)))
+                tiles.append((position, tile_box[:2], tile))
+        render_layers(region, [self._records[i] for i in kept], tiles, offset=(x0, y0))
+        if self._image is None:
+            self._image = region
+        else:
+            self._image.paste(region, (x0, y0))
+
+    def _apply_tiles(self, raster):
+        from PIL import Image
+        if not raster:
+            return
+        from raster_brush import tile_rgba
+        for key, tile in raster.items():
+            if tile is None:
+                self._tiles.pop(key, None)
+            else:
+                self._tiles[key] = Image.fromarray(tile_rgba(tile), "RGBA")
+
+    def _tile_box(self, key):
+        from raster_brush import TILE
+        return (key[0] * TILE, key[1] * TILE, (key[0] + 1) * TILE, (key[1] + 1) * TILE)
+
+    def _clip(self, box):
+        if box is None:
+            return None
+        x0, y0 = max(0, int(box[0])), max(0, int(box[1]))
+        x1, y1 = min(self.width, int(box[2]) + 1), min(self.height, int(box[3]) + 1)
+        return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+    def _publish(self, dirty):
+        """Kareyi sıradaki yuvaya yazar; okuyucular hiçbir zaman beklenmez"""
+        self.index += 1
+        buf = self._shm.buf
+        offset = HEADER.size + (self.index % self.slots) * self._slot_bytes
+        x0, y0, x1, y1 = dirty or (0, 0, 0, 0)
+        # Yazma sürerken yuvanın indeksi 0'dır; okuyucu yarım kareyi tanır
+        SLOT_HEADER.pack_into(buf, offset, 0, 0.0, 0, 0, 0, 0)
+        start = offset + SLOT_HEADER.size
+        buf[start:start + self._stride * self.height] = self._image.tobytes()
+        SLOT_HEADER.pack_into(buf, offset, self.index, time.time(), x0, y0, x1, y1)
+        struct.pack_into("<Q", buf, _LATEST_OFFSET, self.index)
+
+
+class FrameReader:
+    """
+    Başka bir süreçten kare halkasını okur.
+
+    latest, son tamamlanan karenin (indeks, zaman, kirli dikdörtgen,
+    piksel memoryview) bilgisini kopyalamadan döndürür. Pikseller yazıcı
+    halkada dolaşıp aynı yuvaya döndüğünde değişir; kare kullanıldıktan
+    sonra still_valid ile kontrol edilmelidir.
+    """
+    def __init__(self, name):
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13: okuyucu belleği sahiplenmemeli, yoksa çıkışta silinir
+            from multiprocessing import resource_tracker
+            self._shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        magic, version, self.slots, self.width, self.height, self.stride, _ = \
+            HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("tanınmayan kare halkası")
+        self._slot_bytes = _slot_size(self.stride, self.height)
+
+    def _slot_offset(self, index):
+        return HEADER.size + (index % self.slots) * self._slot_bytes
+
+    def latest(self):
+        """Son karenin (indeks, zaman, kirli dikdörtgen, pikseller) bilgisi; kare yoksa None"""
+        for _ in range(self.slots):
+            index = struct.unpack_from("<Q", self._shm.buf, _LATEST_OFFSET)[0]
+            if index == 0:
+                return None
+            offset = self._slot_offset(index)
+            slot_index, timestamp, *dirty = SLOT_HEADER.unpack_from(self._shm.buf, offset)
+            if slot_index == index:
+                start = offset + SLOT_HEADER.size
+                pixels = self._shm.buf[start:start + self.stride * self.height]
+                return index, timestamp, tuple(dirty), pixels
+        return None
+
+    def still_valid(self, index):
+        """Karenin yuvası bu arada üzerine yazılmadıysa True döndürür"""
+        return struct.unpack_from("<Q", self._shm.buf, self._slot_offset(index))[0] == index
+
+    def close(self):
+        self._shm.close()
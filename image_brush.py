@@ -0,0 +1,276 @@
+import math
+import os
+import random
+from collections import OrderedDict
+
+from abstract_classes import DrawingTool
+from canvas_items import register_image
+
+# Resim damgalı fırçalar
+# ======================
+# PNG fırça uçları (tip) seçili renge boyanır, fırça boyutuna ölçeklenir ve
+# isteğe bağlı olarak rastgele döndürülüp saçılarak (jitter) damgalanır.
+# Her damga bir kanvas görüntü öğesidir.
+#
+# Bir ucu her damga için boyamak, ölçeklemek ve döndürmek pahalıdır. Hazır
+# damgalar (PIL görüntüsü + PhotoImage) (uç, renk, boyut, açı dilimi)
+# anahtarıyla, bellek sınırı olan bir LRU önbellekte tutulur. Açı sürekli
+# değil ROTATION_STEPS dilime yuvarlanır; böylece bir çizgi boyunca en fazla
+# o kadar farklı damga hazırlanır. Çizgi başladığında diğer açı dilimleri
+# boşta (idle) küçük parçalar halinde önceden hazırlanır, hızlı çizgiler
+# takılmaz.
+#
+# Tuvalde kullanılan damgalar geçmiş ve dışa aktarma için canvas_items
+# görüntü kaydına eklenir ve orada yaşar; önbellekten çıkarılmaları
+# yalnızca hiç kullanılmamış (önceden hazırlanmış) damgaların belleğini
+# serbest bırakır.
+
+# Fırça uçlarının arandığı klasörler
+BRUSH_DIRS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "brushes"),
+    os.path.join(
+        os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config"),
+        "paint_app", "brushes"
+    ),
+]
+# Döndürme açısının yuvarlandığı dilim sayısı (15 derece)
+ROTATION_STEPS = 24
+# Damga aralığının damga çapına oranı
+SPACING = 0.3
+# Hazır damga önbelleğinin varsayılan sınırı (bayt)
+MAX_STAMP_BYTES = 32 * 1024 * 1024
+# Tuvalde kullanılmış damgaların aranma tablosunun en fazla girişi
+MAX_USED_STAMPS = 4096
+# Boşta bir seferde hazırlanan damga sayısı
+_PREWARM_BATCH = 4
+
+
+def find_brush_tips(folders=None):
+    """Klasörlerdeki PNG fırça uçlarını (ad, yol) çiftleri olarak döndürür"""
+    tips = []
+    for folder in folders or BRUSH_DIRS:
+        try:
+            entries = sorted(os.scandir(folder), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            name, extension = os.path.splitext(entry.name)
+            if extension.lower() == ".png" and entry.is_file():
+                tips.append((name, entry.path))
+    return tips
+
+
+def register_image_brushes(registry, folders=None):
+    """Bulunan her fırça ucu için kayıt defterine bir damga fırçası ekler"""
+    tool_ids = []
+    for name, path in find_brush_tips(folders):
+        tool_id = f"stamp:{name}"
+        registry.register(tool_id, lambda path=path: ImageStampBrush(path), name=name.title())
+        tool_ids.append(tool_id)
+    return tool_ids
+
+
+def load_tip_mask(path):
+    """
+    Fırça ucunu 8 bitlik bir boya maskesine (L) çevirir.
+
+    Saydamlığı olan uçlarda alfa kanalı, olmayanlarda ters parlaklık
+    (koyu = boya) kullanılır.
+    """
+    from PIL import Image, ImageOps
+    with Image.open(path) as image:
+        if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+            alpha = image.convert("RGBA").getchannel("A")
+            if alpha.getextrema()[0] < 255:
+                return alpha
+        return ImageOps.invert(image.convert("L"))
+
+
+class StampCache:
+    """
+    Hazır damgaların (uç, renk, boyut, açı dilimi) anahtarlı LRU önbelleği.
+
+    get, damganın kanvas görüntü adını ve boyutunu döndürür. Önbellek
+    max_bytes'ı aşınca en uzun süredir kullanılmayan damgalar bırakılır.
+    """
+    def __init__(self, max_bytes=MAX_STAMP_BYTES):
+        self.max_bytes = max_bytes
+        self._masks = {}
+        # anahtar -> (PhotoImage, PIL görüntüsü, bayt)
+        self._stamps = OrderedDict()
+        # Tuvalde kullanılmış damgalar: anahtar -> (görüntü adı, genişlik, yükseklik).
+        # Görüntüler canvas_items kaydında yaşar; burası yalnızca bir arama
+        # tablosudur ve sınırı aşınca en eski girişler unutulur
+        self._used = OrderedDict()
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+    def __len__(self):
+        return len(self._stamps)
+
+    def __contains__(self, key):
+        return key in self._stamps or key in self._used
+
+    def get(self, key):
+        """Damgayı kullanıma hazırlar ve (görüntü adı, genişlik, yükseklik) döndürür"""
+        used = self._used.get(key)
+        if used is not None:
+            self.hits += 1
+            self._used.move_to_end(key)
+            if key in self._stamps:
+                self._stamps.move_to_end(key)
+            return used
+        entry = self._stamps.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self.prepare(key)
+        else:
+            self.hits += 1
+            self._stamps.move_to_end(key)
+        photo, image, _ = entry
+        # Tuvale konan damga geçmiş ve dışa aktarma için kayda geçer
+        used = self._used[key] = (register_image(photo, image), image.width, image.height)
+        while len(self._used) > MAX_USED_STAMPS:
+            self._used.popitem(last=False)
+        return used
+
+    def invalidate(self, tip):
+        """Ucun maskesini ve damgalarını bırakır (ör. uç dosyası değişti)"""
+        self._masks.pop(tip, None)
+        for key in [key for key in self._stamps if key[0] == tip]:
+            self._total -= self._stamps.pop(key)[2]
+        for key in [key for key in self._used if key[0] == tip]:
+            del self._used[key]
+
+    def prepare(self, key):
+        """Damgayı (yoksa) hazırlayıp önbelleğe koyar"""
+        entry = self._stamps.get(key)
+        if entry is not None:
+            return entry
+        from PIL import Image, ImageTk
+        tip, rgb, size, bucket = key
+        mask = self._masks.get(tip)
+        if mask is None:
+            mask = self._masks[tip] = load_tip_mask(tip)
+        scale = size / max(mask.size)
+        mask = mask.resize(
+            (max(1, round(mask.width * scale)), max(1, round(mask.height * scale))),
+            Image.LANCZOS
+        )
+        if bucket:
+            mask = mask.rotate(bucket * 360 / ROTATION_STEPS, Image.BICUBIC, expand=True)
+        image = Image.new("RGBA", mask.size, rgb)
+        image.putalpha(mask)
+        # PIL görüntüsü ve Tk kopyası
+        entry = (ImageTk.PhotoImage(image), image, image.width * image.height * 8)
+        self._stamps[key] = entry
+        self._total += entry[2]
+        while self._total > self.max_bytes and len(self._stamps) > 1:
+            _, (_, _, size_bytes) = self._stamps.popitem(last=False)
+            self._total -= size_bytes
+        return entry
+
+
+# Tüm damga fırçalarının paylaştığı önbellek
+_STAMPS = StampCache()
+
+
+def invalidate_tip(path):
+    """Yeniden içe aktarılan ucun önbellekteki eski maskesini ve damgalarını bırakır"""
+    _STAMPS.invalidate(path)
+
+
+class ImageStampBrush(DrawingTool):
+    """
+    PNG fırça ucuyla damgalayan fırça.
+
+    Fare hareketleri arasındaki yol damga çapının SPACING katı aralıklarla
+    damgalanır. random_rotation her damgayı rastgele bir açı dilimine
+    döndürür; jitter damgaları çapın bu oranı kadar rastgele saçar.
+    """
+    def __init__(self, tip_path, random_rotation=True, jitter=0.1, cache=None):
+        self.tip_path = tip_path
+        self.random_rotation = random_rotation
+        self.jitter = jitter
+        self._cache = cache or _STAMPS
+        self._random = random.Random()
+        self._last = None
+        self._carry = 0.0
+        self._prewarm_job = None
+
+    @property
+    def name(self):
+        return os.path.splitext(os.path.basename(self.tip_path))[0].title()
+
+    def start(self, canvas, x, y):
+        self._last = None
+        self._carry = 0.0
+
+    def draw(self, canvas, x, y, brush_size, color):
+        """Son noktadan bu noktaya kadar damgalar ve oluşan öğelerin listesini döndürür"""
+        rgb = _parse_color(canvas, color)
+        diameter = max(2, brush_size * 2)
+        if self._last is None:
+            points = [(x, y)]
+            self._prewarm(canvas, rgb, diameter)
+        else:
+            points = self._spaced_points(self._last, (x, y), diameter * SPACING)
+        self._last = (x, y)
+        items = []
+        for px, py in points:
+            bucket = self._random.randrange(ROTATION_STEPS) if self.random_rotation else 0
+            if self.jitter:
+                spread = self.jitter * diameter
+                px += self._random.uniform(-spread, spread)
+                py += self._random.uniform(-spread, spread)
+            name, width, height = self._cache.get((self.tip_path, rgb, diameter, bucket))
+            # Kayıtlar ve dışa aktarma görüntünün sol üst köşesini kullanır
+            items.append(canvas.create_image(
+                round(px - width / 2), round(py - height / 2), image=name, anchor="nw"
+            ))
+        return items
+
+    def _spaced_points(self, start, end, spacing):
+        """start'tan end'e spacing aralıklı noktalar; kalan mesafe sonraki harekete aktarılır"""
+        distance = math.hypot(end[0] - start[0], end[1] - start[1])
+        spacing = max(1.0, spacing)
+        points = []
+        travelled = spacing - self._carry
+        while travelled <= distance:
+            t = travelled / distance
+            points.append((start[0] + (end[0] - start[0]) * t, start[1] + (end[1] - start[1]) * t))
+            travelled += spacing
+        self._carry = distance - (travelled - spacing)
+        return points
+
+    def _prewarm(self, canvas, rgb, diameter):
+        """Diğer açı dilimlerini boşta küçük parçalar halinde hazırlar"""
+        if not self.random_rotation:
+            return
+        keys = [(self.tip_path, rgb, diameter, bucket) for bucket in range(ROTATION_STEPS)]
+        if self._prewarm_job is not None:
+            canvas.after_cancel(self._prewarm_job)
+
+        def step():
+            self._prewarm_job = None
+            pending = [key for key in keys if key not in self._cache]
+            for key in pending[:_PREWARM_BATCH]:
+                self._cache.prepare(key)
+            if len(pending) > _PREWARM_BATCH:
+                self._prewarm_job = canvas.after_idle(step)
+
+        self._prewarm_job = canvas.after_idle(step)
+
+
+def _parse_color(canvas, color):
+    """Tk rengini (ad ya da #rrggbb) bir RGB üçlüsüne çevirir"""
+    from PIL import ImageColor
+    try:
+        return ImageColor.getrgb(color)[:3]
+    except ValueError:
+        return tuple(c // 256 for c in canvas.winfo_rgb(color))
@@ -0,0 +1,416 @@
+import gzip
+import json
+import time
+
+# Girdi oturumu kaydı ve zamanlamalı yeniden oynatma
+# ==================================================
+# Yapay ölçümler gerçek kullanımı yansıtmaz. InputRecorder, çizim
+# olaylarını (_start_draw, _draw, _end_draw), kısayol komutlarını ve araç /
+# renk / boyut / dolgu / arka plan / simetri değişikliklerini zaman damgasıyla
+# kaydeder. InputReplayer aynı girdileri uygulamaya özgün hızında ya da
+# olabildiğince hızlı geri verir ve her olayın gecikmesini ve kaçırılan
+# kare sayısını raporlar. Böylece kullanıcılardan alınan kayıtlar
+# performans hatalarına eklenip tekrar tekrar ölçülebilir.
+#
+# Dosya biçimi (gzip ile sıkıştırılmış, satır başına bir JSON):
+#   {"version": 1, "canvas": [genişlik, yükseklik], "state": {...}}
+#   [önceki olaydan beri geçen ms, tür, argümanlar...]
+#
+# Olay türleri:
+#   "press" / "drag" / "release" x y  -> fare olayları (tuval koordinatları)
+#   "undo", "redo", "clear", "deselect"
+#   "branch" adım, "selection" komut
+#   "state" {ad: değer}               -> araç, renk, boyut, dolgu türü ve
+#                                        ikinci rengi, arka plan rengi ve
+#                                        dolgusu, simetri
+
+FORMAT_VERSION = 1
+
+# Fare olayları: tür -> (uygulama metodu, Tk olay dizisi)
+POINTER_EVENTS = {
+    "press": ("_start_draw", "<ButtonPress-1>"),
+    "drag": ("_draw", "<B1-Motion>"),
+    "release": ("_end_draw", "<ButtonRelease-1>"),
+}
+# Komutlar: tür -> uygulama metodu
+COMMANDS = {
+    "undo": "_undo",
+    "redo": "_redo",
+    "branch": "_switch_branch",
+    "clear": "_clear_canvas",
+    "selection": "_run_selection_command",
+    "deselect": "_clear_selection",
+}
+
+# Kare kaçırma hesabında kullanılan ekran yenileme aralığı (saniye)
+FRAME_INTERVAL = 1 / 60
+# Kare izleyicinin tetiklenme aralığı (ms)
+_MONITOR_MS = 16
+
+
+def app_state(app):
+    """Uygulamanın kaydedilen ayarlarını (JSON'a yazılabilir) döndürür"""
+    _, background_fill = app._background_state()
+    return {
+        "tool": app._active_tool,
+        "color": app._settings.color,
+        "size": app._settings.brush_size,
+        "fill_kind": app._settings.fill_kind,
+        "fill_end": app._settings.fill_end_color,
+        "bg": app._settings.canvas_bg,
+        # Arka plan dolgusu proje dosyasındaki gibi liste olarak saklanır
+        "bg_fill": list(background_fill) if background_fill is not None else None,
+        "symmetry": app._symmetry_choice.get(),
+    }
+
+
+def apply_state(app, state):
+    """Kaydedilmiş ayarları uygulamaya, kullanıcının yapacağı gibi uygular"""
+    if "tool" in state:
+        app._select_tool(state["tool"])
+    if "color" in state:
+        app._quick_color_select(state["color"])
+    if "size" in state:
+        app._set_brush_size(state["size"])
+    if "fill_kind" in state:
+        from fills import FILL_KINDS
+        app._fill_var.set(FILL_KINDS[state["fill_kind"]])
+        app._settings.fill_kind = state["fill_kind"]
+    if "fill_end" in state:
+        app._settings.fill_end_color = state["fill_end"]
+        app._fill_end_btn.config(bg=state["fill_end"])
+    if "bg" in state:
+        app._change_canvas_bg(state["bg"])
+    if "bg_fill" in state:
+        from fills import Fill
+        before = app._background_state()
+        fill = Fill(*state["bg_fill"]) if state["bg_fill"] is not None else None
+        if app._set_background_fill(fill):
+            app._record_background_change(before)
+    if "symmetry" in state:
+        app._symmetry_choice.set(state["symmetry"])
+        app._set_symmetry(state["symmetry"])
+
+
+class InputRecording:
+    """Kaydedilmiş bir girdi oturumu: başlangıç bilgileri ve (zaman, tür, argümanlar) olayları"""
+    def __init__(self, canvas_size, state, events=None):
+        self.canvas_size = tuple(canvas_size)
+        self.state = dict(state)
+        # (oturum başından beri geçen saniye, tür, argümanlar)
+        self.events = events if events is not None else []
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def duration(self):
+        return self.events[-1][0] if self.events else 0.0
+
+    def save(self, path):
+        """Kaydı sıkıştırılmış olarak dosyaya yazar"""
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "version": FORMAT_VERSION,
+                "canvas": list(self.canvas_size),
+                "state": self.state,
+            }) + "\n")
+            previous = 0
+            for seconds, kind, args in self.events:
+                ms = round(seconds * 1000)
+                f.write(json.dumps([ms - previous, kind, *args], separators=(",", ":")) + "\n")
+                previous = ms
+
+    @classmethod
+    def load(cls, path):
+        """Dosyadan bir kaydı okur"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"desteklenmeyen kayıt sürümü: {header.get('version')}")
+            events = []
+            ms = 0
+            for line in f:
+                delta, kind, *args = json.loads(line)
+                ms += delta
+                events.append((ms / 1000, kind, tuple(args)))
+        return cls(header["canvas"], header["state"], events)
+
+
+class InputRecorder:
+    """
+    Uygulamaya ulaşan girdileri kaydeder.
+
+    Kayıt süresince uygulamanın olay işleyicileri kaydı yapan sarmalayıcılarla
+    değiştirilir; stop ile özgün işleyiciler geri konur. Ayar değişiklikleri
+    (renk diyaloğu, kaydırıcı, klavye dahil) bir sonraki girdiden hemen önce
+    "state" olayı olarak yazılır. Başka bir kaydedilen işleyicinin içinden
+    yapılan çağrılar (ör. geri almanın seçimi kaldırması) ayrıca kaydedilmez.
+    """
+    def __init__(self, app):
+        self._app = app
+        self._recording = None
+        self._started = None
+        self._state = None
+        self._depth = 0
+
+    @property
+    def recording(self):
+        return self._recording is not None
+
+    def start(self):
+        """Kaydı başlatır"""
+        app = self._app
+        canvas = app._canvas
+        self._state = app_state(app)
+        self._recording = InputRecording(
+            (canvas.winfo_width(), canvas.winfo_height()), self._state
+        )
+        self._started = time.perf_counter()
+        for kind, (method, sequence) in POINTER_EVENTS.items():
+            canvas.bind(sequence, self._wrap(method, kind, pointer=True))
+        for kind, method in COMMANDS.items():
+            self._wrap(method, kind)
+
+    def stop(self):
+        """Kaydı bitirir, işleyicileri geri koyar ve kaydı döndürür"""
+        app = self._app
+        self._note_state()
+        for method in [m for m, _ in POINTER_EVENTS.values()] + list(COMMANDS.values()):
+            app.__dict__.pop(method, None)
+        for method, sequence in POINTER_EVENTS.values():
+            app._canvas.bind(sequence, getattr(app, method))
+        recording, self._recording = self._recording, None
+        return recording
+
+    def _wrap(self, method, kind, pointer=False):
+        """Uygulama metodunu olayı kaydeden bir sarmalayıcıyla değiştirir"""
+        original = getattr(self._app, method)
+
+        def wrapper(*args):
+            if self._depth == 0 and self._recording is not None:
+                self._note(kind, (args[0].x, args[0].y) if pointer else args)
+            self._depth += 1
+            try:
+                return original(*args)
+            finally:
+                self._depth -= 1
+
+        setattr(self._app, method, wrapper)
+        return wrapper
+
+    def _note(self, kind, args):
+        self._note_state()
+        self._recording.events.append((time.perf_counter() - self._started, kind, tuple(args)))
+
+    def _note_state(self):
+        """Son kayıttan beri değişen ayarları bir "state" olayı olarak yazar"""
+        if self._recording is None:
+            return
+        state = app_state(self._app)
+        changed = {key: value for key, value in state.items() if self._state.get(key) != value}
+        if changed:
+            self._state = state
+            self._recording.events.append((time.perf_counter() - self._started, "state", (changed,)))
+
+
+class FrameMonitor:
+    """
+    Olay döngüsünün kare aralıklarını izler.
+
+    Her _MONITOR_MS'de bir tetiklenir; iki tetiklenme arasında birden fazla
+    ekran yenilemesi geçtiyse aradaki kareler kaçırılmış sayılır.
+    """
+    def __init__(self, root):
+        self._root = root
+        self._job = None
+        self._last = None
+        self.frames = 0
+        self.dropped = 0
+        self.longest = 0.0
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._job = self._root.after(_MONITOR_MS, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self._root.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        gap = now - self._last
+        self._last = now
+        self.frames += 1
+        self.dropped += max(0, int(gap / FRAME_INTERVAL) - 1)
+        self.longest = max(self.longest, gap)
+        self._job = self._root.after(_MONITOR_MS, self._tick)
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class InputReplayer:
+    """
+    Bir InputRecording'i uygulamaya geri verir ve gecikmeleri ölçer.
+
+    speed 1.0 özgün hız, 2.0 iki kat hızdır; None olayları beklemeden
+    arka arkaya (olabildiğince hızlı) oynatır. Fare olayları Tk olayı
+    olarak üretilir (event_generate), böylece gerçek bağlamalardan geçer;
+    tuval görünür değilse işleyiciler doğrudan çağrılır.
+
+    Bir olayın gecikmesi, zamanlı oynatmada olayın planlanan zamanından,
+    hızlı oynatmada işlenmeye başladığı andan ekran güncellemesi
+    (update_idletasks) bitene kadar geçen süredir.
+    """
+    def __init__(self, app, recording, speed=1.0, on_finished=None):
+        self._app = app
+        self._root = app._root
+        self._recording = recording
+        self._speed = speed
+        self._on_finished = on_finished
+        self._index = 0
+        self._started = None
+        self._job = None
+        self._monitor = FrameMonitor(self._root)
+        # (tür, gecikme saniye)
+        self.latencies = []
+
+    @property
+    def playing(self):
+        return self._started is not None and self._index < len(self._recording.events)
+
+    def start(self):
+        """Başlangıç ayarlarını uygular ve oynatmayı başlatır"""
+        apply_state(self._app, self._recording.state)
+        self._root.update_idletasks()
+        self._monitor.start()
+        self._started = time.perf_counter()
+        self._job = self._root.after_idle(self._step)
+
+    def stop(self):
+        """Oynatmayı yarıda keser"""
+        if self._job is not None:
+            self._root.after_cancel(self._job)
+            self._job = None
+        self._finish()
+
+    def _due(self, seconds):
+        return self._started + seconds / self._speed
+
+    def _step(self):
+        self._job = None
+        events = self._recording.events
+        if self._index >= len(events):
+            self._finish()
+            return
+        seconds, kind, args = events[self._index]
+        began = time.perf_counter()
+        if self._speed is not None:
+            wait = self._due(seconds) - began
+            if wait > 0.001:
+                self._job = self._root.after(int(wait * 1000), self._step)
+                return
+            began = min(began, self._due(seconds))
+        self._dispatch(kind, args)
+        self._root.update_idletasks()
+        self.latencies.append((kind, time.perf_counter() - began))
+        self._index += 1
+        self._job = self._root.after(0, self._step)
+
+    def _dispatch(self, kind, args):
+        app = self._app
+        if kind == "state":
+            apply_state(app, args[0])
+        elif kind in POINTER_EVENTS:
+            method, sequence = POINTER_EVENTS[kind]
+            x, y = args
+            if app._canvas.winfo_viewable():
+                app._canvas.event_generate(sequence, x=x, y=y, when="now")
+            else:
+                getattr(app, method)(_ReplayEvent(x, y))
+        elif kind in COMMANDS:
+            getattr(app, COMMANDS[kind])(*args)
+
+    def _finish(self):
+        self._monitor.stop()
+        if self._on_finished is not None:
+            on_finished, self._on_finished = self._on_finished, None
+            on_finished(self.report())
+
+    def report(self):
+        """Gecikme ve kare istatistiklerini sözlük olarak döndürür (süreler ms)"""
+        values = [latency * 1000 for _, latency in self.latencies]
+        by_kind = {}
+        for kind, latency in self.latencies:
+            by_kind.setdefault(kind, []).append(latency * 1000)
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            "events": len(self.latencies),
+            "elapsed_ms": elapsed * 1000,
+            "recorded_ms": self._recording.duration * 1000,
+            "mean_ms": sum(values) / len(values) if values else 0.0,
+            "p50_ms": _percentile(values, 0.5),
+            "p95_ms": _percentile(values, 0.95),
+            "max_ms": max(values, default=0.0),
+            "dropped_frames": self._monitor.dropped,
+            "longest_frame_ms": self._monitor.longest * 1000,
+            "by_kind": {
+                kind: {"count": len(v), "p95_ms": _percentile(v, 0.95), "max_ms": max(v)}
+                for kind, v in by_kind.items()
+            },
+            "canvas": [self._app._canvas.winfo_width(), self._app._canvas.winfo_height()],
+            "recorded_canvas": list(self._recording.canvas_size),
+        }
+
+
+class _ReplayEvent:
+    """İşleyicilere doğrudan verilen, yalnızca koordinat taşıyan olay"""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def main():
+    """Bir kaydı uygulamada oynatır ve raporu yazdırır"""
+    import argparse
+    import tkinter as tk
+    from paint_app import AdvancedPaintApp
+    parser = argparse.ArgumentParser(description="Girdi kaydını oynatıp gecikmeleri ölçer")
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="oynatma hızı (kat)")
+    parser.add_argument("--fast", action="store_true", help="olayları beklemeden oynat")
+    parser.add_argument("--json", action="store_true", help="raporu JSON olarak yazdır")
+    args = parser.parse_args()
+
+    recording = InputRecording.load(args.recording)
+    root = tk.Tk()
+    app = AdvancedPaintApp(root)
+
+    def finished(report):
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"{report['events']} olay, {report['elapsed_ms']:.0f} ms "
+                  f"(kayıt {report['recorded_ms']:.0f} ms)")
+            print(f"gecikme: ort {report['mean_ms']:.1f} ms, p50 {report['p50_ms']:.1f} ms, "
+                  f"p95 {report['p95_ms']:.1f} ms, en çok {report['max_ms']:.1f} ms")
+            print(f"kaçırılan kare: {report['dropped_frames']}, "
+                  f"en uzun kare {report['longest_frame_ms']:.1f} ms")
+            for kind, stats in sorted(report["by_kind"].items()):
+                print(f"  {kind:10s} {stats['count']:6d}  p95 {stats['p95_ms']:.1f} ms  "
+                      f"en çok {stats['max_ms']:.1f} ms")
+        root.destroy()
+
+    replayer = InputReplayer(app, recording, None if args.fast else args.speed, finished)
+    app._defer_until_first_frame(replayer.start)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import tkinter as tk
-from tkinter import colorchooser, messagebox, filedialog, ttk
-import json
-from PIL import Image, ImageGrab, ImageTk
+from tkinter import ttk
 import os
+import sys
+import time
 
-from drawing_tools import OvalBrush, SquareBrush, StarBrush, LineTool, CircleTool, EraserTool
-from settings import DrawingSettings, PaintHistory
+# PIL ve diyalog modülleri (colorchooser, messagebox, filedialog) açılışı
+# hızlandırmak için modül seviyesinde değil, ilk kullanıldıkları yerde içe aktarılır.
+from canvas_items import DOCUMENT_ITEMS, capture_items
+from drawing_tools import create_default_registry
+from flattening import ItemBudget
+from settings import BackgroundAction, DrawingSettings, PaintHistory
+from timelapse import OperationLog
 
 # İLKE 3: KALITIM (INHERITANCE)
 # ============================
@@ -24,6 +29,12 @@ class PaintApp:
     Kalıtım hiyerarşisinin üst sınıfıdır.
     """
     def __init__(self, root):
+        # Açılış süresi ölçümü (time-to-first-paint) için başlangıç zamanı
+        self._startup_started = time.perf_counter()
+        self.time_to_first_paint = None
+        self._first_frame_shown = False
+        self._deferred_tasks = []
+        
         self._root = root
         self._root.title("Sedef'in Paint Uygulaması")
         self._root.geometry("1080x1000")
@@ -42,10 +53,8 @@ class PaintApp:
             "error": "#F44336",  # Red
         }
         
-        # Uygulama simgesi için kaynak klasörü
-        self.icon_path = "icons"
-        if not os.path.exists(self.icon_path):
-            os.makedirs(self.icon_path)
+        # Uygulama simgesi için kaynak klasörü (ilk erişimde oluşturulur)
+        self._icon_path = "icons"
             
         # Font ayarları
         self.fonts = {
@@ -61,29 +70,78 @@ class PaintApp:
         # Ayarları başlat
         self._settings = DrawingSettings()
         
-        # Araç kutusunu oluştur
-        self._tools = {
-            "oval": OvalBrush(),
-            "square": SquareBrush(),
-            "star": StarBrush(),
-            "line": LineTool(),
-            "circle": CircleTool(),
-            "eraser": EraserTool()
-        }
+        # Araç kutusunu oluştur - araçlar ilk kullanımda yüklenir
+        self._tools = create_default_registry()
         self._active_tool = "oval"
         
+        # Simetri modu (kapalıyken None); simetri açıkken fırça noktaları
+        # biriktirilir ve kare başına bir kez çizilir
+        self._symmetry = None
+        self._symmetry_points = []
+        self._symmetry_job = None
+        
+        # Çalışan betik (yoksa None); betik bitene kadar elle çizim yapılmaz
+        self._script_runner = None
+        
         # Arayüz elemanlarını oluştur
         self._create_widgets()
         
-        # Geçmişi başlat
+        # Geçmişi başlat - boş tuval başlangıç durumu olarak hazır gelir,
+        # açılışta tuvali taramaya gerek yoktur
         self._history = PaintHistory(self._canvas)
-        self._history.save_state()
+        # Arka plan değişikliklerini geri alan işlemler durumu bu yolla uygular
+        BackgroundAction.register(self._canvas, self._apply_background_state)
+        
+        # Öğe sayısı bütçeyi aşınca en eski öğeler arka planda birleştirilir
+        self._item_budget = ItemBudget(
+            self._root,
+            self._canvas,
+            self._history,
+            limit=self._settings.item_budget,
+            on_status=lambda text: self._status_bar.config(text=text)
+        )
         
         # Çizim olaylarını bağla
         self._setup_drawing_events()
         
         # Kısayol tuşları tanımla
         self._setup_keyboard_shortcuts()
+        
+        # İlk kare ekrana geldiğinde ertelenmiş işleri başlat
+        self._map_binding = self._canvas.bind("<Map>", self._on_canvas_mapped, add="+")
+    
+    @property
+    def icon_path(self):
+        """Simge klasörünü ilk ihtiyaç duyulduğunda oluşturur"""
+        if not os.path.exists(self._icon_path):
+            os.makedirs(self._icon_path)
+        return self._icon_path
+    
+    def _on_canvas_mapped(self, event):
+        """Kanvas ilk kez görünür olduğunda ilk kare ölçümünü planlar"""
+        self._canvas.unbind("<Map>", self._map_binding)
+        # Boşta (idle) çalışan çizim işlemleri bittikten sonra ilk kare tamamlanmış olur
+        self._root.after_idle(self._on_first_frame)
+    
+    def _on_first_frame(self):
+        """İlk kare gösterildikten sonra süreyi kaydeder ve ertelenmiş işleri çalıştırır"""
+        self.time_to_first_paint = time.perf_counter() - self._startup_started
+        self._first_frame_shown = True
+        tasks, self._deferred_tasks = self._deferred_tasks, []
+        for task in tasks:
+            self._root.after_idle(task)
+    
+    def _defer_until_first_frame(self, task):
+        """
+        Bir işi ilk kare gösterilene kadar erteler.
+        
+        İkincil paneller gibi ilk görüntü için gerekli olmayan arayüz
+        parçaları bu yöntemle açılışın kritik yolundan çıkarılır.
+        """
+        if self._first_frame_shown:
+            self._root.after_idle(task)
+        else:
+            self._deferred_tasks.append(task)
     
     def _create_widgets(self):
         """Arayüz elemanlarını oluşturur"""
@@ -120,51 +178,14 @@ class PaintApp:
         tool_label.pack(pady=(15, 10))
         
         # Araç butonları
-        tools_frame = tk.Frame(left_panel, bg=self.theme["card_bg"], padx=10, pady=5)
-        tools_frame.pack(fill=tk.X)
+        self._tools_frame = tk.Frame(left_panel, bg=self.theme["card_bg"], padx=10, pady=5)
+        self._tools_frame.pack(fill=tk.X)
         
         self._tool_buttons = {}
         
-        # Araç emojileri
-        tool_icons = {
-            "oval": "🔵",
-            "square": "🟦",
-            "star": "⭐",
-            "line": "➖",
-            "circle": "⭕",
-            "eraser": "🧽"
-        }
-        
         # Her araç için grid yerleşimli butonlar oluştur
-        row, col = 0, 0
-        for tool_id, tool in self._tools.items():
-            btn_frame = tk.Frame(tools_frame, bg=self.theme["card_bg"])
-            btn_frame.grid(row=row, column=col, padx=5, pady=5)
-            
-            # Buton
-            btn = tk.Button(
-                btn_frame,
-                text=f"{tool_icons[tool_id]} {tool.name}",
-                width=12,
-                height=2,
-                bg=self.theme["primary_light"],
-                fg=self.theme["text"],
-                font=self.fonts["normal"],
-                relief="raised",
-                bd=0,
-                activebackground=self.theme["primary"],
-                activeforeground="white",
-                cursor="hand2",
-                command=lambda t=tool_id: self._select_tool(t)
-            )
-            btn.pack(fill=tk.X)
-            self._tool_buttons[tool_id] = btn
-            
-            # 2 sütun olacak şekilde yerleştir
-            col += 1
-            if col > 1:
-                col = 0
-                row += 1
+        for tool_id in self._tools:
+            self._add_tool_button(tool_id)
         
         # Araç butonlarını güncelle
         self._update_tool_buttons()
@@ -277,6 +298,34 @@ class PaintApp:
             )
             size_btn.pack(side=tk.LEFT, padx=2, expand=True)
         
+        # Simetri modu seçimi
+        symmetry_frame = tk.Frame(settings_frame, bg=self.theme["card_bg"])
+        symmetry_frame.pack(fill=tk.X, pady=5)
+        
+        tk.Label(
+            symmetry_frame,
+            text="Simetri:",
+            font=self.fonts["normal"],
+            bg=self.theme["card_bg"],
+            fg=self.theme["text"]
+        ).pack(side=tk.LEFT)
+        
+        # Mod adları burada yazılır; symmetry modülü (NumPy) ilk seçimde yüklenir
+        symmetry_modes = ["Kapalı"] + [
+            f"{kind} {n}" for kind in ("Döndürme", "Ayna") for n in (2, 4, 6, 8)
+        ]
+        self._symmetry_choice = ttk.Combobox(
+            symmetry_frame,
+            values=symmetry_modes,
+            state="readonly",
+            width=11
+        )
+        self._symmetry_choice.set("Kapalı")
+        self._symmetry_choice.bind(
+            "<<ComboboxSelected>>", lambda e: self._set_symmetry(self._symmetry_choice.get())
+        )
+        self._symmetry_choice.pack(side=tk.RIGHT)
+        
         # Dosya işlemleri
         file_frame = tk.LabelFrame(
             left_panel, 
@@ -301,7 +350,8 @@ class PaintApp:
             padx=5,
             pady=8,
             cursor="hand2",
-            command=self._clear_canvas
+            # Metot her tıklamada aranır; girdi kaydı işleyicileri sarmalayabilir
+            command=lambda: self._clear_canvas()
         )
         new_btn.pack(fill=tk.X, pady=3)
         
@@ -320,6 +370,21 @@ class PaintApp:
         )
         save_btn.pack(fill=tk.X, pady=3)
         
+        self._script_btn = tk.Button(
+            file_frame, 
+            text="📜 Betik Çalıştır", 
+            bg=self.theme["primary_light"],
+            fg=self.theme["text"],
+            font=self.fonts["normal"],
+            relief="flat",
+            bd=0,
+            padx=5,
+            pady=8,
+            cursor="hand2",
+            command=self._toggle_script
+        )
+        self._script_btn.pack(fill=tk.X, pady=3)
+        
         # Geçmiş işlemleri
         history_frame = tk.LabelFrame(
             left_panel, 
@@ -346,7 +411,7 @@ class PaintApp:
             padx=5,
             pady=8,
             cursor="hand2",
-            command=self._undo
+            command=lambda: self._undo()
         )
         undo_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 2))
         
@@ -361,14 +426,14 @@ class PaintApp:
             padx=5,
             pady=8,
             cursor="hand2",
-            command=self._redo
+            command=lambda: self._redo()
         )
         redo_btn.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=(2, 0))
         
         # Kısayollar bilgisi
         shortcuts_label = tk.Label(
             history_frame, 
-            text="Ctrl+Z: Geri Al\nCtrl+Y: İleri Al", 
+            text="Ctrl+Z: Geri Al\nCtrl+Y: İleri Al\nAlt+←/→: Dal Değiştir", 
             font=self.fonts["small"],
             bg=self.theme["card_bg"],
             fg=self.theme["text"],
@@ -483,17 +548,66 @@ class PaintApp:
         )
         credit_label.pack(side=tk.RIGHT)
     
+    # Araç emojileri
+    TOOL_ICONS = {
+        "oval": "🔵",
+        "square": "🟦",
+        "star": "⭐",
+        "line": "➖",
+        "circle": "⭕",
+        "eraser": "🧽",
+        "selection": "⬚",
+        "lasso": "➰",
+        "dynamic": "✒️",
+        "raster_oval": "🖌️",
+        "raster_square": "🖌️",
+        "raster_star": "🖌️",
+        "rectangle": "▭",
+        "ellipse": "⬭",
+        "polygon": "⬡",
+        "bezier": "〰️"
+    }
+    
+    def _add_tool_button(self, tool_id):
+        """Araç için bir buton ekler; butonlar 2 sütunlu bir ızgaraya yerleşir"""
+        row, col = divmod(len(self._tool_buttons), 2)
+        btn_frame = tk.Frame(self._tools_frame, bg=self.theme["card_bg"])
+        btn_frame.grid(row=row, column=col, padx=5, pady=5)
+        
+        # Resim damgalı fırçalar (stamp:<ad>) aynı simgeyi paylaşır
+        icon = "🖼️" if tool_id.startswith("stamp:") else self.TOOL_ICONS.get(tool_id, '🔧')
+        btn = tk.Button(
+            btn_frame,
+            text=f"{icon} {self._tools.name_of(tool_id)}",
+            width=12,
+            height=2,
+            bg=self.theme["primary_light"],
+            fg=self.theme["text"],
+            font=self.fonts["normal"],
+            relief="raised",
+            bd=0,
+            activebackground=self.theme["primary"],
+            activeforeground="white",
+            cursor="hand2",
+            command=lambda t=tool_id: self._select_tool(t)
+        )
+        btn.pack(fill=tk.X)
+        self._tool_buttons[tool_id] = btn
+    
     def _setup_drawing_events(self):
         """Çizim olaylarını bağlar"""
         self._canvas.bind("<ButtonPress-1>", self._start_draw)
         self._canvas.bind("<B1-Motion>", self._draw)
         self._canvas.bind("<ButtonRelease-1>", self._end_draw)
         self._canvas.bind("<Motion>", self._update_status_bar)
+        self._canvas.bind("<Configure>", lambda e: self._update_symmetry_guides(), add="+")
     
     def _setup_keyboard_shortcuts(self):
         """Klavye kısayollarını ayarlar"""
         self._root.bind("<Control-z>", lambda e: self._undo())
         self._root.bind("<Control-y>", lambda e: self._redo())
+        self._root.bind("<Alt-Left>", lambda e: self._switch_branch(-1))
+        self._root.bind("<Alt-Right>", lambda e: self._switch_branch(1))
         self._root.bind("<Control-s>", lambda e: self._save_drawing())
         self._root.bind("<Control-n>", lambda e: self._clear_canvas())
         
@@ -504,6 +618,14 @@ class PaintApp:
         self._root.bind("4", lambda e: self._select_tool("line"))
         self._root.bind("5", lambda e: self._select_tool("circle"))
         self._root.bind("6", lambda e: self._select_tool("eraser"))
+        self._root.bind("7", lambda e: self._select_tool("selection"))
+        self._root.bind("8", lambda e: self._select_tool("lasso"))
+        self._root.bind("9", lambda e: self._select_tool("dynamic"))
+        
+        # Seçim kısayolları
+        self._root.bind("<Delete>", lambda e: self._run_selection_command("delete_selection"))
+        self._root.bind("<Control-d>", lambda e: self._run_selection_command("duplicate_selection"))
+        self._root.bind("<Escape>", lambda e: self._clear_selection())
         
         # Fırça boyutu kısayolları
         self._root.bind("+", lambda e: self._increase_brush_size())
@@ -512,6 +634,18 @@ class PaintApp:
     def _select_tool(self, tool_id):
         """Seçili aracı değiştirir"""
         if tool_id in self._tools:
+            try:
+                # İsteğe bağlı bağımlılığı olan araçlar ilk seçimde yüklenir
+                self._tools[tool_id]
+            except ImportError as e:
+                self._status_bar.config(text=f"Bu araç yüklenemedi: {e.name} kütüphanesi gerekli")
+                return
+            self._clear_selection()
+            if self._tools.is_loaded(self._active_tool):
+                # Yarım kalan şekil (ör. Bézier'in ilk hareketi) atılır
+                previous = self._tools[self._active_tool]
+                if hasattr(previous, 'cancel'):
+                    previous.cancel(self._canvas)
             self._active_tool = tool_id
             self._update_tool_buttons()
             self._canvas_info.config(text=f"Aktif Araç: {self._tools[tool_id].name}")
@@ -534,6 +668,7 @@ class PaintApp:
     
     def _choose_color(self):
         """Renk seçimi diyalogunu gösterir"""
+        from tkinter import colorchooser
         color = colorchooser.askcolor(initialcolor=self._settings.color)[1]
         if color:
             self._settings.color = color
@@ -574,109 +709,366 @@ class PaintApp:
     
     def _clear_canvas(self):
         """Kanvası temizler"""
+        if self._script_busy():
+            return
+        from tkinter import messagebox
         if messagebox.askyesno(
             "Temizle", 
             "Tüm çizim silinecek. Emin misiniz?",
             icon="question"
         ):
-            self._canvas.delete("all")
-            self._history.save_state()
+            self._canvas.delete(DOCUMENT_ITEMS)
+            raster = self._clear_raster_layer()
+            self._item_budget.invalidate()
+            # Öğeler ve raster katmanı tek adımda geri alınır
+            self._history.save_state(*raster)
+    
+    def _clear_raster_layer(self):
+        """
+        Raster fırçaların katmanı kullanıldıysa onu da temizler.
+        
+        Geçmişe yazılacak geri alma işlemlerini (en fazla bir tane) döndürür.
+        """
+        # Raster modülü yalnızca bir raster fırça kullanıldıysa ya da raster
+        # döşemeli bir proje açıldıysa içe aktarılmıştır
+        if "raster_brush" in sys.modules:
+            from raster_brush import RasterLayer
+            layer = RasterLayer.existing(self._canvas)
+            action = layer.clear() if layer is not None else None
+            if action is not None:
+                return [action]
+        return []
+    
+    def _toggle_script(self):
+        """Bir betik dosyası seçip çalıştırır ya da çalışan betiği durdurur"""
+        if self._script_runner is not None:
+            self._script_runner.cancel()
+            return
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Çizim betiği", "*.paint *.txt"),
+                ("Tüm dosyalar", "*.*")
+            ]
+        )
+        if file_path:
+            self.run_script(file_path)
+    
+    def run_script(self, file_path):
+        """
+        Betik dosyasını arayüzü bloklamadan çalıştırır.
+        
+        Betiğin eklediği tüm öğeler geçmişte tek bir adımdır.
+        """
+        from scripting import ScriptFile, ScriptRunner
+        if self._script_runner is not None:
+            return
+        settings = DrawingSettings()
+        settings.color = self._settings.color
+        settings.brush_size = self._settings.brush_size
+        settings.canvas_bg = self._settings.canvas_bg
+        self._script_runner = ScriptRunner(
+            self._root,
+            self._canvas,
+            self._tools,
+            self._history,
+            ScriptFile(file_path),
+            settings=settings,
+            on_background=self._set_canvas_bg,
+            background_state=self._background_state,
+            on_items=self._on_items_created,
+            on_progress=self._on_script_progress,
+            on_finish=self._on_script_finished
+        )
+        self._clear_selection()
+        self._script_btn.config(text="⏹ Betiği Durdur")
+        self._script_runner.start()
+    
+    def _on_script_progress(self, runner):
+        fraction = runner.fraction
+        percent = f" (%{int(fraction * 100)})" if fraction is not None else ""
+        self._status_bar.config(text=f"Betik çalışıyor: {runner.executed} komut{percent}")
+    
+    def _on_script_finished(self, runner, error):
+        self._script_runner = None
+        self._script_btn.config(text="📜 Betik Çalıştır")
+        # Eklenen öğeler geçmişe yazıldı; çizgi tamamlanmış gibi bildirilir.
+        # Kayıtlar betikte zaten hazır olduğu için öğeler yeniden okunmaz.
+        self._on_stroke_committed(runner.records)
+        elapsed = time.perf_counter() - runner.started
+        if error is not None:
+            self._status_bar.config(text=f"Betik hatası ({error}) - {runner.executed} komut çalıştı")
+        else:
+            self._status_bar.config(text=f"Betik bitti: {runner.executed} komut, {elapsed:.1f} sn")
+    
+    def _script_busy(self):
+        """Betik çalışırken tuvali değiştiren işlemler engellenir"""
+        if self._script_runner is not None:
+            self._status_bar.config(text="Betik çalışıyor - durdurmak için 'Betiği Durdur'")
+            return True
+        return False
+    
+    def _canvas_busy(self):
+        """_script_busy gibi, ama durum çubuğuna yazmaz (fare hareketlerinde sorulur)"""
+        return self._script_runner is not None
     
     def _start_draw(self, event):
         """Çizim başlangıcını işler"""
+        if self._script_busy():
+            return
         tool = self._tools[self._active_tool]
         
+        # Seçim araçları öğeleri sürüklerken taşır; süren bir birleştirme
+        # taşınan öğelerin eski konumlarıyla bitmemelidir
+        if hasattr(tool, 'clear_selection'):
+            self._item_budget.cancel()
+        
+        # Kapalı şekil araçları seçili dolguyu kullanır
+        if hasattr(tool, 'fill'):
+            tool.fill = self._settings.fill
+        
         # Çizgi veya daire gibi araçlar için başlangıç noktasını kaydet
         if hasattr(tool, 'start'):
             tool.start(self._canvas, event.x, event.y)
     
     def _draw(self, event):
         """Çizim hareketini işler"""
+        if self._canvas_busy():
+            return
         tool = self._tools[self._active_tool]
         
         # Çizgi veya daire gibi araçlar için önizleme
         if hasattr(tool, 'drag'):
+            if hasattr(tool, 'clear_selection'):
+                self._item_budget.cancel()
             tool.drag(self._canvas, event.x, event.y, self._settings.color)
+        elif self._symmetry is not None and not hasattr(tool, 'start'):
+            # Simetri açıkken noktalar biriktirilir, karede bir kez çizilir
+            self._symmetry_points.append((event.x, event.y))
+            if self._symmetry_job is None:
+                self._symmetry_job = self._root.after(16, self._flush_symmetry)
         else:
             # Normal fırça araçları için
-            tool.draw(
+            item = tool.draw(
                 self._canvas, 
                 event.x, 
                 event.y, 
                 self._settings.brush_size, 
                 self._settings.color
             )
+            if isinstance(item, list):
+                # Damga fırçaları bir harekette birden fazla öğe oluşturabilir
+                if item:
+                    self._on_items_created(item)
+            elif item:
+                self._on_items_created([item])
         
         # Durum çubuğunu güncelle
         self._status_bar.config(text=f"Çizim: ({event.x}, {event.y}) - Araç: {self._tools[self._active_tool].name}")
     
     def _end_draw(self, event):
         """Çizim bitişini işler ve geçmişe kaydeder"""
+        if self._canvas_busy():
+            return
         tool = self._tools[self._active_tool]
         
+        # Bekleyen simetri noktaları çizgi kaydedilmeden önce çizilir
+        if self._symmetry_job is not None:
+            self._root.after_cancel(self._symmetry_job)
+            self._flush_symmetry()
+        
         # Eğer araçta 'end' metodu varsa (örneğin çizgi, daire gibi araçlar)
         if hasattr(tool, 'end'):
-            tool.end(
+            item = tool.end(
                 self._canvas, 
                 event.x, 
                 event.y, 
                 self._settings.brush_size, 
                 self._settings.color
             )
+            if isinstance(item, list):
+                # Dolgulu şekiller: dolgu görüntüsü ve kenar çizgisi
+                self._on_items_created(item + self._mirror_filled_shape(tool.fill, item[-1]))
+            elif item:
+                self._on_items_created([item] + self._mirror_item(item))
+            elif getattr(tool, 'pending', False):
+                # Birden fazla hareketle çizilen şekil henüz tamamlanmadı
+                return
+        
+        # Fark tabanlı geçmiş işlemi üreten araçlar (örneğin seçim taşıma)
+        # için tüm tuvalin kopyası alınmaz
+        if hasattr(tool, 'take_history_action'):
+            action = tool.take_history_action()
+            if action is not None:
+                self._history.push_action(action)
+                if hasattr(tool, 'clear_selection'):
+                    # Seçim araçları mevcut öğeleri değiştirir
+                    self._item_budget.invalidate()
+            return
         
         # Her çizim işleminden sonra mevcut durumu kaydet
         self._history.save_state()
+        self._on_stroke_committed()
+    
+    def _set_symmetry(self, mode):
+        """Simetri modunu değiştirir ("Kapalı" simetriyi kapatır)"""
+        try:
+            from symmetry import GUIDE_TAG, SYMMETRY_MODES, Symmetry
+        except ImportError as e:
+            self._status_bar.config(text=f"Simetri kullanılamıyor: {e.name} kütüphanesi gerekli")
+            self._symmetry_choice.set("Kapalı")
+            return
+        self._canvas.delete(GUIDE_TAG)
+        mode = SYMMETRY_MODES.get(mode)
+        self._symmetry = Symmetry(*mode) if mode else None
+        self._update_symmetry_guides()
+    
+    def _symmetry_center(self):
+        return (self._canvas.winfo_width() / 2, self._canvas.winfo_height() / 2)
+    
+    def _update_symmetry_guides(self):
+        """Simetri eksenlerini tuvalin (yeni) merkezine göre çizer"""
+        if self._symmetry is not None:
+            self._symmetry.draw_guides(self._canvas, self._symmetry_center())
+    
+    def _flush_symmetry(self):
+        """
+        Biriken noktaları tek seferde dönüştürür ve tüm kopyaları çizer.
+        
+        Araç, öğeleri kayıt olarak toplayan bir kanvasla çağrılır; öğeler
+        sonra tek bir kanvas çağrısıyla oluşturulur.
+        """
+        from canvas_items import RecordingCanvas, create_items
+        self._symmetry_job = None
+        points, self._symmetry_points = self._symmetry_points, []
+        if not points or self._symmetry is None:
+            return
+        tool = self._tools[self._active_tool]
+        recorder = RecordingCanvas(self._canvas)
+        for x, y in self._symmetry.transform(points, self._symmetry_center()):
+            tool.draw(recorder, x, y, self._settings.brush_size, self._settings.color)
+        item_ids = create_items(self._canvas, recorder.records)
+        if item_ids:
+            self._on_items_created(item_ids)
+    
+    def _mirror_item(self, item):
+        """Simetri açıksa tamamlanan öğenin kopyalarını oluşturur ve kimliklerini döndürür"""
+        if self._symmetry is None:
+            return []
+        from canvas_items import capture_item, create_items
+        copies = self._symmetry.transform_record(
+            capture_item(self._canvas, item), self._symmetry_center()
+        )
+        return create_items(self._canvas, copies)
+    
+    def _mirror_filled_shape(self, fill, outline_item):
+        """Simetri açıksa dolgulu şeklin kopyalarını dolgularıyla birlikte oluşturur"""
+        if self._symmetry is None:
+            return []
+        from canvas_items import capture_item, create_items
+        from fills import refill_records
+        copies = self._symmetry.transform_record(
+            capture_item(self._canvas, outline_item), self._symmetry_center()
+        )
+        return create_items(self._canvas, [
+            record for copy in copies for record in refill_records(fill, copy)
+        ])
+    
+    def _run_selection_command(self, command):
+        """Etkin seçim aracında bir komut çalıştırır ve geçmişe tek adım olarak ekler"""
+        if self._script_busy():
+            return
+        tool = self._tools[self._active_tool]
+        if hasattr(tool, command):
+            action = getattr(tool, command)(self._canvas)
+            if action is not None:
+                self._history.push_action(action)
+                self._item_budget.invalidate()
+    
+    def _clear_selection(self):
+        """Etkin araçta bir seçim varsa kaldırır"""
+        if self._tools.is_loaded(self._active_tool):
+            tool = self._tools[self._active_tool]
+            if hasattr(tool, 'clear_selection'):
+                tool.clear_selection(self._canvas)
+    
+    def _on_items_created(self, item_ids):
+        """
+        Çizim sırasında yeni öğeler oluşturulduğunda çağrılır.
+        
+        Temel sınıfta yalnızca öğe sayacını günceller; alt sınıflar (örneğin
+        ortak çizim) bu kancayı genişleterek öğeleri izleyebilir.
+        """
+        self._item_budget.add(len(item_ids))
+    
+    def _on_stroke_committed(self, records=None):
+        """
+        Bir çizim işlemi tamamlanıp geçmişe kaydedildiğinde çağrılır.
+        
+        records, eklenen öğelerin kayıtları önceden biliniyorsa verilir.
+        """
+        # Bütçe yalnızca çizgi bitince kontrol edilir, çizim sırasında değil
+        self._item_budget.check()
     
     def _undo(self):
         """Geri al işlemini gerçekleştirir"""
+        if self._script_busy():
+            return
+        self._clear_selection()
         self._history.undo()
+        self._item_budget.invalidate()
         self._status_bar.config(text="Son işlem geri alındı")
     
     def _redo(self):
         """İleri al işlemini gerçekleştirir"""
+        if self._script_busy():
+            return
+        self._clear_selection()
         self._history.redo()
+        self._item_budget.invalidate()
         self._status_bar.config(text="Son işlem tekrar uygulandı")
     
+    def _switch_branch(self, step):
+        """Geri aldıktan sonra çizimle açılmış alternatif dallar arasında geçiş yapar"""
+        if self._script_busy():
+            return
+        self._clear_selection()
+        branch = self._history.switch_branch(step)
+        if branch is None:
+            self._status_bar.config(text="Geçilecek başka bir dal yok")
+            return
+        self._item_budget.invalidate()
+        self._status_bar.config(text=f"Dal {branch[0]}/{branch[1]}")
+    
     def _save_drawing(self):
         """Çizimi dosyaya kaydeder - PhotoImage kullanarak doğrudan kaydeder"""
+        from tkinter import filedialog, messagebox
         file_path = filedialog.asksaveasfilename(
             defaultextension=".png",
-            filetypes=[("PNG Dosyaları", "*.png"), ("Tüm Dosyalar", "*.*")]
+            filetypes=[
+                ("PNG Dosyaları", "*.png"),
+                ("SVG Dosyaları", "*.svg"),
+                ("PDF Dosyaları", "*.pdf"),
+                ("Tüm Dosyalar", "*.*")
+            ]
         )
-        if file_path:
+        if file_path and file_path.lower().endswith((".svg", ".pdf")):
+            # Vektör biçimleri ekran görüntüsü gerektirmez
+            self._export_vector(file_path)
+        elif file_path:
+            if not self._ask_png_options():
+                return
             try:
-                # Canvas'ı widget olarak al ve sınırlarını belirle
-                x = self._canvas.winfo_rootx()
-                y = self._canvas.winfo_rooty()
-                width = self._canvas.winfo_width()
-                height = self._canvas.winfo_height()
-                
-                # Ekran görüntüsü alma yöntemini kullan
-                try:
-                    # PIL kullan
-                    # Ekran görüntüsü al
-                    img = ImageGrab.grab(bbox=(x, y, x+width, y+height))
-                    img.save(file_path)
-                    messagebox.showinfo(
-                        "Kaydedildi", 
-                        "Çizim başarıyla kaydedildi!",
-                        icon="info"
-                    )
-                    self._status_bar.config(text=f"Çizim kaydedildi: {file_path}")
-                except ImportError:
-                    messagebox.showerror(
-                        "Hata", 
-                        "PIL kütüphanesi bulunamadı. Lütfen 'pip install pillow' komutunu çalıştırın.",
-                        icon="error"
-                    )
-                except Exception as e:
-                    # PIL hata verirse alternatif yöntemi dene
-                    messagebox.showerror(
-                        "Hata", 
-                        f"PIL ile kaydetme başarısız: {str(e)}\nPostscript yöntemi deneniyor...",
-                        icon="error"
-                    )
-                    self._save_as_postscript(file_path)
+                # Görüntü ekran görüntüsü yerine öğe kayıtlarından çizilir;
+                # PIL ilk kayıtta yüklenir
+                self._export_png(file_path)
+            except ImportError:
+                messagebox.showerror(
+                    "Hata", 
+                    "PIL kütüphanesi bulunamadı. Lütfen 'pip install pillow' komutunu çalıştırın.\nPostscript yöntemi deneniyor...",
+                    icon="error"
+                )
+                self._save_as_postscript(file_path)
             except Exception as e:
                 messagebox.showerror(
                     "Hata", 
@@ -684,8 +1076,110 @@ class PaintApp:
                     icon="error"
                 )
 
+    def _export_png(self, file_path):
+        """Çizimi seçili PNG seçenekleriyle kaydeder; kodlama süresini bildirir"""
+        from png_export import render_canvas, save_png
+        image = render_canvas(self._canvas, self._settings.canvas_bg, self._background_image())
+        info = save_png(
+            image, file_path,
+            compress_level=self._settings.png_compress_level,
+            strategy=self._settings.png_strategy,
+            use_palette=self._settings.png_palette
+        )
+        kind = f"{info['colors']} renkli paletli" if info["mode"] == "P" else "RGB"
+        self._status_bar.config(
+            text=f"Çizim kaydedildi ({kind} PNG, {info['bytes'] // 1024} KB, "
+                 f"{info['seconds'] * 1000:.0f} ms): {file_path}"
+        )
+
+    def _background_image(self):
+        """Düz renk yerine arka planda kullanılacak görüntü (yoksa None)"""
+        return None
+    
+    def _ask_png_options(self):
+        """
+        PNG sıkıştırma seçeneklerini soran kalıcı (modal) pencereyi gösterir.
+        
+        Seçimler ayarlara yazılır ve sonraki kayıtlarda varsayılan olur.
+        Kullanıcı vazgeçerse False döndürür.
+        """
+        from png_export import PNG_STRATEGIES
+        dialog = tk.Toplevel(self._root)
+        dialog.title("PNG Seçenekleri")
+        dialog.resizable(False, False)
+        dialog.transient(self._root)
+        
+        palette = tk.BooleanVar(value=self._settings.png_palette)
+        tk.Checkbutton(
+            dialog, text="Az renkli çizimleri paletli kaydet (≤256 renk, kayıpsız)",
+            variable=palette
+        ).grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 4))
+        
+        tk.Label(dialog, text="Sıkıştırma düzeyi:").grid(row=1, column=0, sticky="w", padx=10)
+        level = tk.IntVar(value=self._settings.png_compress_level)
+        tk.Scale(
+            dialog, from_=0, to=9, orient=tk.HORIZONTAL, variable=level
+        ).grid(row=1, column=1, sticky="we", padx=10)
+        
+        tk.Label(dialog, text="Strateji:").grid(row=2, column=0, sticky="w", padx=10)
+        names = list(PNG_STRATEGIES)
+        current = next(
+            (name for name, value in PNG_STRATEGIES.items() if value == self._settings.png_strategy),
+            names[0]
+        )
+        strategy = ttk.Combobox(dialog, values=names, state="readonly", width=18)
+        strategy.set(current)
+        strategy.grid(row=2, column=1, sticky="we", padx=10, pady=4)
+        
+        accepted = tk.BooleanVar(value=False)
+        
+        def accept():
+            self._settings.png_palette = palette.get()
+            self._settings.png_compress_level = level.get()
+            self._settings.png_strategy = PNG_STRATEGIES[strategy.get()]
+            accepted.set(True)
+            dialog.destroy()
+        
+        buttons = tk.Frame(dialog)
+        buttons.grid(row=3, column=0, columnspan=2, pady=10)
+        tk.Button(buttons, text="Kaydet", width=10, command=accept).pack(side=tk.LEFT, padx=4)
+        tk.Button(buttons, text="Vazgeç", width=10, command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+        dialog.bind("<Return>", lambda e: accept())
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        
+        dialog.grab_set()
+        self._root.wait_window(dialog)
+        return accepted.get()
+
+    def _export_vector(self, file_path):
+        """Çizimi öğe öğe akıtarak SVG ya da PDF olarak kaydeder"""
+        from png_export import raster_layer_tiles
+        from vector_export import export_vector, iter_canvas_records, with_raster_tiles
+        started = time.perf_counter()
+        # Raster döşemeleri öğelerin arasına görüntü olarak gömülür
+        records, images = with_raster_tiles(
+            iter_canvas_records(self._canvas),
+            raster_layer_tiles(self._canvas, len(self._canvas.find_withtag(DOCUMENT_ITEMS)))
+        )
+        try:
+            export_vector(
+                records,
+                file_path,
+                self._canvas.winfo_width(),
+                self._canvas.winfo_height(),
+                self._settings.canvas_bg,
+                images,
+                self._background_image()
+            )
+        except OSError as e:
+            self._status_bar.config(text=f"Vektör olarak kaydetme başarısız: {e}")
+            return
+        elapsed = time.perf_counter() - started
+        self._status_bar.config(text=f"Çizim kaydedildi ({elapsed:.1f} sn): {file_path}")
+    
     def _save_as_postscript(self, file_path):
         """Çizimi postscript olarak kaydeder"""
+        from tkinter import messagebox
         ps_file = file_path.replace(".png", ".ps")
         if not ps_file.endswith(".ps"):
             ps_file += ".ps"
@@ -710,10 +1204,30 @@ class PaintApp:
         self._status_bar.config(text=f"Fare: ({event.x}, {event.y}) - Araç: {self._tools[self._active_tool].name}")
     
     def _change_canvas_bg(self, color):
-        """Kanvas arka planını değiştirir"""
+        """Kanvas arka planını değiştirir; değişiklik geri alınabilir"""
+        before = self._background_state()
+        self._set_canvas_bg(color)
+        self._record_background_change(before)
+    
+    def _record_background_change(self, before):
+        """Arka plan durumu before'dan farklıysa geçmişe bir adım ekler"""
+        after = self._background_state()
+        if after != before:
+            self._history.push_action(BackgroundAction(before, after))
+    
+    def _set_canvas_bg(self, color):
+        """Kanvas arka plan rengini geçmişe yazmadan uygular"""
         self._settings.canvas_bg = color
         self._canvas.config(bg=self._settings.canvas_bg)
         self._status_bar.config(text=f"Arka plan rengi değiştirildi: {color}")
+    
+    def _background_state(self):
+        """Geri alınabilir arka plan durumu; temel uygulamada yalnızca renk"""
+        return self._settings.canvas_bg
+    
+    def _apply_background_state(self, state):
+        """_background_state ile alınmış durumu geçmişe yazmadan uygular"""
+        self._set_canvas_bg(state)
 
 class AdvancedPaintApp(PaintApp):
     """Gelişmiş Paint uygulaması sınıfı"""
@@ -729,11 +1243,69 @@ class AdvancedPaintApp(PaintApp):
         self._default_font = ("Segoe UI", 10)
         self._root.option_add("*Font", self._default_font)
         
-        # Ek araçlar ekle
-        self._add_advanced_features()
+        # Hakkında penceresi ilk kareden sonra gizli olarak hazırlanır
+        self._about_window = None
+        
+        # Ortak çizim (isteğe bağlı) - sunucu ve oturum
+        self._relay_server = None
+        self._collab_session = None
+        
+        # Zaman atlamalı kayıt - tamamlanan işlemlerin günlüğü
+        self._stroke_items = []
+        self._operation_log = OperationLog(self._settings.canvas_bg)
+        self._timelapse_player = None
+        self._timelapse_state = []
+        self._timelapse_bg = self._settings.canvas_bg
+        self._export_progress = None
+        self._export_started = None
+        
+        # Üzerinden çizim yapılacak referans resmi (isteğe bağlı)
+        self._reference_layer = None
+        
+        # Son belgeler listesi ve paneli ilk kullanımda yüklenir
+        self._recent_documents = None
+        self._recent_panel = None
+        
+        # Paylaşılan bellek kare çıkışı (isteğe bağlı)
+        self._frame_publisher = None
+        
+        # İkincil görünümler ilk kullanımda oluşturulur
+        self._view_manager = None
+        
+        # Arka planda yüklenen proje dosyası (varsa)
+        self._project_loader = None
+        
+        # Geçişli ya da desenli arka plan ilk kullanımda oluşturulur
+        self._background_fill = None
+        
+        # Sekmeler tek kanvası ve geçmişi paylaşır; etkin olmayanlar askıdadır
+        import atexit
+        from document_tabs import DocumentTabs
+        self._tabs = DocumentTabs(
+            self._canvas,
+            self._history,
+            self._background_state,
+            self._apply_background_state,
+            on_switch=self._on_tab_switched
+        )
+        self._tab_bar = None
+        atexit.register(self._tabs.close_all)
+        
+        # Ek araçlar ilk kare gösterildikten sonra eklenir
+        self._defer_until_first_frame(self._add_advanced_features)
+        self._defer_until_first_frame(self._build_about_window)
         
     def _add_advanced_features(self):
         """Gelişmiş özellikler ekler"""
+        from document_tabs import TabBar
+        self._tab_bar = TabBar(
+            self._canvas.master, self._tabs, self._switch_tab, self._close_tab, self._new_tab,
+            before=self._canvas
+        )
+        self._root.bind("<Control-t>", lambda e: self._new_tab())
+        self._root.bind("<Control-w>", lambda e: self._close_tab(self._tabs.active))
+        self._root.bind("<Control-Tab>", lambda e: self._switch_tab((self._tabs.active + 1) % len(self._tabs)))
+        
         # Ana çerçeve - tüm ek özellikleri içerecek
         advanced_frame = tk.Frame(self._root, bg="#f0f0f0", pady=8, padx=10)
         advanced_frame.pack(side=tk.BOTTOM, fill=tk.X, before=self._status_bar)
@@ -784,6 +1356,51 @@ class AdvancedPaintApp(PaintApp):
         )
         custom_bg_btn.pack(side=tk.LEFT, padx=4, pady=2)
         
+        # Şekil ve arka plan dolgusu
+        fill_frame = tk.LabelFrame(
+            advanced_frame, 
+            text="Dolgu", 
+            padx=8, 
+            pady=8, 
+            bg="#e8e8e8",
+            font=("Segoe UI", 9, "bold"),
+            relief=tk.GROOVE
+        )
+        fill_frame.pack(side=tk.LEFT, padx=10, pady=5)
+        
+        from fills import FILL_KINDS
+        self._fill_names = {name: kind for kind, name in FILL_KINDS.items()}
+        self._fill_var = tk.StringVar(value=FILL_KINDS[self._settings.fill_kind])
+        fill_menu = tk.OptionMenu(
+            fill_frame, self._fill_var, *self._fill_names,
+            command=lambda name: setattr(self._settings, "fill_kind", self._fill_names[name])
+        )
+        fill_menu.config(width=9, cursor="hand2")
+        fill_menu.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        self._fill_end_btn = tk.Button(
+            fill_frame,
+            text="2. Renk",
+            bg=self._settings.fill_end_color,
+            command=self._choose_fill_end_color,
+            width=8,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        self._fill_end_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        fill_bg_btn = tk.Button(
+            fill_frame,
+            text="Arka Plana",
+            command=self._apply_fill_to_background,
+            width=9,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        fill_bg_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
         # Ekstra özellikler bölümü
         extra_frame = tk.LabelFrame(
             advanced_frame, 
@@ -800,7 +1417,7 @@ class AdvancedPaintApp(PaintApp):
         clear_btn = tk.Button(
             extra_frame,
             text="Temizle",
-            command=self._clear_canvas,
+            command=lambda: self._clear_canvas(),
             width=10,
             bg="#ff9999",
             relief=tk.RAISED,
@@ -822,6 +1439,165 @@ class AdvancedPaintApp(PaintApp):
         )
         save_btn.pack(side=tk.LEFT, padx=4, pady=2)
         
+        # Referans resmi içe aktarma
+        import_btn = tk.Button(
+            extra_frame,
+            text="Resim Aktar",
+            command=self._import_reference_image,
+            width=10,
+            bg="#ccffcc",
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        import_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        remove_ref_btn = tk.Button(
+            extra_frame,
+            text="Resmi Kaldır",
+            command=self._remove_reference_image,
+            width=10,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        remove_ref_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        recent_btn = tk.Button(
+            extra_frame,
+            text="Son Belgeler",
+            command=self._show_recent_documents,
+            width=11,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        recent_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        brush_tip_btn = tk.Button(
+            extra_frame,
+            text="Fırça Ucu",
+            command=self._import_brush_tip,
+            width=10,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        brush_tip_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        # Tuvali paylaşılan bellek üzerinden başka süreçlere yayınlar
+        self._frame_output_btn = tk.Button(
+            extra_frame,
+            text="Canlı Yayın",
+            command=self._toggle_frame_output,
+            width=10,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        self._frame_output_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        new_view_btn = tk.Button(
+            extra_frame,
+            text="Yeni Görünüm",
+            command=self._open_secondary_view,
+            width=12,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        new_view_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        open_project_btn = tk.Button(
+            extra_frame,
+            text="Proje Aç",
+            command=self._open_project,
+            width=10,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        open_project_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        # Ortak çizim bölümü
+        collab_frame = tk.LabelFrame(
+            advanced_frame, 
+            text="Ortak Çizim", 
+            padx=8, 
+            pady=8, 
+            bg="#e8e8e8",
+            font=("Segoe UI", 9, "bold"),
+            relief=tk.GROOVE
+        )
+        collab_frame.pack(side=tk.LEFT, padx=10, pady=5)
+        
+        host_btn = tk.Button(
+            collab_frame,
+            text="Sunucu Başlat",
+            command=self._start_relay_server,
+            width=12,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        host_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        self._collab_btn = tk.Button(
+            collab_frame,
+            text="Bağlan",
+            command=self._toggle_collaboration,
+            width=10,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        self._collab_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        # Zaman atlamalı oynatma ve dışa aktarma bölümü
+        timelapse_frame = tk.LabelFrame(
+            advanced_frame, 
+            text="Zaman Atlamalı", 
+            padx=8, 
+            pady=8, 
+            bg="#e8e8e8",
+            font=("Segoe UI", 9, "bold"),
+            relief=tk.GROOVE
+        )
+        timelapse_frame.pack(side=tk.LEFT, padx=10, pady=5)
+        
+        self._timelapse_btn = tk.Button(
+            timelapse_frame,
+            text="▶ Oynat",
+            command=self._toggle_timelapse,
+            width=8,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        self._timelapse_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
+        # Oynatma hızı (kat)
+        self._timelapse_speed = tk.Spinbox(
+            timelapse_frame,
+            values=("1", "2", "4", "8", "16", "32"),
+            width=3,
+            command=self._update_timelapse_speed
+        )
+        self._timelapse_speed.delete(0, tk.END)
+        self._timelapse_speed.insert(0, "4")
+        self._timelapse_speed.pack(side=tk.LEFT, padx=2, pady=2)
+        
+        export_btn = tk.Button(
+            timelapse_frame,
+            text="Dışa Aktar",
+            command=self._export_timelapse,
+            width=10,
+            relief=tk.RAISED,
+            borderwidth=2,
+            cursor="hand2"
+        )
+        export_btn.pack(side=tk.LEFT, padx=4, pady=2)
+        
         # Hakkında butonu - sağ tarafa hizalı
         about_frame = tk.Frame(advanced_frame, bg="#f0f0f0")
         about_frame.pack(side=tk.RIGHT, padx=10, pady=5)
@@ -838,12 +1614,624 @@ class AdvancedPaintApp(PaintApp):
         )
         about_btn.pack(pady=2)
 
-    def _change_canvas_bg(self, color):
-        """Kanvas arka planını değiştirir"""
+    def _set_canvas_bg(self, color):
+        """Kanvas arka planını geçmişe yazmadan değiştirir"""
+        if self._background_fill is not None:
+            # Düz renk seçilince arka plan dolgusu kaldırılır
+            self._background_fill.set(None)
+        self._apply_canvas_bg(color)
+        if self._collab_session is not None:
+            self._collab_session.send_background(color)
+    
+    def _background_state(self):
+        """Belgenin arka plan durumu: (renk, dolgu); dolgu yoksa None"""
+        fill = self._background_fill.fill if self._background_fill is not None else None
+        return (self._settings.canvas_bg, fill)
+    
+    def _apply_background_state(self, state):
+        """(renk, dolgu) durumunu geçmişe yazmadan uygular"""
+        color, fill = state
+        self._apply_canvas_bg(color)
+        self._set_background_fill(fill)
+        if self._collab_session is not None:
+            self._collab_session.send_background(color)
+    
+    def _apply_canvas_bg(self, color):
+        """Arka plan rengini yalnızca yerel tuvale uygular"""
         self._settings.canvas_bg = color
         self._canvas.config(bg=self._settings.canvas_bg)
+        if self._reference_layer is not None:
+            # Önbellekteki seviyeler yeniden çözülmeden yeni renge soldurulur
+            self._reference_layer.set_background(color)
+        if self._view_manager is not None:
+            self._view_manager.refresh()
+        self._operation_log.record("bg", color)
         self._status_bar.config(text=f"Arkaplan rengi: {color} olarak değiştirildi")
     
+    def _import_reference_image(self):
+        """Büyük bir resmi üzerinden çizim yapmak için tuvalin altına yerleştirir"""
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Resim dosyaları", "*.png *.jpg *.jpeg"), ("Tüm dosyalar", "*.*")]
+        )
+        if file_path:
+            self._load_reference_image(file_path)
+    
+    def _load_reference_image(self, file_path):
+        """Verilen resmi referans katmanı olarak yükler ve son belgelere ekler"""
+        from reference_image import ReferenceImageLayer
+        self._remove_reference_image()
+        started = time.perf_counter()
+        try:
+            self._reference_layer = ReferenceImageLayer(
+                self._root, self._canvas, file_path, on_error=self._on_reference_error
+            )
+            self._reference_layer.show()
+        except (OSError, ValueError) as e:
+            self._reference_layer = None
+            self._status_bar.config(text=f"Resim açılamadı: {e}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        width, height = self._reference_layer.size
+        self._status_bar.config(
+            text=f"Referans resmi yüklendi ({width}x{height}, önizleme {elapsed:.0f} ms)"
+        )
+        self._recent().add(file_path)
+    
+    def _on_reference_error(self, error):
+        """Referans resmi arka planda çözülemedi; katman kendini kaldırdı"""
+        self._reference_layer = None
+        self._status_bar.config(text=f"Resim çözülemedi: {error}")
+    
+    def _export_png(self, file_path):
+        """PNG olarak kaydeder ve dosyayı son belgelere ekler"""
+        super()._export_png(file_path)
+        self._recent().add(file_path)
+    
+    def _background_image(self):
+        """Arka plan dolgusu varsa tuval boyutundaki görüntüsü"""
+        if self._background_fill is None:
+            return None
+        return self._background_fill.image(self._canvas.winfo_width(), self._canvas.winfo_height())
+    
+    def _recent(self):
+        """Son belgeler listesini (ilk kullanımda diskten okuyarak) döndürür"""
+        if self._recent_documents is None:
+            from recent_documents import RecentDocuments
+            self._recent_documents = RecentDocuments()
+        return self._recent_documents
+    
+    def _show_recent_documents(self):
+        """Son belgeler panelini gösterir; panel ilk açılışta oluşturulur"""
+        if self._recent_panel is None:
+            from project_file import render_thumbnail
+            from recent_documents import RecentDocumentsPanel
+            from thumbnails import ThumbnailCache, register_renderer
+            register_renderer(".paintproj", render_thumbnail)
+            self._recent_panel = RecentDocumentsPanel(
+                self._root, self._recent(), ThumbnailCache(), self._open_recent_document
+            )
+        self._recent_panel.show()
+    
+    def _open_recent_document(self, file_path):
+        """Son belgelerden seçilen projeyi açar, resmi referans resmi olarak yükler"""
+        if not os.path.exists(file_path):
+            self._recent().remove(file_path)
+            self._recent_panel.refresh()
+            self._status_bar.config(text=f"Dosya bulunamadı: {file_path}")
+            return
+        if file_path.lower().endswith(".paintproj"):
+            self._load_project(file_path)
+        else:
+            self._load_reference_image(file_path)
+    
+    def _import_brush_tip(self):
+        """Bir PNG'yi kullanıcının fırça klasörüne kopyalar ve damga fırçası olarak ekler"""
+        import shutil
+        from tkinter import filedialog
+        from image_brush import BRUSH_DIRS, ImageStampBrush, invalidate_tip
+        file_path = filedialog.askopenfilename(filetypes=[("PNG fırça ucu", "*.png")])
+        if not file_path:
+            return
+        folder = BRUSH_DIRS[-1]
+        target = os.path.join(folder, os.path.basename(file_path))
+        try:
+            os.makedirs(folder, exist_ok=True)
+            if os.path.abspath(file_path) != os.path.abspath(target):
+                shutil.copyfile(file_path, target)
+        except OSError as e:
+            self._status_bar.config(text=f"Fırça ucu kopyalanamadı: {e}")
+            return
+        # Aynı adla yeniden içe aktarılan uç eski maskeyle çizmemeli
+        invalidate_tip(target)
+        name = os.path.splitext(os.path.basename(target))[0]
+        tool_id = f"stamp:{name}"
+        is_new = tool_id not in self._tools
+        self._tools.register(tool_id, lambda: ImageStampBrush(target), name=name.title())
+        if is_new:
+            self._add_tool_button(tool_id)
+        self._select_tool(tool_id)
+    
+    def _toggle_frame_output(self):
+        """Tuvalin paylaşılan bellek kare yayınını başlatır ya da durdurur"""
+        if self._frame_publisher is not None:
+            self._frame_publisher.close()
+            self._frame_publisher = None
+            self._frame_output_btn.config(relief=tk.RAISED)
+            self._status_bar.config(text="Canlı yayın durduruldu")
+            return
+        from frame_output import CanvasFrameSource, FramePublisher
+        source = CanvasFrameSource(
+            self._canvas,
+            self._history,
+            lambda: self._settings.canvas_bg,
+            lambda: self._stroke_items,
+            self._background_image
+        )
+        try:
+            self._frame_publisher = FramePublisher(
+                self._root, source, self._canvas.winfo_width(), self._canvas.winfo_height()
+            )
+        except (ImportError, OSError) as e:
+            self._status_bar.config(text=f"Canlı yayın başlatılamadı: {e}")
+            return
+        self._frame_publisher.start()
+        self._frame_output_btn.config(relief=tk.SUNKEN)
+        self._status_bar.config(text=f"Canlı yayın: paylaşılan bellek '{self._frame_publisher.name}'")
+    
+    def _choose_fill_end_color(self):
+        """Geçişin bitiş (desenlerde zemin) rengini seçer"""
+        from tkinter import colorchooser
+        color = colorchooser.askcolor(title="Dolgu İkinci Rengi", color=self._settings.fill_end_color)[1]
+        if color:
+            self._settings.fill_end_color = color
+            self._fill_end_btn.config(bg=color)
+    
+    def _apply_fill_to_background(self):
+        """Seçili dolguyu tuval arka planına uygular (düz dolguda kaldırır)"""
+        fill = self._settings.fill
+        before = self._background_state()
+        if not self._set_background_fill(fill):
+            return
+        self._record_background_change(before)
+        if fill is not None:
+            self._status_bar.config(text=f"Arka plan dolgusu: {self._fill_var.get()}")
+    
+    def _set_background_fill(self, fill):
+        """Arka plan dolgusunu geçmişe yazmadan değiştirir; başarısızsa False"""
+        if self._background_fill is None:
+            if fill is None:
+                return True
+            from fills import BackgroundFill
+            self._background_fill = BackgroundFill(self._canvas)
+        try:
+            self._background_fill.set(fill)
+        except ImportError as e:
+            self._background_fill.set(None)
+            self._status_bar.config(text=f"Dolgu için NumPy ve Pillow gerekli: {e}")
+            return False
+        return True
+    
+    def _open_secondary_view(self):
+        """Çizimin yakınlaştırılabilir ikinci bir görünümünü açar"""
+        if self._view_manager is None:
+            from secondary_view import ViewManager
+            self._view_manager = ViewManager(
+                self._root, self._history, lambda: self._settings.canvas_bg
+            )
+        self._view_manager.open()
+        self._status_bar.config(text=f"Açık görünüm sayısı: {len(self._view_manager)}")
+    
+    def _open_project(self):
+        """Proje dosyasını açar; görünen alan önce, kalanı arka planda yüklenir"""
+        if self._script_busy():
+            return
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Paint projesi", "*.paintproj"), ("Tüm dosyalar", "*.*")]
+        )
+        if file_path:
+            self._load_project(file_path)
+    
+    def _load_project(self, file_path):
+        """Verilen proje dosyasını yüklemeye başlar ve son belgelere ekler"""
+        if self._script_busy():
+            return
+        from project_file import ProjectError, ProjectFile, ProjectLoader
+        try:
+            project = ProjectFile(file_path)
+        except (OSError, ProjectError) as e:
+            self._status_bar.config(text=f"Proje açılamadı: {e}")
+            return
+        self._clear_selection()
+        self._canvas.delete(DOCUMENT_ITEMS)
+        raster = self._clear_raster_layer()
+        background = self._background_state()
+        self._apply_background_state((project.background, project.fill))
+        x, y = self._canvas.canvasx(0), self._canvas.canvasy(0)
+        self._project_loader = ProjectLoader(
+            self._root,
+            self._canvas,
+            project,
+            viewport=(x, y, x + self._canvas.winfo_width(), y + self._canvas.winfo_height()),
+            on_progress=self._on_project_progress,
+            on_finish=lambda loader: self._on_project_loaded(loader, background, raster)
+        )
+        self._project_loader.start()
+        self._recent().add(file_path)
+    
+    def _on_project_progress(self, loader):
+        self._status_bar.config(text=f"Proje yükleniyor: {loader.loaded} öğe (%{int(loader.fraction * 100)})")
+    
+    def _on_project_loaded(self, loader, background, raster):
+        """background açılmadan önceki arka plan durumu, raster temizlenen raster katmanının işlemleridir"""
+        from settings import CompoundAction, SnapshotDelta
+        self._project_loader = None
+        loaded = self._load_raster_tiles(loader.project)
+        loader.project.close()
+        records = loader.records
+        # Açma işlemi (arka planı ve raster katmanıyla birlikte) tek adımda
+        # geri alınabilir; tuval yeniden taranmaz
+        delta = SnapshotDelta.between(self._history.records, records)
+        if raster or loaded:
+            delta = CompoundAction(raster + [delta] + loaded)
+        after = self._background_state()
+        if after != background:
+            delta = BackgroundAction(background, after, delta)
+        self._history.push_action(delta)
+        self._operation_log.record("state", records)
+        self._item_budget.invalidate()
+        self._item_budget.check()
+        elapsed = time.perf_counter() - loader.started
+        self._status_bar.config(text=f"Proje açıldı: {loader.loaded} öğe, {elapsed:.1f} sn")
+    
+    def _load_raster_tiles(self, project):
+        """
+        Projedeki raster döşemelerini öğelerin arasındaki yerlerine yükler.
+        
+        Geçmişe yazılacak geri alma işlemlerini (en fazla bir tane) döndürür.
+        """
+        tiles = project.raster_tiles()
+        if not tiles:
+            return []
+        from raster_brush import TILE, RasterLayer, RasterStrokeAction, rgba_tile
+        after, positions = {}, {}
+        for position, (x, y), image in tiles:
+            key = (x // TILE, y // TILE)
+            after[key] = rgba_tile(image.convert("RGBA"))
+            positions[key] = position
+        RasterLayer.for_canvas(self._canvas).restore(after, positions)
+        return [RasterStrokeAction(dict.fromkeys(after), after, positions)]
+    
+    def _script_busy(self):
+        """Proje yüklenirken ve zaman atlamalı oynatma sürerken de tuvali değiştiren işlemler engellenir"""
+        if self._project_loader is not None:
+            self._status_bar.config(text="Proje yükleniyor, lütfen bekleyin")
+            return True
+        if self._timelapse_playing():
+            self._status_bar.config(text="Zaman atlamalı oynatılıyor - durdurmak için '■ Durdur'")
+            return True
+        return super()._script_busy()
+    
+    def _canvas_busy(self):
+        return (self._project_loader is not None or self._timelapse_playing()
+                or super()._canvas_busy())
+    
+    def _timelapse_playing(self):
+        """Oynatma tuvali geçici olarak kullanıyor mu"""
+        return self._timelapse_player is not None and self._timelapse_player.playing
+    
+    def _tabs_busy(self):
+        """Belge değiştirmeyi engelleyen bir iş varsa durum çubuğunda bildirir"""
+        if self._script_busy():
+            return True
+        if self._collab_session is not None:
+            self._status_bar.config(text="Ortak çizim sırasında belge değiştirilemez")
+            return True
+        return False
+    
+    def _new_tab(self):
+        """Yeni boş bir belge sekmesi açar"""
+        if self._tabs_busy():
+            return
+        self._clear_selection()
+        self._tabs.new(background=(self._settings.canvas_bg, None))
+    
+    def _switch_tab(self, index):
+        """Başka bir sekmeye geçer; etkin belge askıya alınır"""
+        if index == self._tabs.active or self._tabs_busy():
+            return
+        self._clear_selection()
+        started = time.perf_counter()
+        self._tabs.switch(index)
+        elapsed = (time.perf_counter() - started) * 1000
+        self._status_bar.config(
+            text=f"{self._tabs[index].name}: {len(self._history.records)} öğe, {elapsed:.0f} ms"
+        )
+    
+    def _close_tab(self, index):
+        """Sekmeyi kapatır (son sekme kapatılamaz)"""
+        if len(self._tabs) < 2 or self._tabs_busy():
+            return
+        from tkinter import messagebox
+        if not messagebox.askyesno("Sekmeyi Kapat", f"{self._tabs[index].name} kapatılsın mı?"):
+            return
+        self._clear_selection()
+        self._tabs.close(index)
+    
+    def _on_tab_switched(self, tab):
+        """Etkin belge değişince belgeye bağlı durumu yeniler"""
+        self._stroke_items = []
+        self._item_budget.invalidate()
+        self._operation_log.record("state", self._history.records)
+        if self._tab_bar is not None:
+            self._tab_bar.refresh()
+    
+    def _save_project(self, file_path):
+        """Belge öğelerini ve raster katmanını bölge dizinli proje dosyasına kaydeder"""
+        from png_export import raster_layer_tiles
+        from project_file import save_project
+        records = capture_items(self._canvas)
+        index = save_project(
+            file_path, records, self._settings.canvas_bg,
+            fill=self._background_state()[1],
+            raster=raster_layer_tiles(self._canvas, len(records))
+        )
+        self._recent().add(file_path)
+        self._status_bar.config(
+            text=f"Proje kaydedildi ({index['count']} öğe, {len(index['blocks'])} blok): {file_path}"
+        )
+    
+    def _remove_reference_image(self):
+        """Referans resmini kaldırır"""
+        if self._reference_layer is not None:
+            self._reference_layer.remove()
+            self._reference_layer = None
+    
+    def _on_items_created(self, item_ids):
+        """Yeni öğeleri zaman atlamalı kayıt ve ortak çizim için izler"""
+        super()._on_items_created(item_ids)
+        self._stroke_items.extend(item_ids)
+        if self._collab_session is not None:
+            self._collab_session.items_created(item_ids)
+    
+    def _on_stroke_committed(self, records=None):
+        """Tamamlanan çizgiyi günlüğe yazar ve ortak çizim oturumuna hemen gönderir"""
+        if records is None:
+            records = capture_items(self._canvas, self._stroke_items)
+        self._operation_log.record("items", records)
+        self._stroke_items = []
+        if self._collab_session is not None:
+            self._collab_session.stroke_committed()
+        super()._on_stroke_committed(records)
+    
+    def _undo(self):
+        """Geri al işlemini gerçekleştirir ve sonucu günlüğe yazar"""
+        if self._collab_session is not None:
+            self._collab_step(self._collab_session.undo, "Son çizginiz geri alındı")
+            return
+        super()._undo()
+        self._operation_log.record("state", capture_items(self._canvas))
+    
+    def _redo(self):
+        """İleri al işlemini gerçekleştirir ve sonucu günlüğe yazar"""
+        if self._collab_session is not None:
+            self._collab_step(self._collab_session.redo, "Çizginiz tekrar uygulandı")
+            return
+        super()._redo()
+        self._operation_log.record("state", capture_items(self._canvas))
+    
+    def _switch_branch(self, step):
+        """Dal değiştirir ve sonucu günlüğe yazar"""
+        if self._collab_session is not None:
+            self._status_bar.config(text="Ortak çizim sırasında dal değiştirilemez")
+            return
+        super()._switch_branch(step)
+        self._operation_log.record("state", capture_items(self._canvas))
+    
+    def _collab_step(self, step, text):
+        """
+        Ortak çizimde geri ya da ileri alır.
+        
+        Geçmiş ağacında gezinmek başkalarının çizgilerini de silerdi; bunun
+        yerine oturum yalnızca bu istemcinin çizgisini siler ya da yeniden
+        oluşturur, diğer istemcilere gönderir. Sonuç yerel geçmişe yeni bir
+        adım olarak yazılır.
+        """
+        if self._script_busy():
+            return
+        self._clear_selection()
+        if not step():
+            self._status_bar.config(text="Ortak çizimde geri ya da ileri alınacak çizginiz yok")
+            return
+        self._history.save_state()
+        self._item_budget.invalidate()
+        self._operation_log.record("state", self._history.records)
+        self._status_bar.config(text=text)
+    
+    def _toggle_timelapse(self):
+        """Çizimin oluşumunu tuval üzerinde yeniden oynatır ya da oynatmayı durdurur"""
+        from timelapse import TimelapsePlayer
+        if self._timelapse_playing():
+            self._timelapse_player.stop()
+            self._finish_timelapse()
+            return
+        if not len(self._operation_log):
+            self._status_bar.config(text="Oynatılacak kayıt yok")
+            return
+        if self._script_busy():
+            return
+        if self._collab_session is not None:
+            # Uzak öğeler oynatılan tuvale karışır ve geçmişe yazılırdı
+            self._status_bar.config(text="Ortak çizim sırasında oynatılamaz")
+            return
+        self._clear_selection()
+        # Oynatma tuvali yeniden kurar; bitince mevcut durum geri yüklenir
+        self._timelapse_state = capture_items(self._canvas)
+        self._timelapse_bg = self._settings.canvas_bg
+        # Oynatılan arka plan rengini oynatıcının görünümü (CanvasView) ayarlar
+        self._timelapse_player = TimelapsePlayer(
+            self._root,
+            self._canvas,
+            self._operation_log,
+            speed=float(self._timelapse_speed.get()),
+            on_finish=self._finish_timelapse
+        )
+        self._timelapse_player.play()
+        self._timelapse_btn.config(text="■ Durdur")
+        self._status_bar.config(text="Zaman atlamalı oynatılıyor...")
+    
+    def _update_timelapse_speed(self):
+        """Oynatma hızını oynatma sırasında günceller"""
+        if self._timelapse_player is not None:
+            self._timelapse_player.speed = float(self._timelapse_speed.get())
+    
+    def _finish_timelapse(self):
+        """Oynatma bittiğinde tuvalin oynatma öncesi durumunu geri yükler"""
+        from canvas_items import create_items
+        self._canvas.delete(DOCUMENT_ITEMS)
+        # Tüm öğeler tek bir Tcl çağrısıyla oluşturulur
+        create_items(self._canvas, self._timelapse_state)
+        self._timelapse_state = []
+        self._item_budget.invalidate()
+        self._canvas.config(bg=self._timelapse_bg)
+        self._timelapse_btn.config(text="▶ Oynat")
+        self._status_bar.config(text="Zaman atlamalı oynatma bitti")
+    
+    def _export_timelapse(self):
+        """Kayıtlı oturumu GIF ya da PNG kare dizisi olarak dışa aktarır"""
+        import threading
+        from tkinter import filedialog
+        from timelapse import export_frames
+        if self._export_progress is not None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".gif",
+            filetypes=[("GIF animasyonu", "*.gif"), ("PNG kare dizisi (klasör)", "*")]
+        )
+        if not file_path:
+            return
+        width = self._canvas.winfo_width()
+        height = self._canvas.winfo_height()
+        speed = float(self._timelapse_speed.get())
+        self._export_progress = (0, 1, None)
+        
+        def report(done, total):
+            self._export_progress = (done, total, None)
+        
+        def run():
+            # Kareler arka planda hazırlanır; Tk iş parçacığı yalnızca ilerlemeyi gösterir
+            try:
+                export_frames(self._operation_log, file_path, width, height,
+                              speed=speed, progress=report)
+                done, total, _ = self._export_progress
+                self._export_progress = (total, total, "ok")
+            except Exception as e:
+                self._export_progress = (0, 1, e)
+        
+        self._export_started = time.perf_counter()
+        threading.Thread(target=run, daemon=True).start()
+        self._root.after(100, lambda: self._poll_export(file_path))
+    
+    def _poll_export(self, file_path):
+        """Dışa aktarma ilerlemesini durum çubuğunda gösterir"""
+        done, total, result = self._export_progress
+        if result is None:
+            self._status_bar.config(text=f"Dışa aktarılıyor: {done}/{total} kare")
+            self._root.after(100, lambda: self._poll_export(file_path))
+            return
+        self._export_progress = None
+        if result == "ok":
+            elapsed = time.perf_counter() - self._export_started
+            self._status_bar.config(text=f"{total} kare {elapsed:.1f} sn'de dışa aktarıldı: {file_path}")
+        else:
+            self._status_bar.config(text=f"Dışa aktarma başarısız: {result}")
+    
+    def _start_relay_server(self):
+        """Bu bilgisayarda ortak çizim aktarma sunucusunu başlatır ve bağlanır"""
+        from collaboration import RelayServer, DEFAULT_PORT
+        if self._relay_server is None:
+            try:
+                self._relay_server = RelayServer(port=DEFAULT_PORT)
+                self._relay_server.start_in_thread()
+            except OSError as e:
+                self._relay_server = None
+                self._status_bar.config(text=f"Sunucu başlatılamadı: {e}")
+                return
+        if self._collab_session is None:
+            self._connect_collaboration("127.0.0.1", self._relay_server.port)
+    
+    def _toggle_collaboration(self):
+        """Ortak çizim sunucusuna bağlanır ya da bağlantıyı keser"""
+        if self._collab_session is not None:
+            self._disconnect_collaboration()
+            return
+        from tkinter import simpledialog
+        from collaboration import DEFAULT_HOST, DEFAULT_PORT
+        address = simpledialog.askstring(
+            "Ortak Çizim",
+            "Sunucu adresi (host:port):",
+            initialvalue=f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+            parent=self._root
+        )
+        if address:
+            host, _, port = address.rpartition(":")
+            try:
+                self._connect_collaboration(host or DEFAULT_HOST, int(port))
+            except ValueError:
+                self._status_bar.config(text=f"Geçersiz adres: {address}")
+    
+    def _connect_collaboration(self, host, port):
+        """Verilen sunucuya ortak çizim oturumu açar"""
+        if self._script_busy():
+            return
+        from collaboration import CollaborationSession
+        try:
+            self._collab_session = CollaborationSession(
+                self._root,
+                self._canvas,
+                host,
+                port,
+                on_clear=self._on_remote_clear,
+                on_background=self._apply_canvas_bg,
+                on_disconnect=self._disconnect_collaboration,
+                on_remote=self._on_remote_items
+            )
+        except OSError as e:
+            self._status_bar.config(text=f"Bağlanılamadı: {e}")
+            return
+        self._collab_btn.config(text="Ayrıl")
+        self._status_bar.config(text=f"Ortak çizim: {host}:{port} adresine bağlanıldı")
+    
+    def _on_remote_clear(self):
+        """Ortak çizimdeki başka bir katılımcı tuvali temizledi (geçmişe _on_remote_items yazar)"""
+        self._operation_log.record("clear")
+    
+    def _on_remote_items(self, records):
+        """
+        Uzak işlemleri yerel geçmişe ayrı bir adım olarak yazar.
+        
+        Oturum sürerken geri alma bu adımlara inmez (bkz. _collab_step).
+        records yalnızca eklenen öğelerin kayıtlarıdır; öğe silindiyse ya da
+        yerel bir çizgi sürüyorsa (öğeleri kayıtlarda henüz yok) tuval taranır.
+        """
+        from settings import SnapshotDelta
+        self._item_budget.invalidate()
+        if records is None or self._stroke_items:
+            self._history.save_state()
+            self._operation_log.record("state", self._history.records)
+            return
+        self._history.push_action(SnapshotDelta(len(self._history.records), (), tuple(records)))
+        self._operation_log.record("items", records)
+    
+    def _disconnect_collaboration(self):
+        """Ortak çizim oturumunu kapatır"""
+        if self._collab_session is not None:
+            self._collab_session.close()
+            self._collab_session = None
+        self._collab_btn.config(text="Bağlan")
+        self._status_bar.config(text="Ortak çizim bağlantısı kapatıldı")
+    
     def _choose_custom_bg(self):
         """Özel arkaplan rengi seçmek için renk seçiciyi açar"""
         from tkinter import colorchooser
@@ -853,7 +2241,17 @@ class AdvancedPaintApp(PaintApp):
     
     def _clear_canvas(self):
         """Kanvası temizler"""
-        self._canvas.delete("all")
+        if self._script_busy():
+            return
+        self._canvas.delete(DOCUMENT_ITEMS)
+        raster = self._clear_raster_layer()
+        self._item_budget.invalidate()
+        # Temizleme (raster katmanıyla birlikte) tek adımda geri alınabilir
+        # ve görünümlere yansır
+        self._history.save_state(*raster)
+        self._operation_log.record("clear")
+        if self._collab_session is not None:
+            self._collab_session.send_clear()
         self._status_bar.config(text="Kanvas temizlendi")
     
     def _save_image(self):
@@ -861,19 +2259,49 @@ class AdvancedPaintApp(PaintApp):
         from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
             defaultextension=".png",
-            filetypes=[("PNG dosyası", "*.png"), ("Tüm dosyalar", "*.*")]
+            filetypes=[
+                ("PNG dosyası", "*.png"),
+                ("SVG dosyası", "*.svg"),
+                ("PDF dosyası", "*.pdf"),
+                ("Paint projesi", "*.paintproj"),
+                ("Tüm dosyalar", "*.*")
+            ]
         )
-        if file_path:
+        if file_path and file_path.lower().endswith(".paintproj"):
             try:
-                # Burada gerçek kaydetme kodunu ekleyin
-                # Örnek: self._canvas.postscript(file=file_path, colormode='color')
-                self._status_bar.config(text=f"Resim kaydedildi: {file_path}")
-            except Exception as e:
+                self._save_project(file_path)
+            except OSError as e:
+                self._status_bar.config(text=f"Hata: {e}")
+        elif file_path and file_path.lower().endswith((".svg", ".pdf")):
+            self._export_vector(file_path)
+        elif file_path:
+            if not self._ask_png_options():
+                return
+            try:
+                self._export_png(file_path)
+            except (ImportError, OSError) as e:
                 self._status_bar.config(text=f"Hata: {e}")
 
     def _show_about(self):
         """Hakkında diyaloğunu gösterir"""
+        if self._about_window is None:
+            self._build_about_window()
+        self._about_window.deiconify()
+        self._about_window.lift()
+    
+    def _build_about_window(self):
+        """
+        Hakkında penceresini gizli olarak oluşturur.
+        
+        Pencere bir kez oluşturulur; kapatıldığında yok edilmek yerine
+        gizlenir ve sonraki açılışlarda yeniden kullanılır.
+        """
+        if self._about_window is not None:
+            return
         about_window = tk.Toplevel(self._root)
+        about_window.withdraw()
+        about_window.protocol("WM_DELETE_WINDOW", about_window.withdraw)
+        self._about_window = about_window
         about_window.title("Hakkında")
         about_window.geometry("400x300")
         about_window.resizable(False, False)
@@ -935,6 +2363,23 @@ class AdvancedPaintApp(PaintApp):
         copyright_label.pack(pady=10)
 
 if __name__ == "__main__":
+    import sys
     root = tk.Tk()
     app = AdvancedPaintApp(root)
+    # python paint_app.py --script cizim.paint
+    if len(sys.argv) > 2 and sys.argv[1] == "--script":
+        app._defer_until_first_frame(lambda: app.run_script(sys.argv[2]))
+    # python paint_app.py --record oturum.paintrec
+    # Girdiler pencere kapanınca dosyaya yazılır; oynatmak için input_recording.py
+    if len(sys.argv) > 2 and sys.argv[1] == "--record":
+        from input_recording import InputRecorder
+        recorder = InputRecorder(app)
+        app._defer_until_first_frame(recorder.start)
+
+        def save_and_close():
+            if recorder.recording:
+                recorder.stop().save(sys.argv[2])
+            root.destroy()
+
+        root.protocol("WM_DELETE_WINDOW", save_and_close)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import os
+import time
+import zlib
+
+from canvas_items import capture_items
+from raster_render import new_image, render_layers
+
+# Küçük PNG dışa aktarma
+# ======================
+# Hızlı renk paletiyle yapılan çizimlerde genellikle birkaç renk bulunur.
+# Böyle bir görüntüyü 24 bitlik RGB yerine paletli (P kipi, piksel başına
+# 1 bayt) PNG olarak yazmak kayıpsızdır ve dosyayı birkaç kat küçültür.
+# Renkler tek bir NumPy geçişiyle bulunur; 256'dan fazla renk varsa (ör.
+# yumuşak kenarlı raster fırçalar) görüntü RGB olarak yazılır.
+# Görüntü ekran görüntüsü alınmadan öğe kayıtlarından çizilir.
+
+# PNG'nin en fazla palet rengi
+MAX_PALETTE_COLORS = 256
+# Kullanıcıya gösterilen zlib sıkıştırma stratejileri
+PNG_STRATEGIES = {
+    "Varsayılan": zlib.Z_DEFAULT_STRATEGY,
+    "Filtreli": zlib.Z_FILTERED,
+    "Yalnızca Huffman": zlib.Z_HUFFMAN_ONLY,
+    "RLE": zlib.Z_RLE,
+    "Sabit Huffman": zlib.Z_FIXED,
+}
+
+
+def render_canvas(canvas, background, background_image=None):
+    """
+    Tuvalin belge içeriğini ekran görüntüsü almadan bir RGB görüntüye çizer.
+
+    Raster fırça döşemeleri (varsa) vektör öğelerle kanvastaki sırasıyla
+    çizilir; referans resmi yalnızca çizim yardımcısı olduğu için dahil edilmez.
+    background_image (ör. geçişli arka plan) verilirse düz rengin yerine geçer.
+    """
+    image = new_image(canvas.winfo_width(), canvas.winfo_height(), background)
+    if background_image is not None:
+        image.paste(background_image.convert("RGB"), (0, 0))
+    records = capture_items(canvas)
+    return render_layers(image, records, raster_layer_tiles(canvas, len(records)))
+
+
+def raster_layer_tiles(canvas, top):
+    """
+    Raster fırça döşemelerini render_layers'ın beklediği biçimde döndürür.
+
+    top, ekrana henüz çıkmamış döşemelerin konumudur (kayıt sayısı).
+    """
+    import sys
+    # Raster modülü yüklenmediyse raster çizim de yoktur
+    if "raster_brush" not in sys.modules:
+        return []
+    from PIL import Image
+    from raster_brush import TILE, RasterLayer
+    layer = RasterLayer.existing(canvas)
+    if layer is None:
+        return []
+    positions = layer.tile_positions()
+    tiles = []
+    for key in layer.buffer.keys():
+        pixels = layer.buffer.rgba(key)
+        if pixels is not None:
+            tiles.append((positions.get(key, top), (key[0] * TILE, key[1] * TILE),
+                          Image.fromarray(pixels, "RGBA")))
+    return tiles
+
+
+def palette_image(image):
+    """
+    Görüntü en fazla 256 renk içeriyorsa kayıpsız paletli (P) kopyasını döndürür.
+
+    Pikseller 24 bitlik tam sayılar olarak okunur ve tek bir geçişte 2^24
+    girişlik bir "görüldü" tablosuna işaretlenir; sıralama (np.unique)
+    gerekmez. Aynı tablo renk -> palet indeksi eşlemesine dönüştürülür.
+    Daha fazla renk varsa None döndürür.
+    """
+    import numpy as np
+    from PIL import Image
+    width, height = image.size
+    # RGBX baytları küçük uçlu (little-endian) 32 bit olarak R | G << 8 | B << 16 verir
+    pixels = np.asarray(image.convert("RGBX")).view("<u4").reshape(height, width) & 0xFFFFFF
+    table = np.zeros(1 << 24, dtype=np.bool_)
+    table[pixels] = True
+    colors = np.flatnonzero(table)
+    if len(colors) > MAX_PALETTE_COLORS:
+        return None
+    lookup = np.zeros(1 << 24, dtype=np.uint8)
+    lookup[colors] = np.arange(len(colors))
+    result = Image.fromarray(lookup[pixels], "P")
+    palette = np.stack((colors & 255, (colors >> 8) & 255, colors >> 16), axis=1)
+    result.putpalette(palette.astype(np.uint8).tobytes())
+    return result
+
+
+def save_png(image, path, compress_level=6, strategy=zlib.Z_DEFAULT_STRATEGY, use_palette=True):
+    """
+    Görüntüyü PNG olarak kaydeder ve kodlama bilgilerini döndürür.
+
+    use_palette doğruysa ve görüntü en fazla 256 renk içeriyorsa paletli
+    PNG yazılır. Dönen sözlük: mode ("P" ya da "RGB"), colors (paletli
+    değilse None), bytes (dosya boyutu) ve seconds (kodlama süresi).
+    """
+    started = time.perf_counter()
+    indexed = None
+    if use_palette:
+        try:
+            indexed = palette_image(image)
+        except ImportError:
+            # NumPy yoksa görüntü RGB olarak yazılır
+            indexed = None
+    output = indexed if indexed is not None else image.convert("RGB")
+    output.save(path, "PNG", compress_level=compress_level, compress_type=strategy)
+    return {
+        "mode": output.mode,
+        "colors": len(indexed.getpalette()) // 3 if indexed is not None else None,
+        "bytes": os.path.getsize(path),
+        "seconds": time.perf_counter() - started,
+    }
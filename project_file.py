@@ -0,0 +1,549 @@
+import io
+import json
+import mmap
+import struct
+import sys
+import time
+import zlib
+from bisect import bisect_left
+
+from canvas_items import CREATE_METHODS, _is_headless, create_items, image_for, register_image
+
+# Bölge dizinli proje dosyaları (.paintproj)
+# =========================================
+# Büyük çizimlerin hemen açılabilmesi için öğe kayıtları tuval üzerindeki
+# konumlarına göre TILE boyutlu bölgelere ayrılarak bloklar halinde yazılır.
+# Dosyanın sonundaki dizin her bloğun bölgesini, öğelerinin ortak sınır
+# kutusunu ve dosyadaki bayt aralığını tutar:
+#
+#   başlık | blok 0 | blok 1 | ... | görüntüler (PNG) | raster döşemeleri (PNG) | dizin
+#
+# Bir öğe sınır kutusunun merkezinin düştüğü bölgenin bloğuna yazılır ve
+# belgedeki sırasını (z-sırası) da taşır. Dizindeki blok kutuları öğelerin
+# tamamını kapsadığı için bir dikdörtgenle kesişen öğeleri bulmak yalnızca o
+# dikdörtgenle kesişen blokları açmayı gerektirir.
+#
+# Dosya bellek eşlemeli (mmap) okunur: açmak yalnızca başlığı ve dizini
+# okur, bloklar istendiklerinde açılır. Uygulama önce görünen alanın
+# bloklarını yükler, geri kalanı boşta zaman dilimleriyle tuvale akıtır;
+# sonradan gelen öğeler z-sırasındaki yerlerine yerleştirilir.
+#
+# Raster fırça katmanının döşemeleri RGBA PNG olarak yazılır; dizin her
+# döşemenin konumunu ve altında kalan öğe sayısını (bkz.
+# RasterLayer.tile_positions) tutar.
+#
+#   python project_file.py info cizim.paintproj
+#   python project_file.py extract cizim.paintproj 0 0 800 600 parca.paintproj
+#   python project_file.py render cizim.paintproj 0 0 800 600 parca.png
+
+MAGIC = b"PPRJ"
+VERSION = 1
+# magic, sürüm, bölge boyutu, dizinin konumu ve uzunluğu
+HEADER = struct.Struct("<4sHHQQ")
+# Bölge (blok) kenar uzunluğu (piksel)
+TILE = 512
+# Yükleme zaman dilimi (saniye)
+SLICE_SECONDS = 0.008
+
+
+class ProjectError(Exception):
+    """Proje dosyası okunamadığında ya da bozuk olduğunda fırlatılır"""
+
+
+def _record_bbox(record, image_size=None):
+    """
+    Kaydın sınır kutusu; görüntülerde görüntünün boyutu kullanılır.
+
+    image_size, görüntü adından (genişlik, yükseklik) döndüren işlevdir;
+    verilmezse canvas_items görüntü kaydına bakılır.
+    """
+    item_type, coords, options = record
+    if not coords:
+        return None
+    coords = [float(c) for c in coords]
+    if item_type == "image":
+        if image_size is None:
+            image = image_for(options.get("image"))
+            width, height = image.size if image is not None else (0, 0)
+        else:
+            width, height = image_size(options.get("image"))
+        x, y = coords[0], coords[1]
+        if options.get("anchor", "center") != "nw":
+            x, y = x - width / 2, y - height / 2
+        return (x, y, x + width, y + height)
+    xs, ys = coords[0::2], coords[1::2]
+    try:
+        half = float(options.get("width", 1)) / 2
+    except (TypeError, ValueError):
+        half = 0.5
+    return (min(xs) - half, min(ys) - half, max(xs) + half, max(ys) + half)
+
+
+def _overlaps(box, rect):
+    return box[0] <= rect[2] and box[2] >= rect[0] and box[1] <= rect[3] and box[3] >= rect[1]
+
+
+def save_project(path, records, background="#FFFFFF", images=None, fill=None, raster=None):
+    """
+    Kayıtları bölge dizinli bir proje dosyasına yazar.
+
+    images, görüntü kayıtlarının adlarını PIL görüntülerine eşler; verilmezse
+    canvas_items görüntü kaydından okunur. fill, arka plan dolgusudur
+    (fills.Fill ya da None). raster, raster katmanının (konum, (x, y), RGBA
+    görüntü) döşemeleridir (bkz. png_export.raster_layer_tiles). Dizini
+    döndürür.
+    """
+    tiles = {}
+    names = {}
+    # Yazılan kayıtların records içindeki sırası; dosyada sıralar ve döşeme
+    # konumları yalnızca yazılan kayıtlara göre sayılır
+    written = []
+    extent = None
+    for order, record in enumerate(records):
+        item_type, coords, options = record
+        if item_type not in CREATE_METHODS:
+            continue
+        if item_type == "image":
+            name = options.get("image")
+            image = (images or {}).get(name) or image_for(name)
+            if image is None:
+                continue
+            names[name] = image
+        box = _record_bbox(record, lambda name: names[name].size)
+        if box is None:
+            continue
+        extent = box if extent is None else (
+            min(extent[0], box[0]), min(extent[1], box[1]),
+            max(extent[2], box[2]), max(extent[3], box[3])
+        )
+        key = (int((box[0] + box[2]) / 2 // TILE), int((box[1] + box[3]) / 2 // TILE))
+        block = tiles.get(key)
+        if block is None:
+            block = tiles[key] = [list(box), []]
+        else:
+            bounds = block[0]
+            bounds[:] = (min(bounds[0], box[0]), min(bounds[1], box[1]),
+                         max(bounds[2], box[2]), max(bounds[3], box[3]))
+        block[1].append([len(written), item_type, [float(c) for c in coords], options])
+        written.append(order)
+
+    index = {
+        "background": background,
+        "fill": list(fill) if fill is not None else None,
+        "count": sum(len(items) for _, items in tiles.values()),
+        "bounds": list(extent) if extent else [0, 0, 0, 0],
+        "blocks": [],
+        "images": {},
+        "raster": [],
+    }
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, TILE, 0, 0))
+        # Bloklar satır satır yazılır; komşu bölgeler dosyada da yakındır
+        for key in sorted(tiles, key=lambda k: (k[1], k[0])):
+            bounds, items = tiles[key]
+            data = zlib.compress(json.dumps(items, separators=(",", ":")).encode("utf-8"))
+            index["blocks"].append([*key, *bounds, f.tell(), len(data), len(items)])
+            f.write(data)
+        for name, image in names.items():
+            data = io.BytesIO()
+            image.save(data, "PNG")
+            index["images"][name] = [f.tell(), data.tell()]
+            f.write(data.getvalue())
+        for position, (x, y), image in raster or ():
+            data = io.BytesIO()
+            image.save(data, "PNG")
+            index["raster"].append([bisect_left(written, position), x, y, f.tell(), data.tell()])
+            f.write(data.getvalue())
+        index_offset = f.tell()
+        data = zlib.compress(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+        f.write(data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, TILE, index_offset, len(data)))
+    return index
+
+
+class ProjectFile:
+    """
+    Bellek eşlemeli olarak açılmış bir proje dosyası.
+
+    Açılışta yalnızca başlık ve dizin okunur; blokların kayıtları
+    istendiklerinde açılır.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ProjectError("dosya boş")
+        try:
+            magic, version, self.tile, offset, length = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ProjectError("proje dosyası değil ya da desteklenmeyen sürüm")
+            self._index = json.loads(zlib.decompress(self._map[offset:offset + length]))
+        except ProjectError:
+            self.close()
+            raise
+        except (struct.error, zlib.error, ValueError) as e:
+            self.close()
+            raise ProjectError(f"dizin okunamadı: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    @property
+    def background(self):
+        return self._index["background"]
+
+    @property
+    def fill(self):
+        """Arka plan dolgusu (fills.Fill); yoksa ya da eski dosyalarda None"""
+        fill = self._index.get("fill")
+        if fill is None:
+            return None
+        from fills import Fill
+        return Fill(*fill)
+
+    @property
+    def count(self):
+        """Dosyadaki öğe sayısı"""
+        return self._index["count"]
+
+    @property
+    def bounds(self):
+        """Tüm öğeleri kapsayan (x0, y0, x1, y1) kutusu"""
+        return tuple(self._index["bounds"])
+
+    @property
+    def blocks(self):
+        """Dizindeki bloklar: (tx, ty, x0, y0, x1, y1, konum, uzunluk, öğe sayısı)"""
+        return self._index["blocks"]
+
+    def blocks_in(self, rect):
+        """Sınır kutusu rect ile kesişen blokları döndürür"""
+        return [block for block in self.blocks if _overlaps(block[2:6], rect)]
+
+    def read_block(self, block):
+        """Bloğun öğelerini (sıra, kayıt) çiftleri olarak döndürür"""
+        offset, length = block[6], block[7]
+        items = json.loads(zlib.decompress(self._map[offset:offset + length]))
+        return [(order, (item_type, coords, options)) for order, item_type, coords, options in items]
+
+    def records_in(self, rect=None):
+        """
+        rect ile kesişen (ya da tüm) öğeleri z-sırasıyla (sıra, kayıt) olarak döndürür.
+
+        Yalnızca kesişen bloklar okunur.
+        """
+        items = []
+        for block in (self.blocks if rect is None else self.blocks_in(rect)):
+            for order, record in self.read_block(block):
+                box = _record_bbox(record, self.image_size)
+                if rect is None or (box is not None and _overlaps(box, rect)):
+                    items.append((order, record))
+        items.sort(key=lambda item: item[0])
+        return items
+
+    def image(self, name):
+        """Dosyaya gömülü görüntüyü PIL görüntüsü olarak döndürür (yoksa None)"""
+        entry = self._index["images"].get(name)
+        if entry is None:
+            return None
+        from PIL import Image
+        offset, length = entry
+        image = Image.open(io.BytesIO(self._map[offset:offset + length]))
+        image.load()
+        return image
+
+    def image_size(self, name):
+        """Gömülü görüntünün boyutu; PNG başlığından okunur, görüntü açılmaz"""
+        entry = self._index["images"].get(name)
+        if entry is None:
+            return (0, 0)
+        # IHDR: 8 bayt imza + 8 bayt parça başlığı, ardından genişlik ve yükseklik
+        return struct.unpack_from(">II", self._map, entry[0] + 16)
+
+    def raster_tiles(self, rect=None):
+        """
+        rect ile kesişen (ya da tüm) raster döşemelerini (konum, (x, y), RGBA
+        görüntü) olarak döndürür; eski dosyalarda boş listedir.
+        """
+        from PIL import Image
+        tiles = []
+        for position, x, y, offset, length in self._index.get("raster", ()):
+            if rect is not None:
+                width, height = struct.unpack_from(">II", self._map, offset + 16)
+                if not _overlaps((x, y, x + width, y + height), rect):
+                    continue
+            image = Image.open(io.BytesIO(self._map[offset:offset + length]))
+            image.load()
+            tiles.append((position, (x, y), image))
+        return tiles
+
+
+def extract_region(project, rect, path):
+    """Dikdörtgenle kesişen öğeleri yeni bir proje dosyasına yazar"""
+    items = project.records_in(rect)
+    images = {}
+    for _, (item_type, _, options) in items:
+        if item_type == "image" and options.get("image") not in images:
+            images[options.get("image")] = project.image(options.get("image"))
+    # Döşemelerin konumları çıkarılan öğelere göre yeniden sayılır
+    orders = [order for order, _ in items]
+    raster = [(bisect_left(orders, position), corner, image)
+              for position, corner, image in project.raster_tiles(rect)]
+    return save_project(path, [record for _, record in items], project.background, images,
+                        project.fill, raster)
+
+
+def render_region(project, rect, scale=1.0):
+    """Dikdörtgenin içeriğini dosyanın yalnızca ilgili bloklarını okuyarak çizer"""
+    from raster_render import new_image, render_records
+    x0, y0, x1, y1 = rect
+    image = new_image(max(1, round((x1 - x0) * scale)), max(1, round((y1 - y0) * scale)),
+                      project.background)
+    pending = []
+    # Döşemeler altlarında kalan öğelerden sonra çizilir
+    tiles = sorted(project.raster_tiles(rect), key=lambda tile: tile[0], reverse=True)
+    for order, record in project.records_in(rect):
+        if tiles and tiles[-1][0] <= order:
+            render_records(image, pending)
+            pending = []
+            while tiles and tiles[-1][0] <= order:
+                _, (x, y), source = tiles.pop()
+                _paste(image, source, (x - x0) * scale, (y - y0) * scale, scale)
+        item_type, coords, options = record
+        if scale != 1:
+            coords = [(float(c) - (y0 if i % 2 else x0)) * scale for i, c in enumerate(coords)]
+            if "width" in options:
+                options = {**options, "width": float(options["width"]) * scale}
+        else:
+            coords = [float(c) - (y0 if i % 2 else x0) for i, c in enumerate(coords)]
+        if item_type != "image":
+            pending.append((item_type, coords, options))
+            continue
+        render_records(image, pending)
+        pending = []
+        source = project.image(options.get("image"))
+        if source is None:
+            continue
+        x, y = coords[0], coords[1]
+        if options.get("anchor", "center") != "nw":
+            x, y = x - source.width * scale / 2, y - source.height * scale / 2
+        _paste(image, source, x, y, scale)
+    render_records(image, pending)
+    for _, (x, y), source in reversed(tiles):
+        _paste(image, source, (x - x0) * scale, (y - y0) * scale, scale)
+    return image
+
+
+def _paste(image, source, x, y, scale):
+    """Görüntüyü ölçekleyip sol üst köşesi (x, y) olacak şekilde yapıştırır"""
+    if scale != 1:
+        source = source.resize((max(1, round(source.width * scale)),
+                                max(1, round(source.height * scale))))
+    mask = source if source.mode == "RGBA" else None
+    image.paste(source.convert(image.mode), (round(x), round(y)), mask)
+
+
+def render_thumbnail(path, size):
+    """
+    Son belgeler paneli için proje dosyasının önizlemesini üretir
+    (thumbnails.register_renderer ile kaydedilir).
+    """
+    from raster_render import new_image
+    with ProjectFile(path) as project:
+        if not project.count:
+            return new_image(size, size, project.background)
+        x0, y0, x1, y1 = project.bounds
+        rect = (min(0, x0), min(0, y0), x1, y1)
+        scale = size / max(rect[2] - rect[0], rect[3] - rect[1], 1)
+        return render_region(project, rect, scale)
+
+
+class ProjectLoader:
+    """
+    Proje dosyasını Tk olay döngüsünü bloklamadan tuvale yükler.
+
+    Görünen alanın (viewport) blokları start çağrısında hemen yüklenir;
+    kalan bloklar boşta zaman dilimleriyle eklenir. Her dilimde oluşturulan
+    öğeler z-sırasındaki yerlerine taşınır. Bitince records, belgenin tüm
+    kayıtlarını z-sırasıyla verir.
+    """
+    def __init__(self, root, canvas, project, viewport=None,
+                 on_items=None, on_progress=None, on_finish=None):
+        self._root = root
+        self._canvas = canvas
+        self._project = project
+        self._viewport = viewport
+        self._on_items = on_items
+        self._on_progress = on_progress
+        self._on_finish = on_finish
+        self._pending = []
+        # Yüklenmiş öğelerin sıraları ve kimlikleri (sıralı)
+        self._orders = []
+        self._ids = []
+        self._records = {}
+        # Dosyadaki görüntü adı -> bu oturumdaki görüntü adı
+        self._image_names = {}
+        self._cancelled = False
+        self.loaded = 0
+        self.started = None
+
+    @property
+    def project(self):
+        return self._project
+
+    @property
+    def fraction(self):
+        """Yüklenen öğelerin oranı"""
+        return self.loaded / self._project.count if self._project.count else 1.0
+
+    @property
+    def records(self):
+        """Yüklenen kayıtlar z-sırasıyla"""
+        return [self._records[order] for order in self._orders]
+
+    def start(self):
+        """Görünen alanı yükler ve kalanını boşta akıtmaya başlar"""
+        self.started = time.perf_counter()
+        blocks = self._project.blocks
+        if self._viewport is not None:
+            visible = self._project.blocks_in(self._viewport)
+            seen = set(id(block) for block in visible)
+            blocks = visible + [block for block in blocks if id(block) not in seen]
+            for block in visible:
+                self._load(self._project.read_block(block))
+            self._pending = blocks[len(visible):]
+        else:
+            self._pending = list(blocks)
+        self._root.after_idle(self._step)
+
+    def cancel(self):
+        """Yüklemeyi bir sonraki zaman diliminde durdurur; yüklenenler kalır"""
+        self._cancelled = True
+
+    def _step(self):
+        deadline = time.perf_counter() + SLICE_SECONDS
+        items = []
+        while self._pending and not self._cancelled and time.perf_counter() < deadline:
+            items.extend(self._project.read_block(self._pending.pop(0)))
+        self._load(items)
+        if self._cancelled or not self._pending:
+            if self._on_finish:
+                self._on_finish(self)
+            return
+        if self._on_progress:
+            self._on_progress(self)
+        self._root.after(1, self._step)
+
+    def _load(self, items):
+        """Öğeleri tek çağrıyla oluşturur ve z-sırasındaki yerlerine taşır"""
+        if not items:
+            return
+        items.sort(key=lambda item: item[0])
+        records = [self._local(record) for _, record in items]
+        item_ids = create_items(self._canvas, records)
+        # Yeni öğeler yüklenmiş öğelerle sıralı birleştirilir
+        old_orders, old_ids = self._orders, self._ids
+        self._orders, self._ids = orders, ids = [], []
+        moves = []
+        position = 0
+        for (order, _), record, item_id in zip(items, records, item_ids):
+            while position < len(old_orders) and old_orders[position] < order:
+                orders.append(old_orders[position])
+                ids.append(old_ids[position])
+                position += 1
+            if position < len(old_orders):
+                # Sonraki (üstteki) yüklenmiş öğenin hemen altına
+                moves.append((item_id, old_ids[position]))
+            orders.append(order)
+            ids.append(item_id)
+            self._records[order] = record
+        orders.extend(old_orders[position:])
+        ids.extend(old_ids[position:])
+        _lower_items(self._canvas, moves)
+        self.loaded += len(item_ids)
+        if self._on_items:
+            self._on_items(item_ids)
+
+    def _local(self, record):
+        """Görüntü kayıtlarını bu oturumda kayıtlı bir görüntüye bağlar"""
+        item_type, coords, options = record
+        if item_type != "image":
+            return record
+        name = options.get("image")
+        local = self._image_names.get(name)
+        if local is None:
+            from PIL import ImageTk
+            image = self._project.image(name)
+            local = self._image_names[name] = register_image(ImageTk.PhotoImage(image), image, document=True)
+        return (item_type, coords, {**options, "image": local})
+
+
+def _lower_items(canvas, moves):
+    """(öğe, üstteki öğe) çiftlerini sırayla tek bir Tcl çağrısında yerleştirir"""
+    if not moves:
+        return
+    if _is_headless(canvas):
+        # Aynı öğenin altına girenler belge modelinde birlikte taşınır
+        groups = {}
+        for item_id, above in moves:
+            groups.setdefault(above, []).append(item_id)
+        for above, item_ids in groups.items():
+            canvas.document.restack(item_ids, above)
+        return
+    canvas.tk.eval("foreach {i a} {%s} { %s lower $i $a }" % (
+        " ".join(f"{item_id} {above}" for item_id, above in moves), canvas._w
+    ))
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Bölge dizinli proje dosyası aracı")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info", help="dizini özetler")
+    info.add_argument("path")
+    for name, help_text in (("extract", "bir bölgeyi yeni projeye çıkarır"),
+                            ("render", "bir bölgeyi PNG olarak çizer")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("path")
+        for coordinate in ("x0", "y0", "x1", "y1"):
+            command.add_argument(coordinate, type=float)
+        command.add_argument("output")
+    commands.choices["render"].add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    try:
+        project = ProjectFile(args.path)
+    except (OSError, ProjectError) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    with project:
+        if args.command == "info":
+            x0, y0, x1, y1 = project.bounds
+            print(f"{project.count} öğe, {len(project.blocks)} blok ({project.tile} px bölgeler)")
+            print(f"Sınırlar: ({x0:.0f}, {y0:.0f}) - ({x1:.0f}, {y1:.0f}), arka plan {project.background}")
+            return 0
+        rect = (args.x0, args.y0, args.x1, args.y1)
+        started = time.perf_counter()
+        blocks = len(project.blocks_in(rect))
+        if args.command == "extract":
+            index = extract_region(project, rect, args.output)
+            result = f"{index['count']} öğe"
+        else:
+            render_region(project, rect, args.scale).save(args.output)
+            result = "çizildi"
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{args.output}: {result} ({blocks}/{len(project.blocks)} blok okundu, {elapsed:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
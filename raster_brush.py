@@ -0,0 +1,510 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from abstract_classes import DrawingTool, HistoryAction
+from canvas_items import DOCUMENT_ITEMS, OVERLAY_TAG
+from drawing_tools import StarBrush
+
+# Kenar yumuşatmalı (anti-aliased) raster fırça motoru
+# ====================================================
+# Vektör fırçalar her damga için ayrı bir kanvas öğesi oluşturur ve Tk bu
+# şekilleri kenar yumuşatması olmadan çizer. Raster fırçalar ise önceden
+# hesaplanmış yumuşak kenarlı alfa maskelerini (damga / dab) NumPy ile bir
+# RGBA döşeme (tile) tamponuna basar. Maskeler şekil, boyut ve sertliğe göre
+# LRU önbellekte tutulur; bir çizgi boyunca sabit aralıklarla damgalanır.
+#
+# Ekranda her döşeme ayrı bir PhotoImage ile gösterilir. Damgalanan döşemeler
+# "kirli" olarak işaretlenir ve kare başına (FRAME_MS) yalnızca bu döşemeler
+# güncellenir; tüm tuvalin resmi hiçbir zaman yeniden oluşturulmaz.
+#
+# Birden fazla çekirdek varsa damgalama ve döşemelerin ekran biçimine
+# çevrilmesi ayrı bir süreçte yapılır (bkz. raster_worker); fırça yalnızca
+# damga noktalarını ve damganın tanımını (spec) tampona iletir.
+
+RASTER_TAG = "raster"
+# Döşeme kenar uzunluğu (piksel)
+TILE = 128
+# Ekran güncellemeleri arasındaki süre (ms)
+FRAME_MS = 16
+# Damga aralığının fırça çapına oranı
+SPACING = 0.25
+# Yıldız maskesi bu kadar büyük çizilip küçültülerek yumuşatılır
+_SUPERSAMPLE = 4
+
+
+@lru_cache(maxsize=64)
+def dab_mask(shape, size, hardness):
+    """
+    Bir damganın yumuşak kenarlı alfa maskesini (0-1, float32) döndürür.
+
+    Şekillerin ölçüleri vektör fırçalarla aynıdır: oval ve kare için
+    yarıçap brush_size, yıldız için StarBrush.points kullanılır.
+    hardness 1'e yaklaştıkça kenar keskinleşir (en az 1 piksellik geçiş kalır).
+    """
+    radius = size * 1.6 if shape == "star" else size
+    half = int(math.ceil(radius)) + 1
+    if shape == "star":
+        # Bulanıklaştırılan kenarın kesilmemesi için pay bırakılır
+        return _star_mask(size, half + int(math.ceil(size * (1.0 - hardness))), hardness)
+    axis = np.arange(-half, half + 1, dtype=np.float32)
+    if shape == "square":
+        distance = np.maximum(np.abs(axis)[:, None], np.abs(axis)[None, :])
+    else:
+        distance = np.hypot(axis[:, None], axis[None, :])
+    falloff = max(radius * (1.0 - hardness), 1.0)
+    mask = np.clip((radius + 0.5 - distance) / falloff, 0.0, 1.0)
+    return mask.astype(np.float32)
+
+
+def _star_mask(size, half, hardness):
+    """Yıldız maskesini büyük çizip küçülterek kenar yumuşatmalı üretir"""
+    from PIL import Image, ImageDraw, ImageFilter
+    side = 2 * half + 1
+    scale = _SUPERSAMPLE
+    image = Image.new("L", (side * scale, side * scale), 0)
+    center = (half + 0.5) * scale
+    points = StarBrush.points(center, center, size * scale)
+    ImageDraw.Draw(image).polygon(points, fill=255)
+    image = image.reduce(scale)
+    blur = size * (1.0 - hardness) / 2
+    if blur > 0.5:
+        image = image.filter(ImageFilter.GaussianBlur(blur))
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def parse_color(canvas, color):
+    """Tk renk değerini 0-1 aralığında RGB dizisine çevirir"""
+    r, g, b = canvas.winfo_rgb(color)
+    return np.array((r, g, b), dtype=np.float32) / 65535.0
+
+
+def make_dab(mask, rgb, opacity=1.0):
+    """
+    Maske ve renkten basılmaya hazır damgayı hazırlar.
+
+    (önceden çarpılmış RGBA kaynak, 1 - alfa) çifti döndürür; böylece her
+    damga tampona yalnızca bir çarpma ve bir toplama ile işlenir. 1 - alfa
+    dört kanala çoğaltılır; yayınlamalı (broadcast) çarpma belirgin şekilde
+    yavaştır. Renk bir çizgi boyunca değişmediği için damga çizgi başına bir
+    kez hazırlanır.
+    """
+    alpha = (mask * opacity)[..., None]
+    source = alpha * np.append(rgb, 1.0).astype(np.float32)
+    return source, np.repeat(1.0 - alpha, 4, axis=2)
+
+
+@lru_cache(maxsize=16)
+def dab_for(shape, size, hardness, rgb):
+    """Şekil, boyut, sertlik ve renk (0-1 RGB demeti) için hazır damgayı döndürür"""
+    return make_dab(dab_mask(shape, size, hardness), np.array(rgb, dtype=np.float32))
+
+
+def tile_rgba(tile):
+    """Önceden çarpılmış float döşemeyi 8 bitlik düz (straight) RGBA diziye çevirir"""
+    alpha = tile[..., 3:4]
+    rgb = np.divide(tile[..., :3], alpha, out=np.zeros_like(tile[..., :3]), where=alpha > 0)
+    return (np.concatenate((rgb, alpha), axis=2) * 255 + 0.5).astype(np.uint8)
+
+
+def rgba_tile(pixels):
+    """8 bitlik düz RGBA diziyi önceden çarpılmış float döşemeye çevirir (tile_rgba'nın tersi)"""
+    tile = np.asarray(pixels, dtype=np.float32) / 255.0
+    tile[..., :3] *= tile[..., 3:4]
+    return tile
+
+
+class RasterBuffer:
+    """
+    Seyrek (sparse) RGBA döşeme tamponu.
+
+    Döşemeler ilk boyandıklarında oluşturulur ve önceden çarpılmış
+    (premultiplied) alfa ile float32 olarak saklanır; böylece "üstüne
+    bindirme" (over) tek bir çarpma-toplama işlemidir. Bir çizgi boyunca
+    değişen döşemelerin eski hali ilk dokunuşta kopyalanır; geçmiş yalnızca
+    bu döşemeleri saklar.
+    """
+    def __init__(self):
+        self._tiles = {}
+        self._dirty = set()
+        self._backup = None
+        # Her değişiklikte artan sayaç ve döşemelerin son değiştiği sayaç değeri;
+        # ekrandan bağımsız izleyiciler (ör. kare çıkışı) için
+        self._revision = 0
+        self._revisions = {}
+
+    def stamp(self, x, y, dab):
+        """Damgayı (make_dab) (x, y) merkezli olarak tampona basar"""
+        source, inverse = dab
+        height, width = inverse.shape[:2]
+        left = int(round(x)) - width // 2
+        top = int(round(y)) - height // 2
+        # Tuvalin sol ve üst kenarının dışında kalan döşemeler oluşturulmaz
+        for tx in range(max(left // TILE, 0), (left + width - 1) // TILE + 1):
+            for ty in range(max(top // TILE, 0), (top + height - 1) // TILE + 1):
+                # Damganın bu döşemeye düşen kısmı
+                x0, y0 = max(left, tx * TILE), max(top, ty * TILE)
+                x1 = min(left + width, (tx + 1) * TILE)
+                y1 = min(top + height, (ty + 1) * TILE)
+                tile = self._touch((tx, ty))
+                region = tile[y0 - ty * TILE:y1 - ty * TILE, x0 - tx * TILE:x1 - tx * TILE]
+                region *= inverse[y0 - top:y1 - top, x0 - left:x1 - left]
+                region += source[y0 - top:y1 - top, x0 - left:x1 - left]
+
+    def stamp_dabs(self, points, spec):
+        """Noktalara spec = (şekil, boyut, sertlik, rgb) damgasını basar"""
+        dab = dab_for(*spec)
+        for x, y in points:
+            self.stamp(x, y, dab)
+
+    def begin_stroke(self):
+        """Yeni bir çizgi için döşeme yedeklerini sıfırlar"""
+        self._backup = {}
+
+    def end_stroke(self):
+        """
+        Çizgide değişen döşemelerin (önceki, sonraki) hallerini döndürür.
+
+        Çizgiden önce var olmayan döşemeler için önceki hal None'dır.
+        """
+        before, self._backup = self._backup or {}, None
+        after = {key: self._tiles[key].copy() for key in before}
+        return before, after
+
+    def stroke_action(self):
+        """Çizgiyi bitirir ve geri alma işlemini döndürür (döşeme değişmediyse None)"""
+        before, after = self.end_stroke()
+        return RasterStrokeAction(before, after) if before else None
+
+    def put_tiles(self, tiles):
+        """Döşemeleri verilen hallere getirir (None döşemeyi siler)"""
+        for key, tile in tiles.items():
+            if tile is None:
+                self._tiles.pop(key, None)
+            else:
+                self._tiles[key] = tile.copy()
+            self._dirty.add(key)
+            self._revision += 1
+            self._revisions[key] = self._revision
+
+    def tiles(self):
+        """Tüm döşemelerin kopyasını döndürür"""
+        return {key: tile.copy() for key, tile in self._tiles.items()}
+
+    def keys(self):
+        """Var olan döşemelerin anahtarları"""
+        return list(self._tiles)
+
+    def mark_dirty(self, keys):
+        """Döşemelerin ekranda yeniden gösterilmesini sağlar"""
+        self._dirty.update(key for key in keys if key in self._tiles)
+
+    def take_dirty(self):
+        """Son çağrıdan bu yana değişen döşemelerin anahtarlarını döndürür"""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def changed_since(self, revision):
+        """
+        Verilen sayaç değerinden sonra değişen döşemelerin kopyalarını
+        (silinenler için None) ve güncel sayaç değerini döndürür.
+        """
+        changed = {
+            key: (self._tiles[key].copy() if key in self._tiles else None)
+            for key, changed_at in self._revisions.items() if changed_at > revision
+        }
+        return changed, self._revision
+
+    def rgba(self, key):
+        """Döşemeyi ekranda gösterilecek 8 bitlik düz (straight) RGBA diziye çevirir"""
+        tile = self._tiles.get(key)
+        if tile is None:
+            return None
+        return tile_rgba(tile)
+
+    def _touch(self, key):
+        """Döşemeyi (yoksa oluşturarak) döndürür, çizgi yedeğini ve kirli işaretini tutar"""
+        tile = self._tiles.get(key)
+        if self._backup is not None and key not in self._backup:
+            self._backup[key] = None if tile is None else tile.copy()
+        if tile is None:
+            tile = self._tiles[key] = np.zeros((TILE, TILE, 4), dtype=np.float32)
+        self._dirty.add(key)
+        self._revision += 1
+        self._revisions[key] = self._revision
+        return tile
+
+
+class RasterLayer:
+    """
+    Bir tuvalin raster tamponunu döşeme başına bir PhotoImage ile gösterir.
+
+    Katman referans resminin üstünde durur ve belgeye ait sayılmaz (overlay
+    etiketi taşır). Yeni döşemeler o ana kadar çizilmiş vektör öğelerin
+    üstüne yerleşir; böylece çizgiler çizildikleri sırayla görünür. Her
+    tuval için tek bir katman vardır (for_canvas).
+    """
+    _layers = {}
+
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self.buffer = _create_buffer()
+        self._photos = {}
+        self._items = {}
+        self._flush_job = None
+        # Döşeme öğesi oluşturulup silindikçe artar (bkz. tile_positions)
+        self.placements = 0
+
+    @classmethod
+    def for_canvas(cls, canvas):
+        """Tuvalin katmanını döndürür; yoksa oluşturur"""
+        layer = cls._layers.get(str(canvas))
+        if layer is None:
+            layer = cls._layers[str(canvas)] = cls(canvas)
+        return layer
+
+    @classmethod
+    def existing(cls, canvas):
+        """Tuvalin katmanı oluşturulmuşsa döndürür, yoksa None"""
+        return cls._layers.get(str(canvas))
+
+    def schedule_flush(self):
+        """Kirli döşemelerin bir sonraki karede güncellenmesini sağlar"""
+        if self._flush_job is None:
+            self._flush_job = self._canvas.after(FRAME_MS, self.flush)
+
+    def flush(self):
+        """Yalnızca kirli döşemelerin ekrandaki resmini günceller"""
+        from PIL import Image, ImageTk
+        self._flush_job = None
+        for key in self.buffer.take_dirty():
+            pixels = self.buffer.rgba(key)
+            if pixels is None:
+                self._photos.pop(key, None)
+                item = self._items.pop(key, None)
+                if item is not None:
+                    self._canvas.delete(item)
+                    self.placements += 1
+                continue
+            image = Image.fromarray(pixels, "RGBA")
+            photo = self._photos.get(key)
+            if photo is not None:
+                photo.paste(image)
+                continue
+            photo = self._photos[key] = ImageTk.PhotoImage(image)
+            self._items[key] = self._canvas.create_image(
+                key[0] * TILE, key[1] * TILE, image=photo, anchor="nw",
+                tags=(OVERLAY_TAG, RASTER_TAG)
+            )
+            self._place(self._items[key])
+            self.placements += 1
+        # İşçi süreç (raster_worker) hâlâ çiziyorsa sonraki karede yeniden bakılır
+        if getattr(self.buffer, "busy", False):
+            self.schedule_flush()
+
+    def restore(self, tiles, positions=None):
+        """
+        Döşemeleri geri yükler ve ekranı hemen günceller.
+
+        positions (bkz. tile_positions) verilirse döşemeler belge öğelerinin
+        arasındaki eski yerlerine taşınır.
+        """
+        self.buffer.put_tiles(tiles)
+        if positions:
+            # İşçi süreçli tamponda döşemelerin yayınlanması beklenir (keys bekler)
+            self.buffer.keys()
+        self.flush()
+        if positions:
+            documents = self._canvas.find_withtag(DOCUMENT_ITEMS)
+            for key, position in positions.items():
+                item = self._items.get(key)
+                if item is None or not documents:
+                    continue
+                if position <= 0:
+                    self._canvas.tag_lower(item, documents[0])
+                else:
+                    self._canvas.tag_raise(item, documents[min(position, len(documents)) - 1])
+
+    def clear(self):
+        """Tüm raster çizimi siler ve geri alınabilir işlemini döndürür"""
+        before = self.buffer.tiles()
+        if not before:
+            return None
+        positions = self.tile_positions()
+        after = dict.fromkeys(before)
+        self.restore(after)
+        return RasterStrokeAction(before, after, positions)
+
+    def tile_positions(self):
+        """
+        Ekrandaki her döşemenin altında kalan belge öğesi sayısı ({anahtar: sayı}).
+
+        Dışa aktarmalar döşemeleri kayıtların arasına bu sırayla yerleştirir;
+        henüz ekrana çıkmamış döşemeler tüm kayıtların üstündedir.
+        """
+        if not self._items:
+            return {}
+        keys = {item: key for key, item in self._items.items()}
+        positions = {}
+        below = 0
+        # find withtag öğeleri yığın sırasıyla (alttan üste) döndürür
+        for item in self._canvas.find_withtag(f"{DOCUMENT_ITEMS}||{RASTER_TAG}"):
+            key = keys.get(item)
+            if key is None:
+                below += 1
+            else:
+                positions[key] = below
+        return positions
+
+    def _place(self, item):
+        """Yeni döşemeyi çizimlerin (yoksa referans resminin ve arka plan dolgusunun) üstüne yerleştirir"""
+        from fills import BACKGROUND_TAG
+        from reference_image import REFERENCE_TAG
+        self._canvas.tag_lower(item)
+        # Tk, birden fazla öğe eşleşirse en üsttekinin üstüne taşır; seçim
+        # kutusu gibi diğer yardımcı öğeler döşemenin üstünde kalır
+        below = f"{DOCUMENT_ITEMS}||{REFERENCE_TAG}||{BACKGROUND_TAG}"
+        if self._canvas.find_withtag(below):
+            self._canvas.tag_raise(item, below)
+
+
+def _create_buffer():
+    """Birden fazla çekirdek varsa işçi süreçli tampon, yoksa yerel tampon"""
+    from raster_worker import USE_WORKER, WorkerRasterBuffer
+    if USE_WORKER:
+        try:
+            return WorkerRasterBuffer()
+        except (OSError, ImportError):
+            pass
+    return RasterBuffer()
+
+
+class RasterStrokeAction(HistoryAction):
+    """
+    Raster çizginin değiştirdiği döşemelerin önceki ve sonraki hallerini saklar.
+
+    Raster katman belge kayıtlarının dışında olduğu için apply kayıtları
+    değiştirmez. positions (bkz. RasterLayer.tile_positions) verilirse geri
+    yüklenen döşemeler vektör öğelerin arasındaki yerlerine döner (ör. tuvali
+    temizlemenin geri alınması ya da projeden yüklenen döşemeler).
+    """
+    def __init__(self, before, after, positions=None):
+        self._before = before
+        self._after = after
+        self._positions = positions
+
+    def undo(self, canvas):
+        RasterLayer.for_canvas(canvas).restore(self._before, self._positions)
+
+    def redo(self, canvas):
+        RasterLayer.for_canvas(canvas).restore(self._after, self._positions)
+
+    def apply(self, records):
+        return records
+
+    def revert(self, records):
+        return records
+
+
+class RasterBrush(DrawingTool):
+    """
+    Raster fırçaların ortak davranışı.
+
+    Fare hareketleri arasındaki yol, fırça çapının SPACING katı aralıklarla
+    damgalanır; kalan mesafe bir sonraki harekete aktarılır, böylece damga
+    aralığı olay sıklığından bağımsızdır.
+    """
+    shape = "oval"
+
+    def __init__(self, hardness=0.8):
+        self.hardness = hardness
+        self._last = None
+        self._carry = 0.0
+        self._layer = None
+        self._spec = None
+        self._dab_key = None
+        self._pending_action = None
+
+    def start(self, canvas, x, y):
+        self._layer = RasterLayer.for_canvas(canvas)
+        self._layer.buffer.begin_stroke()
+        self._last = None
+        self._carry = 0.0
+
+    def draw(self, canvas, x, y, brush_size, color):
+        """Son noktadan bu noktaya kadar damgalar; kanvas öğesi oluşturmaz"""
+        if self._layer is None:
+            self.start(canvas, x, y)
+        key = (brush_size, color, round(self.hardness, 2))
+        if key != self._dab_key:
+            # Damga tamponda (ya da işçi süreçte) bu küçük tanımdan hazırlanır
+            rgb = tuple(parse_color(canvas, color).tolist())
+            self._spec = (self.shape, brush_size, key[2], rgb)
+            self._dab_key = key
+        if self._last is None:
+            points = [(x, y)]
+        else:
+            points = self._spaced_points(self._last, (x, y), brush_size)
+        self._layer.buffer.stamp_dabs(points, self._spec)
+        self._last = (x, y)
+        self._layer.schedule_flush()
+        return None
+
+    def end(self, canvas, x, y, brush_size, color):
+        """Çizgiyi bitirir ve değişen döşemeleri geçmiş işlemi olarak hazırlar"""
+        if self._layer is None:
+            return None
+        if self._last is None:
+            # Sürüklemeden tıklama: tek damga
+            self.draw(canvas, x, y, brush_size, color)
+        self._pending_action = self._layer.buffer.stroke_action()
+        self._layer.flush()
+        self._layer = None
+        self._last = None
+        return None
+
+    def take_history_action(self):
+        """Son çizginin geçmiş işlemini döndürür (yoksa None)"""
+        action, self._pending_action = self._pending_action, None
+        return action
+
+    def _spaced_points(self, start, end, brush_size):
+        spacing = max(1.0, brush_size * 2 * SPACING)
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length = math.hypot(dx, dy)
+        distance = spacing - self._carry
+        points = []
+        while distance <= length:
+            t = distance / length
+            points.append((start[0] + dx * t, start[1] + dy * t))
+            distance += spacing
+        self._carry = length - (distance - spacing)
+        return points
+
+
+class RasterOvalBrush(RasterBrush):
+    """Yumuşak kenarlı yuvarlak raster fırça"""
+    shape = "oval"
+
+    @property
+    def name(self):
+        return "Raster Yuvarlak"
+
+
+class RasterSquareBrush(RasterBrush):
+    """Yumuşak kenarlı kare raster fırça"""
+    shape = "square"
+
+    @property
+    def name(self):
+        return "Raster Kare"
+
+
+class RasterStarBrush(RasterBrush):
+    """Yumuşak kenarlı yıldız raster fırça"""
+    shape = "star"
+
+    @property
+    def name(self):
+        return "Raster Yıldız"
@@ -0,0 +1,101 @@
+# Kanvas kayıtlarını piksel görüntüsüne çizme (rasterleştirme)
+# ===========================================================
+# canvas_items kayıtları (item_type, coords, options) PIL ile bir görüntü
+# tamponuna çizilir. Ekran görüntüsü almadan dışa aktarma, zaman atlamalı
+# video ve önizleme gibi özellikler bu modülü kullanır.
+# PIL, modül içe aktarıldığında değil ilk çizimde yüklenir.
+
+
+def _width(options):
+    """Tk genişlik değerini (ör. "5.0") PIL için tam sayıya çevirir"""
+    try:
+        return max(1, int(round(float(options.get("width", 1)))))
+    except ValueError:
+        return 1
+
+
+def _color(value):
+    """Boş Tk renk değerini (saydam) None'a çevirir"""
+    return value or None
+
+
+def render_record(draw, record):
+    """Tek bir kaydı PIL ImageDraw nesnesine çizer"""
+    item_type, coords, options = record
+    if not coords:
+        return
+    coords = [float(c) for c in coords]
+    fill = _color(options.get("fill"))
+    outline = _color(options.get("outline"))
+    if item_type == "oval":
+        draw.ellipse(_bbox(coords), fill=fill, outline=outline, width=_width(options))
+    elif item_type == "rectangle":
+        draw.rectangle(_bbox(coords), fill=fill, outline=outline, width=_width(options))
+    elif item_type == "polygon":
+        draw.polygon(coords, fill=fill, outline=outline)
+    elif item_type == "line":
+        if fill:
+            draw.line(coords, fill=fill, width=_width(options), joint="curve")
+
+
+def _bbox(coords):
+    """Koordinatları PIL'in beklediği (x0 <= x1, y0 <= y1) sıraya getirir"""
+    x0, y0, x1, y1 = coords[:4]
+    return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+
+def render_records(image, records, offset=(0, 0)):
+    """
+    Kayıt listesini mevcut bir görüntünün üzerine çizer.
+
+    offset, kanvas koordinatlarından görüntü koordinatlarına kaydırmadır;
+    tuvalin yalnızca bir bölgesini çizmek için kullanılır.
+    """
+    from PIL import ImageDraw
+    draw = ImageDraw.Draw(image)
+    dx, dy = offset
+    for record in records:
+        if record[0] == "image":
+            _paste_image(image, record, dx, dy)
+            continue
+        if dx or dy:
+            item_type, coords, options = record
+            coords = [float(c) - (dy if i % 2 else dx) for i, c in enumerate(coords)]
+            record = (item_type, coords, options)
+        render_record(draw, record)
+    return image
+
+
+def render_layers(image, records, tiles, offset=(0, 0)):
+    """
+    Kayıtları ve raster döşemelerini kanvastaki yığın sırasıyla çizer.
+
+    tiles, (konum, (x, y), RGBA görüntü) demetleridir; konum döşemenin
+    altında kalan kayıt sayısıdır (bkz. RasterLayer.tile_positions).
+    """
+    dx, dy = offset
+    drawn = 0
+    for position, (x, y), tile in sorted(tiles, key=lambda tile: tile[0]):
+        if position > drawn:
+            render_records(image, records[drawn:position], offset)
+            drawn = position
+        image.paste(tile.convert(image.mode), (x - dx, y - dy), tile)
+    return render_records(image, records[drawn:], offset)
+
+
+def _paste_image(image, record, dx, dy):
+    """Birleştirilmiş çizim gibi görüntü kayıtlarını saydamlığıyla yapıştırır"""
+    from canvas_items import image_for
+    _, coords, options = record
+    source = image_for(options.get("image"))
+    if source is None or not coords:
+        return
+    position = (int(round(float(coords[0]) - dx)), int(round(float(coords[1]) - dy)))
+    mask = source if source.mode == "RGBA" else None
+    image.paste(source.convert(image.mode), position, mask)
+
+
+def new_image(width, height, background="#FFFFFF"):
+    """Verilen arka plan rengiyle boş bir RGB görüntü oluşturur"""
+    from PIL import Image
+    return Image.new("RGB", (int(width), int(height)), background)
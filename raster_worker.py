@@ -0,0 +1,349 @@
+import atexit
+import itertools
+import os
+import queue
+import struct
+import time
+import weakref
+from multiprocessing import get_context, parent_process, shared_memory
+
+import numpy as np
+
+from raster_brush import FRAME_MS, TILE, RasterBuffer, RasterLayer, RasterStrokeAction, rgba_tile
+
+# Raster fırçaların işçi süreçte çizilmesi
+# ========================================
+# Raster fırça damgalaması ve döşemelerin ekran biçimine (8 bitlik RGBA)
+# çevrilmesi Tk iş parçacığında yapılırsa büyük fırçalarda fare olayları
+# gecikir. Birden fazla çekirdek varsa bu işler ayrı bir süreçte yapılır:
+#
+#   - Tk tarafı (WorkerRasterBuffer) yalnızca küçük komutlar gönderir:
+#     damga noktaları ve damga tanımı (şekil, boyut, sertlik, renk),
+#     çizgi başı / sonu, döşeme geri yükleme.
+#   - İşçi süreç asıl RasterBuffer'ı tutar, komutları ~8 ms'lik dilimlerde
+#     işler ve her dilimden sonra değişen döşemeleri paylaşılan bellekteki
+#     bir yuva halkasına yazar; ardından hangi döşemenin hangi yuvada
+#     olduğunu bildiren kısa bir ileti gönderir.
+#   - Tk tarafı her karede iletileri okur, döşemeyi yuvadan kopyalar ve
+#     PhotoImage.paste ile gösterir (bkz. RasterLayer.flush).
+#
+# Paylaşılan bellek düzeni: SLOTS adet u64 sıra numarası, ardından SLOTS
+# adet TILE x TILE x 4 baytlık döşeme. Yazma sürerken yuvanın sıra numarası
+# 0'dır; okuyucu kopyalamadan önce ve sonra numarayı karşılaştırır. Halka
+# dolup yuva okunmadan üzerine yazıldıysa döşeme yeniden istenir.
+#
+# Çizginin geri alma verisi (değişen döşemelerin önceki / sonraki halleri)
+# işçide kalır; geçmiş işlemi yalnızca çizginin numarasını tutar ve geri
+# alma / yineleme işçiye tek bir komut gönderir. Veri yalnızca geçmiş
+# pickle edilirken (sekme askıya alınırken) Tk tarafına taşınır; işlem
+# bellekten silinince işçideki verisi de bırakılır.
+
+# Paylaşılan bellekteki döşeme yuvası sayısı
+SLOTS = 256
+TILE_BYTES = TILE * TILE * 4
+# İşçinin iki yayın arasında komut işleyeceği süre (s)
+SLICE_SECONDS = 0.008
+# Tek çekirdekte ayrı süreç yalnızca ek yük getirir
+USE_WORKER = (getattr(os, "process_cpu_count", os.cpu_count)() or 1) > 1
+
+_SEQ = struct.Struct("<Q")
+
+
+def _attach(name):
+    """İşçi tarafında paylaşılan belleğe sahiplenmeden bağlanır"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawn ile başlatılan işçi Tk sürecinin kaynak
+        # izleyicisini paylaşır; kayıt aynıdır, bellek Tk tarafında silinir
+        return shared_memory.SharedMemory(name=name)
+
+
+def _slot_pixels(shm, slots):
+    return np.ndarray((slots, TILE, TILE, 4), dtype=np.uint8, buffer=shm.buf, offset=slots * _SEQ.size)
+
+
+def _worker_main(commands, results, shm_name, slots):
+    """İşçi sürecin ana döngüsü"""
+    shm = _attach(shm_name)
+    pixels = _slot_pixels(shm, slots)
+    buffer = RasterBuffer()
+    # Çizgi numarası -> (önceki, sonraki) döşemeler
+    strokes = {}
+    sequence = 0
+    processed = 0
+    published = 0.0
+    running = True
+    while running:
+        try:
+            command = commands.get(timeout=1.0)
+        except queue.Empty:
+            # Tk süreci beklenmedik şekilde kapandıysa işçi de çıkar
+            if not parent_process().is_alive():
+                break
+            continue
+        # Yayınlar ekran kare hızını aşmaz; o zamana kadar gelen komutlar birikir
+        deadline = max(published + FRAME_MS / 1000, time.perf_counter() + SLICE_SECONDS)
+        while True:
+            kind = command[0]
+            if kind == "dabs":
+                buffer.stamp_dabs(command[1], command[2])
+            elif kind == "begin":
+                buffer.begin_stroke()
+            elif kind == "end":
+                before, after = buffer.end_stroke()
+                if before:
+                    strokes[command[1]] = (before, after)
+            elif kind == "restore":
+                # Geri alma (0) ya da yineleme (1)
+                if command[1] in strokes:
+                    buffer.put_tiles(strokes[command[1]][command[2]])
+            elif kind == "forget":
+                strokes.pop(command[1], None)
+            elif kind == "put":
+                buffer.put_tiles(command[1])
+            elif kind == "tiles":
+                results.put(("reply", command[1], buffer.tiles()))
+            elif kind == "stroke_tiles":
+                results.put(("reply", command[1], strokes.get(command[2], ({}, {}))))
+            elif kind == "resend":
+                buffer.mark_dirty(command[1])
+            elif kind == "stop":
+                running = False
+                break
+            processed += 1
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                command = commands.get(timeout=remaining)
+            except queue.Empty:
+                break
+        entries = []
+        for key in buffer.take_dirty():
+            rgba = buffer.rgba(key)
+            if rgba is None:
+                entries.append((key, None, 0))
+                continue
+            sequence += 1
+            slot = sequence % slots
+            _SEQ.pack_into(shm.buf, slot * _SEQ.size, 0)
+            pixels[slot] = rgba
+            _SEQ.pack_into(shm.buf, slot * _SEQ.size, sequence)
+            entries.append((key, slot, sequence))
+        results.put(("publish", processed, entries))
+        published = time.perf_counter()
+    del pixels
+    shm.close()
+
+
+class _WorkerStrokeAction(RasterStrokeAction):
+    """
+    İşçi süreçte çizilen bir çizginin geçmiş işlemi.
+
+    Döşemeler işçide kalır; pickle edilen işlem verisiyle birlikte sıradan
+    bir RasterStrokeAction olur.
+    """
+    def __init__(self, buffer, stroke):
+        super().__init__(None, None)
+        self._buffer = buffer
+        self._stroke = stroke
+        # Çıkışta işçi zaten kapatılır; bırakma komutlarına gerek yoktur
+        weakref.finalize(self, buffer.forget_stroke, stroke).atexit = False
+
+    def undo(self, canvas):
+        self._buffer.restore_stroke(self._stroke, 0)
+        RasterLayer.for_canvas(canvas).flush()
+
+    def redo(self, canvas):
+        self._buffer.restore_stroke(self._stroke, 1)
+        RasterLayer.for_canvas(canvas).flush()
+
+    def __reduce__(self):
+        return RasterStrokeAction, self._buffer.stroke_tiles(self._stroke)
+
+
+class WorkerRasterBuffer:
+    """
+    RasterBuffer ile aynı arayüze sahip, çizimi işçi sürece yaptıran tampon.
+
+    Döşemelerin ekran biçimindeki (8 bitlik RGBA) son halleri Tk tarafında
+    tutulur; tiles ve keys gibi kesin sonuç gereken çağrılar işçinin
+    bekleyen komutları bitirmesini bekler.
+    """
+    def __init__(self, slots=SLOTS):
+        context = get_context("spawn")
+        self._slots = slots
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * (_SEQ.size + TILE_BYTES))
+        self._pixels = _slot_pixels(self._shm, slots)
+        self._commands = context.Queue()
+        self._results = context.Queue()
+        self._process = context.Process(
+            target=_worker_main, args=(self._commands, self._results, self._shm.name, slots),
+            name="raster-worker", daemon=True
+        )
+        self._process.start()
+        self._sent = 0
+        self._processed = 0
+        self._rgba = {}
+        self._dirty = set()
+        self._revision = 0
+        self._revisions = {}
+        self._requests = itertools.count(1)
+        self._replies = {}
+        self._closed = False
+        atexit.register(self.close)
+
+    @property
+    def busy(self):
+        """İşçide henüz işlenmemiş komut varsa True"""
+        self.poll()
+        return self._processed < self._sent
+
+    def stamp_dabs(self, points, spec):
+        """Noktalara spec = (şekil, boyut, sertlik, rgb) damgasını bastırır"""
+        if points:
+            self._send(("dabs", points, spec))
+
+    def begin_stroke(self):
+        self._send(("begin",))
+
+    def stroke_action(self):
+        """Çizgiyi bitirir ve döşemeleri işçide kalan geri alma işlemini döndürür"""
+        stroke = next(self._requests)
+        self._send(("end", stroke))
+        return _WorkerStrokeAction(self, stroke)
+
+    def restore_stroke(self, stroke, index):
+        """Çizginin önceki (0) ya da sonraki (1) döşemelerini geri yükletir"""
+        self._send(("restore", stroke, index))
+
+    def stroke_tiles(self, stroke):
+        """Çizginin (önceki, sonraki) döşemelerini işçiden alır"""
+        return self._request("stroke_tiles", stroke)
+
+    def forget_stroke(self, stroke):
+        """Geçmişten çıkan çizginin işçideki verisini bırakır"""
+        if not self._closed:
+            self._send(("forget", stroke))
+
+    def put_tiles(self, tiles):
+        """Döşemeleri verilen hallere getirir (None döşemeyi siler)"""
+        self._send(("put", tiles))
+
+    def tiles(self):
+        """Tüm döşemelerin (önceden çarpılmış float) kopyasını döndürür"""
+        return self._request("tiles")
+
+    def keys(self):
+        """Bekleyen komutlar işlendikten sonra var olan döşemelerin anahtarları"""
+        self.wait(lambda: self._processed >= self._sent)
+        return list(self._rgba)
+
+    def take_dirty(self):
+        """Son çağrıdan bu yana işçinin yayınladığı döşemelerin anahtarları"""
+        self.poll()
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def rgba(self, key):
+        """Döşemenin en son yayınlanan 8 bitlik düz RGBA hali (yoksa None)"""
+        return self._rgba.get(key)
+
+    def changed_since(self, revision):
+        """
+        Verilen sayaç değerinden sonra değişen döşemeleri (önceden çarpılmış
+        float, silinenler için None) ve güncel sayaç değerini döndürür.
+        """
+        self.poll()
+        changed = {}
+        for key, changed_at in self._revisions.items():
+            if changed_at <= revision:
+                continue
+            rgba = self._rgba.get(key)
+            if rgba is None:
+                changed[key] = None
+                continue
+            changed[key] = rgba_tile(rgba)
+        return changed, self._revision
+
+    def poll(self):
+        """İşçiden gelen iletileri beklemeden işler"""
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._handle(message)
+
+    def wait(self, done, timeout=30.0):
+        """done() doğru olana kadar işçinin iletilerini işler"""
+        deadline = time.monotonic() + timeout
+        self.poll()
+        while not done():
+            try:
+                message = self._results.get(timeout=0.1)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError("raster işçi süreci durdu")
+                if time.monotonic() > deadline:
+                    raise TimeoutError("raster işçi süreci yanıt vermiyor")
+                continue
+            self._handle(message)
+
+    def close(self):
+        """İşçiyi durdurur ve paylaşılan belleği kaldırır"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._process.is_alive():
+            self._commands.put(("stop",))
+            self._process.join(1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        self._commands.close()
+        self._results.close()
+        self._pixels = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _send(self, command):
+        self._sent += 1
+        self._commands.put(command)
+
+    def _request(self, kind, *args):
+        """Yanıt bekleyen bir komut gönderir ve yanıtı döndürür"""
+        request = next(self._requests)
+        self._send((kind, request) + args)
+        self.wait(lambda: request in self._replies)
+        return self._replies.pop(request)
+
+    def _handle(self, message):
+        kind = message[0]
+        if kind == "publish":
+            self._processed = message[1]
+            missed = [key for key, slot, sequence in message[2] if not self._read(key, slot, sequence)]
+            if missed:
+                # Yuva okunmadan üzerine yazıldı; döşeme yeniden yayınlanır
+                self._send(("resend", missed))
+        elif kind == "reply":
+            self._replies[message[1]] = message[2]
+
+    def _read(self, key, slot, sequence):
+        """Döşemeyi yuvasından kopyalar; yuva bu arada değiştiyse False"""
+        if slot is None:
+            self._rgba.pop(key, None)
+        else:
+            offset = slot * _SEQ.size
+            if _SEQ.unpack_from(self._shm.buf, offset)[0] != sequence:
+                return False
+            rgba = self._pixels[slot].copy()
+            if _SEQ.unpack_from(self._shm.buf, offset)[0] != sequence:
+                return False
+            self._rgba[key] = rgba
+        self._dirty.add(key)
+        self._revision += 1
+        self._revisions[key] = self._revision
+        return True
@@ -0,0 +1,294 @@
+import json
+import os
+import queue
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from thumbnails import THUMBNAIL_SIZE
+
+# Son belgeler paneli
+# ===================
+# Kaydedilen ve açılan çizimler bir "son belgeler" listesinde tutulur ve
+# küçük resimleriyle bir ızgarada gösterilir. Liste yüzlerce girdi
+# içerebileceği için ızgara sanallaştırılmıştır: yalnızca görünen satırlar
+# için hücre (widget) oluşturulur, kaydırıldıkça ekrandan çıkan hücreler
+# yeni girdiler için yeniden kullanılır.
+#
+# Küçük resimler çalışan iş parçacıklarında (ThumbnailCache ile) üretilip
+# çözülür ve bir kuyruk üzerinden Tk iş parçacığına verilir; PhotoImage
+# yalnızca Tk iş parçacığında, yalnızca görünen girdiler için oluşturulur
+# ve sınırlı bir LRU önbellekte tutulur.
+
+# Hücre boyutu (piksel)
+CELL_WIDTH = THUMBNAIL_SIZE + 24
+CELL_HEIGHT = THUMBNAIL_SIZE + 40
+# Görünen alanın üstünde ve altında önceden hazırlanan satır sayısı
+OVERSCAN_ROWS = 1
+# Kuyruktan bir seferde alınan en fazla küçük resim (arayüz donmasın diye)
+_POLL_BATCH = 16
+_POLL_MS = 30
+# Ekrandan çıktığı için yüklenmeyen girdiler için kuyruğa konan işaret
+_SKIPPED = object()
+
+
+def default_recent_path():
+    """Kullanıcının yapılandırma klasöründeki son belgeler dosyasını döndürür"""
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "paint_app", "recent.json")
+
+
+class RecentDocuments:
+    """
+    Son kullanılan belgelerin yollarını (en yenisi başta) tutan liste.
+
+    Liste her değişiklikte küçük bir JSON dosyasına yazılır.
+    """
+    def __init__(self, path=None, limit=500):
+        self.path = path or default_recent_path()
+        self.limit = limit
+        self._paths = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._paths = [p for p in json.load(f) if isinstance(p, str)][:limit]
+        except (OSError, ValueError):
+            pass
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __getitem__(self, index):
+        return self._paths[index]
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def add(self, path):
+        """Belgeyi listenin başına taşır (ya da ekler)"""
+        path = os.path.abspath(path)
+        if path in self._paths:
+            self._paths.remove(path)
+        self._paths.insert(0, path)
+        del self._paths[self.limit:]
+        self._save()
+
+    def remove(self, path):
+        """Belgeyi listeden çıkarır (ör. dosya artık yoksa)"""
+        if path in self._paths:
+            self._paths.remove(path)
+            self._save()
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._paths, f)
+        except OSError:
+            # Liste yazılamazsa yalnızca bu oturumda tutulur
+            pass
+
+
+class _Cell:
+    """Izgaradaki tek bir hücre; kaydırıldıkça farklı girdiler için kullanılır"""
+    def __init__(self, panel):
+        canvas = panel._grid
+        self.frame = tk.Frame(canvas, width=CELL_WIDTH - 8, height=CELL_HEIGHT - 8,
+                              bg="#ffffff", cursor="hand2")
+        self.frame.pack_propagate(False)
+        self.image = tk.Label(self.frame, bg="#ffffff", text="…", fg="#999999")
+        self.image.pack(fill=tk.BOTH, expand=True)
+        self.title = tk.Label(self.frame, bg="#ffffff", font=("Segoe UI", 8),
+                              width=(CELL_WIDTH - 8) // 7, anchor="center")
+        self.title.pack(fill=tk.X)
+        self.window = canvas.create_window(0, 0, window=self.frame, anchor="nw")
+        self.path = None
+        for widget in (self.frame, self.image, self.title):
+            widget.bind("<Button-1>", lambda e: panel._open(self.path))
+            widget.bind("<MouseWheel>", panel._on_wheel)
+            widget.bind("<Button-4>", panel._on_wheel)
+            widget.bind("<Button-5>", panel._on_wheel)
+
+    def show(self, canvas, index, columns, path, photo):
+        """Hücreyi index. girdiyi gösterecek şekilde yerleştirir"""
+        row, column = divmod(index, columns)
+        canvas.coords(self.window, column * CELL_WIDTH + 4, row * CELL_HEIGHT + 4)
+        canvas.itemconfigure(self.window, state="normal")
+        if path != self.path:
+            self.path = path
+            self.title.config(text=os.path.basename(path))
+        self.set_photo(photo)
+
+    def set_photo(self, photo):
+        if photo is None:
+            self.image.config(image="", text="…")
+        else:
+            self.image.config(image=photo, text="")
+
+    def hide(self, canvas):
+        canvas.itemconfigure(self.window, state="hidden")
+        self.path = None
+
+
+class RecentDocumentsPanel:
+    """
+    Son belgeleri küçük resimleriyle gösteren, sanallaştırılmış ızgaralı pencere.
+
+    Pencere bir kez oluşturulur; kapatıldığında gizlenir. on_open, bir
+    girdiye tıklandığında belgenin yoluyla çağrılır.
+    """
+    def __init__(self, root, documents, thumbnail_cache, on_open, workers=2):
+        self._root = root
+        self._documents = documents
+        self._cache = thumbnail_cache
+        self._on_open = on_open
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recent")
+        self._results = queue.Queue()
+        # Tk iş parçacığında oluşturulmuş küçük resimler (LRU)
+        self._photos = OrderedDict()
+        # Görünen (istenen) girdiler ve yüklenmekte olanlar
+        self._wanted = set()
+        self._loading = set()
+        self._cells = {}
+        self._spare = []
+        self._columns = 1
+        self._poll_job = None
+
+        window = self._window = tk.Toplevel(root)
+        window.title("Son Belgeler")
+        window.geometry(f"{CELL_WIDTH * 4 + 40}x{CELL_HEIGHT * 3 + 20}")
+        window.protocol("WM_DELETE_WINDOW", self.hide)
+        scrollbar = tk.Scrollbar(window, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._grid = tk.Canvas(window, bg="#f0f0f0", highlightthickness=0,
+                               yscrollcommand=self._on_scrolled)
+        self._grid.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._scrollbar = scrollbar
+        scrollbar.config(command=self._grid.yview)
+        self._grid.bind("<Configure>", lambda e: self.refresh())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self._grid.bind(sequence, self._on_wheel)
+
+    def show(self):
+        """Pencereyi gösterir ve listeyi yeniler"""
+        self._window.deiconify()
+        self._window.lift()
+        self.refresh()
+        if self._poll_job is None:
+            self._poll_job = self._root.after(_POLL_MS, self._poll)
+
+    def hide(self):
+        """Pencereyi gizler; bekleyen yüklemeler atlanır, önbellek dizini kaydedilir"""
+        self._window.withdraw()
+        self._wanted.clear()
+        if self._poll_job is not None:
+            self._root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._cache.save()
+
+    def refresh(self):
+        """Izgaranın boyutunu ve görünen hücreleri günceller"""
+        width = max(self._grid.winfo_width(), CELL_WIDTH)
+        self._columns = max(1, width // CELL_WIDTH)
+        rows = -(-len(self._documents) // self._columns)
+        self._grid.config(scrollregion=(0, 0, self._columns * CELL_WIDTH, rows * CELL_HEIGHT))
+        self._layout()
+
+    def _on_scrolled(self, first, last):
+        self._scrollbar.set(first, last)
+        self._layout()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._grid.yview_scroll(-1, "units")
+        else:
+            self._grid.yview_scroll(1, "units")
+
+    def _visible_range(self):
+        """Görünen (ve önceden hazırlanan) girdilerin indeks aralığı"""
+        top = self._grid.canvasy(0)
+        bottom = top + self._grid.winfo_height()
+        first_row = max(0, int(top // CELL_HEIGHT) - OVERSCAN_ROWS)
+        last_row = int(bottom // CELL_HEIGHT) + OVERSCAN_ROWS
+        return (first_row * self._columns,
+                min(len(self._documents), (last_row + 1) * self._columns))
+
+    def _layout(self):
+        """Yalnızca görünen girdiler için hücre gösterir; diğer hücreleri geri kazanır"""
+        start, end = self._visible_range()
+        visible = range(start, end)
+        for index in [i for i in self._cells if i not in visible]:
+            cell = self._cells.pop(index)
+            cell.hide(self._grid)
+            self._spare.append(cell)
+        self._wanted = {self._documents[i] for i in visible}
+        for index in visible:
+            path = self._documents[index]
+            cell = self._cells.get(index)
+            if cell is None:
+                cell = self._cells[index] = self._spare.pop() if self._spare else _Cell(self)
+            photo = self._photos.get(path)
+            if photo is not None:
+                self._photos.move_to_end(path)
+            else:
+                self._request(path)
+            cell.show(self._grid, index, self._columns, path, photo)
+
+    def _request(self, path):
+        if path not in self._loading:
+            self._loading.add(path)
+            self._pool.submit(self._load, path)
+
+    def _load(self, path):
+        """Çalışan iş parçacığında: küçük resmi üretir/okur ve kuyruğa koyar"""
+        from PIL import Image
+        if path not in self._wanted:
+            # Bu arada ekrandan çıkan girdiler için iş yapılmaz
+            self._results.put((path, _SKIPPED))
+            return
+        image = None
+        try:
+            if os.path.exists(path):
+                thumbnail = self._cache.request(path).result()
+                with Image.open(thumbnail) as opened:
+                    image = opened.copy()
+        except Exception:
+            # Önizlemesi üretilemeyen belge "…" olarak kalır
+            image = None
+        self._results.put((path, image))
+
+    def _poll(self):
+        """Kuyruktaki küçük resimleri PhotoImage'a çevirip hücrelere yerleştirir"""
+        from PIL import ImageTk
+        for _ in range(_POLL_BATCH):
+            try:
+                path, image = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._loading.discard(path)
+            if path not in self._wanted:
+                continue
+            if image is _SKIPPED:
+                # Atlandıktan sonra yeniden görünür olmuş
+                self._request(path)
+                continue
+            if image is None:
+                continue
+            self._photos[path] = ImageTk.PhotoImage(image)
+            self._trim_photos()
+            for cell in self._cells.values():
+                if cell.path == path:
+                    cell.set_photo(self._photos[path])
+        self._poll_job = self._root.after(_POLL_MS, self._poll)
+
+    def _trim_photos(self):
+        """Görünmeyen en eski PhotoImage'ları bırakır"""
+        limit = max(2 * len(self._cells), 32)
+        for path in list(self._photos):
+            if len(self._photos) <= limit:
+                break
+            if path not in self._wanted:
+                del self._photos[path]
+
+    def _open(self, path):
+        if path is not None:
+            self._on_open(path)
@@ -0,0 +1,287 @@
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+from canvas_items import OVERLAY_TAG
+
+# Referans (arka plan) resmi ve mip-map piramidi
+# ==============================================
+# Büyük bir fotoğrafın üzerinden çizim yapmak için resim tuvalin en altına
+# yerleştirilir. Resim bir kez çözülür (decode) ve yarıya indirgenmiş
+# seviyelerden oluşan bir piramit hazırlanır. Ekranda, görünümün boyutuna en
+# yakın seviye gösterilir; hazırlanmış PhotoImage nesneleri sınırlı boyutlu
+# bir LRU önbellekte tutulur.
+#
+# Açılışta JPEG'in "draft" modu kullanılır: çözücü resmi doğrudan 1/2, 1/4
+# ya da 1/8 ölçekte açar; 50 megapiksellik bir resmin önizlemesi bu sayede
+# tam çözmeden çok daha kısa sürede hazır olur. Draft modu olmayan biçimler
+# (PNG vb.) Tk iş parçacığında hiç çözülmez: görünüme uyan seviye hazır olana
+# kadar resmin oranında düz bir yer tutucu gösterilir. Tam çözünürlük ve
+# görünüme uyan seviye arka planda tek bir çözmeyle hazırlanır.
+
+REFERENCE_TAG = "reference"
+# Görünüme uyan seviye çözülene kadar gösterilen yer tutucunun rengi
+PLACEHOLDER_COLOR = "#c8c8c8"
+
+
+class ImagePyramid:
+    """
+    Bir resmin yarıya indirgenmiş seviyelerini (mip-map) tutar.
+
+    Seviye 0 orijinal boyut, seviye n ise 1/2^n boyuttur. Seviyeler
+    ilk ihtiyaç duyulduğunda bir önceki seviyeden üretilir.
+    """
+    def __init__(self, path):
+        from PIL import Image
+        self._path = path
+        # Image.open yalnızca başlığı okur; piksel verisi henüz çözülmez
+        with Image.open(path) as header:
+            self.size = header.size
+            self.format = header.format
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    @property
+    def level_count(self):
+        """En küçük seviye 1 pikselden küçük olmayacak şekilde seviye sayısı"""
+        return int(math.log2(max(self.size))) + 1
+
+    def level_for(self, width, height):
+        """Verilen kutuya sığacak en küçük ayrıntı kaybı olan seviyeyi seçer"""
+        scale = min(width / self.size[0], height / self.size[1], 1.0)
+        if scale <= 0:
+            return self.level_count - 1
+        return min(int(math.floor(math.log2(1 / scale))), self.level_count - 1)
+
+    @property
+    def fast_preview(self):
+        """Biçim küçültülmüş ölçekte çözülebiliyor mu (JPEG draft modu)"""
+        return self.format == "JPEG"
+
+    def preview(self, width, height):
+        """
+        Görünüm boyutuna yakın bir önizlemeyi hızla çözer.
+
+        JPEG için çözücü doğrudan küçültülmüş ölçekte çalışır (draft modu);
+        diğer biçimlerde tam çözme gerekir, bu yüzden Tk iş parçacığında
+        yalnızca fast_preview doğruysa çağrılmalıdır.
+        """
+        from PIL import Image
+        # Oranı koruyarak görünüme sığan boyut istenir; böylece çözücü
+        # mümkün olan en küçük ölçeği seçebilir
+        scale = min(width / self.size[0], height / self.size[1], 1.0)
+        image = Image.open(self._path)
+        image.draft("RGB", (max(1, int(self.size[0] * scale)), max(1, int(self.size[1] * scale))))
+        return image.convert("RGB")
+
+    def decode(self):
+        """Resmi tam çözünürlükte bir kez çözer (arka plan iş parçacığında çağrılır)"""
+        from PIL import Image
+        with self._lock:
+            if 0 not in self._levels:
+                with Image.open(self._path) as image:
+                    self._levels[0] = image.convert("RGB")
+
+    def level(self, level):
+        """Verilen seviyenin resmini döndürür; gerekirse üst seviyeden üretir"""
+        with self._lock:
+            image = self._levels.get(level)
+            if image is not None:
+                return image
+        if level == 0:
+            self.decode()
+            return self._levels[0]
+        # Bir önceki seviyeden 2x2 kutu ortalamasıyla üret
+        image = self.level(level - 1).reduce(2)
+        with self._lock:
+            self._levels[level] = image
+        return image
+
+    @property
+    def decoded(self):
+        return 0 in self._levels
+
+
+def _unbind(widget, sequence, funcid):
+    """
+    Olaydan yalnızca funcid bağlamasını kaldırır.
+
+    Python < 3.13'te unbind(sequence, funcid) olaydaki tüm bağlamaları siler;
+    tuvalin diğer <Configure> dinleyicileri (simetri kılavuzları, arka plan
+    dolgusu) korunmalıdır.
+    """
+    script = widget.bind(sequence)
+    kept = [line for line in script.split("\n") if line.strip() and funcid not in line]
+    widget.bind(sequence, "\n".join(kept))
+    widget.deletecommand(funcid)
+
+
+class ReferenceImageLayer:
+    """
+    Piramitteki uygun seviyeyi tuvalin en altında gösteren katman.
+
+    Ekrandaki görüntü (PhotoImage) seviye, boyut ve arka plan rengine göre
+    LRU önbellekte saklanır; yeniden çizim ya da arka plan değişikliği
+    resmi yeniden çözmez.
+    """
+    def __init__(self, root, canvas, path, fade=0.5, max_cached=6, on_error=None):
+        self._root = root
+        self._canvas = canvas
+        self._pyramid = ImagePyramid(path)
+        self._fade = fade
+        self._max_cached = max_cached
+        self._on_error = on_error
+        self._photos = OrderedDict()
+        self._preview = None
+        # Arka plandaki çözme ve görünüm seviyesi hazır mı
+        self._decoded = False
+        self._item = None
+        self._background = canvas["background"]
+        self._ready = queue.Queue()
+        self._resize_job = None
+        self._configure_binding = canvas.bind("<Configure>", self._on_configure, add="+")
+
+    @property
+    def size(self):
+        return self._pyramid.size
+
+    def show(self):
+        """
+        Önizlemeyi (ya da yer tutucuyu) hemen gösterir; tam çözünürlüğü ve
+        görünüme uyan seviyeyi arka planda hazırlar.
+
+        Çözme başarısız olursa katman kaldırılır ve on_error hatayla çağrılır.
+        """
+        width, height = self._view_size()
+        if self._pyramid.fast_preview:
+            self._preview = self._pyramid.preview(width, height)
+        self._show_preview(width, height)
+        level = self._pyramid.level_for(width, height)
+        threading.Thread(target=self._decode_in_background, args=(level,), daemon=True).start()
+        self._root.after(50, self._poll_ready)
+
+    def set_background(self, color):
+        """Solma (fade) rengi için tuval arka planını günceller"""
+        self._background = color
+        self.refresh()
+
+    def refresh(self):
+        """Görünüm boyutuna uyan seviyeyi gösterir"""
+        width, height = self._view_size()
+        if self._decoded:
+            level = self._pyramid.level_for(width, height)
+            key = (level, width, height)
+            if self._cached(key) is None:
+                self._display(self._fit(self._pyramid.level(level), width, height), key)
+            else:
+                self._display(None, key)
+        else:
+            self._show_preview(width, height)
+
+    def remove(self):
+        """Katmanı tuvalden kaldırır ve önbelleği boşaltır"""
+        _unbind(self._canvas, "<Configure>", self._configure_binding)
+        if self._item is not None:
+            self._canvas.delete(self._item)
+            self._item = None
+        self._photos.clear()
+        self._preview = None
+
+    def _show_preview(self, width, height):
+        """Hızlı önizlemeyi ya da (yoksa) resmin oranında düz bir yer tutucuyu gösterir"""
+        if self._preview is None:
+            from PIL import Image
+            # Küçük bir düz resim; _fit onu görünüme büyütür
+            image_width, image_height = self._pyramid.size
+            scale = 64 / max(image_width, image_height)
+            size = (max(1, round(image_width * scale)), max(1, round(image_height * scale)))
+            placeholder = Image.new("RGB", size, PLACEHOLDER_COLOR)
+            self._display(self._fit(placeholder, width, height), ("placeholder", width, height))
+            return
+        self._display(self._fit(self._preview, width, height), ("preview", width, height))
+
+    def _decode_in_background(self, level):
+        """
+        Arka plan: resmi tam çözer ve görünüme uyan seviyeyi hazırlar.
+
+        Tk iş parçacığına sonuç (True) ya da hata kuyrukla bildirilir.
+        """
+        try:
+            self._pyramid.level(level)
+        except Exception as e:
+            self._ready.put(e)
+            return
+        self._ready.put(True)
+
+    def _poll_ready(self):
+        """Arka plandaki çözme bitince ekrandaki önizlemeyi iyileştirir"""
+        if self._item is None:
+            # Katman kaldırıldı
+            return
+        try:
+            result = self._ready.get_nowait()
+        except queue.Empty:
+            self._root.after(50, self._poll_ready)
+            return
+        if isinstance(result, Exception):
+            self.remove()
+            if self._on_error:
+                self._on_error(result)
+            return
+        self._decoded = True
+        self._preview = None
+        self.refresh()
+
+    def _view_size(self):
+        return max(1, self._canvas.winfo_width()), max(1, self._canvas.winfo_height())
+
+    def _fit(self, image, width, height):
+        """Resmi oranını koruyarak görünüme sığdırır ve arka plana doğru soldurur"""
+        from PIL import Image
+        scale = min(width / image.width, height / image.height)
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        if size != image.size:
+            image = image.resize(size, Image.Resampling.BILINEAR)
+        if self._fade:
+            overlay = Image.new("RGB", image.size, self._background)
+            image = Image.blend(image, overlay, self._fade)
+        return image
+
+    def _cached(self, key):
+        key = key + (self._background,)
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+        return photo
+
+    def _display(self, image, key):
+        """Görüntüyü (önbellekten ya da yeni hazırlanmış resimden) tuvalde gösterir"""
+        from PIL import ImageTk
+        photo = self._cached(key)
+        if photo is None:
+            photo = ImageTk.PhotoImage(image)
+            self._photos[key + (self._background,)] = photo
+            while len(self._photos) > self._max_cached:
+                self._photos.popitem(last=False)
+        if self._item is None:
+            self._item = self._canvas.create_image(
+                0, 0, image=photo, anchor="nw", tags=(OVERLAY_TAG, REFERENCE_TAG)
+            )
+        else:
+            self._canvas.itemconfig(self._item, image=photo)
+        # Referans resmi her zaman tüm çizimlerin altında, arka plan dolgusunun üstünde kalır
+        self._canvas.tag_lower(self._item)
+        from fills import BACKGROUND_TAG
+        if self._canvas.find_withtag(BACKGROUND_TAG):
+            self._canvas.tag_raise(self._item, BACKGROUND_TAG)
+
+    def _on_configure(self, event):
+        """Pencere boyutu değişince uygun seviyeyi kısa bir gecikmeyle yeniden seçer"""
+        if self._resize_job is not None:
+            self._root.after_cancel(self._resize_job)
+        self._resize_job = self._root.after(100, self._after_resize)
+
+    def _after_resize(self):
+        self._resize_job = None
+        self.refresh()
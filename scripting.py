@@ -0,0 +1,311 @@
+import ast
+import os
+import time
+import tkinter as tk
+
+from canvas_items import RecordingCanvas, create_items
+from selection import DuplicateAction
+from settings import BackgroundAction, DrawingSettings
+
+# Betik (makro) çalıştırıcı
+# =========================
+# Bir betik dosyası her satırda bir komut çağrısı içerir:
+#
+#     set_bg("#FFFFEE")
+#     set_color("#FF0000")
+#     stamp("star", 120, 80, 10)
+#     draw_line(0, 0, 300, 200, size=3, color="#0000FF")
+#     fill("#EEEEEE", 0, 0, 100, 100)
+#
+# Komutlar mevcut DrawingTool.draw uygulamalarını ve DrawingSettings'i
+# kullanır. Dosya satır satır okunur; milyonlarca komut belleğe alınmaz.
+# Çalıştırma bir üreteç (generator) üzerinden yapılır: her zaman diliminde
+# birkaç milisaniye komut işlenir, oluşan öğeler tek bir kanvas çağrısıyla
+# eklenir ve kontrol Tk olay döngüsüne geri verilir.
+
+# Bir zaman diliminin en uzun süresi (saniye)
+SLICE_SECONDS = 0.008
+# Saatin kaç komutta bir kontrol edileceği
+CHECK_EVERY = 64
+
+
+class ScriptError(Exception):
+    """Betikteki hatalı bir komut; line hatanın satır numarasıdır"""
+    def __init__(self, message, line=None):
+        super().__init__(message)
+        self.line = line
+
+    def __str__(self):
+        message = super().__str__()
+        return f"satır {self.line}: {message}" if self.line else message
+
+
+def parse_command(text, line=None):
+    """
+    Bir betik satırını (ad, argümanlar, anahtar argümanlar) üçlüsüne çevirir.
+
+    Boş ve # ile başlayan satırlar için None döndürür. Argümanlar yalnızca
+    sabit değerler (sayı, metin, demet) olabilir; kod çalıştırılmaz.
+    """
+    text = text.strip()
+    if not text or text.startswith("#"):
+        return None
+    try:
+        node = ast.parse(text, mode="eval").body
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+            raise ScriptError("komut çağrısı bekleniyor", line)
+        args = tuple(ast.literal_eval(arg) for arg in node.args)
+        kwargs = {keyword.arg: ast.literal_eval(keyword.value) for keyword in node.keywords}
+    except (SyntaxError, ValueError) as e:
+        raise ScriptError(f"geçersiz komut: {e}", line)
+    return node.func.id, args, kwargs
+
+
+class ScriptFile:
+    """
+    Betik dosyasını satır satır okuyan yinelenebilir nesne.
+
+    (satır no, ad, argümanlar, anahtar argümanlar) dörtlüleri üretir;
+    fraction, dosyanın şimdiye kadar okunan oranıdır.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.fraction = 0.0
+
+    def __iter__(self):
+        size = os.path.getsize(self.path) or 1
+        read = 0
+        with open(self.path, "rb") as f:
+            for line, raw in enumerate(f, 1):
+                read += len(raw)
+                self.fraction = read / size
+                command = parse_command(raw.decode("utf-8", errors="replace"), line)
+                if command is not None:
+                    yield (line,) + command
+
+
+class ScriptAction(DuplicateAction):
+    """
+    Betiğin eklediği tüm öğeler ve arka plan değişikliği (BackgroundAction
+    ya da None); geçmişte tek bir adımdır.
+    """
+    def __init__(self, records, background=None):
+        super().__init__(records)
+        self._background = background
+
+    def undo(self, canvas):
+        super().undo(canvas)
+        if self._background is not None:
+            self._background.undo(canvas)
+
+    def redo(self, canvas):
+        # Çok sayıda öğe tek bir kanvas çağrısıyla yeniden oluşturulur
+        create_items(canvas, self._records)
+        if self._background is not None:
+            self._background.redo(canvas)
+
+
+class ScriptRunner:
+    """
+    Betik komutlarını Tk olay döngüsünü bloklamadan zaman dilimleriyle çalıştırır.
+
+    commands, (satır no, ad, argümanlar, anahtar argümanlar) dörtlüleri
+    üreten herhangi bir yinelenebilir nesne olabilir (ör. ScriptFile).
+    Betik bitince eklenen öğeler geçmişe tek bir işlem olarak yazılır.
+    background_state verilirse set_bg'nin geri alınacak arka plan durumu
+    bu işlevle okunur (ör. renk ve dolgu); verilmezse yalnızca renktir.
+    """
+    def __init__(self, root, canvas, registry, history, commands, settings=None,
+                 on_background=None, on_items=None, on_progress=None, on_finish=None,
+                 background_state=None):
+        self._root = root
+        self._canvas = canvas
+        self._registry = registry
+        self._history = history
+        self._commands = commands
+        self.settings = settings or DrawingSettings()
+        self._on_background = on_background
+        self._background_state = background_state
+        self._on_items = on_items
+        self._on_progress = on_progress
+        self._on_finish = on_finish
+        # Betik arayüzdeki araçların durumunu bozmamak için kendi örneklerini kullanır
+        self._tools = {}
+        self._valid_colors = set()
+        self._recorder = None
+        self._records = []
+        # İlk set_bg'den önceki ve son set_bg'nin arka planı (değişmediyse None)
+        self._background_before = None
+        self._background_after = None
+        self._steps = None
+        self._cancelled = False
+        self.executed = 0
+        self.started = None
+
+    @property
+    def records(self):
+        """Betiğin şimdiye kadar eklediği öğelerin kayıtları"""
+        return self._records
+
+    @property
+    def fraction(self):
+        """Tamamlanan oran (bilinmiyorsa None)"""
+        return getattr(self._commands, "fraction", None)
+
+    def start(self):
+        """Betiği çalıştırmaya başlar"""
+        self.started = time.perf_counter()
+        self._steps = self._execute()
+        self._root.after_idle(self._step)
+
+    def cancel(self):
+        """Betiği bir sonraki zaman diliminde durdurur; o ana kadar çizilenler kalır"""
+        self._cancelled = True
+
+    def _step(self):
+        """Bir zaman dilimi boyunca komut çalıştırır"""
+        deadline = time.perf_counter() + SLICE_SECONDS
+        self._recorder = RecordingCanvas(self._canvas)
+        error = None
+        done = self._cancelled
+        # Hangi hata olursa olsun betik bitirilir; yoksa tuval kilitli kalır
+        try:
+            try:
+                while not done and time.perf_counter() < deadline:
+                    done = next(self._steps, True) is True
+            finally:
+                # Hatadan önce çizilenler korunur
+                self._flush()
+        except ScriptError as e:
+            error, done = e, True
+        except OSError as e:
+            error, done = ScriptError(f"betik okunamadı: {e}"), True
+        except Exception as e:
+            error, done = ScriptError(f"beklenmeyen hata: {e!r}"), True
+        finally:
+            if done:
+                self._finish(error)
+        if done:
+            return
+        if self._on_progress:
+            self._on_progress(self)
+        self._root.after(1, self._step)
+
+    def _execute(self):
+        """Komutları çalıştıran üreteç; her CHECK_EVERY komutta bir durur"""
+        for line, name, args, kwargs in self._commands:
+            handler = getattr(self, "_cmd_" + name, None)
+            if handler is None:
+                raise ScriptError(f"bilinmeyen komut: {name}", line)
+            try:
+                handler(*args, **kwargs)
+            except ScriptError as e:
+                e.line = line
+                raise
+            except TypeError as e:
+                raise ScriptError(f"{name}: {e}", line)
+            self.executed += 1
+            if self.executed % CHECK_EVERY == 0:
+                yield
+
+    def _flush(self):
+        """Zaman diliminde biriken öğeleri tek bir kanvas çağrısıyla oluşturur"""
+        records = self._recorder.records
+        if not records:
+            return
+        item_ids = create_items(self._canvas, records)
+        self._records.extend(records)
+        if self._on_items:
+            self._on_items(item_ids)
+
+    def _finish(self, error):
+        background = None
+        if self._background_before not in (None, self._background_after):
+            background = BackgroundAction(self._background_before, self._background_after)
+        if self._records or background is not None:
+            self._history.push_action(ScriptAction(self._records, background))
+        if self._on_finish:
+            self._on_finish(self, error)
+
+    # ------------------------------------------------------------ komutlar
+
+    def _color(self, color):
+        """Rengi doğrular; verilmezse ayarlardaki rengi kullanır"""
+        if color is None:
+            return self.settings.color
+        if color not in self._valid_colors:
+            try:
+                self._canvas.winfo_rgb(color)
+            except tk.TclError:
+                raise ScriptError(f"geçersiz renk: {color!r}")
+            self._valid_colors.add(color)
+        return color
+
+    def _number(self, value):
+        """Koordinat gibi sayısal bir argümanı doğrular"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ScriptError(f"sayı bekleniyor: {value!r}")
+        return value
+
+    def _size(self, size):
+        if size is None:
+            return self.settings.brush_size
+        if self._number(size) <= 0:
+            raise ScriptError(f"geçersiz boyut: {size!r}")
+        return size
+
+    def _tool(self, tool_id):
+        tool = self._tools.get(tool_id)
+        if tool is None:
+            if tool_id not in self._registry:
+                raise ScriptError(f"bilinmeyen araç: {tool_id}")
+            tool = self._tools[tool_id] = self._registry.create(tool_id)
+        return tool
+
+    def _cmd_stamp(self, tool, x, y, size=None, color=None):
+        """Fırça aracıyla (oval, square, star, eraser) tek bir damga basar"""
+        instance = self._tool(tool)
+        if hasattr(instance, "start") or hasattr(instance, "drag"):
+            raise ScriptError(f"{tool} bir damga aracı değil")
+        instance.draw(self._recorder, self._number(x), self._number(y), self._size(size), self._color(color))
+
+    def _cmd_draw_line(self, x1, y1, x2, y2, size=None, color=None):
+        """Çizgi aracıyla iki nokta arasında çizgi çizer"""
+        x1, y1, x2, y2 = map(self._number, (x1, y1, x2, y2))
+        tool = self._tool("line")
+        tool.start(self._recorder, x1, y1)
+        tool.draw(self._recorder, x2, y2, self._size(size), self._color(color))
+
+    def _cmd_fill(self, color=None, x1=0, y1=0, x2=None, y2=None):
+        """Bir dikdörtgeni doldurur; köşeler verilmezse tüm tuvali"""
+        color = self._color(color)
+        if x2 is None:
+            x2 = self._canvas.winfo_width()
+        if y2 is None:
+            y2 = self._canvas.winfo_height()
+        x1, y1, x2, y2 = map(self._number, (x1, y1, x2, y2))
+        self._recorder.create_rectangle(x1, y1, x2, y2, fill=color, outline=color)
+
+    def _cmd_set_bg(self, color):
+        """Tuval arka plan rengini değiştirir"""
+        color = self._color(color)
+        state = self._background_state
+        if self._background_before is None:
+            self._background_before = state() if state else self.settings.canvas_bg
+        self.settings.canvas_bg = color
+        if self._on_background:
+            self._on_background(color)
+        self._background_after = state() if state else color
+
+    def _cmd_set_color(self, color):
+        """Sonraki komutların varsayılan rengini ayarlar"""
+        self.settings.color = self._color(color)
+        if self.settings.color != color:
+            # DrawingSettings yalnızca #RRGGBB biçimini ve birkaç renk adını kabul eder
+            raise ScriptError(f"renk #RRGGBB biçiminde olmalı: {color!r}")
+
+    def _cmd_set_size(self, size):
+        """Sonraki komutların varsayılan fırça boyutunu ayarlar (1-50)"""
+        self.settings.brush_size = self._number(size)
+        if self.settings.brush_size != size:
+            raise ScriptError(f"geçersiz boyut: {size!r}")
@@ -0,0 +1,228 @@
+import tkinter as tk
+
+from canvas_items import create_items, image_for, tag_items
+
+# İkincil görünümler
+# ==================
+# Aynı çizim ayrı pencerelerde farklı yakınlaştırmayla (ör. bir ayrıntı ve
+# bir genel bakış) gösterilebilir. Görünümler tuvali kopyalamaz; çizim
+# geçmişinin (PaintHistory) değişmez kayıt demetini izler ve her
+# değişiklikte yalnızca önceki durumla arasındaki farkı uygular:
+#
+#   eski: [ortak baş | silinen orta | ortak son]
+#   yeni: [ortak baş | eklenen orta | ortak son]
+#
+# Baş ve son kısımlar önce kayıt nesnelerinin kimliğiyle (is) karşılaştırılır;
+# geçmiş değişmeyen kayıtları adımlar arasında paylaştığı için bu
+# karşılaştırma çoğunlukla ucuzdur. Eklenen öğeler tek bir Tcl çağrısıyla oluşturulur.
+#
+# Eşitleme çizim sırasında değil, boşta (after_idle) ve her görünüm için
+# ayrı yapılır; aynı karedeki birden fazla değişiklik tek eşitlemede
+# birleşir. Görünmeyen (simge durumuna küçültülmüş ya da gizli) görünümler
+# yalnızca "kirli" olarak işaretlenir ve yeniden gösterildiklerinde bir kez
+# eşitlenir. Böylece açık görünüm sayısı ana tuvaldeki çizimi yavaşlatmaz.
+#
+# Görünümler yalnızca belge öğelerini gösterir; raster fırça katmanı ve
+# referans resmi ana tuvale özeldir. Görüntü öğeleri (birleştirilmiş
+# bloklar, damgalar, dolgular) görünümün yakınlaştırmasına ölçeklenir;
+# ölçeklenmiş kopyalar görünüm başına, yakınlaştırma değişene kadar saklanır.
+
+# Yeni öğeleri yerine yerleştirmek için geçici etiket
+_WORK_TAG = "view_sync"
+# Fare tekerleğiyle yakınlaştırma adımı ve sınırları
+ZOOM_STEP = 1.25
+MIN_ZOOM = 0.05
+MAX_ZOOM = 16.0
+
+
+def _same(a, b):
+    return a is b or a == b
+
+
+def _scaled(record, zoom, scale_image=None):
+    """
+    Kaydın koordinatlarını ve çizgi kalınlığını zoom ile ölçekler;
+    görüntü adları scale_image ile ölçeklenmiş görüntünün adına çevrilir.
+    """
+    item_type, coords, options = record
+    coords = [float(c) * zoom for c in coords]
+    if item_type == "image" and scale_image is not None and "image" in options:
+        options = {**options, "image": scale_image(options["image"])}
+    if zoom != 1 and "width" in options:
+        options = dict(options)
+        try:
+            options["width"] = max(1.0, float(options["width"]) * zoom)
+        except ValueError:
+            pass
+    return (item_type, coords, options)
+
+
+class SecondaryView:
+    """
+    Çizimin salt okunur ikinci görünümü (ayrı bir pencere).
+
+    Fare tekerleği yakınlaştırır, sürükleme kaydırır. Görünüm kapatılınca
+    on_close çağrılır.
+    """
+    def __init__(self, root, history, background, title="Görünüm", zoom=0.5, on_close=None):
+        self._history = history
+        self._background = background
+        self._zoom = zoom
+        self._on_close = on_close
+        # Görünümde gösterilen kayıtlar ve aynı sıradaki kanvas kimlikleri
+        self._records = ()
+        self._ids = []
+        # Görüntü adı -> bu yakınlaştırmadaki PhotoImage
+        self._images = {}
+        self._dirty = True
+        self._job = None
+
+        window = self.window = tk.Toplevel(root)
+        window.title(title)
+        window.geometry("480x360")
+        window.protocol("WM_DELETE_WINDOW", self.close)
+        self._canvas = tk.Canvas(window, bg=background(), highlightthickness=0)
+        self._canvas.pack(fill=tk.BOTH, expand=True)
+        self._canvas.bind("<Map>", lambda e: self._on_mapped())
+        self._canvas.bind("<ButtonPress-1>", lambda e: self._canvas.scan_mark(e.x, e.y))
+        self._canvas.bind("<B1-Motion>", lambda e: self._canvas.scan_dragto(e.x, e.y, gain=1))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self._canvas.bind(sequence, self._on_wheel)
+        self.schedule()
+
+    @property
+    def zoom(self):
+        return self._zoom
+
+    def mark_dirty(self):
+        """Çizim değişti; görünüm görünürse boşta eşitlenir"""
+        self._dirty = True
+        self.schedule()
+
+    def schedule(self):
+        if self._job is None and self._canvas.winfo_ismapped():
+            self._job = self._canvas.after_idle(self.sync)
+
+    def sync(self):
+        """Görünümü geçmişin mevcut kayıtlarına getirir; yalnızca fark uygulanır"""
+        self._job = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        canvas = self._canvas
+        canvas.config(bg=self._background())
+        old, new = self._records, self._history.records
+        limit = min(len(old), len(new))
+        head = 0
+        while head < limit and _same(old[head], new[head]):
+            head += 1
+        tail = 0
+        while tail < limit - head and _same(old[-1 - tail], new[-1 - tail]):
+            tail += 1
+        removed = self._ids[head:len(old) - tail]
+        kept_tail = self._ids[len(old) - tail:]
+        if removed:
+            tag_items(canvas, _WORK_TAG, removed)
+            canvas.delete(_WORK_TAG)
+        added = [
+            _scaled((item_type, coords, {**options, "tags": _WORK_TAG}), self._zoom, self._scaled_image)
+            for item_type, coords, options in new[head:len(new) - tail]
+        ]
+        created = create_items(canvas, added)
+        if created and kept_tail:
+            # Ortadaki yeni öğeler ortak son kısmın altına yerleştirilir
+            canvas.tag_lower(_WORK_TAG, kept_tail[0])
+        canvas.dtag(_WORK_TAG, _WORK_TAG)
+        self._ids = self._ids[:head] + created + kept_tail
+        self._records = new
+
+    def set_zoom(self, zoom, anchor=(0, 0)):
+        """Yakınlaştırmayı değiştirir; anchor (ekran noktası) yerinde kalır"""
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+        if zoom == self._zoom:
+            return
+        canvas = self._canvas
+        # Bağlantı noktasının çizim koordinatı yakınlaştırmadan sonra aynı ekran noktasında kalır
+        x = canvas.canvasx(anchor[0]) / self._zoom
+        y = canvas.canvasy(anchor[1]) / self._zoom
+        self._zoom = zoom
+        # Kalınlıklar da ölçeklendiği için öğeler yeniden oluşturulur
+        canvas.delete("all")
+        self._records = ()
+        self._ids = []
+        self._images = {}
+        self._dirty = True
+        self.sync()
+        canvas.xview_moveto(0)
+        canvas.yview_moveto(0)
+        canvas.scan_mark(0, 0)
+        canvas.scan_dragto(int(anchor[0] - x * zoom), int(anchor[1] - y * zoom), gain=1)
+
+    def _scaled_image(self, name):
+        """Görüntünün bu yakınlaştırmadaki kopyasının adı (ölçeklenemezse name)"""
+        if self._zoom == 1:
+            return name
+        photo = self._images.get(name)
+        if photo is None:
+            image = image_for(name)
+            if image is None:
+                return name
+            from PIL import Image, ImageTk
+            size = (max(1, round(image.width * self._zoom)), max(1, round(image.height * self._zoom)))
+            photo = self._images[name] = ImageTk.PhotoImage(
+                image.resize(size, Image.LANCZOS), master=self._canvas
+            )
+        return str(photo)
+
+    def close(self):
+        if self._job is not None:
+            self._canvas.after_cancel(self._job)
+            self._job = None
+        self._images = {}
+        self.window.destroy()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def _on_mapped(self):
+        # Gizliyken biriken değişiklikler tek seferde uygulanır
+        self.schedule()
+
+    def _on_wheel(self, event):
+        step = ZOOM_STEP if event.num == 4 or event.delta > 0 else 1 / ZOOM_STEP
+        self.set_zoom(self._zoom * step, (event.x, event.y))
+
+
+class ViewManager:
+    """
+    Açık ikincil görünümleri tutar ve geçmişteki değişiklikleri onlara iletir.
+
+    Geçmişe tek bir dinleyici eklenir; her değişiklik görünümleri yalnızca
+    kirli olarak işaretler, asıl iş görünümlerin kendi boşta eşitlemesindedir.
+    """
+    def __init__(self, root, history, background):
+        self._root = root
+        self._history = history
+        self._background = background
+        self._views = []
+        history.add_listener(self._on_history_changed)
+
+    def __len__(self):
+        return len(self._views)
+
+    def open(self, zoom=0.5):
+        """Yeni bir görünüm penceresi açar"""
+        view = SecondaryView(
+            self._root, self._history, self._background,
+            title=f"Görünüm {len(self._views) + 1}", zoom=zoom, on_close=self._views.remove
+        )
+        self._views.append(view)
+        return view
+
+    def refresh(self):
+        """Geçmiş dışı değişikliklerde (ör. arka plan rengi) görünümleri yeniler"""
+        for view in self._views:
+            view.mark_dirty()
+
+    def _on_history_changed(self):
+        for view in self._views:
+            view.mark_dirty()
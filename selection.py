@@ -0,0 +1,308 @@
+from abstract_classes import DrawingTool, HistoryAction
+from canvas_items import (
+    OVERLAY_TAG, bboxes, capture_items, create_items, document_items, lower_items, tag_items
+)
+
+# Seçim, taşıma, çoğaltma ve silme
+# ================================
+# Seçilen öğeler "sel" etiketiyle işaretlenir. Taşıma gibi işlemler öğe
+# öğe döngü yerine etiket üzerinden tek bir kanvas çağrısıyla yapılır
+# (canvas.move("sel", dx, dy)). Her işlem geçmişe tüm tuvalin kopyası
+# olarak değil, yalnızca farkını saklayan bir HistoryAction olarak yazılır.
+
+SELECTION_TAG = "sel"
+# Geçmiş işlemlerinin geçici olarak kullandığı etiket
+_WORK_TAG = "history_work"
+
+
+def _ids_at(canvas, positions):
+    """Belge sırasındaki konumlara karşılık gelen öğe kimliklerini döndürür"""
+    ids = document_items(canvas)
+    return [ids[p] for p in positions if p < len(ids)]
+
+
+def _shift(coords, dx, dy):
+    """Koordinat listesini (x, y) kadar kaydırır"""
+    return [float(c) + (dy if i % 2 else dx) for i, c in enumerate(coords)]
+
+
+class MoveAction(HistoryAction):
+    """Seçili öğelerin taşınmasını saklar: yalnızca konumlar ve kayma miktarı"""
+    def __init__(self, positions, dx, dy):
+        self._positions = positions
+        self._dx = dx
+        self._dy = dy
+
+    def _move(self, canvas, dx, dy):
+        tag_items(canvas, _WORK_TAG, _ids_at(canvas, self._positions))
+        canvas.move(_WORK_TAG, dx, dy)
+        canvas.dtag(_WORK_TAG, _WORK_TAG)
+
+    def undo(self, canvas):
+        self._move(canvas, -self._dx, -self._dy)
+
+    def redo(self, canvas):
+        self._move(canvas, self._dx, self._dy)
+
+    def apply(self, records):
+        records = list(records)
+        for p in self._positions:
+            item_type, coords, options = records[p]
+            records[p] = (item_type, _shift(coords, self._dx, self._dy), options)
+        return records
+
+    def revert(self, records):
+        return MoveAction(self._positions, -self._dx, -self._dy).apply(records)
+
+
+class DuplicateAction(HistoryAction):
+    """Seçili öğelerin kopyalarını saklar; kopyalar belgenin en üstüne eklenir"""
+    def __init__(self, records):
+        self._records = records
+
+    def undo(self, canvas):
+        ids = document_items(canvas)
+        count = len(self._records)
+        if count:
+            tag_items(canvas, _WORK_TAG, ids[-count:])
+            canvas.delete(_WORK_TAG)
+
+    def redo(self, canvas):
+        # Kopyalar tek bir Tcl çağrısıyla oluşturulur
+        create_items(canvas, self._records)
+
+    def apply(self, records):
+        return list(records) + list(self._records)
+
+    def revert(self, records):
+        return list(records)[:len(records) - len(self._records)]
+
+    def records_held(self):
+        return self._records
+
+
+class DeleteAction(HistoryAction):
+    """Silinen öğeleri konumlarıyla birlikte saklar"""
+    def __init__(self, positions, records):
+        self._positions = positions
+        self._records = records
+
+    def undo(self, canvas):
+        # Öğeler tek çağrıyla en üstte oluşturulur, sonra tek çağrıyla eski
+        # z-sıralarına indirilir: yukarıdan aşağı her öğe, son sıradaki
+        # üst komşusunun altına
+        order = list(document_items(canvas))
+        created = create_items(canvas, self._records)
+        for position, item in zip(self._positions, created):
+            order.insert(position, item)
+        restored = set(created)
+        pairs = [
+            (item, order[index + 1])
+            for index, item in reversed(list(enumerate(order[:-1])))
+            if item in restored
+        ]
+        lower_items(canvas, pairs)
+
+    def redo(self, canvas):
+        tag_items(canvas, _WORK_TAG, _ids_at(canvas, self._positions))
+        canvas.delete(_WORK_TAG)
+
+    def apply(self, records):
+        removed = set(self._positions)
+        return [r for i, r in enumerate(records) if i not in removed]
+
+    def revert(self, records):
+        records = list(records)
+        for position, record in zip(self._positions, self._records):
+            records.insert(position, record)
+        return records
+
+    def records_held(self):
+        return self._records
+
+
+class SelectionTool(DrawingTool):
+    """
+    Dikdörtgen seçim aracı.
+
+    Seçimin dışında sürükleme yeni bir seçim yapar, seçimin içinde
+    sürükleme seçili öğeleri taşır. Delete tuşu siler, Ctrl+D çoğaltır.
+    """
+    def __init__(self):
+        self._mode = None
+        self._start = None
+        self._last = None
+        self._outline = None
+        self._box = None
+        self._pending_action = None
+
+    @property
+    def name(self):
+        return "Seçim"
+
+    def draw(self, canvas, x, y, brush_size, color):
+        # Seçim aracı çizim yapmaz
+        return None
+
+    def start(self, canvas, x, y):
+        """Seçimin içindeyse taşımaya, dışındaysa yeni seçime başlar"""
+        self._start = self._last = (x, y)
+        box = canvas.bbox(SELECTION_TAG)
+        if box and box[0] <= x <= box[2] and box[1] <= y <= box[3]:
+            self._mode = "move"
+        else:
+            self.clear_selection(canvas)
+            self._mode = "select"
+            self._begin_outline(canvas, x, y)
+
+    def drag(self, canvas, x, y, color):
+        """Seçimi taşır ya da seçim çerçevesini günceller"""
+        if self._mode == "move":
+            dx, dy = x - self._last[0], y - self._last[1]
+            # Tüm seçim tek bir etiket çağrısıyla taşınır
+            canvas.move(SELECTION_TAG, dx, dy)
+            if self._box:
+                canvas.move(self._box, dx, dy)
+            self._last = (x, y)
+        elif self._mode == "select":
+            self._update_outline(canvas, x, y)
+
+    def end(self, canvas, x, y, brush_size, color):
+        """Seçimi tamamlar ya da taşımayı geçmiş işlemi olarak hazırlar"""
+        if self._mode == "move":
+            # Bırakma noktası son hareket olayından farklı olabilir; kalan
+            # kaydırma uygulanır ki geçmiş işlemi ekrandaki konumla aynı olsun
+            self.drag(canvas, x, y, color)
+            dx, dy = self._last[0] - self._start[0], self._last[1] - self._start[1]
+            if dx or dy:
+                self._pending_action = MoveAction(self._selected_positions(canvas), dx, dy)
+        elif self._mode == "select":
+            self._select(canvas)
+            canvas.delete(self._outline)
+            self._outline = None
+            self._draw_box(canvas)
+        self._mode = None
+        return None
+
+    def take_history_action(self):
+        """Son hareketin geçmiş işlemini döndürür (yoksa None)"""
+        action, self._pending_action = self._pending_action, None
+        return action
+
+    def clear_selection(self, canvas):
+        """Seçimi kaldırır"""
+        canvas.dtag(SELECTION_TAG, SELECTION_TAG)
+        if self._box:
+            canvas.delete(self._box)
+            self._box = None
+
+    def delete_selection(self, canvas):
+        """Seçili öğeleri siler ve geçmiş işlemini döndürür"""
+        positions = self._selected_positions(canvas)
+        if not positions:
+            return None
+        records = capture_items(canvas, canvas.find_withtag(SELECTION_TAG))
+        canvas.delete(SELECTION_TAG)
+        self.clear_selection(canvas)
+        return DeleteAction(positions, records)
+
+    def duplicate_selection(self, canvas, offset=20):
+        """Seçili öğeleri kaydırarak çoğaltır; seçim yeni kopyalara geçer"""
+        selected = canvas.find_withtag(SELECTION_TAG)
+        if not selected:
+            return None
+        records = [
+            (item_type, _shift(coords, offset, offset), options)
+            for item_type, coords, options in capture_items(canvas, selected)
+        ]
+        self.clear_selection(canvas)
+        action = DuplicateAction(records)
+        action.redo(canvas)
+        count = len(records)
+        tag_items(canvas, SELECTION_TAG, document_items(canvas)[-count:])
+        self._draw_box(canvas)
+        return action
+
+    def _selected_positions(self, canvas):
+        """Seçili öğelerin belge içindeki konumlarını döndürür"""
+        selected = set(canvas.find_withtag(SELECTION_TAG))
+        return [i for i, item in enumerate(document_items(canvas)) if item in selected]
+
+    def _begin_outline(self, canvas, x, y):
+        self._outline = canvas.create_rectangle(
+            x, y, x, y, outline="#3366cc", dash=(4, 2), tags=OVERLAY_TAG
+        )
+
+    def _update_outline(self, canvas, x, y):
+        canvas.coords(self._outline, self._start[0], self._start[1], x, y)
+
+    def _select(self, canvas):
+        """Çerçevenin tamamen içindeki öğeleri tek çağrıyla etiketler"""
+        x1, y1, x2, y2 = canvas.coords(self._outline)
+        canvas.addtag_enclosed(
+            SELECTION_TAG, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+        )
+        canvas.dtag(OVERLAY_TAG, SELECTION_TAG)
+
+    def _draw_box(self, canvas):
+        """Seçimin çevresine kesikli bir çerçeve çizer"""
+        box = canvas.bbox(SELECTION_TAG)
+        if box:
+            self._box = canvas.create_rectangle(
+                box, outline="#3366cc", dash=(2, 2), tags=OVERLAY_TAG
+            )
+
+
+class LassoTool(SelectionTool):
+    """
+    Serbest (kement) seçim aracı.
+
+    Aday öğeler kementin sınır kutusuyla kanvasın kendi uzamsal sorgusundan
+    (find_overlapping) alınır, merkezleri tek bir Tcl çağrısıyla okunur ve
+    yalnızca adaylar için çokgen içinde nokta testi yapılır.
+    """
+    def __init__(self):
+        super().__init__()
+        self._points = []
+
+    @property
+    def name(self):
+        return "Kement"
+
+    def _begin_outline(self, canvas, x, y):
+        self._points = [x, y]
+        self._outline = canvas.create_line(
+            x, y, x, y, fill="#3366cc", dash=(4, 2), tags=OVERLAY_TAG
+        )
+
+    def _update_outline(self, canvas, x, y):
+        self._points.extend((x, y))
+        canvas.coords(self._outline, *self._points)
+
+    def _select(self, canvas):
+        points = list(zip(self._points[::2], self._points[1::2]))
+        if len(points) < 3:
+            return
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        candidates = [
+            item for item in canvas.find_overlapping(min(xs), min(ys), max(xs), max(ys))
+            if item != self._outline
+        ]
+        selected = []
+        for item, box in zip(candidates, bboxes(canvas, candidates)):
+            if box and _point_in_polygon((box[0] + box[2]) / 2, (box[1] + box[3]) / 2, points):
+                selected.append(item)
+        tag_items(canvas, SELECTION_TAG, selected)
+        canvas.dtag(OVERLAY_TAG, SELECTION_TAG)
+
+
+def _point_in_polygon(x, y, points):
+    """Işın atma (ray casting) yöntemiyle noktanın çokgen içinde olup olmadığını bulur"""
+    inside = False
+    x1, y1 = points[-1]
+    for x2, y2 in points:
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
@@ -1,3 +1,9 @@
+from abstract_classes import HistoryAction
+from canvas_items import capture_items, create_items, document_items, referenced_images, tag_items
+
+# Geçmiş işlemlerinin geçici olarak kullandığı etiket
+_WORK_TAG = "history_work"
+
 # İLKE 2: KAPSÜLLEME (ENCAPSULATION)
 # ===================================
 # Kapsülleme, bir nesnenin içsel durumunu dış dünyadan gizleme ve
@@ -20,6 +26,15 @@ class DrawingSettings:
         self._color = "#000000"  # Siyah
         self._brush_size = 5
         self._canvas_bg = "#FFFFFF"  # Beyaz
+        # Bu sayıdan fazla öğe olunca en eski öğeler tek görüntüde birleştirilir
+        self._item_budget = 20000
+        # PNG dışa aktarma seçenekleri (zlib sıkıştırma düzeyi ve stratejisi)
+        self._png_compress_level = 6
+        self._png_strategy = 0
+        self._png_palette = True
+        # Kapalı şekillerin dolgu türü (fills.FILL_KINDS) ve geçişin bitiş rengi
+        self._fill_kind = "flat"
+        self._fill_end_color = "#FFFFFF"
         
     @property
     def color(self):
@@ -64,6 +79,227 @@ class DrawingSettings:
         """
         if isinstance(value, str) and (value.startswith("#") or value in ['black', 'white']):
             self._canvas_bg = value
+    
+    @property
+    def item_budget(self):
+        """Tuvaldeki en fazla öğe sayısı için getter"""
+        return self._item_budget
+    
+    @item_budget.setter
+    def item_budget(self, value):
+        """
+        Öğe bütçesi için setter.
+        Çok küçük bütçeler sık birleştirmeye yol açacağından en az 1000 olmalıdır.
+        """
+        if isinstance(value, int) and value >= 1000:
+            self._item_budget = value
+    
+    @property
+    def png_compress_level(self):
+        """PNG sıkıştırma düzeyi için getter"""
+        return self._png_compress_level
+    
+    @png_compress_level.setter
+    def png_compress_level(self, value):
+        """
+        PNG sıkıştırma düzeyi için setter.
+        zlib düzeyleri 0 (sıkıştırma yok) ile 9 (en küçük dosya) arasındadır.
+        """
+        if isinstance(value, int) and 0 <= value <= 9:
+            self._png_compress_level = value
+    
+    @property
+    def png_strategy(self):
+        """PNG sıkıştırma stratejisi (zlib.Z_* sabiti) için getter"""
+        return self._png_strategy
+    
+    @png_strategy.setter
+    def png_strategy(self, value):
+        """
+        PNG sıkıştırma stratejisi için setter.
+        zlib'in beş stratejisi 0-4 arasındaki sabitlerdir.
+        """
+        if isinstance(value, int) and 0 <= value <= 4:
+            self._png_strategy = value
+    
+    @property
+    def png_palette(self):
+        """Az renkli çizimlerin paletli PNG olarak yazılıp yazılmayacağı"""
+        return self._png_palette
+    
+    @png_palette.setter
+    def png_palette(self, value):
+        self._png_palette = bool(value)
+    
+    @property
+    def fill_kind(self):
+        """Şekil dolgusunun türü ("flat" düz renk demektir)"""
+        return self._fill_kind
+    
+    @fill_kind.setter
+    def fill_kind(self, value):
+        from fills import FILL_KINDS
+        if value in FILL_KINDS:
+            self._fill_kind = value
+    
+    @property
+    def fill_end_color(self):
+        """Geçişin bitiş (desenlerde zemin) rengi"""
+        return self._fill_end_color
+    
+    @fill_end_color.setter
+    def fill_end_color(self, value):
+        if isinstance(value, str) and value.startswith("#"):
+            self._fill_end_color = value
+    
+    @property
+    def fill(self):
+        """Mevcut ayarların dolgusu (fills.Fill); düz renkte None"""
+        if self._fill_kind == "flat":
+            return None
+        from fills import Fill
+        return Fill(self._fill_kind, self._color, self._fill_end_color, angle=90)
+
+class SnapshotDelta(HistoryAction):
+    """
+    save_state ile kaydedilen bir adımın önceki duruma göre farkı.
+    
+    İki durumun ortak öneki (prefix) saklanmaz; yalnızca önekten sonra
+    değişen kuyruğun eski ve yeni kayıtları tutulur. Çizimlerin çoğu
+    belgenin en üstüne öğe eklediği için fark genellikle yalnızca yeni
+    çizginin kayıtlarıdır. Kayıt nesneleri durumlar arasında paylaşılır,
+    kopyalanmaz.
+    """
+    def __init__(self, prefix, old_tail, new_tail):
+        self._prefix = prefix
+        self._old_tail = old_tail
+        self._new_tail = new_tail
+    
+    @classmethod
+    def between(cls, old_records, new_records):
+        """İki kayıt listesi arasındaki farkı oluşturur"""
+        prefix = 0
+        limit = min(len(old_records), len(new_records))
+        while prefix < limit and old_records[prefix] == new_records[prefix]:
+            prefix += 1
+        return cls(prefix, tuple(old_records[prefix:]), tuple(new_records[prefix:]))
+    
+    def _replace_tail(self, canvas, tail):
+        ids = document_items(canvas)
+        if len(ids) > self._prefix:
+            tag_items(canvas, _WORK_TAG, ids[self._prefix:])
+            canvas.delete(_WORK_TAG)
+        create_items(canvas, tail)
+    
+    def undo(self, canvas):
+        self._replace_tail(canvas, self._old_tail)
+    
+    def redo(self, canvas):
+        self._replace_tail(canvas, self._new_tail)
+    
+    def apply(self, records):
+        return records[:self._prefix] + self._new_tail
+    
+    def revert(self, records):
+        return records[:self._prefix] + self._old_tail
+    
+    def records_held(self):
+        return self._old_tail + self._new_tail
+
+
+class BackgroundAction(HistoryAction):
+    """
+    Arka plan değişikliği.
+    
+    Arka plan belge kayıtlarının dışında tutulduğu için apply kayıtları
+    değiştirmez; geri alma ve yineleme durumu, tuval için kaydedilmiş
+    işleyiciyle (register) uygular. Durumun biçimini (renk ya da renk ve
+    dolgu) işleyici belirler. delta verilirse (ör. proje açma) kayıtlardaki
+    değişiklikle birlikte tek adımdır. İşlem yalnızca durumu sakladığından
+    pickle edilebilir (bkz. document_tabs).
+    """
+    _handlers = {}
+    
+    def __init__(self, before, after, delta=None):
+        self._before = before
+        self._after = after
+        self._delta = delta
+    
+    @classmethod
+    def register(cls, canvas, handler):
+        """Tuvalin arka plan durumunu uygulayan işleyiciyi kaydeder"""
+        cls._handlers[str(canvas)] = handler
+    
+    def _set(self, canvas, state):
+        handler = self._handlers.get(str(canvas))
+        if handler is not None:
+            handler(state)
+    
+    def undo(self, canvas):
+        if self._delta is not None:
+            self._delta.undo(canvas)
+        self._set(canvas, self._before)
+    
+    def redo(self, canvas):
+        if self._delta is not None:
+            self._delta.redo(canvas)
+        self._set(canvas, self._after)
+    
+    def apply(self, records):
+        return records if self._delta is None else self._delta.apply(records)
+    
+    def revert(self, records):
+        return records if self._delta is None else self._delta.revert(records)
+    
+    def records_held(self):
+        return () if self._delta is None else self._delta.records_held()
+
+
+class CompoundAction(HistoryAction):
+    """
+    Tek adımda geri alınan işlemler dizisi (ör. tuvali temizlemek: belge
+    kayıtları ve raster katmanı).
+    
+    İşlemler sırayla yinelenir, ters sırayla geri alınır. İçerdiği işlemler
+    pickle edilebiliyorsa bu da edilebilir.
+    """
+    def __init__(self, actions):
+        self._actions = tuple(actions)
+    
+    def undo(self, canvas):
+        for action in reversed(self._actions):
+            action.undo(canvas)
+    
+    def redo(self, canvas):
+        for action in self._actions:
+            action.redo(canvas)
+    
+    def apply(self, records):
+        for action in self._actions:
+            records = action.apply(records)
+        return records
+    
+    def revert(self, records):
+        for action in reversed(self._actions):
+            records = action.revert(records)
+        return records
+    
+    def records_held(self):
+        return tuple(record for action in self._actions for record in action.records_held())
+
+
+class _HistoryNode:
+    """Geçmiş ağacında bir durum; entry, ebeveynden bu duruma geçiren işlemdir"""
+    __slots__ = ("parent", "entry", "children", "active", "visited")
+    
+    def __init__(self, parent, entry):
+        self.parent = parent
+        self.entry = entry
+        self.children = []
+        # İleri almanın gideceği çocuk (en son ziyaret edilen)
+        self.active = None
+        self.visited = 0
+
 
 class PaintHistory:
     """
@@ -71,73 +307,279 @@ class PaintHistory:
     
     Bu sınıf da kapsülleme ilkesini uygular. Geçmiş verilerini
     ve ilgili yöntemleri kapsüller.
+    
+    Geçmiş bir ağaçtır: geri aldıktan sonra çizim yapmak ileri alma dalını
+    silmez, yeni bir dal açar. Her düğüm yalnızca ebeveyniyle arasındaki
+    farkı (HistoryAction) saklar; dallar ortak içeriği paylaşır. Düğümler
+    arasında geçişte yalnızca iki düğüm arasındaki yol oynatılır.
     """
     def __init__(self, canvas):
         # Özel değişkenler ile kapsülleme
         self._canvas = canvas
-        self._history = []
-        self._current_step = -1
-        self._max_history = 20
+        # Boş tuval başlangıç durumu olarak kaydedilir; böylece açılışta
+        # tuvali taramak (save_state) gerekmez
+        self._root = self._current = _HistoryNode(None, None)
+        # Mevcut düğümün kayıtları; kayıt nesneleri farklarla paylaşılır
+        self._records = ()
+        self._node_count = 1
+        self._clock = 0
+        self._max_history = 200
+        # Mevcut durum her değiştiğinde çağrılan işlevler
+        self._listeners = []
         
-    def save_state(self):
-        """Mevcut kanvas durumunu kaydeder"""
-        if self._current_step < len(self._history) - 1:
-            # Geçmiş akışını koru
-            self._history = self._history[:self._current_step+1]
+    @property
+    def records(self):
+        """Mevcut düğümün belge kayıtları (değiştirilemez demet)"""
+        return self._records
+    
+    def save_state(self, *actions):
+        """
+        Mevcut kanvas durumunu kaydeder.
         
-        # Kanvas öğelerini kaydet
-        items_data = []
-        for item_id in self._canvas.find_all():
-            item_type = self._canvas.type(item_id)
-            coords = self._canvas.coords(item_id)
-            options = {}
-            for option in ['fill', 'outline', 'width', 'dash']:
-                try:
-                    value = self._canvas.itemcget(item_id, option)
-                    if value:
-                        options[option] = value
-                except:
-                    pass
-            items_data.append((item_type, coords, options))
+        actions (tuvale zaten uygulanmış işlemler, ör. raster katmanının
+        temizlenmesi) verilirse kayıtlardaki farkla birlikte tek adımdır.
+        """
+        # Kanvas öğelerini kaydet ve yalnızca önceki durumdan farkını sakla
+        items_data = capture_items(self._canvas)
+        delta = SnapshotDelta.between(self._records, items_data)
+        if actions:
+            delta = CompoundAction(actions + (delta,))
         
         # İç veriyi güncelle ve sınırlama uygula - kapsülleme sayesinde 
         # bu karmaşık işlem dışarıya karşı basitleştirilir
-        self._history.append(items_data)
-        if len(self._history) > self._max_history:
-            self._history.pop(0)
-        self._current_step = len(self._history) - 1
+        self._append(delta)
+    
+    def push_action(self, action):
+        """
+        Tam tuval kopyası yerine yalnızca farkı saklayan bir işlemi kaydeder.
+        
+        İşlem (HistoryAction) tuvale zaten uygulanmış olmalıdır.
+        """
+        self._append(action)
+    
+    def _append(self, entry):
+        """Mevcut düğüme yeni bir çocuk ekler; diğer dallar korunur"""
+        node = _HistoryNode(self._current, entry)
+        self._current.children.append(node)
+        self._node_count += 1
+        self._records = tuple(entry.apply(self._records))
+        self._current = node
+        self._visit(node)
+        if self._node_count > self._max_history:
+            self._prune()
+        self._changed()
         
     def undo(self):
         """Bir adım geri al - dış arayüz basit ve anlaşılır"""
-        if self._current_step > 0:
-            self._current_step -= 1
-            self._restore_state()
-            return True
-        return False
+        if self._current.parent is None:
+            return False
+        # Kendiliğinden yapılan işlemler (ör. birleştirme) önceki adımla birlikte geri alınır
+        while self._current.entry.automatic and self._current.parent.parent is not None:
+            self._step_up()
+        self._step_up()
+        self._visit(self._current)
+        self._changed()
+        return True
     
     def redo(self):
-        """Bir adım ileri al - dış arayüz basit ve anlaşılır"""
-        if self._current_step < len(self._history) - 1:
-            self._current_step += 1
-            self._restore_state()
-            return True
-        return False
+        """Bir adım ileri al - en son ziyaret edilen dal izlenir"""
+        child = self._current.active
+        if child is None:
+            return False
+        self._step_down(child)
+        # Adımdan sonra kendiliğinden yapılmış işlemler de yinelenir
+        while child.active is not None and child.active.entry.automatic:
+            child = child.active
+            self._step_down(child)
+        self._visit(child)
+        self._changed()
+        return True
+    
+    def switch_branch(self, step=1):
+        """
+        En yakın çatallanma noktasında step kadar sonraki (ya da önceki) dala geçer.
+        
+        Yeni dalın en son ziyaret edilen ucuna gidilir. (dal sırası, dal sayısı)
+        döndürür; hiç alternatif dal yoksa None.
+        """
+        node = self._current
+        while node.parent is not None and len(node.parent.children) < 2:
+            node = node.parent
+        fork = node.parent
+        if fork is None:
+            return None
+        index = (fork.children.index(node) + step) % len(fork.children)
+        target = fork.children[index]
+        while target.active is not None:
+            target = target.active
+        self.jump_to(target)
+        return index + 1, len(fork.children)
+    
+    def jump_to(self, node):
+        """
+        Ağaçtaki herhangi bir düğüme geçer.
+        
+        Yalnızca iki düğüm arasındaki yol oynatılır: ortak ataya kadar geri
+        alınır, oradan hedefe kadar ileri alınır.
+        """
+        ancestors = set()
+        walker = node
+        while walker is not None:
+            ancestors.add(walker)
+            walker = walker.parent
+        while self._current not in ancestors:
+            self._step_up()
+        path = []
+        walker = node
+        while walker is not self._current:
+            path.append(walker)
+            walker = walker.parent
+        for child in reversed(path):
+            self._step_down(child)
+        self._visit(node)
+        self._changed()
+    
+    def _step_up(self):
+        """Mevcut düğümün işlemini geri alarak ebeveyne geçer"""
+        node = self._current
+        node.entry.undo(self._canvas)
+        records = node.entry.revert(self._records)
+        if records is None:
+            # İşlem tersine çevrilemiyorsa durum tuvalden okunur
+            records = capture_items(self._canvas)
+        self._records = tuple(records)
+        self._current = node.parent
+    
+    def _step_down(self, child):
+        """Çocuğun işlemini yeniden uygulayarak ona geçer"""
+        child.entry.redo(self._canvas)
+        self._records = tuple(child.entry.apply(self._records))
+        self._current = child
+    
+    def image_names(self):
+        """Mevcut kayıtlarda ya da ağaçtaki herhangi bir işlemde anılan görüntü adları"""
+        names = referenced_images(self._records)
+        for node in self._nodes():
+            if node.entry is not None:
+                names |= referenced_images(node.entry.records_held())
+        return names
+    
+    def export_state(self):
+        """
+        Geçmişin tamamını (ağaç ve mevcut kayıtlar) geçmişi değiştirmeden
+        dışa aktarır.
+        
+        Ağaç, ebeveyn sıralarını tutan düz bir düğüm listesine çevrilir;
+        düğümler birbirine bağlı kalsaydı pickle uzun geçmişlerde özyineleme
+        sınırına takılırdı. Dönen durum tuvalden bağımsızdır (pickle ile
+        saklanabilir) ve restore_state ile geri yüklenir.
+        """
+        # Genişlik öncelikli sıra: ebeveyn her zaman çocuklarından önce gelir
+        # ve kardeşler ağaçtaki sırayı korur
+        order = [self._root]
+        for node in order:
+            order.extend(node.children)
+        index = {node: i for i, node in enumerate(order)}
+        nodes = [
+            (
+                index[node.parent] if node.parent is not None else -1,
+                node.entry,
+                index[node.active] if node.active is not None else -1,
+                node.visited,
+            )
+            for node in order
+        ]
+        return (nodes, index[self._current], self._records, self._node_count, self._clock)
     
-    def _restore_state(self):
+    def take_state(self):
         """
-        Belirtilen adımdaki durumu geri yükle.
+        Geçmişi dışa aktarır (export_state) ve boş tuval durumuna döndürür
+        (reset); tuvale dokunmaz.
+        """
+        state = self.export_state()
+        self.reset()
+        return state
+    
+    def reset(self):
+        """Geçmişi boş tuval durumuna döndürür; tuvale dokunmaz"""
+        self._root = self._current = _HistoryNode(None, None)
+        self._records = ()
+        self._node_count = 1
+        self._clock = 0
+        self._changed()
+    
+    def restore_state(self, state):
+        """export_state ile alınmış geçmişi geri yükler; tuval kayıtlarla aynı olmalıdır"""
+        nodes, current, records, self._node_count, self._clock = state
+        order = []
+        for parent, entry, _, visited in nodes:
+            node = _HistoryNode(order[parent] if parent >= 0 else None, entry)
+            node.visited = visited
+            if node.parent is not None:
+                node.parent.children.append(node)
+            order.append(node)
+        for node, (_, _, active, _) in zip(order, nodes):
+            node.active = order[active] if active >= 0 else None
+        self._root = order[0]
+        self._current = order[current]
+        self._records = tuple(records)
+        self._changed()
+    
+    def add_listener(self, listener):
+        """
+        Mevcut durum (records) her değiştiğinde çağrılacak bir işlev ekler.
         
-        Alt çizgi (_) ile başlayan metot ismi, bu metodun 
-        sınıf içi kullanım için olduğunu belirtir (kapsülleme).
-        """
-        self._canvas.delete("all")
-        if 0 <= self._current_step < len(self._history):
-            for item_type, coords, options in self._history[self._current_step]:
-                if item_type == "oval":
-                    self._canvas.create_oval(coords, **options)
-                elif item_type == "rectangle":
-                    self._canvas.create_rectangle(coords, **options)
-                elif item_type == "line":
-                    self._canvas.create_line(coords, **options)
-                elif item_type == "polygon":
-                    self._canvas.create_polygon(coords, **options)
\ No newline at end of file
+        İkincil görünümler gibi izleyiciler tuvali taramadan kayıtlardaki
+        farkı uygulayabilir.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+    
+    def _changed(self):
+        for listener in self._listeners:
+            listener()
+    
+    def _visit(self, node):
+        """Düğümü ve atalarını en son ziyaret edilen yol olarak işaretler"""
+        self._clock += 1
+        while node is not None:
+            node.visited = self._clock
+            if node.parent is not None:
+                node.parent.active = node
+            node = node.parent
+    
+    def _prune(self):
+        """
+        Düğüm sayısı sınırı aşıldığında en uzun süredir ziyaret edilmeyen
+        yaprakları siler; ağaç tek bir zincirse kökü bir adım ileri taşır.
+        """
+        while self._node_count > self._max_history:
+            on_path = set()
+            walker = self._current
+            while walker is not None:
+                on_path.add(walker)
+                walker = walker.parent
+            leaves = [n for n in self._nodes() if not n.children and n not in on_path]
+            if leaves:
+                leaf = min(leaves, key=lambda n: n.visited)
+                leaf.parent.children.remove(leaf)
+                if leaf.parent.active is leaf:
+                    leaf.parent.active = leaf.parent.children[-1] if leaf.parent.children else None
+                self._node_count -= 1
+                continue
+            # Kökün tek çocuğu mevcut yoldadır; o çocuk yeni kök olur
+            child = self._root.children[0]
+            child.parent = None
+            child.entry = None
+            self._root = child
+            self._node_count -= 1
+    
+    def _nodes(self):
+        """Ağaçtaki tüm düğümler"""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children)
@@ -0,0 +1,140 @@
+from abc import abstractmethod
+
+from abstract_classes import DrawingTool
+from canvas_items import CREATE_METHODS, OVERLAY_TAG
+from fills import FILLABLE, fill_records
+
+# Şekil araçları için ortak önizleme
+# ==================================
+# Çizgi, daire, dikdörtgen gibi araçlar sürükleme sırasında şeklin bir
+# önizlemesini gösterir. Her fare hareketinde önizlemeyi silip yeniden
+# oluşturmak yerine hareketin başında tek bir öğe oluşturulur ve yalnızca
+# koordinatları (canvas.coords) güncellenir. Güncellemeler kare hızına
+# (FRAME_MS) göre birleştirilir; aynı karede gelen hareketlerden yalnızca
+# sonuncusu çizilir. Önizleme overlay etiketi taşıdığı için belgeye ait
+# sayılmaz.
+
+PREVIEW_TAG = "preview"
+# İki önizleme güncellemesi arasındaki en kısa süre (ms, ~60 fps)
+FRAME_MS = 16
+# Önizlemenin kesikli çizgi deseni
+PREVIEW_DASH = (4, 2)
+
+
+class ShapePreview:
+    """Bir hareket boyunca tek bir önizleme öğesini yerinde günceller"""
+    def __init__(self):
+        self._canvas = None
+        self._item = None
+        self._pending = None
+        self._job = None
+
+    @property
+    def active(self):
+        return self._item is not None
+
+    def show(self, canvas, item_type, coords, **options):
+        """
+        Önizlemeyi verilen koordinatlarla gösterir.
+
+        İlk çağrıda öğe oluşturulur; sonraki çağrılar yalnızca bir sonraki
+        karede uygulanacak koordinatları günceller.
+        """
+        if self._item is None:
+            self._canvas = canvas
+            create = getattr(canvas, CREATE_METHODS[item_type])
+            self._item = create(coords, tags=(OVERLAY_TAG, PREVIEW_TAG), **options)
+            return
+        self._pending = coords
+        if self._job is None:
+            self._job = canvas.after(FRAME_MS, self._flush)
+
+    def _flush(self):
+        """Karede biriken son koordinatları önizleme öğesine uygular"""
+        self._job = None
+        if self._item is not None and self._pending is not None:
+            self._canvas.coords(self._item, *self._pending)
+        self._pending = None
+
+    def clear(self):
+        """Önizlemeyi kaldırır"""
+        if self._job is not None:
+            self._canvas.after_cancel(self._job)
+            self._job = None
+        if self._item is not None:
+            self._canvas.delete(self._item)
+            self._item = None
+        self._pending = None
+
+
+class ShapeTool(DrawingTool):
+    """
+    Başlangıç noktasından sürüklenerek çizilen şekil araçlarının ortak davranışı.
+
+    Alt sınıflar item_type'ı ve shape_coords'u (ve gerekirse options'ı)
+    tanımlar; önizleme ve çizimin tamamlanması bu sınıftadır. Şekil fare
+    bırakıldığında (end) ya da doğrudan draw çağrıldığında oluşturulur.
+    """
+    item_type = "line"
+    # Kapalı şekiller için geçişli ya da desenli dolgu (fills.Fill); None ise dolgusuz
+    fill = None
+
+    def __init__(self):
+        self.start_x = None
+        self.start_y = None
+        self._preview = ShapePreview()
+
+    def start(self, canvas, x, y):
+        """Şeklin başlangıç noktasını kaydeder"""
+        self.start_x = x
+        self.start_y = y
+
+    def drag(self, canvas, x, y, color):
+        """Önizlemeyi fare konumuna göre günceller"""
+        if self.start_x is None or self.start_y is None:
+            return
+        self._preview.show(canvas, self.item_type, self.shape_coords(x, y),
+                           **self.preview_options(color))
+
+    def draw(self, canvas, x, y, brush_size, color):
+        """Önizlemeyi kaldırır ve kalıcı şekli oluşturur"""
+        self._preview.clear()
+        if self.start_x is None or self.start_y is None:
+            return None
+        coords = self.shape_coords(x, y)
+        self.start_x = None
+        self.start_y = None
+        if self.fill is not None and self.item_type in FILLABLE:
+            # Dolgu görüntüsü ve kenar çizgisi; öğelerin listesi döndürülür
+            records = fill_records(self.fill, self.item_type, coords, self.options(brush_size, color))
+            return [
+                getattr(canvas, CREATE_METHODS[item_type])(item_coords, **options)
+                for item_type, item_coords, options in records
+            ]
+        create = getattr(canvas, CREATE_METHODS[self.item_type])
+        return create(coords, **self.options(brush_size, color))
+
+    def end(self, canvas, x, y, brush_size, color):
+        """Fare bırakıldığında şekli tamamlar"""
+        return self.draw(canvas, x, y, brush_size, color)
+
+    def cancel(self, canvas):
+        """Yarım kalan şekli ve önizlemesini atar (ör. araç değiştirildiğinde)"""
+        self._preview.clear()
+        self.start_x = None
+        self.start_y = None
+
+    @abstractmethod
+    def shape_coords(self, x, y):
+        """Başlangıç noktası ve (x, y) için şeklin düz koordinat listesini döndürür"""
+        pass
+
+    def preview_options(self, color):
+        """Önizleme öğesinin seçenekleri"""
+        if self.item_type == "line":
+            return {"fill": color, "width": 2, "dash": PREVIEW_DASH}
+        return {"outline": color, "fill": "", "dash": PREVIEW_DASH}
+
+    def options(self, brush_size, color):
+        """Kalıcı şeklin seçenekleri"""
+        return {"outline": color, "width": brush_size}
@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+
+from canvas_items import OVERLAY_TAG
+
+# Simetri ve ayna çizim modları
+# =============================
+# Her giriş noktası N çıkış noktasına dönüştürülür ve etkin araçla çizilir.
+# Dönüşümler tuval merkezine göre bir kez 3x3 homojen matrisler olarak
+# hazırlanır; bir karede biriken tüm noktalar tek bir matris çarpımıyla
+# dönüştürülür. Oluşan öğeler create_items ile tek bir kanvas çağrısında
+# eklenir, böylece 8 yönlü simetri 8 kat gecikme demek değildir.
+
+GUIDE_TAG = "symmetry_guide"
+# Desteklenen kopya sayıları
+WAYS = (2, 4, 6, 8)
+# Kullanıcıya gösterilen mod adları: (tür, kopya sayısı)
+SYMMETRY_MODES = {"Kapalı": None}
+SYMMETRY_MODES.update({f"Döndürme {n}": ("radial", n) for n in WAYS})
+SYMMETRY_MODES.update({f"Ayna {n}": ("mirror", n) for n in WAYS})
+
+
+def symmetry_matrices(kind, ways, cx, cy):
+    """
+    (cx, cy) merkezli simetri dönüşümlerini (ways x 3 x 3) döndürür.
+
+    "radial" için 360/ways derecelik döndürmeler, "mirror" için ways/2
+    döndürmenin her biri ve dikey eksene göre yansıması kullanılır.
+    İlk matris her zaman birim matristir (orijinal nokta).
+    """
+    rotations = ways // 2 if kind == "mirror" else ways
+    flip = np.diag((-1.0, 1.0, 1.0))
+    to_origin = np.array(((1, 0, -cx), (0, 1, -cy), (0, 0, 1)), dtype=float)
+    back = np.array(((1, 0, cx), (0, 1, cy), (0, 0, 1)), dtype=float)
+    matrices = []
+    for i in range(rotations):
+        angle = 2 * math.pi * i / rotations
+        cos, sin = math.cos(angle), math.sin(angle)
+        rotation = np.array(((cos, -sin, 0), (sin, cos, 0), (0, 0, 1)))
+        matrices.append(back @ rotation @ to_origin)
+        if kind == "mirror":
+            matrices.append(back @ rotation @ flip @ to_origin)
+    return np.stack(matrices)
+
+
+class Symmetry:
+    """Seçili simetri modunun dönüşümlerini tutar ve nokta/öğe gruplarına uygular"""
+    def __init__(self, kind, ways):
+        self.kind = kind
+        self.ways = ways
+        self._center = None
+        self._matrices = None
+
+    def matrices(self, center):
+        """Merkez değişmedikçe önceden hesaplanmış matrisleri döndürür"""
+        if center != self._center:
+            self._matrices = symmetry_matrices(self.kind, self.ways, *center)
+            self._center = center
+        return self._matrices
+
+    def transform(self, points, center):
+        """
+        (P x 2) noktayı tek bir matris çarpımıyla dönüştürür.
+
+        Sonuç (ways * P) x 2 dizisidir; kopyalar sırayla (önce tüm noktaların
+        birinci kopyası, sonra ikincisi ...) gelir.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        homogeneous = np.column_stack((points, np.ones(len(points))))
+        result = self.matrices(center) @ homogeneous.T
+        return result[:, :2, :].transpose(0, 2, 1).reshape(-1, 2)
+
+    def transform_record(self, record, center):
+        """
+        Bir öğe kaydının simetrik kopyalarını döndürür (orijinal hariç).
+
+        Tk oval ve dikdörtgenleri döndüremez. Ovalde merkez dönüştürülür ve
+        boyut döndürülmüş elipsin sınır kutusuna göre ayarlanır; dikdörtgen
+        eksene hizalı kalmıyorsa köşeleri dönüştürülmüş bir çokgen (içi boşsa
+        kapalı bir çizgi) olur.
+        """
+        item_type, coords, options = record
+        points = np.asarray(coords, dtype=float).reshape(-1, 2)
+        matrices = self.matrices(center)[1:]
+        if item_type == "oval":
+            middle = points.mean(axis=0)
+            half = np.abs(points[1] - points[0]) / 2
+            centers = self.transform(middle, center)[1:]
+            # (a, b) yarı eksenli elipsin M ile dönüşmüş halinin yarı genişliği
+            # sqrt(M00² a² + M01² b²), yarı yüksekliği sqrt(M10² a² + M11² b²)
+            extents = np.sqrt((matrices[:, :2, :2] ** 2) @ half ** 2)
+            return [
+                (item_type, [*(c - e).tolist(), *(c + e).tolist()], dict(options))
+                for c, e in zip(centers, extents)
+            ]
+        if item_type == "rectangle":
+            (x0, y0), (x1, y1) = points[:2]
+            corners = self.transform(((x0, y0), (x1, y0), (x1, y1), (x0, y1)), center)
+            copies = []
+            for matrix, quad in zip(matrices, corners.reshape(self.ways, 4, 2)[1:]):
+                linear = matrix[:2, :2]
+                if np.allclose(linear[0, 1], 0) or np.allclose(linear[0, 0], 0):
+                    # 90 derecenin katlarında kopya yine bir dikdörtgendir
+                    copies.append((item_type, [*quad.min(axis=0).tolist(), *quad.max(axis=0).tolist()],
+                                   dict(options)))
+                elif options.get("fill"):
+                    copies.append(("polygon", quad.ravel().tolist(), dict(options)))
+                else:
+                    # Kayıtlarda boş dolgu saklanmaz (Tk çokgeni siyah doldurur);
+                    # içi boş dikdörtgen kapalı bir çizgi olur
+                    copies.append(("line", quad.ravel().tolist() + quad[0].tolist(),
+                                   {"fill": options.get("outline", "black"),
+                                    "width": options.get("width", 1)}))
+            return copies
+        copies = self.transform(points, center).reshape(self.ways, -1, 2)
+        return [(item_type, copy.ravel().tolist(), dict(options)) for copy in copies[1:]]
+
+    def draw_guides(self, canvas, center):
+        """Simetri eksenlerini ince kesikli çizgiler olarak gösterir"""
+        canvas.delete(GUIDE_TAG)
+        cx, cy = center
+        length = math.hypot(cx, cy)
+        lines = self.ways if self.kind == "radial" else self.ways // 2
+        for i in range(lines):
+            angle = math.pi * i / lines if self.kind == "mirror" else 2 * math.pi * i / lines
+            dx, dy = math.sin(angle) * length, -math.cos(angle) * length
+            # Döndürmede merkezden çıkan ışınlar, aynada merkezden geçen eksenler
+            start = (cx, cy) if self.kind == "radial" else (cx - dx, cy - dy)
+            canvas.create_line(
+                start[0], start[1], cx + dx, cy + dy,
+                fill="#c8c8c8", dash=(3, 4), tags=(OVERLAY_TAG, GUIDE_TAG)
+            )
@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from collaboration import CollaborationSession, RelayServer
+from document import DocumentCanvas
+
+
+def _pump(*canvases, rounds=30):
+    """Oturumların kare işlerini (after) ağdan mesajlar gelene kadar çalıştırır"""
+    for _ in range(rounds):
+        for canvas in canvases:
+            jobs = list(canvas._jobs.values())
+            canvas._jobs.clear()
+            for func, args in jobs:
+                func(*args)
+        time.sleep(0.005)
+
+
+def _types(canvas):
+    return [item_type for item_type, _, _ in canvas.document.records()]
+
+
+class CollaborationUndoTest(unittest.TestCase):
+    def setUp(self):
+        self.server = RelayServer(port=0, tail_limit=1)
+        port = self.server.start_in_thread()
+        self.a, self.b = DocumentCanvas(), DocumentCanvas()
+        self.remote = []
+        self.session_a = CollaborationSession(self.a, self.a, port=port)
+        self.session_b = CollaborationSession(self.b, self.b, port=port, on_remote=self.remote.append)
+        self.port = port
+        _pump(self.a, self.b)
+
+    def tearDown(self):
+        self.session_a.close()
+        self.session_b.close()
+        self.server.stop()
+
+    def _stroke(self, session, canvas, create):
+        session.items_created([create(canvas)])
+        session.stroke_committed()
+
+    def test_undo_removes_only_own_stroke_everywhere(self):
+        self._stroke(self.session_a, self.a, lambda c: c.create_line(0, 0, 10, 10, fill="#FF0000"))
+        self._stroke(self.session_b, self.b, lambda c: c.create_oval(0, 0, 5, 5, fill="#00FF00"))
+        _pump(self.a, self.b)
+        self.assertEqual(sorted(_types(self.a)), ["line", "oval"])
+        self.assertEqual(self.remote[-1], [("line", [0.0, 0.0, 10.0, 10.0], {"fill": "#FF0000"})])
+
+        self.assertTrue(self.session_a.undo())
+        _pump(self.a, self.b)
+        self.assertEqual(_types(self.a), ["oval"])
+        self.assertEqual(_types(self.b), ["oval"])
+        self.assertIsNone(self.remote[-1])
+
+        self.assertTrue(self.session_a.redo())
+        _pump(self.a, self.b)
+        self.assertEqual(_types(self.a), ["oval", "line"])
+        self.assertEqual(_types(self.b), ["oval", "line"])
+        self.assertFalse(self.session_b.redo())
+
+    def test_late_joiner_keeps_stroke_ids(self):
+        self._stroke(self.session_a, self.a, lambda c: c.create_line(0, 0, 10, 10, fill="#FF0000"))
+        self._stroke(self.session_a, self.a, lambda c: c.create_oval(0, 0, 5, 5, fill="#00FF00"))
+        self.session_a.undo()
+        _pump(self.a, self.b)
+        late = DocumentCanvas()
+        session = CollaborationSession(late, late, port=self.port)
+        try:
+            _pump(late)
+            self.assertEqual(_types(late), ["line"])
+            self.session_a.undo()
+            _pump(self.a, late)
+            self.assertEqual(_types(late), [])
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
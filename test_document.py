@@ -0,0 +1,51 @@
+import unittest
+
+from document import CanvasView, Document, DocumentCanvas
+
+
+def _shown(canvas):
+    return canvas.document.records()
+
+
+class CanvasViewTest(unittest.TestCase):
+    def setUp(self):
+        self.document = Document("#FFFFFF")
+        self.target = DocumentCanvas()
+        self.view = CanvasView(self.document, self.target)
+
+    def test_new_items_are_created_in_one_idle_flush(self):
+        first = self.document.add("line", [0, 0, 10, 10], {"fill": "#FF0000"})
+        self.document.add("oval", [0, 0, 5, 5], {"fill": "#00FF00"})
+        self.assertEqual(_shown(self.target), [])
+        self.assertEqual(len(self.target._jobs), 1)
+        self.target.update()
+        self.assertEqual(_shown(self.target), self.document.records())
+        self.assertIsNotNone(self.view.tk_id(first))
+
+    def test_changes_follow_the_model(self):
+        a = self.document.add("rectangle", [0, 0, 10, 10], {"fill": "#FF0000"})
+        b = self.document.add("oval", [0, 0, 5, 5], {"fill": "#00FF00"})
+        c = self.document.add("line", [0, 0, 8, 8], {"fill": "#0000FF"})
+        self.document.move([a], 5, 5)
+        self.document.set_coords(b, [1, 1, 6, 6])
+        self.document.configure(c, fill="#000000")
+        self.document.restack([c], below=a)
+        self.document.set_background("#FFFFEE")
+        self.assertEqual(_shown(self.target), self.document.records())
+        self.assertEqual(self.target["bg"], "#FFFFEE")
+        self.document.remove([b])
+        self.assertEqual(_shown(self.target), self.document.records())
+
+    def test_removed_pending_items_are_never_created(self):
+        item = self.document.add("line", [0, 0, 10, 10], {"fill": "#FF0000"})
+        self.document.remove([item])
+        self.target.update()
+        self.assertEqual(_shown(self.target), [])
+        self.view.close()
+        self.document.add("line", [0, 0, 10, 10], {"fill": "#FF0000"})
+        self.target.update()
+        self.assertEqual(_shown(self.target), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import pickle
+import unittest
+
+from canvas_items import image_for, register_image
+from document import DocumentCanvas
+from document_tabs import DocumentTabs
+from settings import BackgroundAction, HistoryAction, PaintHistory
+
+
+class _UnpicklableAction(HistoryAction):
+    """pickle edilemeyen bir işlem (lambda tutar)"""
+    def __init__(self):
+        self._callback = lambda: None
+
+    def undo(self, canvas):
+        pass
+
+    def redo(self, canvas):
+        pass
+
+    def apply(self, records):
+        return records
+
+    def revert(self, records):
+        return records
+
+
+def _tabs(history_length, max_history=None):
+    canvas = DocumentCanvas()
+    history = PaintHistory(canvas)
+    if max_history is not None:
+        history._max_history = max_history
+    for i in range(history_length):
+        canvas.create_rectangle(i, 0, i + 1, 1, fill="#FF0000")
+        history.save_state()
+    background = ["#FFFFFF"]
+    tabs = DocumentTabs(canvas, history, lambda: background[0], lambda color: background.__setitem__(0, color))
+    return canvas, history, tabs
+
+
+class DocumentTabsTest(unittest.TestCase):
+    def test_long_history_survives_switch(self):
+        canvas, history, tabs = _tabs(1200, max_history=2000)
+        history.undo()
+        canvas.create_oval(0, 0, 5, 5, fill="#00FF00")
+        history.save_state()
+        records = history.records
+        tabs.new()
+        self.assertEqual(len(canvas.document.records()), 0)
+        tabs.switch(0)
+        self.assertEqual(history.records, records)
+        self.assertEqual(len(canvas.document.records()), len(records))
+        self.assertTrue(history.undo())
+        self.assertTrue(history.redo())
+        self.assertEqual(history.switch_branch(), (1, 2))
+
+    def test_failed_suspend_keeps_document(self):
+        canvas, history, tabs = _tabs(5)
+        history.push_action(_UnpicklableAction())
+        records = history.records
+        # Yerel bir lambda Python 3.14 öncesinde AttributeError, sonrasında PicklingError verir
+        with self.assertRaises((pickle.PicklingError, AttributeError)):
+            tabs.new()
+        self.assertEqual(len(tabs), 1)
+        self.assertEqual(tabs.active, 0)
+        self.assertIsNone(tabs[0].suspended)
+        self.assertEqual(history.records, records)
+        self.assertEqual(len(canvas.document.records()), len(records))
+        self.assertTrue(history.undo())
+
+    def test_background_state_follows_tab(self):
+        canvas, history, tabs = _tabs(2)
+        state = ["#FFFFFF", None]
+        apply = lambda new: state.__setitem__(slice(None), list(new))
+        BackgroundAction.register(canvas, apply)
+        tabs = DocumentTabs(canvas, history, lambda: tuple(state), apply)
+        apply(("#000000", "dots"))
+        history.push_action(BackgroundAction(("#FFFFFF", None), ("#000000", "dots")))
+        tabs.new(background=("#FFFFFF", None))
+        self.assertEqual(state, ["#FFFFFF", None])
+        tabs.switch(0)
+        self.assertEqual(state, ["#000000", "dots"])
+        history.undo()
+        self.assertEqual(state, ["#FFFFFF", None])
+        self.assertEqual(len(history.records), 2)
+
+    def test_document_images_leave_with_tab(self):
+        from PIL import Image
+        canvas, history, tabs = _tabs(1)
+        flattened, cached = Image.new("RGBA", (4, 4)), Image.new("RGBA", (4, 4))
+        # Ad olarak dize verilir; başsız testte PhotoImage oluşturulamaz
+        shared = register_image("test_cached", cached)
+        tabs.new()
+        name = register_image("test_flattened", flattened, document=True)
+        canvas.create_image(0, 0, image=name, anchor="nw")
+        history.save_state()
+        tabs.close(1)
+        self.assertIsNone(image_for(name))
+
+        register_image(name, flattened, document=True)
+        canvas.create_image(0, 0, image=name, anchor="nw")
+        canvas.create_image(0, 0, image=shared, anchor="nw")
+        history.save_state()
+        tabs.new()
+        self.assertIsNone(image_for(name))
+        self.assertIs(image_for(shared), cached)
+        self.assertEqual(list(tabs[0].suspended.load()["images"]), [name])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from document import DocumentCanvas
+from timelapse import CLEAR, ITEMS, OperationLog, TimelapsePlayer, export_frames
+
+
+def _log():
+    """Çiz -> temizle -> çiz günlüğü"""
+    log = OperationLog("#FFFFFF")
+    log._entries = [
+        (0.0, ITEMS, [("rectangle", [0, 0, 10, 10], {"fill": "#FF0000", "outline": ""})]),
+        (0.5, CLEAR, None),
+        (1.0, ITEMS, [("rectangle", [20, 0, 30, 10], {"fill": "#0000FF", "outline": ""})]),
+    ]
+    return log
+
+
+class TimelapseClearTest(unittest.TestCase):
+    def test_player_removes_cleared_strokes(self):
+        canvas = DocumentCanvas()
+        TimelapsePlayer(canvas, canvas, _log(), speed=1000.0).play()
+        canvas.update()
+        records = canvas.document.records()
+        self.assertEqual([options["fill"] for _, _, options in records], ["#0000FF"])
+
+    def test_export_removes_cleared_strokes(self):
+        from PIL import Image
+        with tempfile.TemporaryDirectory() as folder:
+            count = export_frames(_log(), folder, 40, 20, fps=2, speed=1.0)
+            last = Image.open(os.path.join(folder, f"frame_{count - 1:05d}.png")).convert("RGB")
+            self.assertEqual(last.getpixel((5, 5)), (255, 255, 255))
+            self.assertEqual(last.getpixel((25, 5)), (0, 0, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
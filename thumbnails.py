@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Kayıtlı çizimler için küçük resim (thumbnail) önbelleği
+# =======================================================
+# Galeri gibi görünümler yüzlerce çizimin önizlemesini gösterir. Önizlemeler
+# diskte bir önbellek klasöründe tutulur; anahtar dosyanın içerik özeti
+# (hash) ve önizleme boyutudur. Böylece taşınan ya da kopyalanan bir çizim
+# yeniden çizilmez, değişen bir çizim ise yeni bir önizleme alır.
+#
+# Her dosyanın özeti, (yol, değiştirilme zamanı, boyut) ile birlikte bir
+# dizin (index) dosyasında saklanır. Isınmış bir önbellekte bir klasörü
+# listelemek yalnızca dosyaları stat etmek ve sözlükten okumaktır; dosya
+# içeriği okunmaz. Eksik önizlemeler bir iş parçacığı havuzunda üretilir
+# (PIL çözme ve küçültme sırasında GIL'i bırakır).
+#
+# Önbellek boyutu sınırlıdır: sınır aşılınca en uzun süredir kullanılmayan
+# (LRU) önizlemeler silinir.
+
+# Varsayılan önbellek boyutu (bayt)
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+# Varsayılan önizleme boyutu (en uzun kenar, piksel)
+THUMBNAIL_SIZE = 128
+# Dizin dosyasının adı
+_INDEX_NAME = "index.json"
+# Özet hesaplanırken okunan parça boyutu
+_CHUNK = 1024 * 1024
+
+
+def default_cache_dir():
+    """Kullanıcının önbellek klasöründeki uygulama alt klasörünü döndürür"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "paint_app", "thumbnails")
+
+
+def content_hash(path):
+    """Dosya içeriğinin kısa özetini (hex) döndürür"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _render_image(path, size):
+    """Resim dosyasının önizlemesini üretir (JPEG'ler küçültülmüş ölçekte çözülür)"""
+    from PIL import Image
+    with Image.open(path) as image:
+        # JPEG çözücüsü resmi doğrudan 1/2, 1/4 ya da 1/8 ölçekte açabilir
+        image.draft("RGB", (size, size))
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        return image.copy()
+
+
+# Dosya uzantısı -> önizleme üreten işlev (yol, boyut) -> PIL görüntüsü
+RENDERERS = {ext: _render_image for ext in (".png", ".jpg", ".jpeg", ".gif", ".bmp")}
+
+
+def register_renderer(extension, renderer):
+    """Yeni bir dosya türü için önizleme üreticisi kaydeder (ör. proje dosyaları)"""
+    RENDERERS[extension.lower()] = renderer
+
+
+def can_preview(path):
+    """Dosya türünün önizlemesi üretilebiliyorsa True döndürür"""
+    return os.path.splitext(path)[1].lower() in RENDERERS
+
+
+class ThumbnailCache:
+    """
+    İçerik özetiyle anahtarlanan, boyutu sınırlı disk önbelleği.
+
+    lookup hazır önizlemeyi hemen döndürür; request eksik önizlemeyi
+    arka planda üretir ve bir Future döndürür. Dizin close (ya da save)
+    çağrıldığında diske yazılır.
+    """
+    def __init__(self, directory=None, max_bytes=MAX_CACHE_BYTES, workers=None):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # yol -> (değiştirilme zamanı, dosya boyutu, içerik özeti)
+        self._hashes = {}
+        # önizleme dosyası adı -> bayt; en eski kullanılan başta
+        self._entries = OrderedDict()
+        self._total = 0
+        self._pending = {}
+        self._dirty = False
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self._load_index()
+
+    @property
+    def total_bytes(self):
+        """Önbellekteki önizlemelerin toplam boyutu"""
+        return self._total
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, path, size=THUMBNAIL_SIZE):
+        """
+        Hazırsa önizleme dosyasının yolunu, değilse None döndürür.
+
+        Yalnızca kaynak dosyayı stat eder; içerik okunmaz.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return self._lookup(os.path.abspath(path), stat, size)
+
+    def _lookup(self, path, stat, size):
+        with self._lock:
+            known = self._hashes.get(path)
+            if known is None or known[:2] != [stat.st_mtime_ns, stat.st_size]:
+                return None
+            name = self._name(known[2], size)
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+            self._dirty = True
+        return os.path.join(self.directory, name)
+
+    def request(self, path, size=THUMBNAIL_SIZE):
+        """
+        Önizleme dosyasının yolunu veren bir Future döndürür.
+
+        Önizleme önbellekteyse Future zaten tamamlanmıştır; değilse
+        havuzda üretilir. Aynı dosya için süren bir iş yeniden başlatılmaz.
+        """
+        cached = self.lookup(path, size)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        key = (os.path.abspath(path), size)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._pool.submit(self._generate, path, size)
+                future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def list_folder(self, folder, size=THUMBNAIL_SIZE):
+        """
+        Klasördeki önizlenebilir dosyaları (yol, önizleme yolu ya da None)
+        çiftleri olarak döndürür; eksik önizlemeler arka planda istenir.
+        """
+        result = []
+        folder = os.path.abspath(folder)
+        with os.scandir(folder) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if not can_preview(entry.name) or not entry.is_file():
+                    continue
+                cached = self._lookup(entry.path, entry.stat(), size)
+                if cached is None:
+                    self.request(entry.path, size)
+                result.append((entry.path, cached))
+        return result
+
+    def save(self):
+        """Dizini diske yazar (değişiklik yoksa bir şey yapmaz)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "hashes": self._hashes,
+                "entries": list(self._entries.items()),
+            }
+            self._dirty = False
+        index_path = os.path.join(self.directory, _INDEX_NAME)
+        temporary = index_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temporary, index_path)
+
+    def close(self, wait=True):
+        """Bekleyen işleri bitirir (ya da iptal eder) ve dizini kaydeder"""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        self.save()
+
+    # ------------------------------------------------------------ iç işler
+
+    @staticmethod
+    def _name(digest, size):
+        return f"{digest}-{size}.png"
+
+    def _load_index(self):
+        """Dizini okur ve klasörde artık bulunmayan önizlemeleri atar"""
+        try:
+            with open(os.path.join(self.directory, _INDEX_NAME), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        present = {entry.name for entry in os.scandir(self.directory)}
+        for name, size in data.get("entries", ()):
+            if name in present:
+                self._entries[name] = size
+                self._total += size
+        # Önizlemesi kalmamış özetler de unutulur; dizin sınırsız büyümez
+        digests = {name.partition("-")[0] for name in self._entries}
+        self._hashes = {
+            path: known for path, known in data.get("hashes", {}).items() if known[2] in digests
+        }
+
+    def _forget(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _generate(self, path, size):
+        """Çalışan iş parçacığında: özeti hesaplar ve gerekirse önizlemeyi üretir"""
+        stat = os.stat(path)
+        digest = content_hash(path)
+        name = self._name(digest, size)
+        target = os.path.join(self.directory, name)
+        with self._lock:
+            self._hashes[os.path.abspath(path)] = [stat.st_mtime_ns, stat.st_size, digest]
+            self._dirty = True
+            if name in self._entries:
+                # Aynı içerikli başka bir dosyanın önizlemesi zaten var
+                self._entries.move_to_end(name)
+                return target
+        renderer = RENDERERS[os.path.splitext(path)[1].lower()]
+        image = renderer(path, size)
+        temporary = f"{target}.{threading.get_ident()}.tmp"
+        image.save(temporary, "PNG", compress_level=1)
+        os.replace(temporary, target)
+        self._add(name, os.path.getsize(target))
+        return target
+
+    def _add(self, name, size):
+        """Yeni önizlemeyi kaydeder ve sınır aşıldıysa en eskileri siler"""
+        evicted = []
+        with self._lock:
+            self._total += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old, old_size = self._entries.popitem(last=False)
+                self._total -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
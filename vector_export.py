@@ -0,0 +1,416 @@
+import base64
+import io
+import zlib
+from itertools import chain, groupby
+
+from canvas_items import capture_item, document_items, image_for
+
+# Akış (streaming) tabanlı SVG ve PDF dışa aktarma
+# ===============================================
+# Öğeler tek tek okunur, aynı tip ve stildeki ardışık öğeler tek bir yola
+# (path) birleştirilir ve çıktı küçük parçalar halinde üreteçlerle (generator)
+# dosyaya yazılır. Tüm belge hiçbir zaman tek bir dize olarak bellekte tutulmaz.
+# Birleştirilmiş (flattening) çizimler gibi görüntü öğeleri resim olarak gömülür;
+# aynı ada sahip görüntü (ör. bir damga fırçası çizgisindeki damgalar) bir kez
+# gömülür ve her geçtiği yerde ona başvurulur (SVG'de <use>, PDF'te aynı XObject).
+# Raster fırça katmanının döşemeleri de (with_raster_tiles) kanvastaki yığın
+# sıralarıyla görüntü olarak gömülür. Arka plan dolgusu (background_image)
+# arka plan renginin üzerine ilk görüntü olarak yazılır.
+
+# Bir yola birleştirilecek en fazla öğe sayısı (bellek kullanımını sınırlar)
+MAX_RUN = 512
+
+# Arka plan görüntüsünün images sözlüğündeki adı (Tk görüntü adlarıyla çakışmaz)
+_BACKGROUND_IMAGE = "background_fill"
+
+# PDF'te eliptik yayı Bezier eğrisiyle yaklaşıklamak için katsayı
+_KAPPA = 0.5522847498
+
+# Renk adları için küçük bir tablo (Tk'de sık kullanılanlar)
+_NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0),
+    "green": (0, 128, 0), "blue": (0, 0, 255), "yellow": (255, 255, 0),
+    "gray": (190, 190, 190), "grey": (190, 190, 190),
+}
+
+
+def iter_canvas_records(canvas):
+    """Belge öğelerini tek tek kayda dönüştüren üreteç"""
+    for item_id in document_items(canvas):
+        yield capture_item(canvas, item_id)
+
+
+def with_raster_tiles(records, tiles):
+    """
+    Raster döşemelerini (bkz. png_export.raster_layer_tiles) kayıtların
+    arasına yığın sıralarıyla görüntü kayıtları olarak ekler.
+
+    (kayıt üreteci, {görüntü adı: RGBA görüntü}) döndürür; sözlük iter_svg,
+    iter_pdf ve export_vector'ın images parametresine verilir.
+    """
+    tiles = sorted(tiles, key=lambda tile: tile[0])
+    images = {f"raster_{x}_{y}": image for _, (x, y), image in tiles}
+
+    def tile_record(tile):
+        _, (x, y), _ = tile
+        return ("image", [x, y], {"image": f"raster_{x}_{y}", "anchor": "nw"})
+
+    def merged():
+        index = 0
+        for drawn, record in enumerate(records):
+            while index < len(tiles) and tiles[index][0] <= drawn:
+                yield tile_record(tiles[index])
+                index += 1
+            yield record
+        for tile in tiles[index:]:
+            yield tile_record(tile)
+
+    return merged(), images
+
+
+def _with_background(records, images, background_image):
+    """Arka plan görüntüsünü (ör. geçişli dolgu) sol üst köşeye ilk kayıt olarak ekler"""
+    if background_image is None:
+        return records, images
+    record = ("image", [0, 0], {"image": _BACKGROUND_IMAGE, "anchor": "nw"})
+    return chain([record], records), {**(images or {}), _BACKGROUND_IMAGE: background_image}
+
+
+def iter_runs(records):
+    """
+    Aynı tip ve stildeki ardışık kayıtları gruplar.
+
+    (item_type, options, [coords, ...]) üçlüleri üretir; her grup en
+    fazla MAX_RUN öğe içerir.
+    """
+    def style_key(record):
+        item_type, _, options = record
+        return item_type, sorted(options.items())
+
+    for (item_type, _), group in groupby(records, key=style_key):
+        run = []
+        options = None
+        for _, coords, options in group:
+            run.append([float(c) for c in coords])
+            if len(run) >= MAX_RUN:
+                yield item_type, options, run
+                run = []
+        if run:
+            yield item_type, options, run
+
+
+def _rgb(color):
+    """Tk renk değerini (0-255) RGB üçlüsüne çevirir; tanınmazsa None"""
+    if not color:
+        return None
+    if color.startswith("#"):
+        digits = color[1:]
+        step = len(digits) // 3
+        if step in (1, 2, 3, 4) and len(digits) == step * 3:
+            scale = 16 ** step - 1
+            return tuple(
+                round(int(digits[i * step:(i + 1) * step], 16) * 255 / scale)
+                for i in range(3)
+            )
+        return None
+    if color.lower() in _NAMED_COLORS:
+        return _NAMED_COLORS[color.lower()]
+    try:
+        from PIL import ImageColor
+        return ImageColor.getrgb(color)[:3]
+    except (ImportError, ValueError):
+        return None
+
+
+def _width(options):
+    try:
+        return float(options.get("width", 1))
+    except ValueError:
+        return 1.0
+
+
+def _num(value):
+    """Sayıyı kısa biçimde yazar (gereksiz ondalıklar olmadan)"""
+    text = "%.1f" % value
+    return text[:-2] if text.endswith(".0") else text
+
+
+# ---------------------------------------------------------------- SVG
+
+def _svg_color(color):
+    rgb = _rgb(color)
+    return "none" if rgb is None else "#%02x%02x%02x" % rgb
+
+
+def _svg_path_data(item_type, run):
+    """Bir gruptaki tüm öğeler için tek bir SVG yol verisi üretir"""
+    parts = []
+    for coords in run:
+        if item_type == "oval":
+            x0, y0, x1, y1 = coords[:4]
+            rx, ry = abs(x1 - x0) / 2, abs(y1 - y0) / 2
+            cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+            parts.append(
+                f"M{_num(cx - rx)} {_num(cy)}a{_num(rx)} {_num(ry)} 0 1 0 {_num(2 * rx)} 0"
+                f"a{_num(rx)} {_num(ry)} 0 1 0 {_num(-2 * rx)} 0Z"
+            )
+        elif item_type == "rectangle":
+            x0, y0, x1, y1 = coords[:4]
+            parts.append(
+                f"M{_num(x0)} {_num(y0)}H{_num(x1)}V{_num(y1)}H{_num(x0)}Z"
+            )
+        else:
+            points = " ".join(_num(c) for c in coords)
+            close = "Z" if item_type == "polygon" else ""
+            parts.append(f"M{points}{close}")
+    return "".join(parts)
+
+
+def _svg_image(coords, options, embedded, images=None):
+    """
+    Görüntü öğesini bir <use> öğesi olarak yazar.
+
+    Görüntünün PNG verisi ilk geçtiği yerde <defs> içinde bir kez gömülür;
+    embedded, gömülen görüntü adlarını SVG kimliklerine eşler. Görüntü önce
+    images sözlüğünde, sonra canvas_items görüntü kaydında aranır.
+    """
+    name = options.get("image")
+    image = (images or {}).get(name) or image_for(name)
+    if image is None:
+        return ""
+    definition = ""
+    if name not in embedded:
+        embedded[name] = f"img{len(embedded) + 1}"
+        data = io.BytesIO()
+        image.save(data, "PNG")
+        encoded = base64.b64encode(data.getvalue()).decode("ascii")
+        definition = (
+            f'<defs><image id="{embedded[name]}" width="{image.width}" height="{image.height}" '
+            f'xlink:href="data:image/png;base64,{encoded}"/></defs>\n'
+        )
+    return definition + (
+        f'<use xlink:href="#{embedded[name]}" x="{_num(coords[0])}" y="{_num(coords[1])}"/>\n'
+    )
+
+
+def iter_svg(records, width, height, background="#FFFFFF", images=None, background_image=None):
+    """
+    SVG belgesini parça parça üreten üreteç.
+
+    images, canvas_items görüntü kaydında olmayan görüntüleri (ör. raster
+    döşemeleri) adlarına eşler; background_image arka plan dolgusunun
+    görüntüsüdür (yoksa None).
+    """
+    records, images = _with_background(records, images, background_image)
+    yield (
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{int(width)}" '
+        f'height="{int(height)}" viewBox="0 0 {int(width)} {int(height)}">\n'
+    )
+    yield f'<rect width="100%" height="100%" fill="{_svg_color(background)}"/>\n'
+    embedded = {}
+    for item_type, options, run in iter_runs(records):
+        if item_type == "image":
+            for coords in run:
+                yield _svg_image(coords, options, embedded, images)
+            continue
+        data = _svg_path_data(item_type, run)
+        stroke_width = _num(_width(options))
+        if item_type == "line":
+            yield (
+                f'<path d="{data}" fill="none" stroke="{_svg_color(options.get("fill"))}" '
+                f'stroke-width="{stroke_width}" stroke-linecap="round" stroke-linejoin="round"/>\n'
+            )
+        else:
+            yield (
+                f'<path d="{data}" fill="{_svg_color(options.get("fill"))}" '
+                f'stroke="{_svg_color(options.get("outline"))}" stroke-width="{stroke_width}"/>\n'
+            )
+    yield "</svg>\n"
+
+
+# ---------------------------------------------------------------- PDF
+
+def _pdf_color(color, operator):
+    rgb = _rgb(color)
+    if rgb is None:
+        return None
+    return "%s %s %s %s" % (*(f"{c / 255:.3f}" for c in rgb), operator)
+
+
+def _pdf_path(item_type, run):
+    """Bir gruptaki öğeler için PDF yol komutları üretir"""
+    for coords in run:
+        if item_type == "oval":
+            x0, y0, x1, y1 = coords[:4]
+            rx, ry = abs(x1 - x0) / 2, abs(y1 - y0) / 2
+            cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+            kx, ky = rx * _KAPPA, ry * _KAPPA
+            yield (
+                f"{_num(cx + rx)} {_num(cy)} m "
+                f"{_num(cx + rx)} {_num(cy + ky)} {_num(cx + kx)} {_num(cy + ry)} {_num(cx)} {_num(cy + ry)} c "
+                f"{_num(cx - kx)} {_num(cy + ry)} {_num(cx - rx)} {_num(cy + ky)} {_num(cx - rx)} {_num(cy)} c "
+                f"{_num(cx - rx)} {_num(cy - ky)} {_num(cx - kx)} {_num(cy - ry)} {_num(cx)} {_num(cy - ry)} c "
+                f"{_num(cx + kx)} {_num(cy - ry)} {_num(cx + rx)} {_num(cy - ky)} {_num(cx + rx)} {_num(cy)} c h\n"
+            )
+        elif item_type == "rectangle":
+            x0, y0, x1, y1 = coords[:4]
+            yield f"{_num(x0)} {_num(y0)} {_num(x1 - x0)} {_num(y1 - y0)} re\n"
+        else:
+            points = list(zip(coords[::2], coords[1::2]))
+            if not points:
+                continue
+            commands = [f"{_num(points[0][0])} {_num(points[0][1])} m"]
+            commands.extend(f"{_num(x)} {_num(y)} l" for x, y in points[1:])
+            if item_type == "polygon":
+                commands.append("h")
+            yield " ".join(commands) + "\n"
+
+
+def _iter_pdf_content(records, height, background, width, images, sources=None):
+    """
+    Sayfa içerik akışını parça parça üretir.
+
+    Karşılaşılan görüntüler images sözlüğüne (ad -> (sıra, görüntü)) bir
+    kez eklenir; bunlar içerik akışından sonra ayrı nesneler olarak
+    yazılır ve aynı adlı her öğe aynı nesneye başvurur. Görüntüler önce
+    sources sözlüğünde, sonra canvas_items görüntü kaydında aranır.
+    """
+    # Tk koordinatları (y aşağı) PDF koordinatlarına (y yukarı) çevrilir
+    yield f"1 0 0 -1 0 {_num(height)} cm 1 J 1 j\n"
+    fill = _pdf_color(background, "rg")
+    if fill:
+        yield f"{fill} 0 0 {_num(width)} {_num(height)} re f\n"
+    for item_type, options, run in iter_runs(records):
+        if item_type == "image":
+            name = options.get("image")
+            image = (sources or {}).get(name) or image_for(name)
+            if image is None:
+                continue
+            if name not in images:
+                images[name] = (len(images) + 1, image)
+            number = images[name][0]
+            for coords in run:
+                x, y = coords[0], coords[1]
+                # Görüntünün üst satırı y'de olacak şekilde birim kare ölçeklenir
+                yield (
+                    f"q {image.width} 0 0 {-image.height} {_num(x)} {_num(y + image.height)} cm "
+                    f"/Im{number} Do Q\n"
+                )
+            continue
+        if item_type == "line":
+            stroke = _pdf_color(options.get("fill"), "RG")
+            fill = None
+        else:
+            stroke = _pdf_color(options.get("outline"), "RG")
+            fill = _pdf_color(options.get("fill"), "rg")
+        if not stroke and not fill:
+            continue
+        yield "".join(
+            f"{part}\n" for part in (fill, stroke, f"{_num(_width(options))} w") if part
+        )
+        # Grup tek bir parça olarak yazılır
+        yield "".join(_pdf_path(item_type, run))
+        yield ("B\n" if stroke else "f\n") if fill else "S\n"
+
+
+def _pdf_image_objects(image, number, start_object):
+    """Görüntüyü sıkıştırılmış bir XObject ve saydamlık maskesi olarak yazar"""
+    rgba = image.convert("RGBA")
+    for offset, data, space in (
+        (0, rgba.convert("RGB").tobytes(), "/DeviceRGB"),
+        (1, rgba.getchannel("A").tobytes(), "/DeviceGray"),
+    ):
+        data = zlib.compress(data)
+        mask = f" /SMask {number + 1} 0 R" if offset == 0 else ""
+        start_object(number + offset)
+        yield (
+            f"{number + offset} 0 obj\n<< /Type /XObject /Subtype /Image /Width {image.width} "
+            f"/Height {image.height} /ColorSpace {space} /BitsPerComponent 8 "
+            f"/Filter /FlateDecode{mask} /Length {len(data)} >>\nstream\n"
+        )
+        yield data
+        yield "\nendstream\nendobj\n"
+
+
+def iter_pdf(records, width, height, background="#FFFFFF", images=None, background_image=None):
+    """
+    Tek sayfalık PDF belgesini bayt parçaları halinde üretir.
+
+    images, canvas_items görüntü kaydında olmayan görüntüleri (ör. raster
+    döşemeleri) adlarına eşler; background_image arka plan dolgusunun
+    görüntüsüdür (yoksa None).
+
+    İçerik akışının uzunluğu önceden bilinmediği için dolaylı bir nesneye
+    (5 0 obj) yazılır; böylece içerik bellekte biriktirilmeden akıtılabilir.
+    Sayfanın kaynakları (gömülü görüntüler) da aynı nedenle içerikten sonra
+    yazılan 6 0 obj sözlüğündedir.
+    """
+    records, images = _with_background(records, images, background_image)
+    offsets = {}
+    position = 0
+    embedded = {}
+
+    def emit(data):
+        nonlocal position
+        chunk = data if isinstance(data, bytes) else data.encode("latin-1")
+        position += len(chunk)
+        return chunk
+
+    def start_object(number):
+        offsets[number] = position
+
+    yield emit("%PDF-1.4\n")
+    start_object(1)
+    yield emit("1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n")
+    start_object(2)
+    yield emit("2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n")
+    start_object(3)
+    yield emit(
+        f"3 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(width)} {_num(height)}] "
+        f"/Contents 4 0 R /Resources 6 0 R >>\nendobj\n"
+    )
+    start_object(4)
+    yield emit("4 0 obj\n<< /Length 5 0 R >>\nstream\n")
+    stream_start = position
+    for part in _iter_pdf_content(records, height, background, width, embedded, images):
+        yield emit(part)
+    stream_length = position - stream_start
+    yield emit("endstream\nendobj\n")
+    start_object(5)
+    yield emit(f"5 0 obj\n{stream_length}\nendobj\n")
+    # Her görüntü için iki nesne: renkler ve saydamlık maskesi (SMask)
+    start_object(6)
+    names = " ".join(f"/Im{i + 1} {7 + 2 * i} 0 R" for i in range(len(embedded)))
+    yield emit(f"6 0 obj\n<< /XObject << {names} >> >>\nendobj\n")
+    for i, (_, image) in enumerate(embedded.values()):
+        for part in _pdf_image_objects(image, 7 + 2 * i, start_object):
+            yield emit(part)
+
+    xref_offset = position
+    lines = [f"xref\n0 {len(offsets) + 1}\n", "0000000000 65535 f \n"]
+    lines.extend(f"{offsets[number]:010d} 00000 n \n" for number in sorted(offsets))
+    yield emit("".join(lines))
+    yield emit(
+        f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    )
+
+
+def export_vector(records, path, width, height, background="#FFFFFF", images=None,
+                  background_image=None):
+    """
+    Kayıtları dosya uzantısına göre SVG ya da PDF olarak yazar.
+
+    records bir liste ya da iter_canvas_records gibi bir üreteç olabilir;
+    images, görüntü kaydında olmayan görüntüleri adlarına eşler (bkz.
+    with_raster_tiles). background_image (ör. geçişli arka plan) düz rengin
+    üzerine çizilir.
+    """
+    if path.lower().endswith(".pdf"):
+        with open(path, "wb") as f:
+            for chunk in iter_pdf(records, width, height, background, images, background_image):
+                f.write(chunk)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in iter_svg(records, width, height, background, images, background_image):
+                f.write(chunk)